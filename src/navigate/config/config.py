@@ -35,6 +35,7 @@ import sys
 import time
 import shutil
 import platform
+import threading
 from pathlib import Path
 from os.path import isfile
 from multiprocessing.managers import ListProxy, DictProxy
@@ -44,7 +45,7 @@ import logging
 import yaml
 
 # Local Imports
-from navigate.tools.common_functions import build_ref_name
+from navigate.tools.common_functions import build_ref_name, copy_proxy_object
 
 # Logger Setup
 p = __name__.split(".")[1]
@@ -220,6 +221,371 @@ def update_config_dict(manager, parent_dict, config_name, new_config) -> bool:
     return True
 
 
+class ConfigurationSnapshot:
+    """A process-local, read-only copy of a shared configuration.
+
+    Each top-level section (e.g., 'experiment') is copied to plain dicts and lists
+    the first time it is accessed, so reading a nested value costs no inter-process
+    round trips. The snapshot must not be modified.
+    """
+
+    def __init__(self, configuration, version):
+        """Initialize the ConfigurationSnapshot.
+
+        Parameters
+        ----------
+        configuration : DictProxy
+            The shared configuration.
+        version : int
+            The configuration version the snapshot was taken at.
+        """
+        #: DictProxy: The shared configuration.
+        self.configuration = configuration
+
+        #: int: The configuration version the snapshot was taken at.
+        self.version = version
+
+        #: dict: The sections copied so far.
+        self.sections = {}
+
+    def __getitem__(self, key):
+        if key not in self.sections:
+            self.sections[key] = copy_proxy_object(self.configuration[key])
+        return self.sections[key]
+
+    def __contains__(self, key):
+        return key in self.sections or key in self.configuration
+
+    def get(self, key, default=None):
+        """Get a section of the configuration.
+
+        Parameters
+        ----------
+        key : str
+            The name of the section.
+        default : object, optional
+            The value returned if the section doesn't exist, by default None
+
+        Returns
+        -------
+        section : dict or object
+            The copy of the section.
+        """
+        if key in self:
+            return self[key]
+        return default
+
+
+#: dict: The configuration snapshots of this process.
+configuration_snapshots = {}
+
+
+def get_configuration_key(configuration):
+    """Get a key identifying a shared configuration within this process.
+
+    Parameters
+    ----------
+    configuration : DictProxy or dict
+        The shared configuration.
+
+    Returns
+    -------
+    key : tuple
+        The key.
+    """
+    if type(configuration) == DictProxy:
+        return (configuration._token.address, configuration._token.id)
+    return ("local", id(configuration))
+
+
+def get_configuration_version(configuration):
+    """Get the version of a shared configuration.
+
+    Parameters
+    ----------
+    configuration : DictProxy
+        The shared configuration.
+
+    Returns
+    -------
+    version : int
+        The version, bumped by every writer with bump_configuration_version().
+    """
+    return configuration.get("snapshot_version", 0)
+
+
+def bump_configuration_version(configuration):
+    """Mark a shared configuration as changed.
+
+    Must be called after writing values that hot code paths read through
+    get_configuration_snapshot().
+
+    Parameters
+    ----------
+    configuration : DictProxy
+        The shared configuration.
+    """
+    configuration["snapshot_version"] = get_configuration_version(configuration) + 1
+
+
+def get_configuration_snapshot(configuration):
+    """Get a process-local, read-only snapshot of a shared configuration.
+
+    Costs a single round trip to check the version. A new snapshot is taken
+    whenever the version changed since the last one. Plain dicts are returned
+    unchanged, as reading them is already cheap.
+
+    Parameters
+    ----------
+    configuration : DictProxy or dict
+        The shared configuration.
+
+    Returns
+    -------
+    snapshot : ConfigurationSnapshot or dict
+        The snapshot.
+    """
+    if type(configuration) != DictProxy:
+        return configuration
+    key = get_configuration_key(configuration)
+    # read the version before copying, so that a concurrent write is never missed
+    version = get_configuration_version(configuration)
+    snapshot = configuration_snapshots.get(key, None)
+    if snapshot is None or snapshot.version != version:
+        snapshot = ConfigurationSnapshot(configuration, version)
+        configuration_snapshots[key] = snapshot
+    return snapshot
+
+
+class ConfigurationTransaction:
+    """Collects changes to a shared configuration and applies them in bulk.
+
+    Writing a shared configuration key by key costs one inter-process round trip
+    per key. A transaction stages the changes locally and applies them with a
+    single update() call per touched dictionary when the outermost ``with`` block
+    exits. Listeners are then notified once with all touched paths. If the block
+    raises, the staged changes are discarded.
+    """
+
+    def __init__(self, configuration, key=None):
+        """Initialize the ConfigurationTransaction.
+
+        Parameters
+        ----------
+        configuration : DictProxy or dict
+            The shared configuration.
+        key : tuple, optional
+            The key of the transaction in configuration_transactions.
+        """
+        #: DictProxy or dict: The shared configuration.
+        self.configuration = configuration
+
+        #: tuple: The key of the transaction in configuration_transactions.
+        self.key = key
+
+        #: dict: The staged changes, {path: (target, {key: value})}.
+        self.changes = {}
+
+        #: int: The nesting depth of the transaction.
+        self.depth = 0
+
+    def __enter__(self):
+        self.depth += 1
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.depth -= 1
+        if self.depth > 0:
+            return
+        configuration_transactions.pop(self.key, None)
+        if exc_type is None:
+            self.commit()
+        else:
+            self.discard()
+
+    def set(self, path, key, value, target=None):
+        """Stage a single value.
+
+        Parameters
+        ----------
+        path : tuple
+            The path of the dictionary, e.g. ("experiment", "MicroscopeState").
+        key : str
+            The key to set.
+        value : object
+            The new value.
+        target : DictProxy or dict, optional
+            The dictionary at path, if already known. Saves looking it up.
+        """
+        self.update(path, {key: value}, target)
+
+    def update(self, path, values, target=None):
+        """Stage several values of a dictionary.
+
+        Parameters
+        ----------
+        path : tuple
+            The path of the dictionary, e.g. ("experiment", "MicroscopeState").
+        values : dict
+            The new values.
+        target : DictProxy or dict, optional
+            The dictionary at path, if already known. Saves looking it up.
+        """
+        path = tuple(path)
+        if path not in self.changes:
+            self.changes[path] = (target, {})
+        elif target is not None:
+            self.changes[path] = (target, self.changes[path][1])
+        self.changes[path][1].update(values)
+
+    def get(self, path, key, default=None):
+        """Get a value, taking the staged changes into account.
+
+        Parameters
+        ----------
+        path : tuple
+            The path of the dictionary.
+        key : str
+            The key to read.
+        default : object, optional
+            The value returned if the key doesn't exist, by default None
+
+        Returns
+        -------
+        value : object
+            The staged value, otherwise the value in the shared configuration.
+        """
+        path = tuple(path)
+        if path in self.changes:
+            target, values = self.changes[path]
+            if key in values:
+                return values[key]
+        else:
+            target = None
+        if target is None:
+            target = self.resolve(path)
+        return target.get(key, default)
+
+    def resolve(self, path):
+        """Look up the dictionary at a path of the shared configuration.
+
+        Parameters
+        ----------
+        path : tuple
+            The path of the dictionary.
+
+        Returns
+        -------
+        target : DictProxy or dict
+            The dictionary.
+        """
+        target = self.configuration
+        for key in path:
+            target = target[key]
+        return target
+
+    def commit(self):
+        """Apply the staged changes and notify the listeners.
+
+        Returns
+        -------
+        paths : list
+            The touched paths, each one a tuple ending in the changed key.
+        """
+        changes, self.changes = self.changes, {}
+        paths = []
+        for path, (target, values) in changes.items():
+            if not values:
+                continue
+            if target is None:
+                target = self.resolve(path)
+            target.update(values)
+            paths.extend(path + (key,) for key in values)
+        if not paths:
+            return paths
+        bump_configuration_version(self.configuration)
+        for listener in list(
+            configuration_listeners.get(get_configuration_key(self.configuration), [])
+        ):
+            try:
+                listener(paths)
+            except Exception as e:
+                logger.exception(f"Configuration listener failed: {e}")
+        return paths
+
+    def discard(self):
+        """Drop the staged changes."""
+        self.changes = {}
+
+
+#: dict: The active configuration transactions of this process, by thread.
+configuration_transactions = {}
+
+#: dict: The callbacks notified with the paths touched by a transaction.
+configuration_listeners = {}
+
+
+def configuration_transaction(configuration):
+    """Get the active transaction of a shared configuration or start a new one.
+
+    Nested ``with`` blocks of the same thread share one transaction, which is
+    applied when the outermost block exits. Other threads get their own.
+
+    Parameters
+    ----------
+    configuration : DictProxy or dict
+        The shared configuration.
+
+    Returns
+    -------
+    transaction : ConfigurationTransaction
+        The transaction.
+
+    Examples
+    --------
+    >>> with configuration_transaction(configuration) as transaction:
+    ...     transaction.update(("experiment", "MicroscopeState"), {"timepoints": 1})
+    """
+    key = (threading.get_ident(),) + get_configuration_key(configuration)
+    if key not in configuration_transactions:
+        configuration_transactions[key] = ConfigurationTransaction(configuration, key)
+    return configuration_transactions[key]
+
+
+def add_configuration_listener(configuration, callback):
+    """Register a callback notified after each committed transaction.
+
+    The callback runs on the thread that committed the transaction.
+
+    Parameters
+    ----------
+    configuration : DictProxy or dict
+        The shared configuration.
+    callback : callable
+        Called with the list of touched paths.
+    """
+    key = get_configuration_key(configuration)
+    configuration_listeners.setdefault(key, []).append(callback)
+
+
+def remove_configuration_listener(configuration, callback):
+    """Remove a callback registered with add_configuration_listener().
+
+    Parameters
+    ----------
+    configuration : DictProxy or dict
+        The shared configuration.
+    callback : callable
+        The registered callback.
+    """
+    key = get_configuration_key(configuration)
+    listeners = configuration_listeners.get(key, [])
+    if callback in listeners:
+        listeners.remove(callback)
+    if not listeners:
+        configuration_listeners.pop(key, None)
+
+
 def verify_experiment_config(manager, configuration):
     """Verify configuration (configuration, experiment, waveform_constants) yaml files
 
@@ -521,6 +887,7 @@ def verify_experiment_config(manager, configuration):
         "experiment_duration": 1.03,
         "is_multiposition": False,
         "multiposition_count": 1,
+        "optimize_position_order": False,
         "selected_channels": 0,
         "stack_z_origin": 0,
         "stack_focus_origin": 0,
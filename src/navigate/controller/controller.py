@@ -54,6 +54,7 @@ from navigate.controller.configuration_controller import ConfigurationController
 from navigate.controller.sub_controllers import (
     KeystrokeController,
     WaveformTabController,
+    OverviewController,
     StageController,
     CameraSettingController,
     CameraViewController,
@@ -69,10 +70,16 @@ from navigate.controller.sub_controllers import (
 )
 
 from navigate.controller.thread_pool import SynchronizedThreadPool
+from navigate.controller.render_scheduler import RenderScheduler
+from navigate.controller.ui_update_scheduler import UIUpdateScheduler
+from navigate.controller.event_bus import EventBus
 
 # Local Model Imports
 from navigate.model.model import Model
-from navigate.model.concurrency.concurrency_tools import ObjectInSubprocess
+from navigate.model.concurrency.concurrency_tools import (
+    ObjectInSubprocess,
+    call_async,
+)
 
 # Misc. Local Imports
 from navigate.config.config import (
@@ -82,6 +89,9 @@ from navigate.config.config import (
     verify_waveform_constants,
     verify_configuration,
     get_navigate_path,
+    configuration_transaction,
+    add_configuration_listener,
+    remove_configuration_listener,
 )
 from navigate.tools.file_functions import create_save_path, save_yaml_file, get_ram_info
 from navigate.tools.common_dict_tools import update_stage_dict
@@ -206,8 +216,8 @@ class Controller:
             Model, args, self.configuration, event_queue=self.event_queue
         )
 
-        #: mp.Pipe: Pipe for sending images from model to view.
-        self.show_img_pipe = self.model.create_pipe("show_img_pipe")
+        #: FrameRing: Newest frames published by the model.
+        self.frame_ring = self.model.create_frame_ring("frame_ring")
 
         #: string: Path to the default experiment yaml file.
         self.default_experiment_file = self.experiment_path
@@ -221,9 +231,30 @@ class Controller:
         #: View: View object in MVC architecture.
         self.view = view(self.root)
 
+        #: UIUpdateScheduler: Throttles widget updates from worker threads.
+        self.ui_update_scheduler = UIUpdateScheduler(self.view)
+
         #: dict: Event listeners for the controller.
         self.event_listeners = {}
 
+        #: EventBus: Delivers events from the model to the Tk main loop.
+        self.event_bus = EventBus(self.view, self.handle_event)
+        # telemetry and images only need the newest value
+        for event in [
+            "update_stage",
+            "display_camera_parameters",
+            "waveform",
+            "overview",
+            "ilastik_mask",
+            "mirror_update",
+        ]:
+            self.event_bus.set_policy(event, "latest")
+        # plots keep a bounded history
+        for event in ["autofocus", "tonywilson"]:
+            self.event_bus.set_policy(event, "history", maxlen=32)
+        self.event_bus.start()
+        add_configuration_listener(self.configuration, self.configuration_changed)
+
         #: AcquireBarController: Acquire Bar Sub-Controller.
         self.acquire_bar_controller = AcquireBarController(self.view.acqbar, self)
 
@@ -247,11 +278,27 @@ class Controller:
             self.view.camera_waveform.mip_tab, self
         )
 
+        #: RenderScheduler: Shared rendering scheduler for all camera views.
+        self.render_scheduler = RenderScheduler()
+        self.render_scheduler.register_view(self.camera_view_controller)
+        self.render_scheduler.register_view(self.mip_setting_controller)
+        self.render_scheduler.start()
+
         #: CameraSettingController: Camera Settings Tab Sub-Controller.
         self.camera_setting_controller = CameraSettingController(
             self.view.settings.camera_settings_tab, self
         )
 
+        self.ui_update_scheduler.register(
+            "progress_bar", self.acquire_bar_controller.progress_bar
+        )
+        self.ui_update_scheduler.register(
+            "framerate",
+            self.camera_setting_controller.framerate_widgets["max_framerate"].set,
+            max_rate=2,
+        )
+        self.ui_update_scheduler.start()
+
         #: StageController: Stage Sub-Controller.
         self.stage_controller = StageController(
             self.view.settings.stage_control_tab,
@@ -265,6 +312,11 @@ class Controller:
             self.view.camera_waveform.waveform_tab, self
         )
 
+        #: OverviewController: Multi-Position Overview Sub-Controller.
+        self.overview_controller = OverviewController(
+            self.view.camera_waveform.overview_tab, self
+        )
+
         #: KeystrokeController: Keystroke Sub-Controller.
         self.keystroke_controller = KeystrokeController(self.view, self)
 
@@ -490,7 +542,12 @@ class Controller:
         ]
 
         # set waveform template
-        if self.acquire_bar_controller.mode in ["live", "single", "z-stack"]:
+        if self.acquire_bar_controller.mode in [
+            "live",
+            "single",
+            "z-stack",
+            "stage-scan",
+        ]:
             camera_setting = self.configuration["experiment"]["CameraParameters"][
                 microscope_name
             ]
@@ -500,23 +557,26 @@ class Controller:
                 self.waveform_tab_controller.set_waveform_template("Bidirectional")
             else:
                 self.waveform_tab_controller.set_waveform_template("Default")
+        elif self.acquire_bar_controller.mode == "hardware-z-stack":
+            self.waveform_tab_controller.set_waveform_template("Hardware-Z-Stack")
 
         # update multi-positions
         positions = self.multiposition_tab_controller.get_positions()
-        self.configuration["experiment"]["MultiPositions"] = positions
-        self.configuration["experiment"]["MicroscopeState"][
-            "multiposition_count"
-        ] = len(positions)
+        with configuration_transaction(self.configuration) as transaction:
+            transaction.set(("experiment",), "MultiPositions", positions)
+            transaction.set(
+                ("experiment", "MicroscopeState"), "multiposition_count", len(positions)
+            )
 
-        if (
-            self.configuration["experiment"]["MicroscopeState"]["is_multiposition"]
-            and len(positions) == 0
-        ):
-            # Update the view and override the settings.
-            self.configuration["experiment"]["MicroscopeState"][
-                "is_multiposition"
-            ] = False
-            self.channels_tab_controller.is_multiposition_val.set(False)
+            if (
+                transaction.get(("experiment", "MicroscopeState"), "is_multiposition")
+                and len(positions) == 0
+            ):
+                # Update the view and override the settings.
+                transaction.set(
+                    ("experiment", "MicroscopeState"), "is_multiposition", False
+                )
+                self.channels_tab_controller.is_multiposition_val.set(False)
 
         # TODO: validate experiment dict
 
@@ -772,6 +832,7 @@ class Controller:
                     "camera",
                     self.capture_image,
                     args=("autofocus", "live", *args),
+                    pass_token=True,
                 )
             elif self.acquire_bar_controller.mode == "live":
                 self.threads_pool.createThread(
@@ -913,6 +974,25 @@ class Controller:
                     "acquire",
                     self.acquire_bar_controller.mode,
                 ),
+                pass_token=True,
+            )
+
+        elif command == "plan_acquisition":
+            """Estimate the duration and data size of the current acquisition.
+
+            The model replies with an 'acquisition_plan' event.
+            """
+            if self.acquire_bar_controller.is_acquiring:
+                return
+            warning_info = self.update_experiment_setting()
+            if warning_info:
+                messagebox.showerror(
+                    title="Warning",
+                    message=f"Cannot estimate acquisition!\n{warning_info}",
+                )
+                return
+            self.threads_pool.createThread(
+                "model", lambda: self.model.run_command("plan_acquisition")
             )
 
         elif command == "stop_acquire":
@@ -922,11 +1002,6 @@ class Controller:
             # self.model.run_command('stop')
             self.sloppy_stop()
             self.menu_controller.feature_id_val.set(0)
-
-            # clear show_img_pipe
-            while self.show_img_pipe.poll():
-                self.show_img_pipe.recv()
-
             self.current_image_id = -1
 
         elif command == "exit":
@@ -948,6 +1023,12 @@ class Controller:
             self.model.run_command("terminate")
             self.model = None
             self.event_queue.put(("stop", ""))
+            self.render_scheduler.stop()
+            self.ui_update_scheduler.stop()
+            remove_configuration_listener(
+                self.configuration, self.configuration_changed
+            )
+            self.event_bus.stop()
             self.threads_pool.clear()
             sys.exit()
 
@@ -969,6 +1050,7 @@ class Controller:
                     "tony_wilson",
                     "live",
                 ),
+                pass_token=True,
             )
         else:
             self.threads_pool.createThread(
@@ -1007,7 +1089,7 @@ class Controller:
             except RuntimeError:
                 e = RuntimeError
 
-    def capture_image(self, command, mode, *args):
+    def capture_image(self, command, mode, *args, cancel_token=None):
         """Trigger the model to capture images.
 
         Parameters
@@ -1017,18 +1099,24 @@ class Controller:
         mode : string
             'continuous', 'z-stack', 'single', or 'projection'
         args : function-specific passes.
+        cancel_token : CancellationToken, optional
+            Token of the thread pool; the display loop stops once it is cancelled.
         """
         self.camera_view_controller.image_count = 0
         self.mip_setting_controller.image_count = 0
 
         # Start up Progress Bars
         images_received = 0
-        self.acquire_bar_controller.progress_bar(
+        self.ui_update_scheduler.post(
+            "progress_bar",
             images_received=images_received,
             microscope_state=self.configuration["experiment"]["MicroscopeState"],
             mode=mode,
             stop=False,
+            coalesce=False,
         )
+        # only display frames published after the acquisition starts
+        last_sequence = self.frame_ring.sequence
         try:
             work_thread = self.threads_pool.createThread(
                 "model", lambda: self.model.run_command(command, *args)
@@ -1062,25 +1150,23 @@ class Controller:
         self.camera_setting_controller.update_readout_time()
 
         while True:
-            if self.stop_acquisition_flag:
-                break
-            # Receive the Image and log it.
-            image_id = self.show_img_pipe.recv()
-            logger.info(f"Navigate Controller - Received Image: {image_id}")
-
-            if image_id == "stop":
-                self.current_image_id = -1
+            if self.stop_acquisition_flag or (
+                cancel_token is not None and cancel_token.cancelled
+            ):
                 break
+            # Wait for the newest image and log it.
+            self.frame_ring.wait(timeout=0.5)
+            record = self.frame_ring.latest()
+            if record is None or record["sequence"] <= last_sequence:
+                if self.frame_ring.stopped:
+                    self.current_image_id = -1
+                    break
+                continue
 
+            image_id = record["slot"]
+            logger.info(f"Navigate Controller - Received Image: {image_id}")
             self.current_image_id = image_id
 
-            if not isinstance(image_id, int):
-                logger.debug(
-                    f"Navigate Controller - Something wrong happened, stop the model!, "
-                    f"{image_id}"
-                )
-                self.execute("stop_acquire")
-
             # Display the Image in the View
             self.camera_view_controller.try_to_display_image(
                 image=self.data_buffer[image_id]
@@ -1088,10 +1174,13 @@ class Controller:
             self.mip_setting_controller.try_to_display_image(
                 image=self.data_buffer[image_id]
             )
-            images_received += 1
+            # frames published in between were skipped, but still count
+            images_received += record["sequence"] - last_sequence
+            last_sequence = record["sequence"]
 
             # Update progress bar.
-            self.acquire_bar_controller.progress_bar(
+            self.ui_update_scheduler.post(
+                "progress_bar",
                 images_received=images_received,
                 microscope_state=self.configuration["experiment"]["MicroscopeState"],
                 mode=mode,
@@ -1110,9 +1199,7 @@ class Controller:
                 )
 
             # Update the Framerate in the Camera Settings Tab
-            self.camera_setting_controller.framerate_widgets["max_framerate"].set(
-                frames_per_second
-            )
+            self.ui_update_scheduler.post("framerate", frames_per_second)
 
             # Update the Framerate in the Acquire Bar to provide an estimate of
             # the duration of time remaining.
@@ -1128,11 +1215,13 @@ class Controller:
             getattr(plugin_obj, "end_acquisition_controller")(self)
 
         # Stop Progress Bars
-        self.acquire_bar_controller.progress_bar(
+        self.ui_update_scheduler.post(
+            "progress_bar",
             images_received=images_received,
             microscope_state=self.configuration["experiment"]["MicroscopeState"],
             mode=mode,
             stop=True,
+            coalesce=False,
         )
         self.set_mode_of_sub("stop")
 
@@ -1140,7 +1229,7 @@ class Controller:
         """Launch additional microscopes."""
 
         def display_images(
-            microscope_name, camera_view_controller, show_img_pipe, data_buffer
+            microscope_name, camera_view_controller, frame_ring, data_buffer
         ):
             """Display images from additional microscopes.
 
@@ -1150,8 +1239,8 @@ class Controller:
                 Microscope name
             camera_view_controller : CameraViewController
                 Camera View Controller object.
-            show_img_pipe : multiprocessing.Pipe
-                Pipe for showing images.
+            frame_ring : FrameRing
+                Newest frames published by the model.
             data_buffer : SharedNDArray
                 Pre-allocated shared memory array.
                 Size dictated by x_pixels, y_pixels, an number_of_frames in
@@ -1162,22 +1251,21 @@ class Controller:
                 self.configuration["experiment"]["CameraParameters"][microscope_name],
             )
             images_received = 0
+            last_sequence = frame_ring.sequence
             while True:
                 if self.stop_acquisition_flag:
                     break
-                # Receive the Image and log it.
-                image_id = show_img_pipe.recv()
+                # Wait for the newest image and log it.
+                frame_ring.wait(timeout=0.5)
+                record = frame_ring.latest()
+                if record is None or record["sequence"] <= last_sequence:
+                    if frame_ring.stopped:
+                        break
+                    continue
+                image_id = record["slot"]
+                last_sequence = record["sequence"]
                 logger.info(f"Navigate Controller - Received Image: {image_id}")
 
-                if image_id == "stop":
-                    break
-                if not isinstance(image_id, int):
-                    logger.debug(
-                        f"Navigate Controller - Something wrong happened in additional "
-                        f"microscope!, {image_id}"
-                    )
-                    break
-
                 # Display the Image in the View
                 try:
                     camera_view_controller.try_to_display_image(
@@ -1197,7 +1285,7 @@ class Controller:
 
         # show additional camera view popup
         for microscope_name in self.additional_microscopes_configs:
-            show_img_pipe = self.model.create_pipe(f"{microscope_name}_show_img_pipe")
+            frame_ring = self.model.create_frame_ring(f"{microscope_name}_frame_ring")
             data_buffer = self.model.launch_virtual_microscope(
                 microscope_name,
                 self.additional_microscopes_configs[microscope_name],
@@ -1212,6 +1300,7 @@ class Controller:
                 )
                 camera_view_controller.microscope_name = microscope_name
                 popup_window.popup.bind("<Configure>", camera_view_controller.resize)
+                self.render_scheduler.register_view(camera_view_controller)
                 self.additional_microscopes[microscope_name]["popup_window"] = popup_window
                 self.additional_microscopes[microscope_name][
                     "camera_view_controller"
@@ -1220,13 +1309,15 @@ class Controller:
                     "WM_DELETE_WINDOW",
                     combine_funcs(
                         popup_window.popup.dismiss,
-                        lambda: self.additional_microscopes[microscope_name].pop(
-                            "camera_view_controller"
+                        lambda: self.release_camera_view(
+                            self.additional_microscopes[microscope_name].pop(
+                                "camera_view_controller"
+                            )
                         ),
                     ),
                 )
 
-            self.additional_microscopes[microscope_name]["show_img_pipe"] = show_img_pipe
+            self.additional_microscopes[microscope_name]["frame_ring"] = frame_ring
             self.additional_microscopes[microscope_name]["data_buffer"] = data_buffer
 
             # start thread
@@ -1237,7 +1328,7 @@ class Controller:
                     self.additional_microscopes[microscope_name][
                         "camera_view_controller"
                     ],
-                    show_img_pipe,
+                    frame_ring,
                     self.additional_microscopes[microscope_name]["data_buffer"],
                 ),
             )
@@ -1257,15 +1348,31 @@ class Controller:
             return
         del self.additional_microscopes[microscope_name]["data_buffer"]
         self.model.destroy_virtual_microscope(microscope_name)
-        # release pipe
-        self.model.release_pipe(f"{microscope_name}_show_img_pipe")
-        del self.additional_microscopes[microscope_name]["show_img_pipe"]
+        # release frame ring
+        self.model.release_frame_ring(f"{microscope_name}_frame_ring")
+        self.additional_microscopes[microscope_name].pop("frame_ring").close()
         # destroy the popup window
         if destroy_window:
+            camera_view_controller = self.additional_microscopes[microscope_name].get(
+                "camera_view_controller", None
+            )
+            if camera_view_controller is not None:
+                self.release_camera_view(camera_view_controller)
             self.additional_microscopes[microscope_name]["popup_window"].popup.dismiss()
             self.additional_microscopes[microscope_name]["camera_view_controller"] = None
             del self.additional_microscopes[microscope_name]
 
+    def release_camera_view(self, camera_view_controller):
+        """Stop the rendering and widget updates of a camera view.
+
+        Parameters
+        ----------
+        camera_view_controller : CameraViewController
+            The camera view controller of a closed popup window.
+        """
+        self.render_scheduler.unregister_view(camera_view_controller)
+        camera_view_controller.unregister_ui_updates()
+
     def move_stage(self, pos_dict):
         """Trigger the model to move the stage.
 
@@ -1277,8 +1384,9 @@ class Controller:
         # Update our local stage dictionary
         update_stage_dict(self, pos_dict)
 
-        # Pass to model
-        self.model.move_stage(pos_dict)
+        # Pass to model without waiting, so jogging doesn't block the GUI
+        future = call_async(self.model, "move_stage", pos_dict)
+        future.add_done_callback(self.log_model_call_error)
 
     def stop_stage(self):
         """Stop the stage.
@@ -1286,7 +1394,21 @@ class Controller:
         Grab the stopped position from the stage
         and update the GUI control values accordingly.
         """
-        self.model.stop_stage()
+        future = call_async(self.model, "stop_stage")
+        future.add_done_callback(self.log_model_call_error)
+
+    @staticmethod
+    def log_model_call_error(future):
+        """Log the exception of an asynchronous model call.
+
+        Parameters
+        ----------
+        future : concurrent.futures.Future
+            The future of the model call.
+        """
+        exception = future.exception()
+        if exception is not None:
+            logger.error(f"Navigate Controller - Model call failed: {exception}")
 
     def update_stage_controller_silent(self, ret_pos_dict):
         """Send updates to the stage GUI
@@ -1303,40 +1425,67 @@ class Controller:
         self.stage_controller.set_position_silent(stage_gui_dict)
 
     def update_event(self):
-        """Update the View/Controller based on events from the Model."""
+        """Receive events from the Model and publish them to the event bus.
+
+        Never touches the GUI, so the Model is not slowed down by it.
+        """
         while True:
             event, value = self.event_queue.get()
 
-            if event == "warning":
-                # Display a warning that arises from the model as a top-level GUI popup
-                messagebox.showwarning(title="Navigate", message=value)
-
-            elif event == "multiposition":
-                # Update the multi-position tab without appending to the list
-                update_table(
-                    table=self.multiposition_tab_controller.table,
-                    pos=value,
-                )
-                self.channels_tab_controller.is_multiposition_val.set(True)
-
-            elif event == "stop":
+            if event == "stop":
                 # Stop the software
                 break
 
-            elif event == "update_stage":
-                for _ in range(10):
-                    try:
-                        self.update_stage_controller_silent(value)
-                        break
-                    except RuntimeError:
-                        time.sleep(0.001)
-                        pass
+            self.event_bus.publish(event, value)
 
-            elif event in self.event_listeners.keys():
-                try:
-                    self.event_listeners[event](value)
-                except Exception:
-                    print(f"*** unhandled event: {event}, {value}")
+    def configuration_changed(self, paths):
+        """Publish the paths touched by a committed configuration transaction.
+
+        Delivered as the 'configuration_changed' event on the Tk main loop, so
+        plugins can react to a batch of changes with register_event_listener().
+
+        Parameters
+        ----------
+        paths : list
+            The touched paths, e.g. ("experiment", "MicroscopeState", "timepoints").
+        """
+        self.event_bus.publish("configuration_changed", paths)
+
+    def handle_event(self, event, value):
+        """Update the View/Controller based on an event from the Model.
+
+        Called by the event bus on the Tk main loop.
+
+        Parameters
+        ----------
+        event : str
+            Name of the event.
+        value : object
+            Value of the event.
+        """
+        if event == "warning":
+            # Display a warning that arises from the model as a top-level GUI popup
+            messagebox.showwarning(title="Navigate", message=value)
+
+        elif event == "acquisition_plan":
+            messagebox.showinfo(title="Acquisition Plan", message=value)
+
+        elif event == "multiposition":
+            # Update the multi-position tab without appending to the list
+            update_table(
+                table=self.multiposition_tab_controller.table,
+                pos=value,
+            )
+            self.channels_tab_controller.is_multiposition_val.set(True)
+
+        elif event == "update_stage":
+            self.update_stage_controller_silent(value)
+
+        elif event in self.event_listeners.keys():
+            try:
+                self.event_listeners[event](value)
+            except Exception:
+                print(f"*** unhandled event: {event}, {value}")
 
     def add_acquisition_mode(self, name, acquisition_obj):
         """Add and Acquisition Mode.
@@ -0,0 +1,191 @@
+# Copyright (c) 2021-2024  The University of Texas Southwestern Medical Center.
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted for academic and research use only
+# (subject to the limitations in the disclaimer below)
+# provided that the following conditions are met:
+
+#      * Redistributions of source code must retain the above copyright notice,
+#      this list of conditions and the following disclaimer.
+
+#      * Redistributions in binary form must reproduce the above copyright
+#      notice, this list of conditions and the following disclaimer in the
+#      documentation and/or other materials provided with the distribution.
+
+#      * Neither the name of the copyright holders nor the names of its
+#      contributors may be used to endorse or promote products derived from this
+#      software without specific prior written permission.
+
+# NO EXPRESS OR IMPLIED LICENSES TO ANY PARTY'S PATENT RIGHTS ARE GRANTED BY
+# THIS LICENSE. THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND
+# CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A
+# PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR
+# BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER
+# IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+#
+
+# Standard Library Imports
+import threading
+import logging
+import itertools
+from collections import deque
+
+# Third Party Imports
+
+# Local Imports
+
+# Logger Setup
+p = __name__.split(".")[1]
+logger = logging.getLogger(p)
+
+
+class EventBus:
+    """Delivers events from the model to the Tk main loop in batches.
+
+    The thread that receives events from the model publishes them to the bus and
+    returns immediately, so the model never waits for the GUI. The bus hands them to
+    the dispatch function on the Tk main loop with `after()`.
+
+    Each topic has a delivery policy:
+
+    - ``"ordered"``: every event is delivered. This is the default.
+    - ``"latest"``: only the newest event is delivered, e.g. stage positions.
+    - ``"history"``: the newest `maxlen` events are delivered, e.g. plot data.
+
+    Events of all topics are delivered in the order they were published.
+    """
+
+    def __init__(self, view, dispatch, interval=20):
+        """Initialize the EventBus.
+
+        Parameters
+        ----------
+        view : tk.Widget
+            Any widget of the application. Used to schedule the deliveries.
+        dispatch : callable
+            Called with (topic, value) for each delivered event.
+        interval : int, optional
+            The interval in milliseconds between two deliveries, by default 20
+        """
+        #: tk.Widget: The widget used to schedule the deliveries.
+        self.view = view
+
+        #: callable: Called with (topic, value) for each delivered event.
+        self.dispatch = dispatch
+
+        #: int: The interval in milliseconds between two deliveries.
+        self.interval = interval
+
+        #: dict: The delivery policy and maximum length of each topic.
+        self.policies = {}
+
+        #: dict: The pending events of each topic, as (sequence, value).
+        self.pending = {}
+
+        #: itertools.count: The sequence numbers of the published events.
+        self.sequence = itertools.count()
+
+        #: int: The number of events dropped by the policies.
+        self.events_dropped = 0
+
+        #: threading.Lock: The lock for the pending events.
+        self.lock = threading.Lock()
+
+        #: str: The id of the scheduled delivery.
+        self.after_id = None
+
+    def set_policy(self, topic, policy="ordered", maxlen=None):
+        """Set the delivery policy of a topic.
+
+        Parameters
+        ----------
+        topic : str
+            The name of the event.
+        policy : str, optional
+            "ordered", "latest" or "history", by default "ordered"
+        maxlen : int, optional
+            The number of events kept by the "history" policy.
+        """
+        if policy not in ["ordered", "latest", "history"]:
+            raise ValueError(f"Unknown delivery policy: {policy}")
+        if policy == "latest":
+            maxlen = 1
+        elif policy == "ordered":
+            maxlen = None
+        elif maxlen is None:
+            raise ValueError("The history policy needs a maximum length.")
+        with self.lock:
+            self.policies[topic] = (policy, maxlen)
+            if topic in self.pending:
+                self.pending[topic] = deque(self.pending[topic], maxlen=maxlen)
+
+    def publish(self, topic, value):
+        """Publish an event. Thread safe and never blocks on the GUI.
+
+        Parameters
+        ----------
+        topic : str
+            The name of the event.
+        value : object
+            The value of the event.
+        """
+        with self.lock:
+            if topic not in self.pending:
+                maxlen = self.policies.get(topic, ("ordered", None))[1]
+                self.pending[topic] = deque(maxlen=maxlen)
+            events = self.pending[topic]
+            if events.maxlen is not None and len(events) == events.maxlen:
+                self.events_dropped += 1
+            events.append((next(self.sequence), value))
+
+    def get_events(self):
+        """Take the pending events.
+
+        Returns
+        -------
+        events : list
+            The list of (topic, value), in the order they were published.
+        """
+        with self.lock:
+            events = [
+                (sequence, topic, value)
+                for topic, pending in self.pending.items()
+                for sequence, value in pending
+            ]
+            self.pending.clear()
+        events.sort(key=lambda event: event[0])
+        return [(topic, value) for _, topic, value in events]
+
+    def flush(self):
+        """Deliver the pending events. Must be called on the Tk main loop."""
+        for topic, value in self.get_events():
+            try:
+                self.dispatch(topic, value)
+            except Exception as e:
+                logger.debug(f"EventBus - {topic} delivery failed: {e}")
+
+    def run(self):
+        """Deliver the pending events and schedule the next delivery."""
+        self.flush()
+        self.after_id = self.view.after(self.interval, self.run)
+
+    def start(self):
+        """Start delivering the events."""
+        if self.after_id is None:
+            self.after_id = self.view.after(self.interval, self.run)
+
+    def stop(self):
+        """Stop delivering the events."""
+        if self.after_id is not None:
+            try:
+                self.view.after_cancel(self.after_id)
+            except Exception:
+                pass
+            self.after_id = None
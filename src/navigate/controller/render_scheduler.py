@@ -0,0 +1,268 @@
+# Copyright (c) 2021-2024  The University of Texas Southwestern Medical Center.
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted for academic and research use only
+# (subject to the limitations in the disclaimer below)
+# provided that the following conditions are met:
+
+#      * Redistributions of source code must retain the above copyright notice,
+#      this list of conditions and the following disclaimer.
+
+#      * Redistributions in binary form must reproduce the above copyright
+#      notice, this list of conditions and the following disclaimer in the
+#      documentation and/or other materials provided with the distribution.
+
+#      * Neither the name of the copyright holders nor the names of its
+#      contributors may be used to endorse or promote products derived from this
+#      software without specific prior written permission.
+
+# NO EXPRESS OR IMPLIED LICENSES TO ANY PARTY'S PATENT RIGHTS ARE GRANTED BY
+# THIS LICENSE. THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND
+# CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A
+# PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR
+# BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER
+# IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+#
+
+# Standard Library Imports
+import threading
+import logging
+import time
+
+# Third Party Imports
+
+# Local Imports
+
+# Logger Setup
+p = __name__.split(".")[1]
+logger = logging.getLogger(p)
+
+
+class RenderScheduler:
+    """A shared rendering scheduler for the camera views.
+
+    All camera views (main camera view, MIP view and the views of additional
+    microscopes) hand their newest image to the scheduler instead of starting a
+    display thread of their own. A single render thread then displays the images.
+
+    Note
+    ----
+    - Only the newest image of each view is kept. Older images are dropped.
+    - Views are served in round-robin order, so a fast camera can not starve the
+      other views.
+    - The total number of images rendered per second, over all views, is limited by
+      `max_frame_rate`.
+    - Hidden or minimized views are skipped. Their newest image is kept and rendered
+      as soon as the view is visible again.
+    """
+
+    def __init__(self, max_frame_rate=30, hidden_view_interval=0.25):
+        """Initialize the RenderScheduler.
+
+        Parameters
+        ----------
+        max_frame_rate : float, optional
+            The maximum number of images rendered per second over all views,
+            by default 30
+        hidden_view_interval : float, optional
+            The interval in seconds to check if a hidden view became visible,
+            by default 0.25
+        """
+        #: float: The maximum number of images rendered per second.
+        self.max_frame_rate = max_frame_rate
+
+        #: float: The interval to check if a hidden view became visible.
+        self.hidden_view_interval = hidden_view_interval
+
+        #: list: The registered view controllers, in round-robin order.
+        self.views = []
+
+        #: dict: The newest image of each view controller waiting to be rendered.
+        self.pending_images = {}
+
+        #: int: The index of the view to serve first in the next round.
+        self.next_view_index = 0
+
+        #: threading.Condition: The condition protecting the views and images.
+        self.condition = threading.Condition()
+
+        #: threading.Thread: The render thread.
+        self.render_thread = None
+
+        #: bool: The flag for the render thread.
+        self.is_running = False
+
+        #: int: The number of rendered images.
+        self.frames_rendered = 0
+
+        #: int: The number of images dropped because a newer image arrived.
+        self.frames_dropped = 0
+
+    def register_view(self, view_controller):
+        """Register a view controller to the scheduler.
+
+        Parameters
+        ----------
+        view_controller : BaseViewController
+            The view controller. It should have a `canvas` and a `display_image`
+            function.
+        """
+        with self.condition:
+            if view_controller not in self.views:
+                self.views.append(view_controller)
+        view_controller.render_scheduler = self
+
+    def unregister_view(self, view_controller):
+        """Remove a view controller from the scheduler.
+
+        Images submitted by the view controller afterwards are ignored.
+
+        Parameters
+        ----------
+        view_controller : BaseViewController
+            The view controller.
+        """
+        with self.condition:
+            if view_controller in self.views:
+                self.views.remove(view_controller)
+            self.pending_images.pop(view_controller, None)
+
+    def submit(self, view_controller, image):
+        """Hand the newest image of a view controller to the scheduler.
+
+        Parameters
+        ----------
+        view_controller : BaseViewController
+            The view controller.
+        image : numpy.ndarray
+            Image data.
+        """
+        with self.condition:
+            if view_controller not in self.views:
+                return
+            if view_controller in self.pending_images:
+                self.frames_dropped += 1
+            self.pending_images[view_controller] = image
+            self.condition.notify()
+
+    @staticmethod
+    def is_view_visible(view_controller):
+        """Check if the view of a view controller is shown on the screen.
+
+        Parameters
+        ----------
+        view_controller : BaseViewController
+            The view controller.
+
+        Returns
+        -------
+        bool
+            Whether the view is visible.
+        """
+        try:
+            return bool(view_controller.canvas.winfo_viewable())
+        except Exception:
+            return False
+
+    def get_next_image(self):
+        """Get the next image to render.
+
+        The views with pending images are visited in round-robin order, starting
+        after the view served last. Hidden views are skipped.
+
+        Returns
+        -------
+        tuple or None
+            The view controller and its newest image, or None if no visible view has
+            a pending image.
+        """
+        with self.condition:
+            number_of_views = len(self.views)
+            candidates = [
+                self.views[(self.next_view_index + i) % number_of_views]
+                for i in range(number_of_views)
+                if self.views[(self.next_view_index + i) % number_of_views]
+                in self.pending_images
+            ]
+
+        # Querying Tk may need the main loop, so do it without holding the lock.
+        for view_controller in candidates:
+            if not self.is_view_visible(view_controller):
+                continue
+            with self.condition:
+                if view_controller not in self.pending_images:
+                    continue
+                image = self.pending_images.pop(view_controller)
+                self.next_view_index = (self.views.index(view_controller) + 1) % len(
+                    self.views
+                )
+            return view_controller, image
+        return None
+
+    def render_next(self):
+        """Render the next image.
+
+        Returns
+        -------
+        bool
+            Whether an image is rendered.
+        """
+        next_image = self.get_next_image()
+        if next_image is None:
+            return False
+        view_controller, image = next_image
+        try:
+            view_controller.display_image(image)
+        except Exception as e:
+            logger.debug(f"Can't display image for {view_controller}: {e}")
+        self.frames_rendered += 1
+        return True
+
+    def run(self):
+        """Render images until the scheduler is stopped."""
+        frame_interval = 1.0 / self.max_frame_rate
+        while True:
+            with self.condition:
+                while self.is_running and not self.pending_images:
+                    self.condition.wait()
+                if not self.is_running:
+                    break
+
+            start_time = time.perf_counter()
+            if not self.render_next():
+                # Only hidden views have images to show.
+                with self.condition:
+                    self.condition.wait(self.hidden_view_interval)
+                continue
+
+            # Keep the global display frame budget.
+            elapsed_time = time.perf_counter() - start_time
+            if elapsed_time < frame_interval:
+                time.sleep(frame_interval - elapsed_time)
+
+    def start(self):
+        """Start the render thread."""
+        if self.is_running:
+            return
+        self.is_running = True
+        self.render_thread = threading.Thread(
+            target=self.run, name="render_scheduler", daemon=True
+        )
+        self.render_thread.start()
+
+    def stop(self):
+        """Stop the render thread."""
+        with self.condition:
+            self.is_running = False
+            self.pending_images.clear()
+            self.condition.notify_all()
+        if self.render_thread and self.render_thread is not threading.current_thread():
+            self.render_thread.join(1)
+        self.render_thread = None
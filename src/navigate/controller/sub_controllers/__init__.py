@@ -8,6 +8,7 @@ from .channels_tab import ChannelsTabController  # noqa
 from .camera_view import CameraViewController, MIPViewController  # noqa
 from .camera_settings import CameraSettingController  # noqa
 from .waveform_tab import WaveformTabController  # noqa
+from .overview import OverviewController  # noqa
 from .waveform_popup import WaveformPopupController  # noqa
 from .autofocus import AutofocusPopupController  # noqa
 from .features_popup import FeaturePopupController  # noqa
@@ -72,6 +72,9 @@ class AcquireBarController(GUIController):
         self.mode_dict = {
             "Continuous Scan": "live",
             "Z-Stack": "z-stack",
+            "Stage-Scan Z-Stack": "stage-scan",
+            "Hardware Z-Stack": "hardware-z-stack",
+            "Channel Sequence": "channel-sequence",
             "Single Acquisition": "single",
             "Customized": "customized",
         }
@@ -135,7 +138,12 @@ class AcquireBarController(GUIController):
 
         if mode == "single":
             number_of_slices = 1
-        elif mode == "z-stack":
+        elif mode in [
+            "z-stack",
+            "stage-scan",
+            "hardware-z-stack",
+            "channel-sequence",
+        ]:
             number_of_slices = microscope_state["number_z_steps"]
         else:
             number_of_slices = 1
@@ -151,7 +159,13 @@ class AcquireBarController(GUIController):
         if images_received > 0:
             # Update progress bars according to imaging mode.
             if stop is False:
-                if mode == "z-stack" or mode == "single":
+                if mode in [
+                    "z-stack",
+                    "stage-scan",
+                    "hardware-z-stack",
+                    "channel-sequence",
+                    "single",
+                ]:
                     # Calculate the number of images remaining.
                     # Time is estimated from the framerate, which includes stage
                     # movement time inherently.
@@ -166,7 +180,12 @@ class AcquireBarController(GUIController):
                     self.view.OvrAcq.start()
                     self.view.total_acquisition_label.config(text="--:--:--")
 
-                if mode == "z-stack":
+                if mode in [
+                    "z-stack",
+                    "stage-scan",
+                    "hardware-z-stack",
+                    "channel-sequence",
+                ]:
                     top_percent_complete = 100 * (
                         images_received / top_anticipated_images
                     )
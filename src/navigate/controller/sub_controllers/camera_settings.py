@@ -37,6 +37,7 @@ import logging
 
 # Local Imports
 from navigate.controller.sub_controllers.gui import GUIController
+from navigate.config.config import configuration_transaction
 
 # Logger Setup
 p = __name__.split(".")[1]
@@ -270,20 +271,17 @@ class CameraSettingController(GUIController):
         Args:
             *args: Variable length argument list.
         """
+        camera_setting = {}
         # Camera Operation Mode
-        self.camera_setting_dict["sensor_mode"] = self.mode_widgets["Sensor"].get()
-        if self.camera_setting_dict["sensor_mode"] == "Light-Sheet":
-            self.camera_setting_dict["readout_direction"] = self.mode_widgets[
-                "Readout"
-            ].get()
-            self.camera_setting_dict["number_of_pixels"] = self.mode_widgets[
-                "Pixels"
-            ].get()
+        camera_setting["sensor_mode"] = self.mode_widgets["Sensor"].get()
+        if camera_setting["sensor_mode"] == "Light-Sheet":
+            camera_setting["readout_direction"] = self.mode_widgets["Readout"].get()
+            camera_setting["number_of_pixels"] = self.mode_widgets["Pixels"].get()
             # light-sheet doesn't support binning
             self.roi_widgets["Binning"].set("1x1")
 
         # Camera Binning
-        self.camera_setting_dict["binning"] = self.roi_widgets["Binning"].get()
+        camera_setting["binning"] = self.roi_widgets["Binning"].get()
 
         # Camera FOV Size.
         if not self.roi_widgets["is_centered"].get():
@@ -306,6 +304,7 @@ class CameraSettingController(GUIController):
                     + f"The values of X must be divisible by {self.step_width}!"
                     + f"The values of Y must be divisible by {self.step_height}!"
                 )
+                self.update_camera_setting_dict(camera_setting)
                 return warning_message
 
             center_x = (bottom_x + top_x) // 2
@@ -326,32 +325,53 @@ class CameraSettingController(GUIController):
         if y_pixels < self.min_height:
             y_pixels = self.min_height
 
-        self.camera_setting_dict["pixel_size"] = self.default_pixel_size
-        self.camera_setting_dict["frames_to_average"] = self.framerate_widgets[
+        camera_setting["pixel_size"] = self.default_pixel_size
+        camera_setting["frames_to_average"] = self.framerate_widgets[
             "frames_to_average"
         ].get()
 
         binning = [
-            int(x) if x != "" else 1
-            for x in self.camera_setting_dict["binning"].split("x")
+            int(x) if x != "" else 1 for x in camera_setting["binning"].split("x")
         ]
         img_width = x_pixels // binning[0]
         img_height = y_pixels // binning[1]
 
-        self.camera_setting_dict["x_pixels"] = x_pixels
-        self.camera_setting_dict["y_pixels"] = y_pixels
-        self.camera_setting_dict["img_x_pixels"] = img_width
-        self.camera_setting_dict["img_y_pixels"] = img_height
-        self.camera_setting_dict["center_x"] = center_x
-        self.camera_setting_dict["center_y"] = center_y
+        camera_setting["x_pixels"] = x_pixels
+        camera_setting["y_pixels"] = y_pixels
+        camera_setting["img_x_pixels"] = img_width
+        camera_setting["img_y_pixels"] = img_height
+        camera_setting["center_x"] = center_x
+        camera_setting["center_y"] = center_y
 
         self.roi_widgets["Width"].set(x_pixels)
         self.roi_widgets["Height"].set(y_pixels)
-        self.camera_setting_dict["fov_x"] = self.roi_widgets["FOV_X"].get()
-        self.camera_setting_dict["fov_y"] = self.roi_widgets["FOV_Y"].get()
+        camera_setting["fov_x"] = self.roi_widgets["FOV_X"].get()
+        camera_setting["fov_y"] = self.roi_widgets["FOV_Y"].get()
+        self.update_camera_setting_dict(camera_setting)
 
         return ""
 
+    def update_camera_setting_dict(self, values):
+        """Write several camera settings to the experiment in a single update.
+
+        Parameters
+        ----------
+        values : dict
+            The camera settings to update.
+        """
+        configuration = self.parent_controller.configuration
+        microscope_name = (
+            self.microscope_name
+            if self.microscope_name
+            else configuration["experiment"]["MicroscopeState"]["microscope_name"]
+        )
+        with configuration_transaction(configuration) as transaction:
+            transaction.update(
+                ("experiment", "CameraParameters", microscope_name),
+                values,
+                self.camera_setting_dict,
+            )
+
     def update_sensor_mode(self, *args):
         """Updates the camera sensor mode.
 
@@ -495,12 +515,16 @@ class CameraSettingController(GUIController):
             for widget_name in ["Top_X", "Top_Y", "Bottom_X", "Bottom_Y"]:
                 self.roi_widgets[widget_name].widget._toggle_error(False)
 
-            self.camera_setting_dict["top_x"] = self.roi_widgets["Top_X"].get()
-            self.camera_setting_dict["bottom_x"] = self.roi_widgets["Bottom_X"].get()
-            self.camera_setting_dict["top_y"] = self.roi_widgets["Top_Y"].get()
-            self.camera_setting_dict["bottom_y"] = self.roi_widgets["Bottom_Y"].get()
-            self.camera_setting_dict["x_pixels"] = width
-            self.camera_setting_dict["y_pixels"] = height
+            self.update_camera_setting_dict(
+                {
+                    "top_x": self.roi_widgets["Top_X"].get(),
+                    "bottom_x": self.roi_widgets["Bottom_X"].get(),
+                    "top_y": self.roi_widgets["Top_Y"].get(),
+                    "bottom_y": self.roi_widgets["Bottom_Y"].get(),
+                    "x_pixels": width,
+                    "y_pixels": height,
+                }
+            )
             self.roi_widgets["Width"].widget.set(width)
             self.roi_widgets["Height"].widget.set(height)
         self.calculate_physical_dimensions()
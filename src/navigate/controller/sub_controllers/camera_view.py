@@ -116,6 +116,13 @@ class BaseViewController(GUIController, ABaseViewController):
         #: numpy.ndarray: The variance map.
         self._variance = None
 
+        #: tuple: The offset and variance maps down-sampled to the canvas size, and
+        #: the SNR gain of averaging camera pixels into canvas pixels.
+        self._snr_maps = None
+
+        #: tuple: The crop indices and canvas size of the cached SNR maps.
+        self._snr_maps_key = None
+
         #: bool: The flag for the display of the cross-hair.
         self.apply_cross_hair = True
 
@@ -156,14 +163,18 @@ class BaseViewController(GUIController, ABaseViewController):
         self.microscope_name = None
 
         #: dict: The flip flags for the camera.
-        self.flip_flags = None
+        self.flip_flags = {"x": False, "y": False}
 
         #: int: The height of the image.
         self.height = None
 
-        #: numpy.ndarray: The image data.
+        #: numpy.ndarray: The image data, as acquired by the camera (not flipped).
         self.image = None
 
+        #: tuple: The crop indices (y_start, y_end, x_start, x_end) of the digital
+        #: zoom in the acquired image.
+        self.zoom_crop = None
+
         #: bool: The flag for the image cache.
         self.image_cache_flag = True
 
@@ -173,6 +184,9 @@ class BaseViewController(GUIController, ABaseViewController):
         #: VariableWithLock: The lock for displaying the image.
         self.is_displaying_image = VariableWithLock(bool)
 
+        #: RenderScheduler: The shared rendering scheduler, if registered to one.
+        self.render_scheduler = None
+
         #: logging.Logger: The logger for the camera view controller.
         self.logger = logging.getLogger(p)
 
@@ -381,7 +395,6 @@ class BaseViewController(GUIController, ABaseViewController):
         """
         self.transpose = self.image_palette["Flip XY"].get()
         if display and self.image is not None:
-            self.image = self.flip_image(self.image)
             self.process_image()
 
     def toggle_min_max_buttons(self, display=False):
@@ -416,11 +429,18 @@ class BaseViewController(GUIController, ABaseViewController):
         function will return. Thus, if imaging is faster than the display, the display
         will skip frames.
 
+        If the view controller is registered to a render scheduler, the image is
+        handed to the scheduler, which renders the newest image of each view.
+
         Parameters
         ----------
         image : numpy.ndarray
             Image data.
         """
+        if self.render_scheduler is not None:
+            self.render_scheduler.submit(self, image)
+            return
+
         with self.is_displaying_image as is_displaying_image:
             if is_displaying_image.value:
                 return
@@ -732,14 +752,22 @@ class BaseViewController(GUIController, ABaseViewController):
 
         y_start_index = int(-self.zoom_rect[1][0] / self.zoom_scale)
         y_end_index = int(y_start_index + self.zoom_height)
-        zoom_image = self.image[
-            int(y_start_index * self.canvas_height_scale) : int(
-                y_end_index * self.canvas_height_scale
-            ),
-            int(x_start_index * self.canvas_width_scale) : int(
-                x_end_index * self.canvas_width_scale
-            ),
-        ]
+
+        image_height, image_width = self.image.shape[:2]
+        y_start = max(int(y_start_index * self.canvas_height_scale), 0)
+        y_end = min(int(y_end_index * self.canvas_height_scale), image_height)
+        x_start = max(int(x_start_index * self.canvas_width_scale), 0)
+        x_end = min(int(x_end_index * self.canvas_width_scale), image_width)
+
+        # The zoom rectangle is defined on the displayed (flipped) image. Mirror it
+        # onto the acquired image, which is only flipped after down-sampling.
+        if self.flip_flags["y"]:
+            y_start, y_end = image_height - y_end, image_height - y_start
+        if self.flip_flags["x"]:
+            x_start, x_end = image_width - x_end, image_width - x_start
+
+        self.zoom_crop = (y_start, y_end, x_start, x_end)
+        zoom_image = self.image[y_start:y_end, x_start:x_end]
 
         return zoom_image
 
@@ -768,7 +796,8 @@ class BaseViewController(GUIController, ABaseViewController):
     def down_sample_image(self, image):
         """Down-sample the data for image display according to widget size.
 
-        Interpolation type is cv2.INTER_LINEAR by default.
+        Interpolation type is cv2.INTER_AREA, which averages the pixels that fall
+        into each canvas pixel.
 
         Parameters
         ----------
@@ -781,9 +810,62 @@ class BaseViewController(GUIController, ABaseViewController):
             Down-sampled image data.
         """
         sx, sy = self.canvas_width, self.canvas_height
-        down_sampled_image = cv2.resize(image, (sx, sy))
+        down_sampled_image = cv2.resize(image, (sx, sy), interpolation=cv2.INTER_AREA)
         return down_sampled_image
 
+    def get_signal_to_noise_maps(self):
+        """Get the offset and variance maps matching the displayed image.
+
+        The maps are cropped to the digital zoom and down-sampled to the canvas
+        size. The result is cached until the zoom or the canvas size changes.
+
+        Returns
+        -------
+        offset : numpy.ndarray
+            Down-sampled offset map.
+        variance : numpy.ndarray
+            Down-sampled variance map, i.e. the mean variance of a camera pixel.
+        gain : float
+            Square root of the number of camera pixels averaged into each canvas
+            pixel, at least 1.
+        """
+        key = (self.zoom_crop, self.canvas_width, self.canvas_height)
+        if self._snr_maps_key != key:
+            y_start, y_end, x_start, x_end = self.zoom_crop
+            binning = (y_end - y_start) * (x_end - x_start)
+            binning /= self.canvas_width * self.canvas_height
+            self._snr_maps = (
+                self.down_sample_image(self._offset[y_start:y_end, x_start:x_end]),
+                self.down_sample_image(self._variance[y_start:y_end, x_start:x_end]),
+                np.sqrt(max(binning, 1.0)),
+            )
+            self._snr_maps_key = key
+        return self._snr_maps
+
+    def signal_to_noise(self, image):
+        """Compute the signal-to-noise ratio of the down-sampled image.
+
+        Each canvas pixel is the mean of `binning` camera pixels. The variance of
+        the mean, shot noise and camera noise alike, is the variance of a camera
+        pixel divided by `binning`, so the SNR of a canvas pixel is the SNR of
+        its mean camera pixel times sqrt(binning).
+
+        Parameters
+        ----------
+        image : numpy.ndarray
+            Down-sampled image data.
+
+        Returns
+        -------
+        image : numpy.ndarray
+            Signal-to-noise ratio of each displayed pixel, or the image itself if
+            no offset and variance maps are available.
+        """
+        if not self._snr_selected or self._offset is None or self.zoom_crop is None:
+            return image
+        offset, variance, gain = self.get_signal_to_noise_maps()
+        return compute_signal_to_noise(image, offset, variance) * gain
+
     def scale_image_intensity(self, image):
         """Scale the data to the min/max counts, and adjust bit-depth.
 
@@ -900,15 +982,22 @@ class BaseViewController(GUIController, ABaseViewController):
     def process_image(self):
         """Process the image to be displayed.
 
-        Applies digital zoom, detects saturation, down-samples the image, scales the
-        image intensity, adds a crosshair, applies the lookup table, and populates the
+        Applies digital zoom, detects saturation, down-samples the image, computes
+        the signal-to-noise ratio, flips and transposes the image, scales the image
+        intensity, adds a crosshair, applies the lookup table, and populates the
         image.
+
+        Everything after the down-sampling operates on canvas-sized arrays, so the
+        cost of displaying an image depends on the window size rather than on the
+        camera size.
         """
         if self.image is None:
             return
         image = self.digital_zoom()
         self.detect_saturation(image)
         image = self.down_sample_image(image)
+        image = self.signal_to_noise(image)
+        image = self.flip_image(image)
         image = self.transpose_image(image)
         image = self.scale_image_intensity(image)
         image = self.add_crosshair(image)
@@ -1049,6 +1138,20 @@ class CameraViewController(BaseViewController):
         #: dict: The dictionary of image metrics widgets.
         self.image_metrics = view.image_metrics.get_widgets()
 
+        #: dict: The callbacks that update the image metrics widgets.
+        self.image_metrics_callbacks = {
+            "channel": lambda channel: self.image_metrics["Channel"].set(channel),
+            "max_counts": lambda: self.update_max_counts(),
+        }
+
+        #: UIUpdateScheduler: Throttles the image metrics updates.
+        self.ui_update_scheduler = getattr(
+            parent_controller, "ui_update_scheduler", None
+        )
+        if self.ui_update_scheduler is not None:
+            for name, callback in self.image_metrics_callbacks.items():
+                self.ui_update_scheduler.register((self, name), callback)
+
         self.update_snr()
 
         self.view.live_frame.live.bind(
@@ -1102,7 +1205,9 @@ class CameraViewController(BaseViewController):
         """
         # Identify the channel index and slice index, update GUI.
         channel_idx, slice_idx = self.identify_channel_index_and_slice()
-        self.image_metrics["Channel"].set(int(self.selected_channels[channel_idx][2:]))
+        self.update_image_metrics(
+            "channel", int(self.selected_channels[channel_idx][2:])
+        )
 
         # Save the image to the spooled image loader.
         self.spooled_images.save_image(
@@ -1147,6 +1252,7 @@ class CameraViewController(BaseViewController):
             self.image_palette["SNR"].grid_remove()
         else:
             self._offset, self._variance = copy.deepcopy(off), copy.deepcopy(var)
+            self._snr_maps_key = None
             self.image_palette["SNR"].grid(row=3, column=0, sticky=tk.NSEW, pady=3)
 
     def slider_update(self, *args):
@@ -1169,7 +1275,7 @@ class CameraViewController(BaseViewController):
         if image is None:
             return
 
-        self.image = self.flip_image(image)
+        self.image = image
         self.process_image()
         self.update_max_counts()
 
@@ -1256,6 +1362,35 @@ class CameraViewController(BaseViewController):
         else:
             self.menu.entryconfig("Move Here", state="disabled")
 
+    def update_image_metrics(self, name, *args):
+        """Update an image metrics widget.
+
+        Safe to call from worker threads. The update is handed to the
+        UIUpdateScheduler, which applies it on the Tk main loop at a limited rate.
+
+        Parameters
+        ----------
+        name : str
+            The name of the image metric. 'channel' or 'max_counts'.
+        args : tuple
+            Arguments of the update.
+        """
+        if self.ui_update_scheduler is None:
+            self.image_metrics_callbacks[name](*args)
+        else:
+            self.ui_update_scheduler.post((self, name), *args)
+
+    def unregister_ui_updates(self):
+        """Remove the image metrics updates from the UIUpdateScheduler.
+
+        Called when the view is torn down, e.g. when the popup window of an
+        additional microscope is closed.
+        """
+        if self.ui_update_scheduler is None:
+            return
+        for name in self.image_metrics_callbacks:
+            self.ui_update_scheduler.unregister((self, name))
+
     def update_max_counts(self):
         """Update the max counts in the camera view.
 
@@ -1332,14 +1467,10 @@ class CameraViewController(BaseViewController):
             Image data.
         """
         start_time = time.time()
-        self.image = self.flip_image(image)
+        self.image = image
         self.max_intensity_history.append(np.max(image))
-        if self._snr_selected:
-            self.image = compute_signal_to_noise(
-                self.image, self._offset, self._variance
-            )
         self.process_image()
-        self.update_max_counts()
+        self.update_image_metrics("max_counts")
         with self.is_displaying_image as is_displaying_image:
             is_displaying_image.value = False
         logger.info(f"Displaying image took {time.time() - start_time:.4f} seconds")
@@ -1525,7 +1656,6 @@ class MIPViewController(BaseViewController):
         elif display_mode == "ZX":
             image = self.zx_mip[channel_idx]
 
-        image = self.flip_image(image)
         # map the image to canvas size()
         image = self.down_sample_image(image, True)
         return image
@@ -1645,7 +1775,7 @@ class MIPViewController(BaseViewController):
             Flag to reset the original image size.
         """
         sx, sy = self.canvas_width, self.canvas_height
-        down_sampled_image = cv2.resize(image, (sx, sy))
+        down_sampled_image = cv2.resize(image, (sx, sy), interpolation=cv2.INTER_AREA)
         if reset_original:
             self.original_image_width = self.canvas_width
             self.original_image_height = self.canvas_height
@@ -41,6 +41,7 @@ import tkinter as tk
 
 # Local Imports
 from navigate.controller.sub_controllers.gui import GUIController
+from navigate.config.config import configuration_transaction
 from navigate.controller.sub_controllers.channels_settings import (
     ChannelSettingController,
 )
@@ -163,6 +164,10 @@ class ChannelsTabController(GUIController):
             command=self.launch_tiling_wizard
         )
 
+        #: tk.BooleanVar: Whether or not to optimize the multi-position order.
+        self.optimize_order_val = self.view.multipoint_frame.optimize_order
+        self.optimize_order_val.trace_add("write", self.toggle_optimize_order)
+
         # Waveform Parameters
         self.view.quick_launch.buttons["waveform_parameters"].configure(
             command=self.launch_waveform_parameters
@@ -208,6 +213,9 @@ class ChannelsTabController(GUIController):
         self.is_multiposition_val.set(self.microscope_state_dict["is_multiposition"])
         self.is_multiposition_cache = self.is_multiposition
         self.toggle_multiposition()
+        self.optimize_order_val.set(
+            self.microscope_state_dict.get("optimize_position_order", False)
+        )
 
         # validate
         self.view.stack_timepoint_frame.stack_pause_spinbox.trigger_focusout_validation()
@@ -412,32 +420,35 @@ class ChannelsTabController(GUIController):
             self.stack_acq_vals["abs_z_end"].set(self.z_origin + end_position)
 
         # update experiment MicroscopeState dict
-        self.microscope_state_dict["start_position"] = start_position
-        self.microscope_state_dict["end_position"] = end_position
-        self.microscope_state_dict["step_size"] = step_size * (
-            -1 if flip_flags["z"] else 1
-        )
-        self.microscope_state_dict["number_z_steps"] = number_z_steps
-        self.microscope_state_dict["abs_z_start"] = self.stack_acq_vals[
-            "abs_z_start"
-        ].get()
-        self.microscope_state_dict["abs_z_end"] = self.stack_acq_vals["abs_z_end"].get()
+        microscope_state = {
+            "start_position": start_position,
+            "end_position": end_position,
+            "step_size": step_size * (-1 if flip_flags["z"] else 1),
+            "number_z_steps": number_z_steps,
+            "abs_z_start": self.stack_acq_vals["abs_z_start"].get(),
+            "abs_z_end": self.stack_acq_vals["abs_z_end"].get(),
+            "stack_z_origin": self.z_origin,
+            "stack_focus_origin": self.focus_origin,
+        }
         try:
-            self.microscope_state_dict["start_focus"] = self.stack_acq_vals[
-                "start_focus"
-            ].get()
+            microscope_state["start_focus"] = self.stack_acq_vals["start_focus"].get()
         except tk._tkinter.TclError:
-            self.microscope_state_dict["start_focus"] = 0
+            microscope_state["start_focus"] = 0
         try:
-            self.microscope_state_dict["end_focus"] = self.stack_acq_vals[
-                "end_focus"
-            ].get()
+            microscope_state["end_focus"] = self.stack_acq_vals["end_focus"].get()
         except tk._tkinter.TclError:
-            self.microscope_state_dict["end_focus"] = 0
-        self.microscope_state_dict["stack_z_origin"] = self.z_origin
-        self.microscope_state_dict["stack_focus_origin"] = self.focus_origin
-
-        self.update_timepoint_setting()
+            microscope_state["end_focus"] = 0
+
+        # the timepoint settings are written in the same transaction
+        with configuration_transaction(
+            self.parent_controller.configuration
+        ) as transaction:
+            transaction.update(
+                ("experiment", "MicroscopeState"),
+                microscope_state,
+                self.microscope_state_dict,
+            )
+            self.update_timepoint_setting()
         self.show_verbose_info(
             "stack acquisition settings on channels tab have been changed and "
             "recalculated"
@@ -691,13 +702,20 @@ class ChannelsTabController(GUIController):
         )
 
         # update experiment MicroscopeState dict
-        self.microscope_state_dict["timepoints"] = number_of_timepoints
-        self.microscope_state_dict["stack_pause"] = self.timepoint_vals[
-            "stack_pause"
-        ].get()
-        # self.microscope_state_dict['timepoint_interval']
-        self.microscope_state_dict["stack_acq_time"] = stack_acquisition_duration
-        self.microscope_state_dict["experiment_duration"] = experiment_duration
+        with configuration_transaction(
+            self.parent_controller.configuration
+        ) as transaction:
+            transaction.update(
+                ("experiment", "MicroscopeState"),
+                {
+                    "timepoints": number_of_timepoints,
+                    "stack_pause": self.timepoint_vals["stack_pause"].get(),
+                    # 'timepoint_interval'
+                    "stack_acq_time": stack_acquisition_duration,
+                    "experiment_duration": experiment_duration,
+                },
+                self.microscope_state_dict,
+            )
 
         self.show_verbose_info(
             "timepoint settings on channels tab have been changed and recalculated"
@@ -713,13 +731,38 @@ class ChannelsTabController(GUIController):
         self.update_timepoint_setting()
         self.show_verbose_info("Multi-position:", self.is_multiposition)
 
+    def toggle_optimize_order(self, *args):
+        """Toggle optimization of the multi-position acquisition order."""
+        self.microscope_state_dict["optimize_position_order"] = (
+            self.optimize_order_val.get()
+        )
+        self.view.multipoint_frame.route_label.config(text="")
+        self.show_verbose_info(
+            "Optimize position order:", self.optimize_order_val.get()
+        )
+
+    def show_position_route(self, travel_times):
+        """Show the estimated stage travel time of the planned position route.
+
+        Parameters
+        ----------
+        travel_times : tuple
+            Estimated travel time (s) in table order and in planned order.
+        """
+        before, after = travel_times
+        self.view.multipoint_frame.route_label.config(
+            text=f"Travel: {before:.1f} s -> {after:.1f} s"
+        )
+
     def disable_multiposition_btn(self):
         """Disable multiposition button"""
         self.view.multipoint_frame.save_check.config(state="disabled")
+        self.view.multipoint_frame.optimize_check.config(state="disabled")
 
     def enable_multiposition_btn(self):
         """Enable multiposition button"""
         self.view.multipoint_frame.save_check.config(state="normal")
+        self.view.multipoint_frame.optimize_check.config(state="normal")
 
     def launch_waveform_parameters(self):
         """Launches waveform parameters popup."""
@@ -845,4 +888,7 @@ class ChannelsTabController(GUIController):
     @property
     def custom_events(self):
         """Custom events for the channels tab."""
-        return {"exposure_time": self.set_exposure_time}
+        return {
+            "exposure_time": self.set_exposure_time,
+            "position_route": self.show_position_route,
+        }
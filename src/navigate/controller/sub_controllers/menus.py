@@ -235,6 +235,13 @@ class MenuController(GUIController):
                     "<Control-Return>",
                     "<Control_L-Return>",
                 ],
+                "Estimate Acquisition": [
+                    "standard",
+                    lambda *args: self.parent_controller.execute("plan_acquisition"),
+                    None,
+                    None,
+                    None,
+                ],
                 "Load Images": ["standard", self.load_images, None, None, None],
                 "Unload Images": [
                     "standard",
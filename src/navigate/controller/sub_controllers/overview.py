@@ -0,0 +1,129 @@
+# Copyright (c) 2021-2024  The University of Texas Southwestern Medical Center.
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted for academic and research use only
+# (subject to the limitations in the disclaimer below)
+# provided that the following conditions are met:
+
+#      * Redistributions of source code must retain the above copyright notice,
+#      this list of conditions and the following disclaimer.
+
+#      * Redistributions in binary form must reproduce the above copyright
+#      notice, this list of conditions and the following disclaimer in the
+#      documentation and/or other materials provided with the distribution.
+
+#      * Neither the name of the copyright holders nor the names of its
+#      contributors may be used to endorse or promote products derived from this
+#      software without specific prior written permission.
+
+# NO EXPRESS OR IMPLIED LICENSES TO ANY PARTY'S PATENT RIGHTS ARE GRANTED BY
+# THIS LICENSE. THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND
+# CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A
+# PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR
+# BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER
+# IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+# Standard Library Imports
+import logging
+
+# Third Party Imports
+import cv2
+import numpy as np
+from PIL import Image, ImageTk
+
+# Local Imports
+from navigate.controller.sub_controllers.gui import GUIController
+
+# Logger Setup
+p = __name__.split(".")[1]
+logger = logging.getLogger(p)
+
+
+class OverviewController(GUIController):
+    """Controller for the multi-position overview tab"""
+
+    def __init__(self, view, parent_controller=None):
+        """Initialize the overview controller
+
+        Parameters
+        ----------
+        view : navigate.view.main_window_content.display_notebook.OverviewTab
+            View for the overview tab
+        parent_controller : navigate.controller.controller.Controller
+            Parent controller for the overview tab
+        """
+        super().__init__(view, parent_controller)
+
+        #: dict: The overview sent by the model.
+        self.overview = None
+
+        #: ImageTk.PhotoImage: The image displayed on the canvas.
+        self.tk_image = None
+
+        #: dict: The overview settings widgets.
+        self.widgets = self.view.overview_settings.get_widgets()
+        self.widgets["channel"].widget.bind(
+            "<<ComboboxSelected>>", lambda event: self.display_overview()
+        )
+
+    def update_overview(self, overview):
+        """Update the overview with a new mosaic from the model
+
+        Parameters
+        ----------
+        overview : dict
+            The down-sampled mosaic ('image'), its stage extent in um ('extent')
+            and the number of tiles ('number_of_tiles').
+        """
+        self.overview = overview
+        number_of_channels = overview["image"].shape[0]
+        channels = [f"CH{i + 1}" for i in range(number_of_channels)]
+        if list(self.widgets["channel"].widget["values"]) != channels:
+            self.widgets["channel"].widget["values"] = channels
+        if self.widgets["channel"].get() not in channels:
+            self.widgets["channel"].set(channels[0])
+
+        self.view.overview_settings.tiles.set(f"Tiles: {overview['number_of_tiles']}")
+        left, top, right, bottom = overview["extent"]
+        self.view.overview_settings.extent.set(
+            f"{right - left:.0f} x {bottom - top:.0f} um"
+        )
+        self.display_overview()
+
+    def display_overview(self):
+        """Display the selected channel of the overview on the canvas"""
+        if self.overview is None:
+            return
+        channel = self.widgets["channel"].get()
+        channel_idx = int(channel[2:]) - 1 if channel else 0
+        image = self.overview["image"][channel_idx].astype(np.float32)
+
+        # scale the image intensity to 8-bit
+        min_value, max_value = image.min(), image.max()
+        if max_value > min_value:
+            image = (image - min_value) * (255.0 / (max_value - min_value))
+        else:
+            image[:] = 0
+
+        # fit the image into the canvas, keeping the aspect ratio
+        height, width = image.shape
+        zoom = min(self.view.canvas_width / width, self.view.canvas_height / height)
+        size = (max(1, int(width * zoom)), max(1, int(height * zoom)))
+        interpolation = cv2.INTER_AREA if zoom < 1 else cv2.INTER_NEAREST
+        image = cv2.resize(image, size, interpolation=interpolation)
+
+        self.tk_image = ImageTk.PhotoImage(Image.fromarray(image.astype(np.uint8)))
+        self.view.canvas.delete("all")
+        self.view.canvas.create_image(0, 0, image=self.tk_image, anchor="nw")
+
+    @property
+    def custom_events(self):
+        """Custom events for the overview tab"""
+        return {"overview": self.update_overview}
@@ -39,6 +39,7 @@ import logging
 
 # Local Imports
 from navigate.controller.sub_controllers.gui import GUIController
+from navigate.config.config import configuration_transaction
 from navigate.tools.decorators import log_initialization
 
 # Logger Setup
@@ -337,6 +338,7 @@ class StageController(GUIController):
             {'x': value, 'y': value, 'z': value, 'theta': value, 'f': value}
         """
         widgets = self.view.get_widgets()
+        stage_setting = {}
         for axis in ["x", "y", "z", "theta", "f"]:
             if axis not in position:
                 continue
@@ -344,7 +346,15 @@ class StageController(GUIController):
             # validate position value if set through variable
             if self.stage_limits:
                 widgets[axis].widget.trigger_focusout_validation()
-            self.stage_setting_dict[axis] = position.get(axis, 0)
+            stage_setting[axis] = position.get(axis, 0)
+        with configuration_transaction(
+            self.parent_controller.configuration
+        ) as transaction:
+            transaction.update(
+                ("experiment", "StageParameters"),
+                stage_setting,
+                self.stage_setting_dict,
+            )
         self.show_verbose_info("Set stage position")
 
     def get_position(self):
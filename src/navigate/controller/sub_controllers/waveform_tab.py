@@ -39,6 +39,7 @@ from tkinter import NSEW
 
 # Local Imports
 from navigate.controller.sub_controllers.gui import GUIController
+from navigate.model.waveforms import repeat_min_max_envelope
 from navigate.tools.waveform_template_funcs import get_waveform_template_parameters
 
 # Logger Setup
@@ -149,9 +150,48 @@ class WaveformTabController(GUIController):
             row=5, column=0, columnspan=3, sticky=(NSEW), padx=(5, 5), pady=(5, 5)
         )
 
+        self.view.plot_etl.set_title("Remote Focus Waveform")
+        self.view.plot_galvo.set_title("Galvo Waveform")
+
+        self.view.plot_etl.set_xlabel("Duration (s)")
+        self.view.plot_galvo.set_xlabel("Duration (s)")
+
+        self.view.plot_etl.set_ylabel("Amplitude")
+        self.view.plot_galvo.set_ylabel("Amplitude")
+
+        self.view.fig.tight_layout()
+
+        #: dict: Plotted lines, reused between updates.
+        self.lines = {}
+
+    def plot_line(self, plot, name, x, y, **kwargs):
+        """Update a plotted line, or create it if it doesn't exist yet.
+
+        Parameters
+        ----------
+        plot : matplotlib.axes.Axes
+            The plot of the line
+        name : str
+            The name of the line
+        x : np.array
+            The x data
+        y : np.array
+            The y data
+        **kwargs : dict
+            Line properties, used when the line is created.
+        """
+        key = (plot, name)
+        if key in self.lines:
+            self.lines[key].set_data(x, y)
+        else:
+            (self.lines[key],) = plot.plot(x, y, **kwargs)
+
     def plot_waveforms(self, event):
         """Plot the waveforms in the waveform tab
 
+        The waveforms are the min/max envelopes sent by the model. Lines that are
+        already plotted are updated in place.
+
         Parameters
         ----------
         event : Tkinter event
@@ -169,8 +209,9 @@ class WaveformTabController(GUIController):
             and parent_notebook.tab(current_tab, "text") != "Waveforms"
         ):
             return
-        self.view.plot_etl.clear()
-        self.view.plot_galvo.clear()
+
+        if not hasattr(self, "waveform_dict"):
+            return
 
         waveform_template_name = self.parent_controller.configuration["experiment"][
             "MicroscopeState"
@@ -180,6 +221,29 @@ class WaveformTabController(GUIController):
             self.parent_controller.configuration["waveform_templates"],
             self.parent_controller.configuration["experiment"]["MicroscopeState"],
         )
+        waveform_repeat_total_num = repeat_num * expand_num
+
+        def repeat_waveform(waveform, start_time, plot):
+            """Repeat a decimated waveform according to the waveform template.
+
+            The envelope of the repeated waveform has one bin per pixel column of
+            the plot that its span covers.
+            """
+            number_of_columns = np.ceil(
+                max(plot.bbox.width, 1) * duration(waveform) / total_duration
+            )
+            sample_index, envelope = repeat_min_max_envelope(
+                waveform, waveform_repeat_total_num, number_of_columns
+            )
+            return sample_index / self.sample_rate + start_time, envelope
+
+        def duration(waveform):
+            """Duration of a repeated waveform in seconds."""
+            return (
+                waveform["number_of_samples"]
+                * waveform_repeat_total_num
+                / self.sample_rate
+            )
 
         last_etl = 0
         last_galvo = 0
@@ -190,18 +254,20 @@ class WaveformTabController(GUIController):
         min_camera_waveform = 1000000
         max_remote_focus_waveform = 0
         min_remote_focus_waveform = 1000000
+        total_duration = 0
         # two pass
         for k in self.waveform_dict["camera_waveform"].keys():
             remote_focus_waveform = self.waveform_dict["remote_focus_waveform"][k]
             if remote_focus_waveform is None:
                 continue
+            total_duration += duration(remote_focus_waveform)
             max_remote_focus_waveform = np.maximum(
-                max_remote_focus_waveform, np.max(remote_focus_waveform)
+                max_remote_focus_waveform, np.max(remote_focus_waveform["envelope"])
             )
             min_remote_focus_waveform = np.minimum(
-                min_remote_focus_waveform, np.min(remote_focus_waveform)
+                min_remote_focus_waveform, np.min(remote_focus_waveform["envelope"])
             )
-            camera_waveform = self.waveform_dict["camera_waveform"][k]
+            camera_waveform = self.waveform_dict["camera_waveform"][k]["envelope"]
             max_camera_waveform = np.maximum(
                 max_camera_waveform, np.max(camera_waveform)
             )
@@ -209,11 +275,13 @@ class WaveformTabController(GUIController):
                 min_camera_waveform, np.min(camera_waveform)
             )
             for galvo_waveform in self.waveform_dict["galvo_waveform"]:
+                if galvo_waveform[k] is None:
+                    continue
                 max_galvo_waveform = np.maximum(
-                    max_galvo_waveform, np.max(galvo_waveform[k])
+                    max_galvo_waveform, np.max(galvo_waveform[k]["envelope"])
                 )
                 min_galvo_waveform = np.minimum(
-                    min_galvo_waveform, np.min(galvo_waveform[k])
+                    min_galvo_waveform, np.min(galvo_waveform[k]["envelope"])
                 )
 
         true_max = np.maximum(max_remote_focus_waveform, max_galvo_waveform)
@@ -224,90 +292,63 @@ class WaveformTabController(GUIController):
         else:
             scale = (true_max - true_min) / (max_camera_waveform - min_camera_waveform)
 
+        plotted_lines = set()
         for k in sorted(self.waveform_dict["camera_waveform"].keys()):
             if self.waveform_dict["remote_focus_waveform"][k] is None:
                 continue
             remote_focus_waveform = self.waveform_dict["remote_focus_waveform"][k]
 
-            galvo_waveform_list = []
-            for galvo_waveform in self.waveform_dict["galvo_waveform"]:
-                if galvo_waveform[k] is None:
-                    continue
-                max_galvo_waveform = np.maximum(
-                    max_galvo_waveform, np.max(galvo_waveform[k])
-                )
-                min_galvo_waveform = np.minimum(
-                    min_galvo_waveform, np.min(galvo_waveform[k])
-                )
-                galvo_waveform_list += [galvo_waveform[k]]
-
-            camera_waveform = (
-                scale * self.waveform_dict["camera_waveform"][k] + true_min
-            )
+            galvo_waveform_list = [
+                galvo_waveform[k]
+                for galvo_waveform in self.waveform_dict["galvo_waveform"]
+                if galvo_waveform[k] is not None
+            ]
 
-            waveform_repeat_total_num = repeat_num * expand_num
+            camera_waveform = dict(self.waveform_dict["camera_waveform"][k])
+            camera_waveform["envelope"] = scale * camera_waveform["envelope"] + true_min
 
             channel_index = k[-1]
             label = "CH" + channel_index
 
-            self.view.plot_etl.plot(
-                np.arange(len(remote_focus_waveform) * waveform_repeat_total_num)
-                / self.sample_rate
-                + last_etl,
-                np.hstack([remote_focus_waveform] * waveform_repeat_total_num),
+            self.plot_line(
+                self.view.plot_etl,
+                label,
+                *repeat_waveform(remote_focus_waveform, last_etl, self.view.plot_etl),
                 label=label,
             )
-            # ax = self.view.plot_galvo.axis
+            plotted_lines.add((self.view.plot_etl, label))
             for i, galvo_waveform in enumerate(galvo_waveform_list):
                 label = label + " G" + str(i)
-                self.view.plot_galvo.plot(
-                    np.arange(len(galvo_waveform) * waveform_repeat_total_num)
-                    / self.sample_rate
-                    + last_galvo,
-                    np.hstack([galvo_waveform] * waveform_repeat_total_num),
+                self.plot_line(
+                    self.view.plot_galvo,
+                    label,
+                    *repeat_waveform(galvo_waveform, last_galvo, self.view.plot_galvo),
                     label=label,
                 )
-            self.view.plot_etl.plot(
-                np.arange(len(camera_waveform) * waveform_repeat_total_num)
-                / self.sample_rate
-                + last_camera,
-                np.hstack([camera_waveform] * waveform_repeat_total_num),
-                c="k",
-                linestyle="--",
-            )
-            self.view.plot_galvo.plot(
-                np.arange(len(camera_waveform) * waveform_repeat_total_num)
-                / self.sample_rate
-                + last_camera,
-                np.hstack([camera_waveform] * waveform_repeat_total_num),
-                c="k",
-                linestyle="--",
-            )
-            last_etl += (
-                len(remote_focus_waveform)
-                * waveform_repeat_total_num
-                / self.sample_rate
-            )
-            last_galvo += (
-                len(galvo_waveform) * waveform_repeat_total_num / self.sample_rate
-            )
-            last_camera += (
-                len(camera_waveform) * waveform_repeat_total_num / self.sample_rate
-            )
-
-        self.view.plot_etl.set_title("Remote Focus Waveform")
-        self.view.plot_galvo.set_title("Galvo Waveform")
-
-        self.view.plot_etl.set_xlabel("Duration (s)")
-        self.view.plot_galvo.set_xlabel("Duration (s)")
-
-        self.view.plot_etl.set_ylabel("Amplitude")
-        self.view.plot_galvo.set_ylabel("Amplitude")
-
-        self.view.plot_etl.legend()
-        self.view.plot_galvo.legend()
-
-        self.view.fig.tight_layout()
+                plotted_lines.add((self.view.plot_galvo, label))
+            for plot in (self.view.plot_etl, self.view.plot_galvo):
+                self.plot_line(
+                    plot,
+                    f"camera {k}",
+                    *repeat_waveform(camera_waveform, last_camera, plot),
+                    c="k",
+                    linestyle="--",
+                )
+                plotted_lines.add((plot, f"camera {k}"))
+            last_etl += duration(remote_focus_waveform)
+            if galvo_waveform_list:
+                last_galvo += duration(galvo_waveform_list[-1])
+            last_camera += duration(camera_waveform)
+
+        # remove the lines of channels that are not selected anymore
+        for key in list(self.lines.keys()):
+            if key not in plotted_lines:
+                self.lines.pop(key).remove()
+
+        for plot in (self.view.plot_etl, self.view.plot_galvo):
+            plot.relim()
+            plot.autoscale_view()
+            plot.legend()
 
         self.view.canvas.draw_idle()
 
@@ -32,10 +32,8 @@
 #
 
 # Standard Library Imports
-import os
 import threading
-import ctypes
-import sys
+import time
 from collections import deque
 import logging
 import traceback
@@ -43,6 +41,7 @@ import traceback
 # Third Party Imports
 
 # Local Imports
+from navigate.model.concurrency.cancellation import CancellationToken
 
 # Logger Setup
 p = __name__.split(".")[1]
@@ -62,6 +61,9 @@ class SelfLockThread(threading.Thread):
       `wait()` and `unlock()` methods.
     - It allows checking whether the thread is currently locked using the `isLocked()`
       method.
+    - Each thread owns a cancellation token. Cancelling it asks the task to stop
+      at its next checkpoint; a thread that is still waiting for its turn returns
+      without running its task.
     """
 
     def __init__(
@@ -89,6 +91,8 @@ class SelfLockThread(threading.Thread):
         self.selfLock = threading.Lock()
         # lock itself
         self.selfLock.acquire()
+        #: CancellationToken: The cancellation token of the thread.
+        self.cancel_token = CancellationToken()
 
     def run(self):
         """Run the thread."""
@@ -142,17 +146,28 @@ class SynchronizedThreadPool:
     - This class provides explicit control over thread creation, removal,
     and synchronization.
     - It allows managing threads associated with different resources efficiently.
-    - The `clear` method moves threads to the `toDeleteList` for later deletion.
+    - Threads are stopped cooperatively. The `clear` method cancels the token of
+    every thread, moves waiting threads to the `toDeleteList` and joins all of
+    them with a bounded timeout.
 
     """
 
-    def __init__(self):
-        """Initialize the SynchronizedThreadPool."""
+    def __init__(self, join_timeout=1.0):
+        """Initialize the SynchronizedThreadPool.
+
+        Parameters
+        ----------
+        join_timeout : float, optional
+            Maximum time in seconds `clear` waits for the threads to stop,
+            by default 1.0
+        """
 
         #: dict: The resources of the thread pool.
         self.resources = {}
         #: dict: The toDeleteList of the thread pool.
         self.toDeleteList = {}
+        #: float: Maximum time in seconds `clear` waits for the threads to stop.
+        self.join_timeout = join_timeout
 
     def registerResource(self, resourceName):
         """Register a resource to the pool.
@@ -175,6 +190,7 @@ class SynchronizedThreadPool:
         callback=None,
         cbArgs=(),
         cbKargs={},
+        pass_token=False,
     ):
         """Create a thread and add it to the waitlist of the resource.
 
@@ -194,6 +210,9 @@ class SynchronizedThreadPool:
             The arguments of the callback function, by default ()
         cbKargs : dict, optional
             The keyword arguments of the callback function, by default {}
+        pass_token : bool, optional
+            Whether to pass the thread's cancellation token to the target function
+            as the `cancel_token` keyword argument, by default False
 
         Returns
         -------
@@ -204,14 +223,28 @@ class SynchronizedThreadPool:
         if resourceName not in self.resources:
             self.registerResource(resourceName)
         task = self.threadTaskWrapping(
-            resourceName, target, callback=callback, cbArgs=cbArgs, cbKargs=cbKargs
+            resourceName,
+            target,
+            callback=callback,
+            cbArgs=cbArgs,
+            cbKargs=cbKargs,
+            pass_token=pass_token,
+        )
+        taskThread = SelfLockThread(
+            None, task, resourceName, args, dict(kwargs), daemon=True
         )
-        taskThread = SelfLockThread(None, task, resourceName, args, kwargs, daemon=True)
         taskThread.start()
         return taskThread
 
     def threadTaskWrapping(
-        self, resourceName, target, *, callback=None, cbArgs=(), cbKargs={}
+        self,
+        resourceName,
+        target,
+        *,
+        callback=None,
+        cbArgs=(),
+        cbKargs={},
+        pass_token=False,
     ):
         """Wrap the target function of the thread.
 
@@ -227,6 +260,9 @@ class SynchronizedThreadPool:
             The arguments of the callback function, by default ()
         cbKargs : dict, optional
             The keyword arguments of the callback function, by default {}
+        pass_token : bool, optional
+            Whether to pass the thread's cancellation token to the target function,
+            by default False
 
         Returns
         -------
@@ -241,13 +277,22 @@ class SynchronizedThreadPool:
             del kwargs["thread"]
             # add thread to the waitlist of the resource
             with self.resources[resourceName] as resource:
+                if thread.cancel_token.cancelled:
+                    return
                 resource.waitlist.append(thread)
                 if len(resource.waitlist) == 1:
                     thread.unlock()
             # wait for it's turn
             thread.wait()
+            # the thread was removed from the waitlist while waiting
+            if thread.cancel_token.cancelled:
+                with self.resources[resourceName] as resource:
+                    if not resource.waitlist or resource.waitlist[0] != thread:
+                        return
             # run itself
-            if callable(target):
+            elif callable(target):
+                if pass_token:
+                    kwargs["cancel_token"] = thread.cancel_token
                 try:
                     target(*args, **kwargs)
                 except Exception as e:
@@ -270,7 +315,7 @@ class SynchronizedThreadPool:
                 if len(resource.waitlist) > 0:
                     resource.waitlist[0].unlock()
             # run callback
-            if callback:
+            if callback and not thread.cancel_token.cancelled:
                 callback(*cbArgs, **cbKargs)
 
         return func
@@ -278,6 +323,10 @@ class SynchronizedThreadPool:
     def removeThread(self, resourceName, taskThread):
         """Remove a thread from the waitlist of the resource.
 
+        The thread's cancellation token is cancelled. A waiting thread is removed
+        from the waitlist and returns without running its task. A running thread
+        stops at its next checkpoint.
+
         Parameters
         ----------
         resourceName : str
@@ -290,18 +339,19 @@ class SynchronizedThreadPool:
         bool
             Whether the thread is removed.
         """
-        # can only remove waiting threads
-        # do not remove running threading
         # if no such resource
         if resourceName not in self.resources:
             return False
+        taskThread.cancel_token.cancel()
         with self.resources[resourceName] as resource:
-            # if it is the current running one, kill it and wake up next thread if any
-            if resource.waitlist[0] != taskThread:
-                # add the thread to toDeleteList
-                self.moveToDelete(resourceName, taskThread)
-                resource.waitlist.remove(taskThread)
-                return
+            # the running thread removes itself when it reaches a checkpoint
+            if taskThread not in resource.waitlist or (
+                resource.waitlist[0] == taskThread
+            ):
+                return False
+            resource.waitlist.remove(taskThread)
+        taskThread.unlock()
+        return True
 
     def moveToDelete(self, resourceName, taskThread):
         """Move a thread to the toDeleteList.
@@ -338,109 +388,84 @@ class SynchronizedThreadPool:
             return None
         return self.resources[resourceName].waitlist[0]
 
-    def clear(self):
-        """Clear all the threads in the pool."""
+    def clear(self, timeout=None):
+        """Clear all the threads in the pool.
 
-        # move all the threads except first one to toDeleteList
-        sys.settrace(self.globaltrace)
-        for resourceName in self.resources:
-            with self.resources[resourceName] as temp:
-                headThread = temp.waitlist[0] if len(temp.waitlist) > 0 else None
-                for i in range(1, len(temp.waitlist)):
-                    self.moveToDelete(resourceName, temp.waitlist[i])
-            if headThread:
-                self._raiseError(headThread.native_id)
-            self.killThreadInList(resourceName, self.toDeleteList)
-
-    def killThreadInList(self, resourceName, threadList):
-        """Kill all the threads in the threadList.
+        Every thread is cancelled. Waiting threads return without running their
+        tasks, and running tasks stop at their next checkpoint. The threads are
+        joined until the timeout expires; threads that are still alive afterwards
+        are daemon threads and are logged and abandoned.
 
         Parameters
         ----------
-        resourceName : str
-            The name of the resource.
-        threadList : dict
-            The threadList to kill.
-        """
-        sys.settrace(self.globaltrace)
-        # remove all the threads in threadList
-        if resourceName in threadList:
-            with threadList[resourceName] as temp:
-                while temp.waitlist:
-                    thread = temp.waitlist[0]
-                    thread.unlock()
-                    self._raiseError(thread.native_id)
-                    thread.join(1)
-                    if not thread.is_alive():
-                        # move it from the list
-                        temp.waitlist.popleft()
-                    else:
-                        thread.wait()
-                        # move the thread to the end of the list
-                        temp.waitlist.popleft()
-                        temp.waitlist.append(thread)
-
-    def globaltrace(self, frame, event, arg):
-        """Global trace function.
-
-        Parameters
-        ----------
-        frame : frame
-            The frame of the thread.
-        event : str
-            The event of the thread.
-        arg : any
-            The argument of the thread.
+        timeout : float, optional
+            Maximum time in seconds to wait for all threads, by default
+            `join_timeout`.
 
         Returns
         -------
-        callable
-            The local trace function if the event is "call", otherwise None.
+        list
+            The threads that did not stop before the timeout.
         """
+        if timeout is None:
+            timeout = self.join_timeout
+        deadline = time.monotonic() + timeout
 
-        if event == "call":
-            return self.localtrace
-        else:
-            return None
-
-    def localtrace(self, frame, event, arg):
-        """Local trace function.
+        # move all the threads except first one to toDeleteList
+        running_threads = []
+        for resourceName in self.resources:
+            with self.resources[resourceName] as temp:
+                while len(temp.waitlist) > 1:
+                    self.moveToDelete(resourceName, temp.waitlist.pop())
+                if len(temp.waitlist) > 0:
+                    temp.waitlist[0].cancel_token.cancel()
+                    running_threads.append(temp.waitlist[0])
+
+        alive_threads = []
+        for resourceName in list(self.toDeleteList):
+            alive_threads += self.cancelThreadInList(
+                resourceName, self.toDeleteList, deadline
+            )
+        for thread in running_threads:
+            thread.join(max(deadline - time.monotonic(), 0))
+            if thread.is_alive():
+                alive_threads.append(thread)
+
+        for thread in alive_threads:
+            logger.warning(f"{thread.name} thread did not stop in {timeout} s.")
+        return alive_threads
+
+    def cancelThreadInList(self, resourceName, threadList, deadline=None):
+        """Cancel all the threads in the threadList.
 
         Parameters
         ----------
-        frame : frame
-            The frame of the thread.
-        event : str
-            The event of the thread.
-        arg : any
-            The argument of the thread.
+        resourceName : str
+            The name of the resource.
+        threadList : dict
+            The threadList to cancel.
+        deadline : float, optional
+            The time.monotonic() value after which joining stops, by default
+            `join_timeout` from now.
 
         Returns
         -------
-        callable
-            The local trace function if the event is "exception", otherwise None.
+        list
+            The threads that did not stop before the deadline.
         """
-
-        if event == "exception":
-            print("****in local trace: exception stops the thread")
-            logger.debug("****in local trace: exception stops the thread")
-            if os.getenv("GITHUB_ACTIONS") == "true":
-                return
-            raise SystemExit()
-        return self.localtrace
-
-    def _raiseError(self, threadId):
-        """Raise error in the thread.
-
-        Parameters
-        ----------
-        threadId : int
-            The id of the thread.
-        """
-
-        ctypes.pythonapi.PyThreadState_SetAsyncExc(
-            ctypes.c_ulong(threadId), ctypes.py_object(SystemExit)
-        )
+        if deadline is None:
+            deadline = time.monotonic() + self.join_timeout
+        alive_threads = []
+        if resourceName in threadList:
+            with threadList[resourceName] as temp:
+                while temp.waitlist:
+                    thread = temp.waitlist.popleft()
+                    thread.cancel_token.cancel()
+                    thread.unlock()
+                    thread.join(max(deadline - time.monotonic(), 0))
+                    if thread.is_alive():
+                        alive_threads.append(thread)
+        return alive_threads
 
 
 class ThreadWaitlist:
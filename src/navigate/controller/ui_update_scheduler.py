@@ -0,0 +1,220 @@
+# Copyright (c) 2021-2024  The University of Texas Southwestern Medical Center.
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted for academic and research use only
+# (subject to the limitations in the disclaimer below)
+# provided that the following conditions are met:
+
+#      * Redistributions of source code must retain the above copyright notice,
+#      this list of conditions and the following disclaimer.
+
+#      * Redistributions in binary form must reproduce the above copyright
+#      notice, this list of conditions and the following disclaimer in the
+#      documentation and/or other materials provided with the distribution.
+
+#      * Neither the name of the copyright holders nor the names of its
+#      contributors may be used to endorse or promote products derived from this
+#      software without specific prior written permission.
+
+# NO EXPRESS OR IMPLIED LICENSES TO ANY PARTY'S PATENT RIGHTS ARE GRANTED BY
+# THIS LICENSE. THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND
+# CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A
+# PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR
+# BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER
+# IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+#
+
+# Standard Library Imports
+import threading
+import logging
+import time
+from collections import deque
+
+# Third Party Imports
+
+# Local Imports
+
+# Logger Setup
+p = __name__.split(".")[1]
+logger = logging.getLogger(p)
+
+
+class UIUpdateScheduler:
+    """Throttles widget updates that are requested from worker threads.
+
+    Worker threads post the new value of a widget to the scheduler instead of
+    touching Tk directly. The scheduler delivers the values on the Tk main loop with
+    `after()`, at most `max_rate` times per second for each widget.
+
+    Note
+    ----
+    - Coalesced updates only keep the newest value of a widget. Intermediate values
+      are dropped.
+    - Updates posted with `coalesce=False` (e.g. starting or stopping the progress
+      bar) are never dropped and are delivered in the order they were posted.
+    """
+
+    def __init__(self, view, interval=50):
+        """Initialize the UIUpdateScheduler.
+
+        Parameters
+        ----------
+        view : tk.Widget
+            Any widget of the application. Used to schedule the updates.
+        interval : int, optional
+            The interval in milliseconds between two deliveries, by default 50
+        """
+        #: tk.Widget: The widget used to schedule the updates.
+        self.view = view
+
+        #: int: The interval in milliseconds between two deliveries.
+        self.interval = interval
+
+        #: dict: The registered callbacks and their maximum update rate.
+        self.callbacks = {}
+
+        #: dict: The newest coalesced update of each key.
+        self.pending = {}
+
+        #: deque: The ordered updates that must not be dropped.
+        self.ordered = deque()
+
+        #: dict: The time each key was last delivered.
+        self.last_update = {}
+
+        #: int: The number of coalesced updates dropped.
+        self.updates_dropped = 0
+
+        #: threading.Lock: The lock for the pending updates.
+        self.lock = threading.Lock()
+
+        #: str: The id of the scheduled delivery.
+        self.after_id = None
+
+    def register(self, key, callback, max_rate=10):
+        """Register a widget update callback.
+
+        Parameters
+        ----------
+        key : str
+            The name of the update.
+        callback : callable
+            The function that updates the widget. Called on the Tk main loop.
+        max_rate : float, optional
+            The maximum number of updates per second, by default 10
+        """
+        with self.lock:
+            self.callbacks[key] = (callback, max_rate)
+            self.last_update[key] = 0
+
+    def unregister(self, key):
+        """Remove a widget update callback and drop its pending updates.
+
+        Updates posted for the key afterwards are ignored.
+
+        Parameters
+        ----------
+        key : str
+            The name of the update.
+        """
+        with self.lock:
+            self.callbacks.pop(key, None)
+            self.last_update.pop(key, None)
+            self.pending.pop(key, None)
+            self.ordered = deque(update for update in self.ordered if update[0] != key)
+
+    def post(self, key, *args, coalesce=True, **kwargs):
+        """Post an update of a widget. Thread safe.
+
+        Parameters
+        ----------
+        key : str
+            The name of the update.
+        *args
+            The positional arguments of the callback.
+        coalesce : bool, optional
+            Only keep the newest update of this key, by default True
+        **kwargs
+            The keyword arguments of the callback.
+        """
+        with self.lock:
+            if key not in self.callbacks:
+                logger.debug(f"UIUpdateScheduler - Unknown update: {key}")
+                return
+            if coalesce:
+                if key in self.pending:
+                    self.updates_dropped += 1
+                self.pending[key] = (args, kwargs)
+            else:
+                # an ordered update supersedes the older coalesced one
+                self.pending.pop(key, None)
+                self.ordered.append((key, args, kwargs))
+
+    def get_updates(self, force=False):
+        """Get the updates to deliver now.
+
+        Parameters
+        ----------
+        force : bool, optional
+            Ignore the maximum update rate, by default False
+
+        Returns
+        -------
+        updates : list
+            The list of (key, args, kwargs) to deliver.
+        """
+        now = time.perf_counter()
+        with self.lock:
+            updates = list(self.ordered)
+            self.ordered.clear()
+            for key, _, _ in updates:
+                self.last_update[key] = now
+
+            for key in list(self.pending.keys()):
+                max_rate = self.callbacks[key][1]
+                if not force and now - self.last_update[key] < 1.0 / max_rate:
+                    continue
+                args, kwargs = self.pending.pop(key)
+                updates.append((key, args, kwargs))
+                self.last_update[key] = now
+        return updates
+
+    def flush(self, force=True):
+        """Deliver the pending updates. Must be called on the Tk main loop.
+
+        Parameters
+        ----------
+        force : bool, optional
+            Ignore the maximum update rate, by default True
+        """
+        for key, args, kwargs in self.get_updates(force):
+            try:
+                self.callbacks[key][0](*args, **kwargs)
+            except Exception as e:
+                logger.debug(f"UIUpdateScheduler - {key} update failed: {e}")
+
+    def run(self):
+        """Deliver the pending updates and schedule the next delivery."""
+        self.flush(force=False)
+        self.after_id = self.view.after(self.interval, self.run)
+
+    def start(self):
+        """Start delivering the updates."""
+        if self.after_id is None:
+            self.after_id = self.view.after(self.interval, self.run)
+
+    def stop(self):
+        """Stop delivering the updates."""
+        if self.after_id is not None:
+            try:
+                self.view.after_cancel(self.after_id)
+            except Exception:
+                pass
+            self.after_id = None
@@ -0,0 +1,831 @@
+# Copyright (c) 2021-2024  The University of Texas Southwestern Medical Center.
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted for academic and research use only
+# (subject to the limitations in the disclaimer below)
+# provided that the following conditions are met:
+
+#      * Redistributions of source code must retain the above copyright notice,
+#      this list of conditions and the following disclaimer.
+
+#      * Redistributions in binary form must reproduce the above copyright
+#      notice, this list of conditions and the following disclaimer in the
+#      documentation and/or other materials provided with the distribution.
+
+#      * Neither the name of the copyright holders nor the names of its
+#      contributors may be used to endorse or promote products derived from this
+#      software without specific prior written permission.
+
+# NO EXPRESS OR IMPLIED LICENSES TO ANY PARTY'S PATENT RIGHTS ARE GRANTED BY
+# THIS LICENSE. THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND
+# CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A
+# PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR
+# BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER
+# IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+# Standard Library Imports
+import copy
+import logging
+import os
+import shutil
+import tempfile
+import time
+
+# Third Party Imports
+import numpy as np
+
+# Local Imports
+from navigate.model.concurrency.cancellation import CancellationToken
+from navigate.model.features.feature_container import dummy_True, load_features
+from navigate.tools.common_functions import copy_proxy_object
+from navigate.tools.multipos_table_tools import (
+    estimate_travel_time,
+    plan_position_route,
+)
+
+# Logger Setup
+p = __name__.split(".")[1]
+logger = logging.getLogger(p)
+
+#: list: Phases of an acquisition, in the order they are reported.
+PHASES = ["exposure", "readout", "settle", "stage", "channel switch", "pause"]
+
+
+class DeviceTimingModel:
+    """How long the devices of a microscope take for each step of an acquisition.
+
+    All times are in seconds.
+    """
+
+    def __init__(
+        self,
+        exposure_times,
+        sweep_times,
+        readout_time=0.0,
+        axis_weights=None,
+        stage_settle_time=0.0,
+        filter_wheel_delays=None,
+        channel_switch_time=0.0,
+        writer_throughput=None,
+    ):
+        """Initialize the DeviceTimingModel.
+
+        Parameters
+        ----------
+        exposure_times : dict
+            Camera exposure time of each channel, without the readout.
+        sweep_times : dict
+            Duration of the DAQ program of each channel. Includes the exposure,
+            the readout in normal mode and the settle times of the waveforms.
+        readout_time : float, optional
+            Camera readout time, if it is part of the sweep time.
+        axis_weights : dict, optional
+            Seconds per micron (per degree for theta) for each stage axis. Missing
+            axes use DEFAULT_TRAVEL_WEIGHTS of multipos_table_tools.
+        stage_settle_time : float, optional
+            Time for a stage to settle after a move.
+        filter_wheel_delays : list, optional
+            Switch time of each filter wheel.
+        channel_switch_time : float, optional
+            Measured dead time of a channel switch, see
+            Microscope.estimate_channel_switch_time(). No switch is shorter.
+        writer_throughput : float, optional
+            Sustained writing speed in bytes per second. None if writing is not
+            limited.
+        """
+        #: dict: Camera exposure time of each channel.
+        self.exposure_times = exposure_times
+
+        #: dict: Duration of the DAQ program of each channel.
+        self.sweep_times = sweep_times
+
+        #: float: Camera readout time that is part of the sweep time.
+        self.readout_time = readout_time
+
+        #: dict: Seconds per unit of travel for each stage axis.
+        self.axis_weights = axis_weights
+
+        #: float: Time for a stage to settle after a move.
+        self.stage_settle_time = stage_settle_time
+
+        #: list: Switch time of each filter wheel.
+        self.filter_wheel_delays = filter_wheel_delays or []
+
+        #: float: Measured dead time of a channel switch.
+        self.channel_switch_time = channel_switch_time
+
+        #: float: Sustained writing speed in bytes per second.
+        self.writer_throughput = writer_throughput
+
+    @classmethod
+    def from_microscope(cls, microscope, writer_throughput=None):
+        """Build the timing model of a microscope from its current settings.
+
+        Parameters
+        ----------
+        microscope : Microscope
+            The microscope.
+        writer_throughput : float, optional
+            Sustained writing speed in bytes per second, e.g. from
+            benchmark_writer_throughput().
+
+        Returns
+        -------
+        timing : DeviceTimingModel
+            The timing model.
+        """
+        exposure_times, sweep_times = microscope.calculate_exposure_sweep_times()
+        microscope_config = microscope.configuration["configuration"]["microscopes"][
+            microscope.microscope_name
+        ]
+        camera_parameters = microscope.configuration["experiment"]["CameraParameters"][
+            microscope.microscope_name
+        ]
+        readout_time = 0.0
+        if camera_parameters["sensor_mode"] == "Normal":
+            readout_time = microscope.camera.calculate_readout_time()
+
+        stage_hardware = microscope_config["stage"]["hardware"]
+        if not hasattr(stage_hardware, "index"):
+            stage_hardware = [stage_hardware]
+        settle_durations = [
+            float(stage.get("settle_duration_ms", 0) or 0) for stage in stage_hardware
+        ]
+
+        filter_wheel_delays = [
+            float(filter_wheel.get("filter_wheel_delay", 0) or 0)
+            for filter_wheel in microscope_config["filter_wheel"]
+        ]
+
+        return cls(
+            {k: v - readout_time for k, v in exposure_times.items()},
+            dict(sweep_times),
+            readout_time=readout_time,
+            stage_settle_time=max(settle_durations, default=0) / 1000,
+            filter_wheel_delays=filter_wheel_delays,
+            channel_switch_time=microscope.estimate_channel_switch_time(),
+            writer_throughput=writer_throughput,
+        )
+
+    def stage_move_time(self, start, end):
+        """Estimate the time of a stage move, including settling.
+
+        Parameters
+        ----------
+        start : list
+            Start position (x, y, z, theta, f).
+        end : list
+            End position (x, y, z, theta, f).
+
+        Returns
+        -------
+        move_time : float
+            Time until the stages have settled at the end position.
+        """
+        if np.allclose(start, end):
+            return 0.0
+        return (
+            estimate_travel_time([start, end], self.axis_weights)
+            + self.stage_settle_time
+        )
+
+    def filter_wheel_time(self, wheel_index):
+        """Get the switch time of a filter wheel.
+
+        Parameters
+        ----------
+        wheel_index : int
+            Index of the filter wheel.
+
+        Returns
+        -------
+        switch_time : float
+            Switch time of the filter wheel.
+        """
+        if wheel_index < len(self.filter_wheel_delays):
+            return self.filter_wheel_delays[wheel_index]
+        return max(self.filter_wheel_delays, default=0.0)
+
+
+def benchmark_writer_throughput(
+    configuration, microscope_name, directory=None, number_of_frames=8
+):
+    """Measure how fast frames can be saved with the current saving settings.
+
+    Frames of the current camera size are written with the data source of the
+    selected file type into a temporary directory, which is removed afterwards.
+
+    Parameters
+    ----------
+    configuration : dict
+        The configuration of the microscope.
+    microscope_name : str
+        Name of the active microscope.
+    directory : str, optional
+        Where to write. Defaults to the save directory, or the system temporary
+        directory if it doesn't exist.
+    number_of_frames : int, optional
+        Number of frames to write.
+
+    Returns
+    -------
+    throughput : float
+        Writing speed in bytes per second.
+    """
+    from navigate.model import data_sources
+
+    saving = configuration["experiment"]["Saving"]
+    if directory is None:
+        directory = saving.get("save_directory", None)
+    if not directory or not os.path.isdir(directory):
+        directory = None
+    benchmark_directory = tempfile.mkdtemp(prefix="navigate_benchmark_", dir=directory)
+    file_type = saving.get("file_type", "TIFF")
+    ext = "." + file_type.lower().replace(" ", ".").replace("-", ".")
+
+    try:
+        data_source = data_sources.get_data_source(file_type)(
+            file_name=os.path.join(benchmark_directory, "benchmark" + ext)
+        )
+        data_source.set_metadata_from_configuration_experiment(
+            configuration, microscope_name
+        )
+        rng = np.random.default_rng(0)
+        frame = rng.integers(
+            0,
+            2**16,
+            size=(int(data_source.shape_y), int(data_source.shape_x)),
+            dtype=np.uint16,
+        )
+        start_time = time.perf_counter()
+        for _ in range(number_of_frames):
+            data_source.write(frame, x=0, y=0, z=0, theta=0, f=0)
+        data_source.close()
+        duration = time.perf_counter() - start_time
+    finally:
+        shutil.rmtree(benchmark_directory, ignore_errors=True)
+
+    throughput = frame.nbytes * number_of_frames / max(duration, 1e-9)
+    logger.info(
+        f"Writer benchmark: {file_type}, {throughput / 1e6:.1f} MB/s "
+        f"in {benchmark_directory}"
+    )
+    return throughput
+
+
+class _NoOp:
+    """Accepts any attribute access or call and does nothing."""
+
+    def __getattr__(self, __name):
+        return self
+
+    def __call__(self, *args, **kwargs):
+        return None
+
+
+class _PlanningMicroscope:
+    """Stands in for the active microscope during a dry run."""
+
+    def __init__(self, planner, name):
+        """Initialize the _PlanningMicroscope.
+
+        Parameters
+        ----------
+        planner : _DryRun
+            The dry run the microscope reports to.
+        name : str
+            Name of the microscope.
+        """
+        #: _DryRun: The dry run the microscope reports to.
+        self.planner = planner
+
+        #: str: Name of the microscope.
+        self.microscope_name = name
+
+        #: int: Current channel.
+        self.current_channel = 0
+
+        #: float: Central focus position.
+        self.central_focus = None
+
+        #: list: Selected channels.
+        self.available_channels = planner.selected_channels
+
+    def prepare_next_channel(self, update_daq_task_flag=True, wait=True):
+        """Switch to the next selected channel, like Microscope does.
+
+        Parameters
+        ----------
+        update_daq_task_flag : bool
+            Unused.
+        wait : bool
+            Unused. The switch is always accounted as overlapping with the stage
+            moves before the next frame.
+        """
+        curr_channel = self.current_channel
+        if self.current_channel == 0:
+            self.current_channel = self.available_channels[0]
+        else:
+            idx = (self.available_channels.index(self.current_channel) + 1) % len(
+                self.available_channels
+            )
+            self.current_channel = self.available_channels[idx]
+        if curr_channel == self.current_channel:
+            return
+        if self.central_focus is None:
+            self.central_focus = self.planner.position[4]
+        self.planner.switch_channel(
+            curr_channel, self.current_channel, self.central_focus
+        )
+
+    def __getattr__(self, __name):
+        return _NoOp()
+
+
+class _PlanningModel:
+    """Stands in for the model during a dry run.
+
+    Stage moves and channel switches are forwarded to the dry run. Everything
+    else a feature asks of the model does nothing.
+    """
+
+    def __init__(self, planner, configuration):
+        """Initialize the _PlanningModel.
+
+        Parameters
+        ----------
+        planner : _DryRun
+            The dry run the model reports to.
+        configuration : dict
+            A private copy of the configuration.
+        """
+        #: dict: A private copy of the configuration.
+        self.configuration = configuration
+
+        #: _DryRun: The dry run the model reports to.
+        self.planner = planner
+
+        #: str: Name of the active microscope.
+        self.active_microscope_name = configuration["experiment"]["MicroscopeState"][
+            "microscope_name"
+        ]
+
+        #: _PlanningMicroscope: The active microscope.
+        self.active_microscope = _PlanningMicroscope(
+            planner, self.active_microscope_name
+        )
+
+        #: dict: Virtual microscopes.
+        self.virtual_microscopes = {}
+
+        #: int: Frame counter.
+        self.frame_id = 0
+
+        #: bool: Stop flag, set by features.
+        self.stop_acquisition = False
+
+        #: CancellationToken: Never cancelled.
+        self.cancel_token = CancellationToken()
+
+    def get_stage_position(self, settled=False):
+        """Get the simulated stage position.
+
+        Parameters
+        ----------
+        settled : bool
+            Unused.
+
+        Returns
+        -------
+        position : dict
+            The position, e.g. {"x_pos": 0, ...}.
+        """
+        return {
+            f"{axis}_pos": value
+            for axis, value in zip(["x", "y", "z", "theta", "f"], self.planner.position)
+        }
+
+    def move_stage(self, pos_dict, wait_until_done=False, update_focus=True):
+        """Move the simulated stages.
+
+        Parameters
+        ----------
+        pos_dict : dict
+            Target positions, e.g. {"x_abs": 0, ...}.
+        wait_until_done : bool
+            Unused.
+        update_focus : bool
+            Unused.
+
+        Returns
+        -------
+        success : bool
+            Always True.
+        """
+        self.planner.move_stage(pos_dict)
+        return True
+
+    def __getattr__(self, __name):
+        return _NoOp()
+
+
+class _DryRun:
+    """One pass of a feature list against a timing model."""
+
+    def __init__(self, configuration, timing, max_frames):
+        """Initialize the _DryRun.
+
+        Parameters
+        ----------
+        configuration : dict
+            A private copy of the configuration.
+        timing : DeviceTimingModel
+            The timing model.
+        max_frames : int
+            Stop after this many frames.
+        """
+        #: dict: A private copy of the configuration.
+        self.configuration = configuration
+
+        #: DeviceTimingModel: The timing model.
+        self.timing = timing
+
+        #: int: Stop after this many frames.
+        self.max_frames = max_frames
+
+        microscope_state = configuration["experiment"]["MicroscopeState"]
+
+        #: dict: Channels of the experiment.
+        self.channels = microscope_state["channels"]
+
+        #: list: Indices of the selected channels.
+        self.selected_channels = [
+            int(k[len("channel_") :])
+            for k, v in self.channels.items()
+            if v["is_selected"]
+        ]
+
+        stage = configuration["experiment"]["StageParameters"]
+
+        #: list: Simulated stage position (x, y, z, theta, f).
+        self.position = [float(stage[axis]) for axis in ["x", "y", "z", "theta", "f"]]
+
+        #: float: Stage travel since the last frame.
+        self.stage_time = 0.0
+
+        #: float: Channel switch since the last frame.
+        self.switch_time = 0.0
+
+        #: dict: Critical-path time of each phase.
+        self.phases = dict.fromkeys(PHASES, 0.0)
+
+        #: int: Number of frames.
+        self.frames = 0
+
+        #: bool: The feature list ran to the end.
+        self.complete = False
+
+    def move_stage(self, pos_dict):
+        """Account a stage move.
+
+        Parameters
+        ----------
+        pos_dict : dict
+            Target positions, e.g. {"x_abs": 0, ...}.
+        """
+        target = list(self.position)
+        for i, axis in enumerate(["x", "y", "z", "theta", "f"]):
+            if f"{axis}_abs" in pos_dict:
+                target[i] = float(pos_dict[f"{axis}_abs"])
+        self.stage_time += self.timing.stage_move_time(self.position, target)
+        self.position = target
+
+    def switch_channel(self, previous, channel, central_focus):
+        """Account a channel switch.
+
+        Filter wheels and the focus stage switch in parallel, so the slowest
+        device that has to move sets the switch time. The switch times measured
+        on the microscope during earlier acquisitions are a lower bound.
+
+        Parameters
+        ----------
+        previous : int
+            The previous channel, 0 if none.
+        channel : int
+            The next channel.
+        central_focus : float
+            Focus position without defocus.
+        """
+        new = self.channels[f"channel_{channel}"]
+        old = self.channels.get(f"channel_{previous}", {})
+        switch_time = self.timing.channel_switch_time
+        for k in new:
+            if not k.startswith("filter_wheel_") or old.get(k) == new[k]:
+                continue
+            wheel_index = int(k[len("filter_wheel_") :])
+            switch_time = max(switch_time, self.timing.filter_wheel_time(wheel_index))
+
+        target = list(self.position)
+        target[4] = central_focus + float(new.get("defocus", 0))
+        switch_time = max(
+            switch_time, self.timing.stage_move_time(self.position, target)
+        )
+        self.position = target
+        self.switch_time = max(self.switch_time, switch_time)
+
+    def acquire_frame(self, channel):
+        """Account one frame.
+
+        The channel switch runs in the background while the stages move, so the
+        dead time before the trigger is the longer of the two.
+
+        Parameters
+        ----------
+        channel : int
+            The channel of the frame.
+        """
+        if self.switch_time > self.stage_time:
+            self.phases["channel switch"] += self.switch_time
+        else:
+            self.phases["stage"] += self.stage_time
+        self.stage_time = self.switch_time = 0.0
+
+        channel_key = f"channel_{channel}"
+        sweep_time = self.timing.sweep_times.get(channel_key, 0.0)
+        exposure_time = min(
+            self.timing.exposure_times.get(channel_key, 0.0), sweep_time
+        )
+        readout_time = min(self.timing.readout_time, sweep_time - exposure_time)
+        self.phases["exposure"] += exposure_time
+        self.phases["readout"] += readout_time
+        self.phases["settle"] += sweep_time - exposure_time - readout_time
+        self.frames += 1
+
+    def run(self, feature_list):
+        """Dry-run a feature list.
+
+        Parameters
+        ----------
+        feature_list : list
+            The feature list.
+        """
+        microscope_state = self.configuration["experiment"]["MicroscopeState"]
+        stack_pause = float(microscope_state.get("stack_pause", 0) or 0)
+        # pauses are accounted, not slept
+        microscope_state["stack_pause"] = 0
+
+        model = _PlanningModel(self, self.configuration)
+        signal_container, _ = load_features(model, feature_list)
+
+        # walk the tree, loops point back to earlier nodes
+        nodes, visited = [signal_container.root], set()
+        while nodes:
+            node = nodes.pop()
+            if node is None or id(node) in visited:
+                continue
+            visited.add(id(node))
+            if node.node_funcs.get("main-response", dummy_True) is not dummy_True:
+                raise ValueError(
+                    f"{node.node_name} waits for image data and can't be planned."
+                )
+            if node.node_name == "StackPause":
+                timepoints = int(microscope_state.get("timepoints", 1))
+                self.phases["pause"] += stack_pause * max(timepoints - 1, 0)
+            nodes.extend([node.child, node.sibling])
+
+        signal_container.reset()
+        while (
+            not signal_container.end_flag
+            and not model.stop_acquisition
+            and self.frames < self.max_frames
+        ):
+            signal_container.run()
+            self.acquire_frame(
+                model.active_microscope.current_channel
+                or (self.selected_channels or [0])[0]
+            )
+            signal_container.run(wait_response=True)
+            model.frame_id += 1
+            if signal_container.is_closed:
+                # a feature raised, see the log for its traceback
+                logger.warning("Dry run ended by an error in a feature.")
+                break
+        self.complete = not signal_container.is_closed and (
+            signal_container.end_flag or model.stop_acquisition
+        )
+        signal_container.cleanup()
+
+
+class AcquisitionPlanner:
+    """Estimates how long an acquisition takes and what limits it.
+
+    A feature list is dry-run with stand-ins for the model and the devices. The
+    signal functions of the features run as in a real acquisition, while stage
+    moves, channel switches and frames are accounted with a DeviceTimingModel.
+    Data functions are not run, so features that wait for image data, e.g. to
+    detect tissue, can't be planned.
+    """
+
+    def __init__(self, configuration, timing, max_frames=10**7):
+        """Initialize the AcquisitionPlanner.
+
+        Parameters
+        ----------
+        configuration : dict
+            The configuration. It is copied, features never change it.
+        timing : DeviceTimingModel
+            The timing model.
+        max_frames : int, optional
+            Stop the dry run after this many frames, e.g. for live mode.
+        """
+        #: dict: A private copy of the configuration.
+        self.configuration = copy.deepcopy(copy_proxy_object(configuration))
+
+        #: DeviceTimingModel: The timing model.
+        self.timing = timing
+
+        #: int: Stop the dry run after this many frames.
+        self.max_frames = max_frames
+
+    def dry_run(self, feature_list, **microscope_state):
+        """Dry-run a feature list.
+
+        Parameters
+        ----------
+        feature_list : list
+            The feature list.
+        **microscope_state
+            MicroscopeState settings to change for this run.
+
+        Returns
+        -------
+        dry_run : _DryRun
+            The accounted frames and phases.
+        """
+        configuration = copy.deepcopy(self.configuration)
+        configuration["experiment"]["MicroscopeState"].update(microscope_state)
+        dry_run = _DryRun(configuration, self.timing, self.max_frames)
+        dry_run.run(feature_list)
+        return dry_run
+
+    def plan(self, feature_list):
+        """Plan an acquisition.
+
+        Parameters
+        ----------
+        feature_list : list
+            The feature list.
+
+        Returns
+        -------
+        plan : dict
+            "duration": estimated total time (s),
+            "acquisition_time": time to acquire all frames (s),
+            "write_time": time to save all frames (s), None if not limited,
+            "frames": number of frames,
+            "bytes": amount of image data,
+            "phases": critical-path time of each phase (s),
+            "limiting_resource": the phase or "writer" that takes the longest,
+            "complete": False if the dry run stopped at max_frames or on an
+            error,
+            "recommendations": list of suggested changes.
+        """
+        dry_run = self.dry_run(feature_list)
+        plan = self.summarize(dry_run)
+
+        recommendations = []
+        microscope_state = self.configuration["experiment"]["MicroscopeState"]
+
+        # switching channels once per stack instead of once per plane
+        if len(dry_run.selected_channels) > 1:
+            current_mode = microscope_state.get("stack_cycling_mode", "per_stack")
+            other_mode = "per_stack" if current_mode == "per_z" else "per_z"
+            other = self.summarize(
+                self.dry_run(feature_list, stack_cycling_mode=other_mode)
+            )
+            if other["duration"] < 0.9 * plan["duration"]:
+                recommendations.append(
+                    f"Set stack_cycling_mode to {other_mode}: "
+                    f"{other['duration']:.1f} s instead of {plan['duration']:.1f} s."
+                )
+
+        # visiting the positions in a planned order
+        positions = [
+            list(position)
+            for position in self.configuration["experiment"]["MultiPositions"]
+        ]
+        if (
+            microscope_state.get("is_multiposition", False)
+            and not microscope_state.get("optimize_position_order", False)
+            and len(positions) > 2
+        ):
+            before = estimate_travel_time(positions, self.timing.axis_weights)
+            order = plan_position_route(positions, self.timing.axis_weights)
+            after = estimate_travel_time(
+                [positions[i] for i in order], self.timing.axis_weights
+            )
+            if after < 0.9 * before:
+                recommendations.append(
+                    f"Enable Optimize Order: stage travel between positions "
+                    f"{after:.1f} s instead of {before:.1f} s."
+                )
+
+        if plan["limiting_resource"] == "writer":
+            needed = plan["bytes"] / max(plan["acquisition_time"], 1e-9)
+            recommendations.append(
+                f"Saving needs {needed / 1e6:.0f} MB/s but the disk sustains "
+                f"{self.timing.writer_throughput / 1e6:.0f} MB/s. Save to a faster "
+                "disk, or reduce the data with binning or a smaller region."
+            )
+        elif plan["limiting_resource"] == "channel switch":
+            recommendations.append(
+                "Channel switches dominate. Use a multi-band filter, avoid defocus "
+                "between channels or play all channels in one DAQ program "
+                "(Channel Sequence mode)."
+            )
+
+        plan["recommendations"] = recommendations
+        return plan
+
+    def summarize(self, dry_run):
+        """Summarize a dry run.
+
+        Parameters
+        ----------
+        dry_run : _DryRun
+            The dry run.
+
+        Returns
+        -------
+        plan : dict
+            See plan(), without recommendations.
+        """
+        camera_parameters = self.configuration["experiment"]["CameraParameters"][
+            dry_run.configuration["experiment"]["MicroscopeState"]["microscope_name"]
+        ]
+        frame_bytes = (
+            int(camera_parameters["img_x_pixels"])
+            * int(camera_parameters["img_y_pixels"])
+            * 2
+        )
+        total_bytes = frame_bytes * dry_run.frames
+
+        phases = dict(dry_run.phases)
+        acquisition_time = sum(phases.values())
+        write_time = None
+        if self.timing.writer_throughput:
+            write_time = total_bytes / self.timing.writer_throughput
+
+        limiting_resource = max(phases, key=phases.get)
+        duration = acquisition_time
+        if write_time is not None and write_time > acquisition_time:
+            # frames queue up in memory until the writer catches up
+            limiting_resource = "writer"
+            duration = write_time
+
+        return {
+            "duration": duration,
+            "acquisition_time": acquisition_time,
+            "write_time": write_time,
+            "frames": dry_run.frames,
+            "bytes": total_bytes,
+            "phases": phases,
+            "limiting_resource": limiting_resource,
+            "complete": dry_run.complete,
+        }
+
+
+def format_acquisition_plan(plan):
+    """Format an acquisition plan as text.
+
+    Parameters
+    ----------
+    plan : dict
+        The plan, from AcquisitionPlanner.plan().
+
+    Returns
+    -------
+    text : str
+        The formatted plan.
+    """
+    lines = [
+        f"Estimated duration: {plan['duration']:.1f} s "
+        f"({plan['duration'] / 3600:.2f} h)"
+        + ("" if plan["complete"] else ", dry run stopped early"),
+        f"Frames: {plan['frames']}, data: {plan['bytes'] / 1e9:.2f} GB",
+        f"Limited by: {plan['limiting_resource']}",
+    ]
+    for phase, duration in plan["phases"].items():
+        if duration > 0:
+            lines.append(f"  {phase}: {duration:.1f} s")
+    if plan["write_time"] is not None:
+        lines.append(f"  writer: {plan['write_time']:.1f} s")
+    lines.extend(f"- {text}" for text in plan.get("recommendations", []))
+    return "\n".join(lines)
@@ -0,0 +1,315 @@
+# Copyright (c) 2021-2024  The University of Texas Southwestern Medical Center.
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted for academic and research use only
+# (subject to the limitations in the disclaimer below)
+# provided that the following conditions are met:
+
+#      * Redistributions of source code must retain the above copyright notice,
+#      this list of conditions and the following disclaimer.
+
+#      * Redistributions in binary form must reproduce the above copyright
+#      notice, this list of conditions and the following disclaimer in the
+#      documentation and/or other materials provided with the distribution.
+
+#      * Neither the name of the copyright holders nor the names of its
+#      contributors may be used to endorse or promote products derived from this
+#      software without specific prior written permission.
+
+# NO EXPRESS OR IMPLIED LICENSES TO ANY PARTY'S PATENT RIGHTS ARE GRANTED BY
+# THIS LICENSE. THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND
+# CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A
+# PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR
+# BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER
+# IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+#
+
+#  Standard Imports
+import logging
+import math
+
+# Third Party Imports
+import numpy as np
+
+# Local Imports
+
+# Logger Setup
+p = __name__.split(".")[1]
+logger = logging.getLogger(p)
+
+
+def block_max(image, factor):
+    """Down-sample the last two axes of an array by taking the block maximum.
+
+    The array is zero padded at the end of each axis to a multiple of the factor.
+    Taking the maximum keeps the maximum intensity projection semantics.
+
+    Parameters
+    ----------
+    image : np.ndarray
+        Array with shape (..., height, width).
+    factor : int
+        The down-sampling factor.
+
+    Returns
+    -------
+    image : np.ndarray
+        Array with shape (..., ceil(height / factor), ceil(width / factor)).
+    """
+    if factor <= 1:
+        return image
+    height, width = image.shape[-2:]
+    pad_y, pad_x = -height % factor, -width % factor
+    if pad_y or pad_x:
+        pad = [(0, 0)] * (image.ndim - 2) + [(0, pad_y), (0, pad_x)]
+        image = np.pad(image, pad)
+    shape = image.shape[:-2] + (
+        image.shape[-2] // factor,
+        factor,
+        image.shape[-1] // factor,
+        factor,
+    )
+    return image.reshape(shape).max(axis=(-3, -1))
+
+
+class OverviewMosaic:
+    """A low-resolution mosaic of multi-position tiles.
+
+    Each tile, usually the maximum intensity projection of a z-stack, is
+    down-sampled into the canvas at its stage position. The canvas pixel size is
+    the camera pixel size times a power of two (the pyramid level). Whenever the
+    mosaic would grow beyond `max_size` pixels, the canvas moves one pyramid level
+    up and is down-sampled by two, so the memory used is bounded by
+    `number_of_channels * max_size**2` pixels.
+
+    Note
+    ----
+    Stage x increases along the image columns and stage y along the image rows.
+    Overlapping tiles are combined with a maximum.
+    """
+
+    def __init__(
+        self,
+        pixel_size,
+        number_of_channels=1,
+        tile_size=128,
+        max_size=2048,
+        dtype=np.uint16,
+    ):
+        """Initialize the OverviewMosaic.
+
+        Parameters
+        ----------
+        pixel_size : float
+            The size of a tile pixel in um.
+        number_of_channels : int, optional
+            The number of channels, by default 1
+        tile_size : int, optional
+            The size in pixels of the first tile in the mosaic, by default 128
+        max_size : int, optional
+            The maximum size in pixels of the mosaic, by default 2048
+        dtype : np.dtype, optional
+            The data type of the mosaic, by default np.uint16
+        """
+        #: float: The size of a tile pixel in um.
+        self.pixel_size = pixel_size
+
+        #: int: The number of channels.
+        self.number_of_channels = number_of_channels
+
+        #: int: The size in pixels of the first tile in the mosaic.
+        self.tile_size = tile_size
+
+        #: int: The maximum size in pixels of the mosaic.
+        self.max_size = max_size
+
+        #: np.dtype: The data type of the mosaic.
+        self.dtype = dtype
+
+        #: int: The pyramid level of the canvas.
+        self.level = None
+
+        #: tuple: The stage position (x, y) in um of the upper-left canvas pixel.
+        self.origin = None
+
+        #: np.ndarray: The canvas with shape (channels, height, width).
+        self.canvas = None
+
+        #: tuple: The stage extent (left, top, right, bottom) of the tiles in um.
+        self.bounds = None
+
+        #: int: The number of tiles added to the mosaic.
+        self.number_of_tiles = 0
+
+    @property
+    def scale(self):
+        """The size of a canvas pixel in um.
+
+        Returns
+        -------
+        scale : float
+            The size of a canvas pixel in um.
+        """
+        return self.pixel_size * 2**self.level
+
+    @property
+    def extent(self):
+        """The stage extent (left, top, right, bottom) of the canvas in um.
+
+        Returns
+        -------
+        extent : tuple
+            The stage extent of the canvas in um.
+        """
+        if self.canvas is None:
+            return None
+        height, width = self.canvas.shape[-2:]
+        return (
+            self.origin[0],
+            self.origin[1],
+            self.origin[0] + width * self.scale,
+            self.origin[1] + height * self.scale,
+        )
+
+    def add_tile(self, tile, x, y):
+        """Down-sample a tile into the mosaic.
+
+        Parameters
+        ----------
+        tile : np.ndarray
+            The tile with shape (height, width) or (channels, height, width).
+        x : float
+            The stage x position of the tile center in um.
+        y : float
+            The stage y position of the tile center in um.
+        """
+        if tile.ndim == 2:
+            tile = tile[np.newaxis]
+        tile = tile[: self.number_of_channels]
+        height, width = tile.shape[-2:]
+
+        if self.level is None:
+            self.level = max(
+                0, math.ceil(math.log2(max(height, width) / self.tile_size))
+            )
+
+        left = x - width * self.pixel_size / 2
+        top = y - height * self.pixel_size / 2
+        self.fit(
+            left, top, left + width * self.pixel_size, top + height * self.pixel_size
+        )
+
+        reduced = block_max(tile, 2**self.level)
+        col = int(round((left - self.origin[0]) / self.scale))
+        row = int(round((top - self.origin[1]) / self.scale))
+
+        # clip the tile to the canvas
+        canvas_height, canvas_width = self.canvas.shape[-2:]
+        row_start, col_start = max(row, 0), max(col, 0)
+        row_end = min(row + reduced.shape[-2], canvas_height)
+        col_end = min(col + reduced.shape[-1], canvas_width)
+        if row_end <= row_start or col_end <= col_start:
+            return
+        region = self.canvas[: reduced.shape[0], row_start:row_end, col_start:col_end]
+        np.maximum(
+            region,
+            reduced[
+                :,
+                row_start - row : row_end - row,
+                col_start - col : col_end - col,
+            ].astype(self.dtype),
+            out=region,
+        )
+        self.number_of_tiles += 1
+
+    def fit(self, left, top, right, bottom):
+        """Grow the canvas so that it covers a stage extent.
+
+        Moves up the pyramid while the canvas would be larger than `max_size`.
+
+        Parameters
+        ----------
+        left : float
+            The left edge in um.
+        top : float
+            The top edge in um.
+        right : float
+            The right edge in um.
+        bottom : float
+            The bottom edge in um.
+        """
+        if self.bounds is None:
+            self.bounds = (left, top, right, bottom)
+        else:
+            self.bounds = (
+                min(self.bounds[0], left),
+                min(self.bounds[1], top),
+                max(self.bounds[2], right),
+                max(self.bounds[3], bottom),
+            )
+
+        extent = self.extent
+        if (
+            extent is not None
+            and extent[0] <= left
+            and extent[1] <= top
+            and right <= extent[2]
+            and bottom <= extent[3]
+        ):
+            return
+
+        level = self.level
+        while True:
+            scale = self.pixel_size * 2**level
+            origin_x = math.floor(self.bounds[0] / scale) * scale
+            origin_y = math.floor(self.bounds[1] / scale) * scale
+            width = math.ceil((self.bounds[2] - origin_x) / scale)
+            height = math.ceil((self.bounds[3] - origin_y) / scale)
+            if max(width, height) <= self.max_size:
+                break
+            level += 1
+
+        canvas = np.zeros((self.number_of_channels, height, width), dtype=self.dtype)
+        if self.canvas is not None:
+            # pad the old canvas so that its origin matches the new one
+            pad_x = max(0, int(round((self.origin[0] - origin_x) / self.scale)))
+            pad_y = max(0, int(round((self.origin[1] - origin_y) / self.scale)))
+            old = np.pad(self.canvas, ((0, 0), (pad_y, 0), (pad_x, 0)))
+            old = block_max(old, 2 ** (level - self.level))
+            old_height = min(old.shape[-2], height)
+            old_width = min(old.shape[-1], width)
+            canvas[:, :old_height, :old_width] = old[:, :old_height, :old_width]
+            logger.debug(f"Overview mosaic resized to {width}x{height}, level {level}")
+
+        self.canvas = canvas
+        self.level = level
+        self.origin = (origin_x, origin_y)
+
+    def get_image(self, max_size=512):
+        """Get a down-sampled copy of the mosaic for display.
+
+        Parameters
+        ----------
+        max_size : int, optional
+            The maximum size in pixels of the image, by default 512
+
+        Returns
+        -------
+        image : np.ndarray
+            The mosaic with shape (channels, height, width).
+        """
+        if self.canvas is None:
+            return None
+        factor = 1
+        while max(self.canvas.shape[-2:]) > max_size * factor:
+            factor *= 2
+        if factor == 1:
+            return self.canvas.copy()
+        return block_max(self.canvas, factor)
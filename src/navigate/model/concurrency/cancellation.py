@@ -0,0 +1,102 @@
+# Copyright (c) 2021-2024  The University of Texas Southwestern Medical Center.
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted for academic and research use only
+# (subject to the limitations in the disclaimer below)
+# provided that the following conditions are met:
+
+#      * Redistributions of source code must retain the above copyright notice,
+#      this list of conditions and the following disclaimer.
+
+#      * Redistributions in binary form must reproduce the above copyright
+#      notice, this list of conditions and the following disclaimer in the
+#      documentation and/or other materials provided with the distribution.
+
+#      * Neither the name of the copyright holders nor the names of its
+#      contributors may be used to endorse or promote products derived from this
+#      software without specific prior written permission.
+
+# NO EXPRESS OR IMPLIED LICENSES TO ANY PARTY'S PATENT RIGHTS ARE GRANTED BY
+# THIS LICENSE. THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND
+# CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A
+# PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR
+# BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER
+# IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+# Standard Library Imports
+import threading
+
+# Third Party Imports
+
+# Local Imports
+
+
+class CancelledError(Exception):
+    """Raised at a checkpoint when the task's token has been cancelled."""
+
+    pass
+
+
+class CancellationToken:
+    """A cooperative cancellation token.
+
+    Long-running tasks receive a token and check it at safe points, e.g. between
+    frames or between feature nodes, so they stop where the hardware is in a
+    well-defined state. Cancelling a token never interrupts a task; it only asks
+    the task to return at its next checkpoint.
+
+    Tokens are single use. A new token is created for each task or acquisition.
+    """
+
+    def __init__(self):
+        """Initialize the CancellationToken."""
+        #: threading.Event: Set once the token is cancelled.
+        self._event = threading.Event()
+
+    @property
+    def cancelled(self):
+        """Whether the token has been cancelled.
+
+        Returns
+        -------
+        bool
+            True if cancel() has been called.
+        """
+        return self._event.is_set()
+
+    def cancel(self):
+        """Ask the task holding this token to stop."""
+        self._event.set()
+
+    def check(self):
+        """Checkpoint: raise if the token has been cancelled.
+
+        Raises
+        ------
+        CancelledError
+            If the token has been cancelled.
+        """
+        if self._event.is_set():
+            raise CancelledError()
+
+    def wait(self, timeout=None):
+        """Sleep for up to timeout seconds, waking up early on cancellation.
+
+        Parameters
+        ----------
+        timeout : float, optional
+            Maximum time to wait in seconds. None waits until cancelled.
+
+        Returns
+        -------
+        bool
+            True if the token has been cancelled.
+        """
+        return self._event.wait(timeout)
@@ -10,6 +10,8 @@ from contextlib import redirect_stdout
 import sys
 import traceback
 import inspect
+import itertools
+from concurrent.futures import Future
 
 # Making sure objects are cleaned up nicely is tricky:
 import weakref
@@ -346,6 +348,11 @@ class ObjectInSubprocess:
         close_method_name -- string, optional, name of our object's method to
             be called automatically when the child process exits
         closeargs, closekwargs -- arguments to 'close_method'
+
+        Method calls take a single round trip to the child process once the
+        method name is known. Use call_async() to call a method without
+        waiting for the result, and call_batch() to send several small calls
+        at once.
         """
         # Put an instance of the Python object returned by 'initializer'
         # in a child process:
@@ -377,10 +384,33 @@ class ObjectInSubprocess:
             self._.resource_lock = threading.Lock()
         else:
             self._.resource_lock = None
+        # Requests are tagged with an id, so several of them can be in flight.
+        # A receiver thread hands each response to the future of its request.
+        self._.send_lock = threading.Lock()
+        self._.request_ids = itertools.count()
+        self._.pending_requests = {}
+        # Names of the child object's methods, so that calling a method only
+        # takes one round trip:
+        self._.method_names = set()
         # Make sure the child process initialized successfully:
         with self._.parent_pipe_lock:
             self._.child_process.start()
-            assert _get_response(self) == "Successfully initialized"
+            resp, printed_output = self._.parent_pipe.recv()
+            if len(printed_output) > 0:
+                print(printed_output, end="")
+            if isinstance(resp, Exception):
+                raise resp
+            assert resp == "Successfully initialized"
+        # The child process has its end of the pipe now. Closing ours lets the
+        # receiver thread see EOF if the child process dies.
+        self._.child_pipe.close()
+        self._.receiver_thread = threading.Thread(
+            target=_receive_responses,
+            args=(self._,),
+            name=f"{initializer.__name__}_receiver",
+            daemon=True,
+        )
+        self._.receiver_thread.start()
         # Try to ensure the child process closes when we exit:
         dummy_namespace = getattr(self, "_")
         weakref.finalize(self, _close, dummy_namespace)
@@ -401,48 +431,200 @@ class ObjectInSubprocess:
             self._.resource_lock.acquire()
         if name == "terminate":
             with self._.parent_pipe_lock:
-                self._.parent_pipe.send(None)
+                with self._.send_lock:
+                    self._.parent_pipe.send(None)
                 self._.child_process.terminate()
             if self._.resource_lock:
                 self._.resource_lock.release()
             return _dummy_function
-        with self._.parent_pipe_lock:
-            self._.parent_pipe.send(("__getattribute__", (name,), {}))
-            attr = _get_response(self)
+        if name in self._.method_names:
+            # Known method: skip the attribute lookup round trip.
+            attr = _dummy_function
+        else:
+            future = _send_request(self._, "__getattribute__", (name,), {})
+            attr = _get_response(self, future)
         if callable(attr):
+            self._.method_names.add(name)
 
             def attr(*args, **kwargs):
-                with self._.parent_pipe_lock:
-                    self._.parent_pipe.send((name, args, kwargs))
-                    return _get_response(self, True)
+                # The response is matched by its request id, so the pipe is only
+                # locked while sending, and other threads can call meanwhile.
+                future = _send_request(self._, name, args, kwargs)
+                return _get_response(self, future, True)
 
         elif self._.resource_lock:
             self._.resource_lock.release()
         return attr
 
     def __setattr__(self, name, value):
-        with self._.parent_pipe_lock:
-            self._.parent_pipe.send(("__setattr__", (name, value), {}))
-            return _get_response(self)
+        self._.method_names.discard(name)
+        future = _send_request(self._, "__setattr__", (name, value), {})
+        return _get_response(self, future)
 
 
-def _get_response(object_in_subprocess, release=False):
-    """
+def _send_request(dummy_namespace, method_name, args, kwargs):
+    """Send a request to the child process without waiting for the response.
+
     Effectively a method of ObjectInSubprocess, but defined externally to
     minimize shadowing of the object's namespace
+
+    Parameters
+    ----------
+    dummy_namespace : _DummyClass
+        The namespace of the ObjectInSubprocess.
+    method_name : str or None
+        The name of the method to call. None for a batch of calls, in which case
+        args is a list of (method_name, args, kwargs) tuples.
+    args : tuple
+        The positional arguments.
+    kwargs : dict
+        The keyword arguments.
+
+    Returns
+    -------
+    future : concurrent.futures.Future or list
+        The future of the response, or a list of futures for a batch.
+    """
+    if method_name is None:
+        future = [Future() for _ in args]
+    else:
+        future = Future()
+    with dummy_namespace.send_lock:
+        request_id = next(dummy_namespace.request_ids)
+        dummy_namespace.pending_requests[request_id] = future
+        try:
+            dummy_namespace.parent_pipe.send((request_id, method_name, args, kwargs))
+        except Exception:
+            del dummy_namespace.pending_requests[request_id]
+            raise
+    return future
+
+
+def _receive_responses(dummy_namespace):
+    """The loop of the receiver thread of an ObjectInSubprocess.
+
+    Hands each response of the child process to the future of its request.
+
+    Parameters
+    ----------
+    dummy_namespace : _DummyClass
+        The namespace of the ObjectInSubprocess.
     """
-    resp, printed_output = object_in_subprocess._.parent_pipe.recv()
-    if len(printed_output) > 0:
-        print(printed_output, end="")
+    while True:
+        try:
+            request_id, resp, printed_output = dummy_namespace.parent_pipe.recv()
+        except (EOFError, OSError):
+            break
+        if len(printed_output) > 0:
+            print(printed_output, end="")
+        if request_id is None:  # The child process is exiting.
+            break
+        future = dummy_namespace.pending_requests.pop(request_id, None)
+        if future is None:
+            continue
+        if isinstance(future, list):
+            if isinstance(resp, Exception):
+                resp = [resp] * len(future)
+            for f, r in zip(future, resp):
+                _set_future(f, r)
+        else:
+            _set_future(future, resp)
+
+    # Nothing more will arrive:
+    while dummy_namespace.pending_requests:
+        _, future = dummy_namespace.pending_requests.popitem()
+        for f in future if isinstance(future, list) else [future]:
+            _set_future(f, EOFError("The child process exited."))
+
+
+def _set_future(future, resp):
+    """Set the result, or the exception, of a future."""
     if isinstance(resp, Exception):
-        raise resp
-    if (
-        release
-        and object_in_subprocess._.resource_lock
-        and object_in_subprocess._.resource_lock.locked()
-    ):
-        object_in_subprocess._.resource_lock.release()
-    return resp
+        future.set_exception(resp)
+    else:
+        future.set_result(resp)
+
+
+def _get_response(object_in_subprocess, future, release=False):
+    """
+    Effectively a method of ObjectInSubprocess, but defined externally to
+    minimize shadowing of the object's namespace
+    """
+    try:
+        return future.result()
+    finally:
+        if (
+            release
+            and object_in_subprocess._.resource_lock
+            and object_in_subprocess._.resource_lock.locked()
+        ):
+            object_in_subprocess._.resource_lock.release()
+
+
+def call_async(object_in_subprocess, method_name, *args, **kwargs):
+    """Call a method of an object without waiting for the result.
+
+    For an ObjectInSubprocess, the call is sent to the child process right away
+    and several calls can be in flight at the same time. They are executed by the
+    child process in the order they were sent. Any other object is called
+    directly.
+
+    Parameters
+    ----------
+    object_in_subprocess : ObjectInSubprocess or object
+        The object.
+    method_name : str
+        The name of the method.
+    *args
+        The positional arguments of the method.
+    **kwargs
+        The keyword arguments of the method.
+
+    Returns
+    -------
+    future : concurrent.futures.Future
+        The future of the result.
+    """
+    if isinstance(object_in_subprocess, ObjectInSubprocess):
+        return _send_request(object_in_subprocess._, method_name, args, kwargs)
+    return _call_directly(getattr(object_in_subprocess, method_name), args, kwargs)
+
+
+def call_batch(object_in_subprocess, calls):
+    """Call several methods of an object in a single round trip.
+
+    Useful for many small calls. The calls are executed in order; an exception
+    in one of them does not stop the others.
+
+    Parameters
+    ----------
+    object_in_subprocess : ObjectInSubprocess or object
+        The object.
+    calls : list
+        List of (method_name, args, kwargs) tuples.
+
+    Returns
+    -------
+    futures : list
+        The futures of the results, in the order of the calls.
+    """
+    calls = [(name, tuple(args), dict(kwargs)) for name, args, kwargs in calls]
+    if isinstance(object_in_subprocess, ObjectInSubprocess):
+        return _send_request(object_in_subprocess._, None, calls, {})
+    return [
+        _call_directly(getattr(object_in_subprocess, name), args, kwargs)
+        for name, args, kwargs in calls
+    ]
+
+
+def _call_directly(method, args, kwargs):
+    """Call a method and wrap the result in a finished future."""
+    future = Future()
+    try:
+        future.set_result(method(*args, **kwargs))
+    except Exception as e:
+        future.set_exception(e)
+    return future
 
 
 def _close(dummy_namespace):
@@ -454,8 +636,10 @@ def _close(dummy_namespace):
     if not dummy_namespace.child_process.is_alive():
         return
     with dummy_namespace.parent_pipe_lock:
-        dummy_namespace.parent_pipe.send(None)
+        with dummy_namespace.send_lock:
+            dummy_namespace.parent_pipe.send(None)
         dummy_namespace.child_process.join()
+        dummy_namespace.receiver_thread.join(timeout=1)
         dummy_namespace.parent_pipe.close()
 
 
@@ -519,18 +703,57 @@ def _child_loop(
         except EOFError:  # This implies the parent is dead; exit.
             return None
         if cmd is None:  # This is how the parent signals us to exit.
+            child_pipe.send((None, None, ""))
             return None
-        method_name, args, kwargs = cmd
+        request_id, method_name, args, kwargs = cmd
+        if method_name is None:  # A batch of calls
+            result = [
+                _call_in_child(obj, *call, printed_output=printed_output)
+                for call in args
+            ]
+        else:
+            result = _call_in_child(
+                obj, method_name, args, kwargs, printed_output=printed_output
+            )
         try:
-            with redirect_stdout(printed_output):
-                result = getattr(obj, method_name)(*args, **kwargs)
-            if callable(result):
-                result = _dummy_function  # Cheaper than sending a real callable
-            child_pipe.send((result, printed_output.getvalue()))
+            child_pipe.send((request_id, result, printed_output.getvalue()))
         except Exception as e:
-            # e.child_traceback_string = traceback.format_exc()
+            # The result can not be pickled.
             print("Exception inside ObjectInSubprocess:", traceback.format_exc())
-            child_pipe.send((Exception(str(e)), printed_output.getvalue()))
+            child_pipe.send((request_id, Exception(str(e)), printed_output.getvalue()))
+
+
+def _call_in_child(obj, method_name, args, kwargs, printed_output):
+    """Call a method of the object in the child process.
+
+    Parameters
+    ----------
+    obj : object
+        The object in the child process.
+    method_name : str
+        The name of the method.
+    args : tuple
+        The positional arguments.
+    kwargs : dict
+        The keyword arguments.
+    printed_output : io.StringIO
+        Collects the printed output.
+
+    Returns
+    -------
+    result : object
+        The result of the call, or the exception it raised.
+    """
+    try:
+        with redirect_stdout(printed_output):
+            result = getattr(obj, method_name)(*args, **kwargs)
+        if callable(result):
+            result = _dummy_function  # Cheaper than sending a real callable
+        return result
+    except Exception as e:
+        # e.child_traceback_string = traceback.format_exc()
+        print("Exception inside ObjectInSubprocess:", traceback.format_exc())
+        return Exception(str(e))
 
 
 # A minimal class that we use just to get another namespace:
@@ -0,0 +1,261 @@
+# Copyright (c) 2021-2024  The University of Texas Southwestern Medical Center.
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted for academic and research use only
+# (subject to the limitations in the disclaimer below)
+# provided that the following conditions are met:
+
+#      * Redistributions of source code must retain the above copyright notice,
+#      this list of conditions and the following disclaimer.
+
+#      * Redistributions in binary form must reproduce the above copyright
+#      notice, this list of conditions and the following disclaimer in the
+#      documentation and/or other materials provided with the distribution.
+
+#      * Neither the name of the copyright holders nor the names of its
+#      contributors may be used to endorse or promote products derived from this
+#      software without specific prior written permission.
+
+# NO EXPRESS OR IMPLIED LICENSES TO ANY PARTY'S PATENT RIGHTS ARE GRANTED BY
+# THIS LICENSE. THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND
+# CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A
+# PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR
+# BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER
+# IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+# Standard Library Imports
+import logging
+import threading
+import weakref
+from concurrent.futures import Future, ThreadPoolExecutor
+
+# Third Party Imports
+
+# Local Imports
+
+# Logger Setup
+p = __name__.split(".")[1]
+logger = logging.getLogger(p)
+
+#: weakref.WeakKeyDictionary: One single-worker executor per device connection.
+_executors = weakref.WeakKeyDictionary()
+
+#: weakref.WeakKeyDictionary: One lock per device connection.
+_connection_locks = weakref.WeakKeyDictionary()
+
+#: threading.Lock: Guards the creation of executors and connection locks.
+_executors_lock = threading.Lock()
+
+
+def get_command_queue_key(device):
+    """Get the object whose commands must not overlap.
+
+    Devices that share a connection, e.g. several axes and a filter wheel on one
+    serial controller, share one command queue. Devices without a usable
+    connection object get a queue of their own.
+
+    Parameters
+    ----------
+    device : object
+        The device.
+
+    Returns
+    -------
+    key : object
+        The device connection, or the device itself.
+    """
+    connection = getattr(device, "device_connection", None)
+    if connection is None:
+        return device
+    try:
+        weakref.ref(connection)
+        hash(connection)
+    except TypeError:
+        return device
+    return connection
+
+
+def get_connection_lock(device):
+    """Get the lock serializing every call over the connection of a device.
+
+    Commands run by the executor hold this lock, so code that talks to a device
+    outside the executor, e.g. a position poller, must hold it too.
+
+    Parameters
+    ----------
+    device : object
+        The device.
+
+    Returns
+    -------
+    lock : threading.RLock
+        The lock of the device connection.
+    """
+    key = get_command_queue_key(device)
+    with _executors_lock:
+        lock = _connection_locks.get(key)
+        if lock is None:
+            lock = threading.RLock()
+            _connection_locks[key] = lock
+        return lock
+
+
+def run_device_command(lock, command, *args, **kwargs):
+    """Run a device command while holding the lock of its connection.
+
+    Parameters
+    ----------
+    lock : threading.RLock
+        The lock of the device connection.
+    command : callable
+        The blocking command.
+    *args
+        Positional arguments of the command.
+    **kwargs
+        Keyword arguments of the command.
+
+    Returns
+    -------
+    result : object
+        The return value of the command.
+    """
+    with lock:
+        return command(*args, **kwargs)
+
+
+def get_device_executor(device):
+    """Get the command executor of a device.
+
+    Every device connection owns one worker thread. Commands submitted to the
+    same connection run one after another in submission order, while commands to
+    different connections run in parallel.
+
+    Parameters
+    ----------
+    device : object
+        The device.
+
+    Returns
+    -------
+    executor : concurrent.futures.ThreadPoolExecutor
+        The executor that runs the commands of this device.
+    """
+    key = get_command_queue_key(device)
+    with _executors_lock:
+        executor = _executors.get(key)
+        if executor is None:
+            executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix=f"{device.__class__.__name__}"
+            )
+            _executors[key] = executor
+        return executor
+
+
+def submit_device_command(device, command, *args, **kwargs):
+    """Run a device command in the background.
+
+    Parameters
+    ----------
+    device : object
+        The device the command talks to.
+    command : callable
+        The blocking command, e.g. a bound method of the device.
+    *args
+        Positional arguments of the command.
+    **kwargs
+        Keyword arguments of the command.
+
+    Returns
+    -------
+    future : concurrent.futures.Future
+        Resolves to the return value of the command, or to its exception.
+    """
+    return get_device_executor(device).submit(
+        run_device_command, get_connection_lock(device), command, *args, **kwargs
+    )
+
+
+def completed_future(result=None):
+    """Create a future that is already resolved.
+
+    Parameters
+    ----------
+    result : object, optional
+        The result of the future.
+
+    Returns
+    -------
+    future : concurrent.futures.Future
+        The resolved future.
+    """
+    future = Future()
+    future.set_result(result)
+    return future
+
+
+def wait_for_futures(futures, timeout=None):
+    """Wait for all device commands to finish.
+
+    Every future is waited on, even if an earlier one failed, so no device is
+    still busy when this function returns or raises.
+
+    Parameters
+    ----------
+    futures : iterable of concurrent.futures.Future
+        The pending device commands.
+    timeout : float, optional
+        Maximum time to wait for each command in seconds.
+
+    Returns
+    -------
+    results : list
+        The results of the commands, in the order of the futures.
+
+    Raises
+    ------
+    Exception
+        The first exception raised by any of the commands.
+    concurrent.futures.TimeoutError
+        If a command does not finish in time.
+    """
+    results = []
+    error = None
+    for future in futures:
+        try:
+            results.append(future.result(timeout))
+        except Exception as e:
+            logger.error(f"Device command failed: {e}")
+            results.append(None)
+            if error is None:
+                error = e
+    if error is not None:
+        raise error
+    return results
+
+
+def shutdown_device_executor(device):
+    """Stop the worker thread of a device connection.
+
+    Pending commands are finished first. Objects that can not own an executor
+    are ignored.
+
+    Parameters
+    ----------
+    device : object
+        The device.
+    """
+    key = get_command_queue_key(device)
+    with _executors_lock:
+        try:
+            executor = _executors.pop(key, None)
+        except TypeError:
+            return
+    if executor is not None:
+        executor.shutdown(wait=True)
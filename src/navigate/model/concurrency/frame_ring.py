@@ -0,0 +1,200 @@
+# Copyright (c) 2021-2024  The University of Texas Southwestern Medical Center.
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted for academic and research use only
+# (subject to the limitations in the disclaimer below)
+# provided that the following conditions are met:
+
+#      * Redistributions of source code must retain the above copyright notice,
+#      this list of conditions and the following disclaimer.
+
+#      * Redistributions in binary form must reproduce the above copyright
+#      notice, this list of conditions and the following disclaimer in the
+#      documentation and/or other materials provided with the distribution.
+
+#      * Neither the name of the copyright holders nor the names of its
+#      contributors may be used to endorse or promote products derived from this
+#      software without specific prior written permission.
+
+# NO EXPRESS OR IMPLIED LICENSES TO ANY PARTY'S PATENT RIGHTS ARE GRANTED BY
+# THIS LICENSE. THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND
+# CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A
+# PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR
+# BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER
+# IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+#
+
+# Standard Library Imports
+import time
+import multiprocessing as mp
+
+# Third Party Imports
+import numpy as np
+
+# Local Imports
+from navigate.model.concurrency.concurrency_tools import SharedNDArray
+
+
+class FrameRing:
+    """A shared-memory ring of published frame records.
+
+    The data thread publishes one record per batch of acquired frames. Readers,
+    e.g. the camera views, only ever want the newest frame, so they read the record
+    at the cursor instead of receiving every frame id through a pipe. A pipe is only
+    used to wake up a waiting reader, and at most one wakeup is pending at a time.
+
+    Row 0 of the shared array is a header holding the cursor (the sequence number of
+    the newest record), the stopped flag and the pending-wakeup flag. Each record
+    row holds the sequence number, the data buffer slot, the timestamp, the stage
+    position (x, y, z, theta, f) and the channel. A record is valid if its sequence
+    number is unchanged before and after it is read.
+    """
+
+    #: tuple: The fields of a record.
+    fields = ("sequence", "slot", "timestamp", "x", "y", "z", "theta", "f", "channel")
+
+    def __init__(self, capacity=16):
+        """Initialize the FrameRing.
+
+        Parameters
+        ----------
+        capacity : int
+            The number of records kept in the ring.
+        """
+        #: int: The number of records kept in the ring.
+        self.capacity = capacity
+
+        #: SharedNDArray: The header and the records.
+        self.records = SharedNDArray(
+            shape=(capacity + 1, len(self.fields)), dtype=float
+        )
+        self.records[:] = 0
+        self.records[1:, 0] = -1
+
+        reader_connection, writer_connection = mp.Pipe(duplex=False)
+
+        #: multiprocessing.connection.Connection: The end used to wait for wakeups.
+        self.reader_connection = reader_connection
+
+        #: multiprocessing.connection.Connection: The end used to send wakeups.
+        self.writer_connection = writer_connection
+
+    @property
+    def sequence(self):
+        """int: The sequence number of the newest record, 0 if none."""
+        return int(self.records[0, 0])
+
+    @property
+    def stopped(self):
+        """bool: Whether the writer stopped publishing."""
+        return bool(self.records[0, 1])
+
+    def reset(self):
+        """Prepare the ring for a new acquisition.
+
+        Sequence numbers keep increasing, so readers can tell old records apart.
+        """
+        self.records[0, 1] = 0
+        self.records[0, 2] = 0
+
+    def publish(self, slot, position=None, channel=0):
+        """Publish the newest frame and wake up a waiting reader.
+
+        Parameters
+        ----------
+        slot : int
+            The index of the frame in the data buffer.
+        position : array_like, optional
+            The stage position (x, y, z, theta, f) of the frame.
+        channel : int, optional
+            The channel of the frame.
+
+        Returns
+        -------
+        sequence : int
+            The sequence number of the record.
+        """
+        sequence = self.sequence + 1
+        row = self.records[(sequence - 1) % self.capacity + 1]
+        # invalidate the row while writing it
+        row[0] = -1
+        row[1] = slot
+        row[2] = time.time()
+        row[3:8] = position if position is not None else 0
+        row[8] = channel
+        row[0] = sequence
+        self.records[0, 0] = sequence
+        if not self.records[0, 2]:
+            self.records[0, 2] = 1
+            self.wakeup()
+        return sequence
+
+    def stop(self):
+        """Mark the end of the acquisition and wake up a waiting reader."""
+        self.records[0, 1] = 1
+        self.wakeup()
+
+    def wakeup(self):
+        """Wake up a waiting reader."""
+        try:
+            self.writer_connection.send_bytes(b"\x01")
+        except (OSError, ValueError):
+            # the reader is gone
+            pass
+
+    def wait(self, timeout=None):
+        """Wait until a frame is published or the writer stopped.
+
+        Parameters
+        ----------
+        timeout : float, optional
+            The maximum time to wait in seconds. Waits forever if None.
+
+        Returns
+        -------
+        woken : bool
+            False if the wait timed out.
+        """
+        if not self.reader_connection.poll(timeout):
+            return False
+        while self.reader_connection.poll():
+            self.reader_connection.recv_bytes()
+        # clear the flag before the cursor is read, so no frame can be missed
+        self.records[0, 2] = 0
+        return True
+
+    def latest(self):
+        """Read the newest record.
+
+        Returns
+        -------
+        record : dict or None
+            The record, or None if nothing was published yet.
+        """
+        while True:
+            sequence = self.sequence
+            if sequence == 0:
+                return None
+            row = self.records[(sequence - 1) % self.capacity + 1]
+            values = np.array(row)
+            if row[0] == values[0] == sequence:
+                break
+        return {
+            "sequence": sequence,
+            "slot": int(values[1]),
+            "timestamp": values[2],
+            "position": dict(zip(("x", "y", "z", "theta", "f"), values[3:8])),
+            "channel": int(values[8]),
+        }
+
+    def close(self):
+        """Close both ends of the wakeup pipe."""
+        self.reader_connection.close()
+        self.writer_connection.close()
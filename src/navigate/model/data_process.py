@@ -0,0 +1,348 @@
+# Copyright (c) 2021-2024  The University of Texas Southwestern Medical Center.
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted for academic and research use only
+# (subject to the limitations in the disclaimer below)
+# provided that the following conditions are met:
+
+#      * Redistributions of source code must retain the above copyright notice,
+#      this list of conditions and the following disclaimer.
+
+#      * Redistributions in binary form must reproduce the above copyright
+#      notice, this list of conditions and the following disclaimer in the
+#      documentation and/or other materials provided with the distribution.
+
+#      * Neither the name of the copyright holders nor the names of its
+#      contributors may be used to endorse or promote products derived from this
+#      software without specific prior written permission.
+
+# NO EXPRESS OR IMPLIED LICENSES TO ANY PARTY'S PATENT RIGHTS ARE GRANTED BY
+# THIS LICENSE. THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND
+# CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A
+# PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR
+# BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER
+# IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+# Standard Library Imports
+import logging
+import multiprocessing as mp
+from types import SimpleNamespace
+
+# Third Party Imports
+import psutil
+
+# Local Imports
+from navigate.model.features.image_writer import ImageWriter
+
+# Logger Setup
+p = __name__.split(".")[1]
+logger = logging.getLogger(p)
+
+
+def set_cpu_affinity(cpu_affinity):
+    """Pin the current process to a set of CPU cores.
+
+    Parameters
+    ----------
+    cpu_affinity : list of int
+        Indices of the CPU cores. An empty list leaves the affinity unchanged.
+
+    Returns
+    -------
+    bool
+        True if the affinity was changed.
+    """
+    if not cpu_affinity:
+        return False
+    try:
+        psutil.Process().cpu_affinity(list(cpu_affinity))
+    except (AttributeError, ValueError, psutil.Error) as e:
+        # cpu_affinity() is not available on macOS.
+        logger.warning(f"Unable to set CPU affinity {cpu_affinity}: {e}")
+        return False
+    logger.info(f"CPU affinity set to {cpu_affinity}")
+    return True
+
+
+def get_data_process_setting(configuration):
+    """Get the data process setting from the configuration.
+
+    Parameters
+    ----------
+    configuration : dict
+        The navigate configuration.
+
+    Returns
+    -------
+    dict
+        The 'enabled', 'cpu_affinity' and 'model_cpu_affinity' settings.
+    """
+    setting = configuration["configuration"].get("data_process", None) or {}
+    return {
+        "enabled": bool(setting.get("enabled", False)),
+        "cpu_affinity": list(setting.get("cpu_affinity", None) or []),
+        "model_cpu_affinity": list(setting.get("model_cpu_affinity", None) or []),
+    }
+
+
+class DataProcessContext:
+    """The part of the model an ImageWriter uses, rebuilt in the data process.
+
+    Setting `stop_acquisition` is reported back to the model.
+    """
+
+    def __init__(
+        self,
+        configuration,
+        data_buffer,
+        data_buffer_positions,
+        number_of_frames,
+        event_queue,
+        microscope_name,
+        current_channel,
+    ):
+        """Initialize the DataProcessContext.
+
+        Parameters
+        ----------
+        configuration : dict
+            The shared navigate configuration.
+        data_buffer : [SharedNDArray]
+            The data buffer of the model.
+        data_buffer_positions : SharedNDArray
+            The stage positions of the frames in the data buffer.
+        number_of_frames : int
+            The number of frames in the data buffer.
+        event_queue : multiprocessing.Queue
+            The event queue of the model.
+        microscope_name : str
+            The name of the active microscope.
+        current_channel : int
+            The current channel of the active microscope.
+        """
+        #: dict: The shared navigate configuration.
+        self.configuration = configuration
+        #: [SharedNDArray]: The data buffer of the model.
+        self.data_buffer = data_buffer
+        #: SharedNDArray: The stage positions of the frames in the data buffer.
+        self.data_buffer_positions = data_buffer_positions
+        #: int: The number of frames in the data buffer.
+        self.number_of_frames = number_of_frames
+        #: multiprocessing.Queue: The event queue of the model.
+        self.event_queue = event_queue
+        #: str: The name of the active microscope.
+        self.active_microscope_name = microscope_name
+        #: SimpleNamespace: Stands in for the active microscope.
+        self.active_microscope = SimpleNamespace(current_channel=current_channel)
+        #: bool: Whether a frame consumer asked to stop the acquisition.
+        self.stop_acquisition = False
+
+
+def run_data_process(connection, context, saving_config, cpu_affinity):
+    """The main function of the data process.
+
+    Receives lists of frame ids, saves the frames, and acknowledges each list so
+    the model knows the data buffer slots can be reused. A None message ends the
+    process.
+
+    Parameters
+    ----------
+    connection : multiprocessing.connection.Connection
+        The data process end of the pipe.
+    context : DataProcessContext
+        The model state the ImageWriter needs.
+    saving_config : dict
+        Saving configuration passed to the ImageWriter.
+    cpu_affinity : list of int
+        The CPU cores of the data process.
+    """
+    set_cpu_affinity(cpu_affinity)
+    image_writer = None
+    stop_reported = False
+    try:
+        image_writer = ImageWriter(context, saving_config=saving_config)
+        while True:
+            frame_ids = connection.recv()
+            if frame_ids is None:
+                break
+            if not context.stop_acquisition:
+                image_writer.save_image(frame_ids)
+            if context.stop_acquisition and not stop_reported:
+                connection.send(("stop", None))
+                stop_reported = True
+            connection.send(("done", len(frame_ids)))
+    except Exception as e:
+        logger.error(f"Data process stopped because of an error: {e}")
+        context.event_queue.put(("warning", f"Error - Data Process: {e}"))
+        if not stop_reported:
+            connection.send(("stop", None))
+    finally:
+        if image_writer is not None:
+            image_writer.close()
+        connection.send(("closed", None))
+        connection.close()
+
+
+class DataProcess:
+    """Saves frames in a separate process.
+
+    The signal and data threads of the model share one GIL, so writing frames and
+    computing MIPs in the data thread delays the hardware. A DataProcess runs the
+    ImageWriter in its own process. It reads the frames from the shared data buffer,
+    and the model only sends it frame ids over a pipe.
+
+    It can be used in place of an ImageWriter: `save_image` sends the frame ids and
+    returns, and `close` waits until every frame is saved. At most half of the data
+    buffer is in flight, so the camera never overwrites a frame that has not been
+    saved yet.
+    """
+
+    def __init__(self, model, saving_flags=None, saving_config={}, cpu_affinity=[]):
+        """Initialize and start the DataProcess.
+
+        Parameters
+        ----------
+        model : navigate.model.model.Model
+            Navigate Model class for controlling hardware/acquisition.
+        saving_flags : list, optional
+            Saving flags of the data buffer. Only flagged frames are sent.
+        saving_config : dict, optional
+            Saving configuration passed to the ImageWriter.
+        cpu_affinity : list of int, optional
+            The CPU cores of the data process.
+        """
+        #: navigate.model.model.Model: Navigate Model class.
+        self.model = model
+
+        #: list: Saving flags of the data buffer.
+        self.saving_flags = saving_flags
+
+        #: int: Maximum number of frames sent but not yet saved.
+        self.max_pending_frames = max(1, model.number_of_frames // 2)
+
+        #: int: Number of frames sent but not yet saved.
+        self.pending_frames = 0
+
+        #: bool: Whether the data process has been closed.
+        self.is_closed = False
+
+        #: bool: Whether the data process is still accepting frames.
+        self.is_running = True
+
+        context = DataProcessContext(
+            model.configuration,
+            model.data_buffer,
+            model.data_buffer_positions,
+            model.number_of_frames,
+            model.event_queue,
+            model.active_microscope_name,
+            model.active_microscope.current_channel,
+        )
+        #: multiprocessing.connection.Connection: The model end of the pipe.
+        self.connection, child_connection = mp.Pipe()
+
+        #: multiprocessing.Process: The data process.
+        self.process = mp.Process(
+            target=run_data_process,
+            args=(child_connection, context, saving_config, cpu_affinity),
+            name="Data Process",
+            daemon=True,
+        )
+        self.process.start()
+        child_connection.close()
+
+    def save_image(self, frame_ids):
+        """Send frames to the data process.
+
+        Parameters
+        ----------
+        frame_ids : list
+            Indices into the data buffer.
+        """
+        if self.is_closed or not self.is_running:
+            return
+        if self.saving_flags:
+            flagged_ids = []
+            for idx in frame_ids:
+                if self.saving_flags[idx]:
+                    self.saving_flags[idx] = False
+                    flagged_ids.append(idx)
+            frame_ids = flagged_ids
+        if not frame_ids:
+            self.receive_results(wait=False)
+            return
+        self.receive_results(wait=False)
+        while (
+            self.pending_frames > 0
+            and self.pending_frames + len(frame_ids) > self.max_pending_frames
+        ):
+            if not self.receive_results(wait=True) or self.model.stop_acquisition:
+                return
+        self.connection.send(list(frame_ids))
+        self.pending_frames += len(frame_ids)
+
+    def receive_results(self, wait=False, timeout=1.0):
+        """Handle the results sent back by the data process.
+
+        Parameters
+        ----------
+        wait : bool, optional
+            Whether to wait for a result.
+        timeout : float, optional
+            Maximum time in seconds to wait for a result.
+
+        Returns
+        -------
+        bool
+            False if the data process ended, otherwise True.
+        """
+        try:
+            if wait and not self.connection.poll(timeout):
+                self.is_running = self.process.is_alive()
+                return self.is_running
+            while self.connection.poll():
+                result, value = self.connection.recv()
+                if result == "done":
+                    self.pending_frames -= value
+                elif result == "stop":
+                    self.model.stop_acquisition = True
+                elif result == "closed":
+                    self.is_running = False
+        except (EOFError, OSError):
+            self.is_running = False
+        return self.is_running
+
+    def close(self, timeout=60.0):
+        """Save the remaining frames and end the data process.
+
+        Parameters
+        ----------
+        timeout : float, optional
+            Maximum time in seconds to wait for the data process.
+        """
+        if self.is_closed:
+            return
+        self.is_closed = True
+        try:
+            if self.is_running:
+                self.connection.send(None)
+            while self.is_running and self.connection.poll(timeout):
+                result, value = self.connection.recv()
+                if result == "stop":
+                    self.model.stop_acquisition = True
+                elif result == "closed":
+                    self.is_running = False
+        except (EOFError, OSError):
+            pass
+        self.process.join(timeout)
+        if self.process.is_alive():
+            logger.warning("Data process did not end. Terminating it.")
+            self.process.terminate()
+        self.connection.close()
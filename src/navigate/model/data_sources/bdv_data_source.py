@@ -155,7 +155,7 @@ class BigDataViewerDataSource(PyramidalDataSource):
         if not (z or c or t or p):
             self.setup()
 
-        ds_name = self.ds_name(t, c, p)
+        ds_name = self.ds_name(t, c, self.metadata.table_position(p))
         is_kw = len(kw) > 0
         for i in range(self.subdivisions.shape[0]):
             dx, dy, dz = self.resolutions[i, ...]
@@ -250,7 +250,8 @@ class TiffDataSource(DataSource):
 
         if self.metadata._multiposition:
             position_directory = os.path.join(
-                self.save_directory, f"Position{self._current_position}"
+                self.save_directory,
+                f"Position{self.metadata.table_position(self._current_position)}",
             )
         else:
             position_directory = self.save_directory
@@ -148,6 +148,7 @@ class OMEZarrDataSource(PyramidalDataSource):
         c, z, t, p = self._cztp_indices(
             self._current_frame, self.metadata.per_stack
         )  # find current channel
+        p = self.metadata.table_position(p)
 
         if self._current_position != p:
             self._current_position = p
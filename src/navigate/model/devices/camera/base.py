@@ -40,6 +40,7 @@ import tifffile
 # Local Imports
 from navigate.config import get_navigate_path
 from navigate.tools.decorators import log_initialization
+from navigate.model.devices.device_state import ARGUMENT, DeviceStateMixin
 
 # Logger Setup
 p = __name__.split(".")[1]
@@ -47,9 +48,20 @@ logger = logging.getLogger(p)
 
 
 @log_initialization
-class CameraBase:
+class CameraBase(DeviceStateMixin):
     """CameraBase - Parent camera class."""
 
+    #: dict: Commands that are skipped when the camera is already in that state.
+    #: Changing the sensor mode, readout, binning or ROI may reset the timing.
+    cached_commands = {
+        "set_exposure_time": ("exposure_time", ARGUMENT, ()),
+        "set_line_interval": ("line_interval", ARGUMENT, ()),
+        "set_sensor_mode": (None, None, ("exposure_time", "line_interval")),
+        "set_readout_direction": (None, None, ("exposure_time", "line_interval")),
+        "set_binning": (None, None, ("exposure_time", "line_interval")),
+        "set_ROI": (None, None, ("exposure_time", "line_interval")),
+    }
+
     def __init__(self, microscope_name, device_connection, configuration):
         """Initialize CameraBase class.
 
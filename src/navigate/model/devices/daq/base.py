@@ -34,9 +34,11 @@
 import logging
 
 # Third Party Imports
+import numpy as np
 
 # Local Imports
-from navigate.model.waveforms import camera_exposure
+from navigate.config.config import get_configuration_snapshot
+from navigate.model.waveforms import camera_exposure, waveform_cache
 from navigate.tools.decorators import log_initialization
 
 # Logger Setup
@@ -99,6 +101,23 @@ class DAQBase:
         #: int: Number of times to expand the waveform
         self.waveform_expand_num = 1
 
+        #: dict: Analog outputs and their waveforms.
+        self.analog_outputs = {}
+
+        #: list: Channel keys played back to back in one DAQ program, or None to
+        #: play one channel per program.
+        self.channel_sequence = None
+
+        #: dict: Laser lines driven by a channel sequence, and the value of each
+        #: line during the exposure of each channel.
+        self.sequence_outputs = {}
+
+        #: bool: Replay the channel sequence on every external trigger.
+        self.sequence_retriggerable = False
+
+        #: bool: The tasks regenerate their waveforms until they are stopped.
+        self.continuous = False
+
     def __str__(self) -> str:
         """Returns the string representation of the DAQBase class"""
         return "DAQBase"
@@ -127,7 +146,8 @@ class DAQBase:
         self.waveform_dict = dict.fromkeys(self.waveform_dict, None)
         self.enable_microscope(microscope_name)
 
-        microscope_state = self.configuration["experiment"]["MicroscopeState"]
+        configuration = get_configuration_snapshot(self.configuration)
+        microscope_state = configuration["experiment"]["MicroscopeState"]
 
         # Iterate through the dictionary.
         for channel_key in microscope_state["channels"].keys():
@@ -140,11 +160,20 @@ class DAQBase:
                 sweep_time = sweep_times[channel_key]
 
                 # Create 5V TTL for 1 camera exposure.
-                self.waveform_dict[channel_key] = camera_exposure(
-                    sample_rate=self.sample_rate,
-                    sweep_time=sweep_time,
-                    exposure=exposure_time,
-                    camera_delay=self.camera_delay,
+                self.waveform_dict[channel_key] = waveform_cache.get(
+                    (
+                        "camera_exposure",
+                        self.sample_rate,
+                        sweep_time,
+                        exposure_time,
+                        self.camera_delay,
+                    ),
+                    lambda: camera_exposure(
+                        sample_rate=self.sample_rate,
+                        sweep_time=sweep_time,
+                        exposure=exposure_time,
+                        camera_delay=self.camera_delay,
+                    ),
                 )
 
         return self.waveform_dict
@@ -167,3 +196,194 @@ class DAQBase:
         self.sample_rate = self.configuration["configuration"]["microscopes"][
             microscope_name
         ]["daq"]["sample_rate"]
+
+    def close_tasks(self):
+        """Close the tasks that are kept open between acquisitions."""
+        pass
+
+    def start_continuous_acquisition(self):
+        """Play the waveforms of the current channel until stopped.
+
+        Returns
+        -------
+        result : bool
+            True if the DAQ is running. DAQs that can not regenerate their
+            waveforms return False, and each frame is a run_acquisition() again.
+        """
+        return False
+
+    def stop_continuous_acquisition(self):
+        """Stop playing the waveforms of the current channel."""
+        self.continuous = False
+
+    def get_analog_output_waveforms(self, channel_key):
+        """Assemble the analog output buffer of each board for one channel.
+
+        Waveforms that cover a single sweep are repeated waveform_expand_num times,
+        waveforms that already cover all expanded sweeps (e.g., a z-stack staircase)
+        are written as they are.
+
+        Parameters
+        ----------
+        channel_key : str
+            Channel key for analog output.
+
+        Returns
+        -------
+        board_waveforms : dict
+            For each board, a tuple of the analog output channels and the samples
+            to write, one row per channel.
+        """
+        n_sample = int(self.sample_rate * self.sweep_times[channel_key])
+        max_sample = n_sample * self.waveform_expand_num
+
+        board_waveforms = {}
+        boards = list(set([x.split("/")[0] for x in self.analog_outputs.keys()]))
+        for board in boards:
+            channels = [
+                x for x in self.analog_outputs.keys() if x.split("/")[0] == board
+            ]
+            # TODO: may change this later to automatically expand the waveform to the
+            #  longest
+            for k in channels:
+                v = self.analog_outputs[k]
+                if len(v["waveform"][channel_key]) < max_sample:
+                    v["waveform"][channel_key] = np.hstack(
+                        [v["waveform"][channel_key]] * self.waveform_expand_num
+                    )
+            waveforms = np.vstack(
+                [
+                    self.analog_outputs[k]["waveform"][channel_key][:max_sample]
+                    for k in channels
+                ]
+            ).squeeze()
+            board_waveforms[board] = (channels, waveforms)
+        return board_waveforms
+
+    def get_camera_pulse_times(self, channel_key):
+        """Get the high and low time of the camera trigger pulses of a channel.
+
+        Parameters
+        ----------
+        channel_key : str
+            Channel key.
+
+        Returns
+        -------
+        high_time : float
+            Duration of the trigger pulse in seconds.
+        low_time : float
+            Time between two trigger pulses in seconds.
+        """
+        if self.analog_outputs or self.channel_sequence:
+            high_time = 0.004
+            low_time = self.sweep_times[channel_key] - high_time
+        elif self.waveform_repeat_num * self.waveform_expand_num == 1:
+            # if no ao tasks, let the camera task occupy the full sweep time
+            high_time = self.sweep_times[channel_key] - self.camera_delay
+            low_time = 0.004
+        else:
+            high_time = self.sweep_times[channel_key] - 0.004
+            low_time = 0.004
+        return high_time, low_time
+
+    def set_channel_sequence(
+        self, channel_keys=None, laser_outputs=None, retriggerable=False
+    ):
+        """Play the waveforms of several channels back to back in one DAQ program.
+
+        Once set, prepare_acquisition() loads every channel of the sequence, and one
+        run_acquisition() triggers one frame per channel (times the waveform
+        template). Lasers are switched by the DAQ during the exposure of each
+        channel instead of by the software.
+
+        Parameters
+        ----------
+        channel_keys : list, optional
+            Channel keys in the order they are played. None plays one channel per
+            DAQ program again.
+        laser_outputs : dict, optional
+            The value of each laser line during the exposure of each channel, e.g.
+            {"PXI6733/port0/line2": {"channel_1": True},
+            "PXI6733/ao0": {"channel_1": 2.5}}. Digital lines are low and analog
+            lines are at 0 V outside of these exposures.
+        retriggerable : bool
+            Replay the sequence on every external trigger.
+        """
+        self.channel_sequence = list(channel_keys) if channel_keys else None
+        if self.channel_sequence is None:
+            self.sequence_outputs = {}
+            self.sequence_retriggerable = False
+            return
+        self.sequence_outputs = {
+            line: dict(values) for line, values in (laser_outputs or {}).items()
+        }
+        self.sequence_retriggerable = retriggerable
+
+    def get_sequence_waveforms(self):
+        """Assemble the buffers of the channel sequence.
+
+        The analog output waveforms of each channel are concatenated in the order
+        of the sequence. Laser lines are on during the camera exposure of the
+        channels they belong to.
+
+        Returns
+        -------
+        analog_waveforms : dict
+            For each board, a tuple of the analog output channels and the samples
+            to write, one row per channel.
+        digital_waveforms : dict
+            For each board, a tuple of the digital output lines and their samples,
+            one row per line.
+        camera_pulses : list
+            The (high time, low time) of every camera trigger pulse.
+        """
+        analog_rows = {}
+        digital_rows = {}
+        camera_pulses = []
+
+        for channel_key in self.channel_sequence:
+            n_sample = int(self.sample_rate * self.sweep_times[channel_key])
+            exposure = np.resize(
+                np.asarray(self.waveform_dict[channel_key]) > 0, n_sample
+            )
+            exposure = np.tile(exposure, self.waveform_expand_num)
+
+            if self.analog_outputs:
+                board_waveforms = self.get_analog_output_waveforms(channel_key)
+                for board, (channels, waveforms) in board_waveforms.items():
+                    for line, row in zip(channels, np.atleast_2d(waveforms)):
+                        analog_rows.setdefault(board, {}).setdefault(line, [])
+                        analog_rows[board][line].append(row)
+
+            for line, values in self.sequence_outputs.items():
+                board = line.split("/")[0]
+                if "/ao" in line:
+                    row = np.where(exposure, float(values.get(channel_key, 0)), 0.0)
+                    rows = analog_rows
+                else:
+                    row = exposure & bool(values.get(channel_key, False))
+                    rows = digital_rows
+                rows.setdefault(board, {}).setdefault(line, []).append(row)
+
+            camera_pulses += [
+                self.get_camera_pulse_times(channel_key)
+            ] * self.waveform_expand_num
+
+        def assemble(rows):
+            return {
+                board: (
+                    list(lines.keys()),
+                    np.tile(
+                        np.vstack([np.hstack(row) for row in lines.values()]),
+                        self.waveform_repeat_num,
+                    ).squeeze(),
+                )
+                for board, lines in rows.items()
+            }
+
+        return (
+            assemble(analog_rows),
+            assemble(digital_rows),
+            camera_pulses * self.waveform_repeat_num,
+        )
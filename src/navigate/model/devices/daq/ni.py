@@ -40,6 +40,7 @@ import time
 import nidaqmx
 import nidaqmx.constants
 import nidaqmx.task
+from nidaqmx.types import CtrTime
 import numpy as np
 
 # Local Imports
@@ -91,6 +92,19 @@ class NIDAQ(DAQBase):
         #: dict: NI DAQmx tasks for analog output.
         self.analog_output_tasks = {}
 
+        #: dict: NI DAQmx tasks for the digital laser lines of a channel sequence.
+        self.digital_output_tasks = {}
+
+        #: dict: NI DAQmx tasks kept open between channels and acquisitions, by
+        #: their type, physical channels and timing.
+        self.task_pool = {}
+
+        #: dict: The timing and channel settings of each pooled task.
+        self.task_settings = {}
+
+        #: dict: The samples in the buffer of each pooled task.
+        self.task_samples = {}
+
         #: float: Number of samples.
         self.n_sample = None
 
@@ -109,8 +123,8 @@ class NIDAQ(DAQBase):
 
     def __del__(self):
         """Destructor."""
-        if self.camera_trigger_task is not None:
-            self.stop_acquisition()
+        if self.task_pool:
+            self.close_tasks()
 
     def set_external_trigger(self, external_trigger=None):
         """Set trigger mode.
@@ -156,6 +170,9 @@ class NIDAQ(DAQBase):
                 self.analog_output_tasks[
                     board_name
                 ].triggers.start_trigger.cfg_dig_edge_start_trig(trigger_source)
+                self.analog_output_tasks[
+                    board_name
+                ].triggers.start_trigger.retriggerable = False
                 try:
                     self.analog_output_tasks[board_name].register_done_event(None)
                 except Exception:
@@ -163,11 +180,10 @@ class NIDAQ(DAQBase):
                         f"Error Registering Done Event: {traceback.format_exc()}"
                     )
         else:
-            # close master trigger task
+            # stop master trigger task, it stays in the task pool
             if self.master_trigger_task:
                 try:
                     self.master_trigger_task.stop()
-                    self.master_trigger_task.close()
                 except Exception:
                     logger.debug(
                         f"Error stopping master trigger task: "
@@ -179,8 +195,10 @@ class NIDAQ(DAQBase):
                 self.external_trigger
             )
 
-            # change camera task to so that it can be triggered again.
-            self.camera_trigger_task.triggers.start_trigger.retriggerable = False
+            # a channel sequence can replay on every external trigger
+            self.camera_trigger_task.triggers.start_trigger.retriggerable = (
+                self.sequence_retriggerable
+            )
 
             # add callback function to analog tasks
             for board_name in self.analog_output_tasks.keys():
@@ -189,7 +207,11 @@ class NIDAQ(DAQBase):
                     self.external_trigger
                 )
                 task.register_done_event(None)
-                task.register_done_event(self.restart_analog_task_callback_func(task))
+                task.triggers.start_trigger.retriggerable = self.sequence_retriggerable
+                if not self.sequence_retriggerable:
+                    task.register_done_event(
+                        self.restart_analog_task_callback_func(task)
+                    )
 
     def wait_for_external_trigger(
         self, trigger_channel, wait_internal=0.001, timeout=-1
@@ -276,48 +298,311 @@ class NIDAQ(DAQBase):
         channel_key : str
             Channel key for current channel.
         """
-        self.camera_trigger_task = nidaqmx.Task()
         camera_trigger_out_line = self.configuration["configuration"]["microscopes"][
             self.microscope_name
         ]["daq"]["camera_trigger_out_line"]
-
+        camera_high_time, camera_low_time = self.get_camera_pulse_times(channel_key)
         # apply waveform templates
         camera_waveform_repeat_num = self.waveform_repeat_num * self.waveform_expand_num
 
-        if self.analog_outputs:
-            camera_high_time = 0.004
-            camera_low_time = self.sweep_times[channel_key] - camera_high_time
-        elif camera_waveform_repeat_num == 1:
-            # if no ao tasks, let the camera task occupy the full sweep time
-            camera_high_time = self.sweep_times[channel_key] - self.camera_delay
-            camera_low_time = 0.004
+        key = ("co", camera_trigger_out_line, "pulse")
+        self.camera_trigger_task = self.get_task(
+            key,
+            lambda task: task.co_channels.add_co_pulse_chan_time(
+                camera_trigger_out_line,
+                high_time=camera_high_time,
+                low_time=camera_low_time,
+                initial_delay=self.camera_delay,
+            ),
+        )
+        self.configure_task(
+            key,
+            (
+                camera_high_time,
+                camera_low_time,
+                self.camera_delay,
+                camera_waveform_repeat_num,
+                self.continuous,
+            ),
+            lambda task: self.configure_camera_task(
+                task,
+                camera_high_time,
+                camera_low_time,
+                camera_waveform_repeat_num,
+            ),
+        )
+
+    def configure_camera_task(self, task, high_time, low_time, number_of_pulses):
+        """Set the pulses of a camera trigger task.
+
+        Parameters
+        ----------
+        task : nidaqmx.Task
+            Camera trigger task.
+        high_time : float
+            Duration of the trigger pulses in seconds.
+        low_time : float
+            Time between two trigger pulses in seconds.
+        number_of_pulses : int
+            Number of trigger pulses. In continuous mode, the pulses are repeated
+            until the task is stopped.
+        """
+        channel = task.co_channels[0]
+        channel.co_pulse_high_time = high_time
+        channel.co_pulse_low_time = low_time
+        channel.co_pulse_time_initial_delay = self.camera_delay
+        task.timing.cfg_implicit_timing(
+            sample_mode=self.get_sample_mode(),
+            samps_per_chan=number_of_pulses,
+        )
+
+    def get_sample_mode(self):
+        """Get the sample mode of the tasks.
+
+        Returns
+        -------
+        sample_mode : nidaqmx.constants.AcquisitionType
+            CONTINUOUS while the tasks regenerate until stopped, FINITE otherwise.
+        """
+        if self.continuous:
+            return nidaqmx.constants.AcquisitionType.CONTINUOUS
+        return nidaqmx.constants.AcquisitionType.FINITE
+
+    def get_task(self, key, add_channels):
+        """Get a task from the task pool, or create it.
+
+        Creating a task and adding its channels takes tens of milliseconds, so tasks
+        are kept open between channels and acquisitions. A pooled task is only
+        reconfigured, and its buffer only rewritten, when its timing or its samples
+        change.
+
+        Parameters
+        ----------
+        key : tuple
+            The type, the physical channels and the timing of the task.
+        add_channels : function
+            Adds the physical channels to a new task.
+
+        Returns
+        -------
+        task : nidaqmx.Task
+            The task.
+        """
+        task = self.task_pool.get(key)
+        if task is None:
+            task = nidaqmx.Task()
+            add_channels(task)
+            self.task_pool[key] = task
+            logger.debug(f"Created DAQ task {key}")
+        return task
+
+    def configure_task(self, key, settings, configure):
+        """Configure a pooled task, unless it already has these settings.
+
+        Reconfiguring the timing of a task may reallocate its buffer, so the samples
+        are written again afterwards.
+
+        Parameters
+        ----------
+        key : tuple
+            The key of the task in the task pool.
+        settings : tuple
+            The settings applied by configure.
+        configure : function
+            Configures the task, which is passed as its argument.
+        """
+        if self.task_settings.get(key) == settings:
+            return
+        configure(self.task_pool[key])
+        self.task_settings[key] = settings
+        self.task_samples.pop(key, None)
+
+    def write_task(self, key, samples):
+        """Write samples to a pooled task, unless they are already in its buffer.
+
+        Parameters
+        ----------
+        key : tuple
+            The key of the task in the task pool.
+        samples : numpy.ndarray
+            The samples, one row per channel. For a counter task, the (high time,
+            low time) of every pulse.
+        """
+        written = self.task_samples.get(key)
+        if written is not None and np.array_equal(written, samples):
+            return
+        task = self.task_pool[key]
+        if key[0] == "co":
+            task.write(
+                [
+                    CtrTime(high_time=high_time, low_time=low_time)
+                    for high_time, low_time in samples
+                ]
+            )
+        elif key[0] == "do":
+            task.write(np.asarray(samples).tolist())
         else:
-            camera_high_time = self.sweep_times[channel_key] - 0.004
-            camera_low_time = 0.004
-
-        self.camera_trigger_task.co_channels.add_co_pulse_chan_time(
-            camera_trigger_out_line,
-            high_time=camera_high_time,
-            low_time=camera_low_time,
-            initial_delay=self.camera_delay,
+            task.write(samples)
+        self.task_samples[key] = np.array(samples, copy=True)
+
+    def get_task_key(self, task):
+        """Get the key of a task in the task pool.
+
+        Parameters
+        ----------
+        task : nidaqmx.Task
+            The task.
+
+        Returns
+        -------
+        key : tuple
+            The key of the task, or None if the task is not pooled.
+        """
+        for key, pooled_task in self.task_pool.items():
+            if pooled_task is task:
+                return key
+        return None
+
+    def close_task(self, key):
+        """Close a pooled task and remove it from the task pool.
+
+        Parameters
+        ----------
+        key : tuple
+            The key of the task in the task pool.
+        """
+        task = self.task_pool.pop(key, None)
+        self.task_settings.pop(key, None)
+        self.task_samples.pop(key, None)
+        if task is None:
+            return
+        try:
+            task.stop()
+            task.close()
+        except Exception:
+            logger.debug(f"Could not close DAQ task {key}: {traceback.format_exc()}")
+
+    def close_tasks(self):
+        """Close all tasks in the task pool."""
+        for key in list(self.task_pool.keys()):
+            self.close_task(key)
+        self.camera_trigger_task = None
+        self.master_trigger_task = None
+        self.analog_output_tasks = {}
+        self.digital_output_tasks = {}
+
+    def create_sequence_tasks(self):
+        """Create the tasks that play every channel of the channel sequence.
+
+        The camera counter task writes one pulse per frame, so every channel keeps
+        its own sweep time. The analog output tasks play the waveforms of all
+        channels back to back, and the laser blanking lines are written to one
+        digital output task per board, clocked by the analog output sample clock
+        of that board.
+        """
+        (
+            analog_waveforms,
+            digital_waveforms,
+            camera_pulses,
+        ) = self.get_sequence_waveforms()
+
+        camera_trigger_out_line = self.configuration["configuration"]["microscopes"][
+            self.microscope_name
+        ]["daq"]["camera_trigger_out_line"]
+        key = ("co", camera_trigger_out_line, "sequence")
+        self.camera_trigger_task = self.get_task(
+            key,
+            lambda task: task.co_channels.add_co_pulse_chan_time(
+                camera_trigger_out_line,
+                high_time=camera_pulses[0][0],
+                low_time=camera_pulses[0][1],
+                initial_delay=self.camera_delay,
+            ),
         )
+        self.configure_task(
+            key,
+            (self.camera_delay, len(camera_pulses), self.continuous),
+            lambda task: self.configure_camera_task(
+                task, camera_pulses[0][0], camera_pulses[0][1], len(camera_pulses)
+            ),
+        )
+        self.write_task(key, camera_pulses)
 
-        # apply waveform templates
-        camera_waveform_repeat_num = self.waveform_repeat_num * self.waveform_expand_num
-        self.camera_trigger_task.timing.cfg_implicit_timing(
-            sample_mode=nidaqmx.constants.AcquisitionType.FINITE,
-            samps_per_chan=camera_waveform_repeat_num,
+        for board, (channels, waveforms) in analog_waveforms.items():
+            self.analog_output_tasks[board] = self.create_output_task(
+                "ao", channels, waveforms
+            )
+
+        for board, (lines, waveforms) in digital_waveforms.items():
+            self.digital_output_tasks[board] = self.create_output_task(
+                "do", lines, waveforms, source=f"/{board}/ao/SampleClock"
+            )
+
+    def create_output_task(
+        self, task_type, channels, waveforms, source="", number_of_samples=None
+    ):
+        """Get a finite output task from the task pool and write its samples.
+
+        Parameters
+        ----------
+        task_type : str
+            "ao" for analog outputs, "do" for digital output lines.
+        channels : list
+            The physical channels of the task.
+        waveforms : numpy.ndarray
+            The samples to write, one row per channel.
+        source : str
+            The sample clock of the task. The default is the onboard clock.
+        number_of_samples : int, optional
+            The number of samples per channel the task generates. The default is
+            the length of the waveforms.
+
+        Returns
+        -------
+        task : nidaqmx.Task
+            The task.
+        """
+        key = (task_type, ", ".join(channels), source)
+        if task_type == "do":
+            task = self.get_task(
+                key,
+                lambda task: task.do_channels.add_do_chan(
+                    key[1],
+                    line_grouping=nidaqmx.constants.LineGrouping.CHAN_PER_LINE,
+                ),
+            )
+        else:
+            task = self.get_task(
+                key, lambda task: task.ao_channels.add_ao_voltage_chan(key[1])
+            )
+        # a regenerating task plays its buffer over and over
+        samples = np.shape(waveforms)[-1]
+        if number_of_samples and not self.continuous:
+            samples = number_of_samples
+        self.configure_task(
+            key,
+            (self.sample_rate, samples, self.continuous),
+            lambda task: task.timing.cfg_samp_clk_timing(
+                rate=self.sample_rate,
+                source=source,
+                sample_mode=self.get_sample_mode(),
+                samps_per_chan=samples,
+            ),
         )
+        self.write_task(key, waveforms)
+        return task
 
     def create_master_trigger_task(self):
         """Set up the DO master trigger task."""
-        self.master_trigger_task = nidaqmx.Task()
         master_trigger_out_line = self.configuration["configuration"]["microscopes"][
             self.microscope_name
         ]["daq"]["master_trigger_out_line"]
-        self.master_trigger_task.do_channels.add_do_chan(
-            master_trigger_out_line,
-            line_grouping=nidaqmx.constants.LineGrouping.CHAN_FOR_ALL_LINES,
+        self.master_trigger_task = self.get_task(
+            ("do", master_trigger_out_line, "master"),
+            lambda task: task.do_channels.add_do_chan(
+                master_trigger_out_line,
+                line_grouping=nidaqmx.constants.LineGrouping.CHAN_FOR_ALL_LINES,
+            ),
         )
 
     def create_analog_output_tasks(self, channel_key):
@@ -327,6 +612,10 @@ class NIDAQ(DAQBase):
         have only one clock for analog output sample timing, and as such all channels
         must be grouped here.
 
+        Each task is finite and spans all frames of the waveform template. With the
+        Hardware-Z-Stack template, a stage staircase plays out over the whole stack in
+        step with the camera trigger pulses.
+
         Parameters
         ----------
         channel_key : str
@@ -338,23 +627,8 @@ class NIDAQ(DAQBase):
         #  same sweep time. There needs some fix.
 
         # Create one analog output task per board, grouping the channels
-        boards = list(set([x.split("/")[0] for x in self.analog_outputs.keys()]))
-        for board in boards:
-            channel = ", ".join(
-                list(
-                    [x for x in self.analog_outputs.keys() if x.split("/")[0] == board]
-                )
-            )
-            self.analog_output_tasks[board] = nidaqmx.Task()
-            self.analog_output_tasks[board].ao_channels.add_ao_voltage_chan(channel)
-
-            # apply templates to analog tasks
-            self.analog_output_tasks[board].timing.cfg_samp_clk_timing(
-                rate=self.sample_rate,
-                sample_mode=nidaqmx.constants.AcquisitionType.FINITE,
-                samps_per_chan=max_sample * self.waveform_repeat_num,
-            )
-
+        board_waveforms = self.get_analog_output_waveforms(channel_key)
+        for board, (channels, waveforms) in board_waveforms.items():
             # triggers = list(
             #     set([v["trigger_source"] for v in self.analog_outputs.values()])
             # )
@@ -366,25 +640,15 @@ class NIDAQ(DAQBase):
             # self.analog_output_tasks[board].triggers.start_trigger.cfg_dig_edge_start_trig(
             #     triggers[0]
             # )
-            # TODO: may change this later to automatically expand the waveform to the
-            #  longest
-            for k, v in self.analog_outputs.items():
-                if (
-                    k.split("/")[0] == board
-                    and len(v["waveform"][channel_key]) < max_sample
-                ):
-                    v["waveform"][channel_key] = np.hstack(
-                        [v["waveform"][channel_key]] * self.waveform_expand_num
-                    )
-            # Write values to board
-            waveforms = np.vstack(
-                [
-                    v["waveform"][channel_key][:max_sample]
-                    for k, v in self.analog_outputs.items()
-                    if k.split("/")[0] == board
-                ]
-            ).squeeze()
-            self.analog_output_tasks[board].write(waveforms)
+
+            # apply templates to analog tasks, the buffer is regenerated for every
+            # repeat of the template
+            self.analog_output_tasks[board] = self.create_output_task(
+                "ao",
+                channels,
+                waveforms,
+                number_of_samples=max_sample * self.waveform_repeat_num,
+            )
 
     def prepare_acquisition(self, channel_key):
         """Prepare the acquisition.
@@ -413,8 +677,13 @@ class NIDAQ(DAQBase):
         logger.info(f"Waveform Expand Num = {self.waveform_expand_num}")
         logger.info(f"Waveform Repeat Num = {self.waveform_repeat_num}")
 
-        self.create_camera_task(channel_key)
-        self.create_analog_output_tasks(channel_key)
+        try:
+            self.create_tasks(channel_key)
+        except nidaqmx.errors.DaqError:
+            # a pooled task may be in a bad state, start over with new tasks
+            logger.debug(f"Could not reuse the DAQ tasks: {traceback.format_exc()}")
+            self.close_tasks()
+            self.create_tasks(channel_key)
         self.current_channel_key = channel_key
         self.is_updating_analog_task = False
         if self.wait_to_run_lock.locked():
@@ -422,6 +691,21 @@ class NIDAQ(DAQBase):
         # Specify ports, timing, and triggering
         self.set_external_trigger(self.external_trigger)
 
+    def create_tasks(self, channel_key):
+        """Create the camera trigger and output tasks of a channel.
+
+        Parameters
+        ----------
+        channel_key : str
+            Channel key for current channel.
+        """
+        if self.channel_sequence:
+            logger.info(f"Channel Sequence: {self.channel_sequence}")
+            self.create_sequence_tasks()
+        else:
+            self.create_camera_task(channel_key)
+            self.create_analog_output_tasks(channel_key)
+
     def run_acquisition(self):
         """Run DAQ Acquisition.
 
@@ -437,6 +721,8 @@ class NIDAQ(DAQBase):
 
         if self.camera_trigger_task.is_task_done():
             self.camera_trigger_task.start()
+            for task in self.digital_output_tasks.values():
+                task.start()
             for task in self.analog_output_tasks.values():
                 task.start()
 
@@ -451,6 +737,8 @@ class NIDAQ(DAQBase):
                 if self.trigger_mode == "self-trigger":
                     task.wait_until_done()
                 task.stop()
+            for task in self.digital_output_tasks.values():
+                task.stop()
         except Exception:
             # when triggered from external triggers, sometimes the camera trigger task
             # is done but not actually done, there will a DAQ WARNING message
@@ -463,30 +751,71 @@ class NIDAQ(DAQBase):
         except nidaqmx.DaqError:
             pass
 
-    def stop_acquisition(self):
-        """Stop Acquisition.
+    def start_continuous_acquisition(self):
+        """Play the waveforms of the current channel until stopped.
+
+        The output tasks regenerate their buffers and the camera trigger counter
+        runs freely, so frames are triggered at the rate of the sweep time without
+        arming the DAQ for every frame. Waveform changes are written to the running
+        tasks by update_analog_task().
 
-        Stop all tasks and close them.
+        Returns
+        -------
+        result : bool
+            True if the tasks are running. The tasks can only be started by the
+            master trigger, not by an external trigger.
         """
-        try:
-            self.camera_trigger_task.stop()
-            self.camera_trigger_task.close()
+        if self.trigger_mode != "self-trigger":
+            return False
+        self.stop_acquisition()
+        self.continuous = True
+        self.prepare_acquisition(self.current_channel_key)
+        self.start_continuous_tasks()
+        return True
+
+    def start_continuous_tasks(self):
+        """Start the regenerating tasks with the master trigger."""
+        for task in self.digital_output_tasks.values():
+            task.start()
+        for task in self.analog_output_tasks.values():
+            task.start()
+        self.camera_trigger_task.start()
+        self.master_trigger_task.write(
+            [False, True, True, True, False], auto_start=True
+        )
+        self.master_trigger_task.stop()
 
-            if self.trigger_mode == "self-trigger":
-                self.master_trigger_task.stop()
-                self.master_trigger_task.close()
+    def stop_continuous_acquisition(self):
+        """Stop the regenerating tasks.
 
-            for k, task in self.analog_output_tasks.items():
-                task.stop()
-                task.close()
+        The tasks are configured as finite tasks again by the next
+        prepare_acquisition().
+        """
+        self.stop_acquisition()
+        self.continuous = False
 
-        except (AttributeError, nidaqmx.errors.DaqError):
-            pass
+    def stop_acquisition(self):
+        """Stop Acquisition.
+
+        Stop all tasks. The tasks stay open in the task pool, so the next
+        prepare_acquisition() only rewrites what changed. close_tasks() closes them.
+        """
+        tasks = [self.camera_trigger_task]
+        if self.trigger_mode == "self-trigger":
+            tasks.append(self.master_trigger_task)
+        tasks += list(self.analog_output_tasks.values())
+        tasks += list(self.digital_output_tasks.values())
+        for task in tasks:
+            try:
+                task.stop()
+            except (AttributeError, nidaqmx.errors.DaqError):
+                pass
 
         if self.wait_to_run_lock.locked():
             self.wait_to_run_lock.release()
 
         self.analog_output_tasks = {}
+        self.digital_output_tasks = {}
 
     def enable_microscope(self, microscope_name):
         """Enable microscope.
@@ -499,7 +828,7 @@ class NIDAQ(DAQBase):
         if microscope_name != self.microscope_name:
             self.microscope_name = microscope_name
             self.analog_outputs = {}
-            self.analog_output_tasks = {}
+            self.close_tasks()
 
         self.camera_delay = (
             float(self.waveform_constants["other_constants"].get("camera_delay", 5))
@@ -558,30 +887,59 @@ class NIDAQ(DAQBase):
 
             # updating an analog task happens after the task
             # is done when running a feature, so it will check and return immediately.
-            self.analog_output_tasks[board_name].wait_until_done(timeout=1.0)
-            self.analog_output_tasks[board_name].stop()
+            task = self.analog_output_tasks[board_name]
+            if self.continuous:
+                # a regenerating task keeps running. The new samples replace its
+                # buffer from the first sample on, which is the start of a frame.
+                task.out_stream.relative_to = (
+                    nidaqmx.constants.WriteRelativeTo.FIRST_SAMPLE
+                )
+                task.out_stream.offset = 0
+            else:
+                task.wait_until_done(timeout=1.0)
+                task.stop()
 
             # Write values to board
-            waveforms = np.vstack(
-                [
-                    v["waveform"][self.current_channel_key][: self.n_sample]
-                    for k, v in self.analog_outputs.items()
-                    if k.split("/")[0] == board_name
-                ]
-            ).squeeze()
+            if self.channel_sequence:
+                waveforms = self.get_sequence_waveforms()[0][board_name][1]
+            elif self.continuous:
+                waveforms = self.get_analog_output_waveforms(self.current_channel_key)[
+                    board_name
+                ][1]
+            else:
+                waveforms = np.vstack(
+                    [
+                        v["waveform"][self.current_channel_key][: self.n_sample]
+                        for k, v in self.analog_outputs.items()
+                        if k.split("/")[0] == board_name
+                    ]
+                ).squeeze()
             self.analog_output_tasks[board_name].write(waveforms)
+            # the buffer no longer holds the samples the task pool wrote
+            self.task_samples.pop(
+                self.get_task_key(self.analog_output_tasks[board_name]), None
+            )
         except Exception:
             logger.debug(f"Could not update analog task: {traceback.format_exc()}")
-            for board in self.analog_output_tasks.keys():
-                try:
-                    self.analog_output_tasks[board].stop()
-                    self.analog_output_tasks[board].close()
-                except Exception:
-                    logger.debug(
-                        f"Could not stop analog tasks: {traceback.format_exc()}"
-                    )
-
-            self.create_analog_output_tasks(self.current_channel_key)
+            tasks = list(self.analog_output_tasks.values())
+            if self.channel_sequence or self.continuous:
+                # the sequence and the regenerating tasks are created together
+                tasks += [self.camera_trigger_task]
+                tasks += list(self.digital_output_tasks.values())
+            for task in tasks:
+                self.close_task(self.get_task_key(task))
+            self.analog_output_tasks = {}
+            self.digital_output_tasks = {}
+
+            if self.continuous:
+                self.create_tasks(self.current_channel_key)
+                self.set_external_trigger(self.external_trigger)
+                self.start_continuous_tasks()
+            elif self.channel_sequence:
+                self.create_sequence_tasks()
+                self.set_external_trigger(self.external_trigger)
+            else:
+                self.create_analog_output_tasks(self.current_channel_key)
 
         self.is_updating_analog_task = False
         self.wait_to_run_lock.release()
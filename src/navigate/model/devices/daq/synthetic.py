@@ -33,12 +33,13 @@
 # Standard Imports
 import logging
 import time
-from threading import Lock
+from threading import Event, Lock, Thread
 
 # Third Party Imports
 
 # Local Imports
 from navigate.model.devices.daq.base import DAQBase
+from navigate.tools.waveform_template_funcs import get_waveform_template_parameters
 from navigate.tools.decorators import log_initialization
 
 # Logger Setup
@@ -72,12 +73,27 @@ class SyntheticDAQ(DAQBase):
         #: dict: Analog output tasks.
         self.analog_outputs = {}
 
+        #: dict: Samples each board would play, one row per analog output channel.
+        self.analog_output_tasks = {}
+
+        #: dict: Samples each board would play, one row per digital output line.
+        self.digital_output_tasks = {}
+
+        #: list: The (high time, low time) of every camera trigger pulse.
+        self.camera_pulses = []
+
         #: bool: Flag for updating analog task.
         self.is_updating_analog_task = False
 
         #: str: Trigger mode. Self-trigger or external-trigger.
         self.trigger_mode = "self-trigger"
 
+        #: Thread: Generates the frames of a continuous acquisition.
+        self.continuous_thread = None
+
+        #: Event: Stops the frames of a continuous acquisition.
+        self.stop_continuous_event = Event()
+
     def __str__(self):
         """String representation of the class."""
         return "SyntheticDAQ"
@@ -94,6 +110,35 @@ class SyntheticDAQ(DAQBase):
         """Create galvo and remote focus tasks"""
         pass
 
+    def create_analog_output_tasks(self, channel_key):
+        """Emulate the analog output tasks by keeping the samples of each board.
+
+        Parameters
+        ----------
+        channel_key : str
+            Channel key for analog output.
+        """
+        self.analog_output_tasks = {
+            board: waveforms
+            for board, (_, waveforms) in self.get_analog_output_waveforms(
+                channel_key
+            ).items()
+        }
+
+    def create_sequence_tasks(self):
+        """Emulate the tasks of a channel sequence by keeping their samples."""
+        (
+            analog_waveforms,
+            digital_waveforms,
+            self.camera_pulses,
+        ) = self.get_sequence_waveforms()
+        self.analog_output_tasks = {
+            board: waveforms for board, (_, waveforms) in analog_waveforms.items()
+        }
+        self.digital_output_tasks = {
+            board: waveforms for board, (_, waveforms) in digital_waveforms.items()
+        }
+
     def start_tasks(self):
         """Start the tasks for camera triggering and analog outputs.
 
@@ -117,6 +162,20 @@ class SyntheticDAQ(DAQBase):
         channel_key : str
             Channel key for current channel.
         """
+        microscope_state = self.configuration["experiment"]["MicroscopeState"]
+        (
+            self.waveform_repeat_num,
+            self.waveform_expand_num,
+        ) = get_waveform_template_parameters(
+            microscope_state.get("waveform_template", "Default"),
+            self.configuration.get("waveform_templates", {}),
+            microscope_state,
+        )
+        if self.channel_sequence and self.sweep_times:
+            self.create_sequence_tasks()
+        elif self.analog_outputs and self.sweep_times:
+            self.create_analog_output_tasks(channel_key)
+
         self.current_channel_key = channel_key
         self.is_updating_analog_task = False
         if self.wait_to_run_lock.locked():
@@ -135,12 +194,53 @@ class SyntheticDAQ(DAQBase):
             self.wait_to_run_lock.release()
         time.sleep(0.01)
         if self.trigger_mode == "self-trigger":
-            for microscope_name in self.camera:
-                self.camera[microscope_name].generate_new_frame()
+            # one camera trigger per frame of the waveform template, and per channel
+            # of a channel sequence
+            number_of_frames = self.waveform_repeat_num * self.waveform_expand_num
+            if self.channel_sequence and self.camera_pulses:
+                number_of_frames = len(self.camera_pulses)
+            for _ in range(number_of_frames):
+                for microscope_name in self.camera:
+                    self.camera[microscope_name].generate_new_frame()
+
+    def start_continuous_acquisition(self):
+        """Generate a frame every sweep time of the current channel until stopped.
+
+        Returns
+        -------
+        result : bool
+            True if the frames are generated.
+        """
+        if self.trigger_mode != "self-trigger":
+            return False
+        self.stop_continuous_acquisition()
+        self.continuous = True
+        sweep_time = (self.sweep_times or {}).get(self.current_channel_key, 0.01)
+        self.stop_continuous_event.clear()
+
+        def generate_frames():
+            while not self.stop_continuous_event.wait(max(sweep_time, 0.001)):
+                for microscope_name in self.camera:
+                    self.camera[microscope_name].generate_new_frame()
+
+        self.continuous_thread = Thread(target=generate_frames, daemon=True)
+        self.continuous_thread.name = "SyntheticDAQ continuous"
+        self.continuous_thread.start()
+        return True
+
+    def stop_continuous_acquisition(self):
+        """Stop generating frames."""
+        self.stop_continuous_event.set()
+        if self.continuous_thread is not None:
+            self.continuous_thread.join()
+            self.continuous_thread = None
+        self.continuous = False
 
     def stop_acquisition(self):
         """Stop Acquisition."""
-        pass
+        self.analog_output_tasks = {}
+        self.digital_output_tasks = {}
+        self.camera_pulses = []
 
     def write_waveforms_to_tasks(self):
         """Write the galvo, remote focus, and laser waveforms to each task."""
@@ -173,6 +273,10 @@ class SyntheticDAQ(DAQBase):
         self.wait_to_run_lock.acquire()
         self.is_updating_analog_task = True
 
+        # the regenerating buffers are rewritten while the frames continue
+        if self.continuous and self.analog_outputs and self.sweep_times:
+            self.create_analog_output_tasks(self.current_channel_key)
+
         self.is_updating_analog_task = False
         self.wait_to_run_lock.release()
 
@@ -0,0 +1,208 @@
+# Copyright (c) 2021-2024  The University of Texas Southwestern Medical Center.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted for academic and research use only (subject to the
+# limitations in the disclaimer below) provided that the following conditions are met:
+#
+#      * Redistributions of source code must retain the above copyright notice,
+#      this list of conditions and the following disclaimer.
+#
+#      * Redistributions in binary form must reproduce the above copyright
+#      notice, this list of conditions and the following disclaimer in the
+#      documentation and/or other materials provided with the distribution.
+#
+#      * Neither the name of the copyright holders nor the names of its
+#      contributors may be used to endorse or promote products derived from this
+#      software without specific prior written permission.
+#
+# NO EXPRESS OR IMPLIED LICENSES TO ANY PARTY'S PATENT RIGHTS ARE GRANTED BY
+# THIS LICENSE. THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND
+# CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A
+# PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR
+# BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER
+# IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+# Standard Library Imports
+import inspect
+import logging
+from functools import wraps
+
+# Third Party Imports
+
+# Local Imports
+
+# Logger Setup
+p = __name__.split(".")[1]
+logger = logging.getLogger(p)
+
+#: object: Marks a cached command whose state is its first argument.
+ARGUMENT = object()
+
+
+class DeviceStateCache:
+    """Last known state of a device.
+
+    The cache only holds states the device was commanded to. A key that is not
+    in the cache is unknown, and the next command for it is always sent.
+    """
+
+    def __init__(self):
+        """Initialize the DeviceStateCache."""
+        #: dict: Last commanded state, by key.
+        self.states = {}
+
+    def is_current(self, key, value):
+        """Whether the device is known to be in a state.
+
+        Parameters
+        ----------
+        key : str
+            State name, e.g. "power".
+        value : object
+            The requested state.
+
+        Returns
+        -------
+        bool
+            True if the last command for key set exactly this value.
+        """
+        try:
+            return key in self.states and bool(self.states[key] == value)
+        except Exception:
+            # values that can not be compared are never current
+            return False
+
+    def update(self, key, value):
+        """Record the state a command has set.
+
+        Parameters
+        ----------
+        key : str
+            State name.
+        value : object
+            The new state.
+        """
+        self.states[key] = value
+
+    def invalidate(self, *keys):
+        """Forget states, e.g. after an error or a change outside the software.
+
+        Parameters
+        ----------
+        *keys : str
+            State names to forget. Forgets every state if no key is given.
+        """
+        if not keys:
+            self.states.clear()
+        for key in keys:
+            self.states.pop(key, None)
+
+
+def cached_command(command, key, value=ARGUMENT, invalidates=()):
+    """Wrap a device command so it is skipped when it would not change the state.
+
+    Parameters
+    ----------
+    command : callable
+        The device method.
+    key : str or None
+        State set by the command. None for commands that are always sent and
+        only invalidate other states.
+    value : object, optional
+        State the command sets. ARGUMENT uses the first argument of the command.
+    invalidates : tuple, optional
+        States the command changes as a side effect. None invalidates all.
+
+    Returns
+    -------
+    wrapper : callable
+        The wrapped command.
+    """
+    parameters = list(inspect.signature(command).parameters)
+    argument_name = parameters[1] if len(parameters) > 1 else None
+
+    @wraps(command)
+    def wrapper(self, *args, **kwargs):
+        cache = self.device_state
+        state = value
+        if state is ARGUMENT:
+            state = args[0] if args else kwargs.get(argument_name)
+
+        if key is not None and cache.is_current(key, state):
+            logger.debug(f"{self} is already in state {key}={state}, skipped.")
+            return None
+
+        try:
+            result = command(self, *args, **kwargs)
+        except Exception:
+            cache.invalidate(*([] if invalidates is None else [key, *invalidates]))
+            raise
+
+        if invalidates is None:
+            cache.invalidate()
+        else:
+            cache.invalidate(*invalidates)
+        if key is not None:
+            if result is False:
+                # commands that report a failure leave the state unknown
+                cache.invalidate(key)
+            else:
+                cache.update(key, state)
+        return result
+
+    wrapper.is_cached_command = True
+    return wrapper
+
+
+class DeviceStateMixin:
+    """Skip hardware commands that would not change the device state.
+
+    Subclasses list their idempotent commands in cached_commands. Every class
+    in the hierarchy that defines one of these methods gets it wrapped with
+    cached_command(), so device implementations do not need to know about the
+    cache.
+    """
+
+    #: dict: Command name -> (state key, state value, invalidated states).
+    cached_commands = {}
+
+    def __init_subclass__(cls, **kwargs):
+        """Wrap the cached commands a device class defines."""
+        super().__init_subclass__(**kwargs)
+        for name, (key, value, invalidates) in cls.cached_commands.items():
+            command = cls.__dict__.get(name)
+            if command is None or getattr(command, "is_cached_command", False):
+                continue
+            setattr(cls, name, cached_command(command, key, value, invalidates))
+
+    @property
+    def device_state(self):
+        """Last known state of the device.
+
+        Returns
+        -------
+        DeviceStateCache
+            The state cache of this device.
+        """
+        cache = self.__dict__.get("_device_state")
+        if cache is None:
+            cache = self.__dict__["_device_state"] = DeviceStateCache()
+        return cache
+
+    def invalidate_device_state(self, *keys):
+        """Forget the known device state, so the next commands are sent.
+
+        Parameters
+        ----------
+        *keys : str
+            State names to forget. Forgets every state if no key is given.
+        """
+        self.device_state.invalidate(*keys)
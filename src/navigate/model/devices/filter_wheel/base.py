@@ -37,6 +37,8 @@ import logging
 
 # Local Imports
 from navigate.tools.decorators import log_initialization
+from navigate.model.devices.device_state import ARGUMENT, DeviceStateMixin
+from navigate.model.concurrency.device_commands import submit_device_command
 
 # Logger Setup
 p = __name__.split(".")[1]
@@ -44,9 +46,12 @@ logger = logging.getLogger(p)
 
 
 @log_initialization
-class FilterWheelBase:
+class FilterWheelBase(DeviceStateMixin):
     """FilterWheelBase - Parent class for controlling filter wheels."""
 
+    #: dict: Commands that are skipped when the wheel is already in that state.
+    cached_commands = {"set_filter": ("filter", ARGUMENT, ())}
+
     def __init__(self, device_connection, device_config):
         """Initialize the FilterWheelBase class.
 
@@ -102,3 +107,22 @@ class FilterWheelBase:
             logger.error(f"Unknown filter name: {filter_name}")
             raise ValueError(f"Unknown filter name: {filter_name}")
         return filter_exists
+
+    def set_filter_async(self, filter_name, wait_until_done=True):
+        """Change the filter wheel position without blocking the calling thread.
+
+        Parameters
+        ----------
+        filter_name : str
+            Name of filter to move to.
+        wait_until_done : bool
+            Whether the command only completes once the wheel has settled.
+
+        Returns
+        -------
+        future : concurrent.futures.Future
+            Resolves when set_filter() returns.
+        """
+        return submit_device_command(
+            self, self.set_filter, filter_name, wait_until_done
+        )
@@ -36,7 +36,8 @@ import logging
 # Third Party Imports
 
 # Local Imports
-from navigate.model.waveforms import sawtooth, sine_wave
+from navigate.config.config import get_configuration_snapshot
+from navigate.model.waveforms import sawtooth, sine_wave, waveform_cache
 from navigate.tools.decorators import log_initialization
 
 # # Logger Setup
@@ -132,16 +133,17 @@ class GalvoBase:
             Dictionary that includes the galvo waveforms on a per-channel basis.
         """
         self.waveform_dict = dict.fromkeys(self.waveform_dict, None)
-        microscope_state = self.configuration["experiment"]["MicroscopeState"]
+        configuration = get_configuration_snapshot(self.configuration)
+        microscope_state = configuration["experiment"]["MicroscopeState"]
         microscope_name = microscope_state["microscope_name"]
         zoom_value = microscope_state["zoom"]
-        galvo_factor = self.configuration["waveform_constants"]["other_constants"].get(
+        galvo_factor = configuration["waveform_constants"]["other_constants"].get(
             "galvo_factor", "none"
         )
-        galvo_parameters = self.configuration["waveform_constants"]["galvo_constants"][
+        galvo_parameters = configuration["waveform_constants"]["galvo_constants"][
             self.galvo_name
         ][microscope_name][zoom_value]
-        self.sample_rate = self.configuration["configuration"]["microscopes"][
+        self.sample_rate = configuration["configuration"]["microscopes"][
             self.microscope_name
         ]["daq"]["sample_rate"]
 
@@ -187,51 +189,93 @@ class GalvoBase:
                     return
 
                 # Calculate the Waveforms
-                if self.galvo_waveform == "sawtooth":
-                    self.waveform_dict[channel_key] = sawtooth(
-                        sample_rate=self.sample_rate,
-                        sweep_time=self.sweep_time,
-                        frequency=galvo_frequency,
-                        amplitude=galvo_amplitude,
-                        offset=galvo_offset,
-                        phase=self.camera_delay,
-                    )
-                elif self.galvo_waveform == "sine":
-                    self.waveform_dict[channel_key] = sine_wave(
-                        sample_rate=self.sample_rate,
-                        sweep_time=self.sweep_time,
-                        frequency=galvo_frequency,
-                        amplitude=galvo_amplitude,
-                        offset=galvo_offset,
-                        phase=self.device_config["phase"],
-                    )
-                elif self.galvo_waveform == "halfsaw":
-                    new_wave = sawtooth(
-                        sample_rate=self.sample_rate,
-                        sweep_time=self.sweep_time,
-                        frequency=galvo_frequency,
-                        amplitude=galvo_amplitude,
-                        offset=galvo_offset,
-                        phase=self.camera_delay,
-                    )
-                    half_samples = (
-                        new_wave.argmax() if galvo_amplitude > 0 else new_wave.argmin()
-                    )
-                    new_wave[:half_samples] = -galvo_offset
-                    self.waveform_dict[channel_key] = new_wave
-                else:
-                    print("Unknown Galvo waveform specified in configuration file.")
-                    self.waveform_dict[channel_key] = None
-                    continue
-                self.waveform_dict[channel_key][
-                    self.waveform_dict[channel_key] > self.galvo_max_voltage
-                ] = self.galvo_max_voltage
-                self.waveform_dict[channel_key][
-                    self.waveform_dict[channel_key] < self.galvo_min_voltage
-                ] = self.galvo_min_voltage
+                phase = (
+                    self.device_config["phase"]
+                    if self.galvo_waveform == "sine"
+                    else self.camera_delay
+                )
+                self.waveform_dict[channel_key] = waveform_cache.get(
+                    (
+                        "galvo",
+                        self.galvo_waveform,
+                        self.sample_rate,
+                        self.sweep_time,
+                        galvo_frequency,
+                        galvo_amplitude,
+                        galvo_offset,
+                        phase,
+                        self.galvo_min_voltage,
+                        self.galvo_max_voltage,
+                    ),
+                    lambda: self.calculate_waveform(
+                        self.sweep_time,
+                        galvo_frequency,
+                        galvo_amplitude,
+                        galvo_offset,
+                        phase,
+                    ),
+                )
 
         return self.waveform_dict
 
+    def calculate_waveform(self, sweep_time, frequency, amplitude, offset, phase):
+        """Calculate the galvo waveform of one channel.
+
+        Parameters
+        ----------
+        sweep_time : float
+            Sweep time in seconds.
+        frequency : float
+            Galvo frequency in Hz.
+        amplitude : float
+            Galvo amplitude in volts.
+        offset : float
+            Galvo offset in volts.
+        phase : float
+            Galvo phase.
+
+        Returns
+        -------
+        waveform : np.array
+            Galvo waveform clipped to the hardware limits, or None if the waveform
+            type is unknown.
+        """
+        if self.galvo_waveform == "sawtooth":
+            waveform = sawtooth(
+                sample_rate=self.sample_rate,
+                sweep_time=sweep_time,
+                frequency=frequency,
+                amplitude=amplitude,
+                offset=offset,
+                phase=phase,
+            )
+        elif self.galvo_waveform == "sine":
+            waveform = sine_wave(
+                sample_rate=self.sample_rate,
+                sweep_time=sweep_time,
+                frequency=frequency,
+                amplitude=amplitude,
+                offset=offset,
+                phase=phase,
+            )
+        elif self.galvo_waveform == "halfsaw":
+            waveform = sawtooth(
+                sample_rate=self.sample_rate,
+                sweep_time=sweep_time,
+                frequency=frequency,
+                amplitude=amplitude,
+                offset=offset,
+                phase=phase,
+            )
+            half_samples = waveform.argmax() if amplitude > 0 else waveform.argmin()
+            waveform[:half_samples] = -offset
+        else:
+            print("Unknown Galvo waveform specified in configuration file.")
+            return None
+        waveform[waveform > self.galvo_max_voltage] = self.galvo_max_voltage
+        waveform[waveform < self.galvo_min_voltage] = self.galvo_min_voltage
+        return waveform
+
     def turn_off(self):
         """Turn off the galvo."""
         pass
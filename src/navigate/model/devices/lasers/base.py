@@ -40,6 +40,8 @@ import logging
 
 # Local Imports
 from navigate.tools.decorators import log_initialization
+from navigate.model.devices.device_state import ARGUMENT, DeviceStateMixin
+from navigate.model.concurrency.device_commands import submit_device_command
 
 # Logger Setup
 p = __name__.split(".")[1]
@@ -47,9 +49,18 @@ logger = logging.getLogger(p)
 
 
 @log_initialization
-class LaserBase:
+class LaserBase(DeviceStateMixin):
     """Laser Base Class"""
 
+    #: dict: Commands that are skipped when the laser is already in that state.
+    #: A new power invalidates the on/off state, since lasers without an on/off
+    #: line emit as soon as their power is set.
+    cached_commands = {
+        "set_power": ("power", ARGUMENT, ("on",)),
+        "turn_on": ("on", True, ()),
+        "turn_off": ("on", False, ()),
+    }
+
     def __init__(self, microscope_name, device_connection, configuration, laser_id):
         """Initialize Laser Base Class
 
@@ -65,6 +76,9 @@ class LaserBase:
             Laser ID
         """
 
+        #: object: Hardware device the laser talks through.
+        self.device_connection = device_connection
+
         #: dict: Configuration dictionary
         self.configuration = configuration
 
@@ -90,6 +104,21 @@ class LaserBase:
         """
         pass
 
+    def set_power_async(self, laser_intensity):
+        """Set laser power without blocking the calling thread.
+
+        Parameters
+        ----------
+        laser_intensity : int
+            Laser intensity
+
+        Returns
+        -------
+        future : concurrent.futures.Future
+            Resolves when set_power() returns.
+        """
+        return submit_device_command(self, self.set_power, laser_intensity)
+
     def turn_on(self):
         """Turn on the laser"""
         pass
@@ -98,6 +127,34 @@ class LaserBase:
         """Turn off the laser"""
         pass
 
+    def turn_off_async(self):
+        """Turn off the laser without blocking the calling thread.
+
+        Returns
+        -------
+        future : concurrent.futures.Future
+            Resolves when turn_off() returns.
+        """
+        return submit_device_command(self, self.turn_off)
+
+    def get_sequence_outputs(self, laser_intensity):
+        """Get the DAQ lines that switch the laser during a channel sequence.
+
+        Lasers that are not switched by the DAQ return an empty dictionary, and can
+        not be part of a channel sequence.
+
+        Parameters
+        ----------
+        laser_intensity : float
+            Laser intensity in percent.
+
+        Returns
+        -------
+        outputs : dict
+            The value of each DAQ line while the laser is on.
+        """
+        return {}
+
     def close(self):
         """
         Close the laser before exit.
@@ -171,6 +171,33 @@ class LaserNI(LaserBase):
         except DaqError as e:
             logger.exception(e)
 
+    def get_sequence_outputs(self, laser_intensity):
+        """Get the DAQ lines that switch the laser during a channel sequence.
+
+        The on/off line and the power line of the laser are driven by the DAQ
+        program, so the lines must not be written by this laser while the sequence
+        is running.
+
+        Parameters
+        ----------
+        laser_intensity : float
+            Laser intensity in percent.
+
+        Returns
+        -------
+        outputs : dict
+            The value of each DAQ line while the laser is on.
+        """
+        outputs = {}
+        if self.laser_do_task is not None:
+            outputs[self.device_config["onoff"]["hardware"]["channel"]] = (
+                self.laser_max_do if self.on_off_type == "analog" else True
+            )
+        outputs[self.device_config["power"]["hardware"]["channel"]] = (
+            float(laser_intensity) / 100
+        ) * self.laser_max_ao
+        return outputs
+
     def close(self):
         """Close the NI Task before exit."""
         try:
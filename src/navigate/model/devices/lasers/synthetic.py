@@ -64,6 +64,32 @@ class SyntheticLaser(LaserBase):
         """
         super().__init__(microscope_name, device_connection, configuration, laser_id)
 
+    def get_sequence_outputs(self, laser_intensity):
+        """Emulate the DAQ lines of the laser that are given in the configuration.
+
+        Parameters
+        ----------
+        laser_intensity : float
+            Laser intensity in percent.
+
+        Returns
+        -------
+        outputs : dict
+            The value of each DAQ line while the laser is on.
+        """
+        outputs = {}
+        onoff = self.device_config.get("onoff", {}).get("hardware", {})
+        if onoff.get("channel"):
+            outputs[onoff["channel"]] = (
+                float(onoff.get("max", 5)) if "/ao" in onoff["channel"] else True
+            )
+        power = self.device_config.get("power", {}).get("hardware", {})
+        if power.get("channel"):
+            outputs[power["channel"]] = (float(laser_intensity) / 100) * float(
+                power.get("max", 5)
+            )
+        return outputs
+
     def close(self):
         """Close the port before exit."""
         pass
@@ -40,6 +40,7 @@ from navigate.model.waveforms import (
     remote_focus_ramp,
     smooth_waveform,
     remote_focus_ramp_triangular,
+    waveform_cache,
 )
 from navigate.tools.decorators import log_initialization
 
@@ -168,8 +169,6 @@ class RemoteFocusBase:
                 exposure_time = exposure_times[channel_key]
                 self.sweep_time = sweep_times[channel_key]
 
-                samples = int(self.sample_rate * self.sweep_time)
-
                 # Remote Focus Parameters
                 temp = waveform_constants["remote_focus_constants"][imaging_mode][zoom][
                     laser
@@ -203,46 +202,112 @@ class RemoteFocusBase:
                     remote_focus_offset += offset
 
                 # Calculate the Waveforms
-                if sensor_mode == "Light-Sheet" and (
+                triangular = sensor_mode == "Light-Sheet" and (
                     readout_direction == "Bidirectional"
                     or readout_direction == "Rev. Bidirectional"
-                ):
-                    self.waveform_dict[channel_key] = remote_focus_ramp_triangular(
-                        sample_rate=self.sample_rate,
-                        exposure_time=exposure_time,
-                        sweep_time=self.sweep_time,
-                        remote_focus_delay=remote_focus_delay,
-                        camera_delay=self.camera_delay,
-                        amplitude=remote_focus_amplitude,
-                        offset=remote_focus_offset,
-                    )
-                    samples *= 2
-
-                else:
-                    self.waveform_dict[channel_key] = remote_focus_ramp(
-                        sample_rate=self.sample_rate,
-                        exposure_time=exposure_time,
-                        sweep_time=self.sweep_time,
-                        remote_focus_delay=remote_focus_delay,
-                        camera_delay=self.camera_delay,
-                        fall=remote_focus_ramp_falling,
-                        amplitude=remote_focus_amplitude,
-                        offset=remote_focus_offset,
-                    )
-
-                # Smooth the Waveform if specified
-                if percent_smoothing > 0:
-                    self.waveform_dict[channel_key] = smooth_waveform(
-                        waveform=self.waveform_dict[channel_key],
-                        percent_smoothing=percent_smoothing,
-                    )[:samples]
-
-                # Clip any values outside of the hardware limits
-                self.waveform_dict[channel_key][
-                    self.waveform_dict[channel_key] > self.remote_focus_max_voltage
-                ] = self.remote_focus_max_voltage
-                self.waveform_dict[channel_key][
-                    self.waveform_dict[channel_key] < self.remote_focus_min_voltage
-                ] = self.remote_focus_min_voltage
+                )
+                self.waveform_dict[channel_key] = waveform_cache.get(
+                    (
+                        "remote_focus",
+                        triangular,
+                        self.sample_rate,
+                        exposure_time,
+                        self.sweep_time,
+                        remote_focus_delay,
+                        self.camera_delay,
+                        remote_focus_ramp_falling,
+                        remote_focus_amplitude,
+                        remote_focus_offset,
+                        percent_smoothing,
+                        self.remote_focus_min_voltage,
+                        self.remote_focus_max_voltage,
+                    ),
+                    lambda: self.calculate_waveform(
+                        exposure_time,
+                        self.sweep_time,
+                        remote_focus_delay,
+                        remote_focus_ramp_falling,
+                        remote_focus_amplitude,
+                        remote_focus_offset,
+                        percent_smoothing,
+                        triangular,
+                    ),
+                )
 
         return self.waveform_dict
+
+    def calculate_waveform(
+        self,
+        exposure_time,
+        sweep_time,
+        remote_focus_delay,
+        fall,
+        amplitude,
+        offset,
+        percent_smoothing,
+        triangular=False,
+    ):
+        """Calculate the remote focus waveform of one channel.
+
+        Parameters
+        ----------
+        exposure_time : float
+            Camera exposure time in seconds.
+        sweep_time : float
+            Sweep time in seconds.
+        remote_focus_delay : float
+            Delay of the ramp in seconds.
+        fall : float
+            Duration of the falling edge of the ramp in seconds.
+        amplitude : float
+            Ramp amplitude in volts.
+        offset : float
+            Ramp offset in volts.
+        percent_smoothing : float
+            Percentage of the waveform to smooth.
+        triangular : bool
+            Calculate a triangular ramp for bidirectional light-sheet readout.
+
+        Returns
+        -------
+        waveform : numpy.ndarray
+            Remote focus waveform clipped to the hardware limits.
+        """
+        samples = int(self.sample_rate * sweep_time)
+        if triangular:
+            waveform = remote_focus_ramp_triangular(
+                sample_rate=self.sample_rate,
+                exposure_time=exposure_time,
+                sweep_time=sweep_time,
+                remote_focus_delay=remote_focus_delay,
+                camera_delay=self.camera_delay,
+                amplitude=amplitude,
+                offset=offset,
+            )
+            samples *= 2
+        else:
+            waveform = remote_focus_ramp(
+                sample_rate=self.sample_rate,
+                exposure_time=exposure_time,
+                sweep_time=sweep_time,
+                remote_focus_delay=remote_focus_delay,
+                camera_delay=self.camera_delay,
+                fall=fall,
+                amplitude=amplitude,
+                offset=offset,
+            )
+
+        # Smooth the Waveform if specified
+        if percent_smoothing > 0:
+            waveform = smooth_waveform(
+                waveform=waveform, percent_smoothing=percent_smoothing
+            )[:samples]
+
+        # Clip any values outside of the hardware limits
+        waveform[waveform > self.remote_focus_max_voltage] = (
+            self.remote_focus_max_voltage
+        )
+        waveform[waveform < self.remote_focus_min_voltage] = (
+            self.remote_focus_min_voltage
+        )
+        return waveform
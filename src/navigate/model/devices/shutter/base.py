@@ -37,6 +37,7 @@ import logging
 
 # Local Imports
 from navigate.tools.decorators import log_initialization
+from navigate.model.devices.device_state import DeviceStateMixin
 
 # Logger Setup
 p = __name__.split(".")[1]
@@ -44,9 +45,15 @@ logger = logging.getLogger(p)
 
 
 @log_initialization
-class ShutterBase:
+class ShutterBase(DeviceStateMixin):
     """ShutterBase Class - Parent class for the laser shutters."""
 
+    #: dict: Commands that are skipped when the shutter is already in that state.
+    cached_commands = {
+        "open_shutter": ("open", True, ()),
+        "close_shutter": ("open", False, ()),
+    }
+
     def __init__(self, microscope_name, device_connection, configuration):
         """Initialize the Shutter.
 
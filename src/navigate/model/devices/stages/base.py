@@ -37,6 +37,7 @@ from multiprocessing.managers import ListProxy
 
 # Local Imports
 from navigate.tools.decorators import log_initialization
+from navigate.model.concurrency.device_commands import submit_device_command
 
 # Logger Setup
 p = __name__.split(".")[1]
@@ -61,6 +62,9 @@ class StageBase:
         device_id : int, optional
             Device ID, by default 0
         """
+        #: object: Hardware device the stage talks through.
+        self.device_connection = device_connection
+
         stage_configuration = configuration["configuration"]["microscopes"][
             microscope_name
         ]["stage"]
@@ -212,6 +216,25 @@ class StageBase:
             return {}
         return abs_pos_dict
 
+    def move_absolute_async(self, move_dictionary, wait_until_done=True):
+        """Move the stage without blocking the calling thread.
+
+        Parameters
+        ----------
+        move_dictionary : dict
+            A dictionary of values required for movement. Includes 'x_abs', etc.
+        wait_until_done : bool
+            Whether the command only completes once the stage is on target.
+
+        Returns
+        -------
+        future : concurrent.futures.Future
+            Resolves to the return value of move_absolute().
+        """
+        return submit_device_command(
+            self, self.move_absolute, move_dictionary, wait_until_done
+        )
+
     def stop(self):
         """Stop all stage movement abruptly."""
         pass
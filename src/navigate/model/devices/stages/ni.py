@@ -41,6 +41,7 @@ import nidaqmx
 
 # Local Imports
 from navigate.model.devices.stages.base import StageBase
+from navigate.model.waveforms import staircase
 from navigate.tools.decorators import log_initialization
 
 # Logger Setup
@@ -208,6 +209,40 @@ class GalvoNIStage(StageBase):
         }
         return True
 
+    def set_stack_waveform(self, positions, sweep_times, ramp=False):
+        """Drive the stage through a z-stack with the DAQ.
+
+        The stage steps to the next position every sweep, so that a finite analog
+        output task paces the whole stack with the camera triggers. The DAQ waveform
+        template must expand to one sweep per position.
+
+        Parameters
+        ----------
+        positions : list
+            Stage position of each plane in microns.
+        sweep_times : dict
+            Dictionary of sweep times for each channel
+        ramp : bool
+            Ramp continuously between positions instead of stepping.
+
+        Returns
+        -------
+        result : bool
+            success or failed
+        """
+        volts = [eval(self.volts_per_micron, {"x": pos}) for pos in positions]
+        microscope_state = self.configuration["experiment"]["MicroscopeState"]
+        waveform_dict = {}
+        for channel_key in microscope_state["channels"].keys():
+            if microscope_state["channels"][channel_key]["is_selected"] is True:
+                waveform_dict[channel_key] = staircase(
+                    sample_rate=self.sample_rate,
+                    sweep_time=sweep_times[channel_key],
+                    levels=volts,
+                    ramp=ramp,
+                )
+        return self.update_waveform(waveform_dict)
+
     def move_axis_absolute(self, axis, abs_pos, wait_until_done=False):
         """Implement movement logic along a single axis.
 
@@ -301,6 +336,8 @@ class GalvoNIStage(StageBase):
         self.exposure_times = exposure_times
         self.sweep_times = sweep_times
         if mode == "normal":
+            # stop playing waveforms, the stage holds a static voltage
+            self.daq.analog_outputs.pop(self.axes_channels[0], None)
             if self.ao_task is None:
                 self.ao_task = nidaqmx.Task()
                 self.ao_task.ao_channels.add_ao_voltage_chan(self.axes_channels[0])
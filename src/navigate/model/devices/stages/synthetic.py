@@ -237,6 +237,25 @@ class SyntheticStage(StageBase):
         """Stop a scan."""
         pass
 
+    def set_stack_waveform(self, positions, sweep_times, ramp=False):
+        """Drive the stage through a z-stack with the DAQ.
+
+        Parameters
+        ----------
+        positions : list
+            Stage position of each plane in microns.
+        sweep_times : dict
+            Dictionary of sweep times for each channel
+        ramp : bool
+            Ramp continuously between positions instead of stepping.
+
+        Returns
+        -------
+        result : bool
+            success or failed
+        """
+        return True
+
     def update_waveform(self, waveform_dict):
         print("*** update waveform:", waveform_dict.keys())
         pass
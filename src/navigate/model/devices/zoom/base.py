@@ -37,6 +37,8 @@ import logging
 
 # Local Imports
 from navigate.tools.decorators import log_initialization
+from navigate.model.devices.device_state import ARGUMENT, DeviceStateMixin
+from navigate.model.concurrency.device_commands import submit_device_command
 
 # Logger Setup
 p = __name__.split(".")[1]
@@ -44,9 +46,15 @@ logger = logging.getLogger(p)
 
 
 @log_initialization
-class ZoomBase:
+class ZoomBase(DeviceStateMixin):
     """ZoomBase parent class."""
 
+    #: dict: Commands that are skipped when the zoom is already in that state.
+    cached_commands = {
+        "set_zoom": ("zoom", ARGUMENT, ()),
+        "move": (None, None, ("zoom",)),
+    }
+
     def __init__(self, microscope_name, device_controller, configuration):
         """Initialize the parent zoom class.
 
@@ -60,6 +68,9 @@ class ZoomBase:
             Global configuration of the microscope
         """
 
+        #: object: Hardware device the zoom talks through.
+        self.device_connection = device_controller
+
         #: dict: Configuration dictionary for the device.
         self.configuration = configuration["configuration"]["microscopes"][
             microscope_name
@@ -138,6 +149,23 @@ class ZoomBase:
             logger.error(f"Zoom designation, {zoom}, not in the configuration")
             raise ValueError("Zoom designation not in the configuration")
 
+    def set_zoom_async(self, zoom, wait_until_done=True):
+        """Change the microscope zoom without blocking the calling thread.
+
+        Parameters
+        ----------
+        zoom : str
+            Zoom designation.
+        wait_until_done : bool
+            Whether the command only completes once the zoom is on target.
+
+        Returns
+        -------
+        future : concurrent.futures.Future
+            Resolves when set_zoom() returns.
+        """
+        return submit_device_command(self, self.set_zoom, zoom, wait_until_done)
+
     def move(self, position=0, wait_until_done=False):
         """Move the Zoom Servo
 
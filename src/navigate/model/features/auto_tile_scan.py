@@ -36,6 +36,7 @@
 
 # Local application imports
 from navigate.model.features.autofocus import Autofocus
+from navigate.config.config import bump_configuration_version
 
 
 class CalculateFocusRange:
@@ -111,7 +112,7 @@ class CalculateFocusRange:
         self.focus_end_pos = None
 
         # get current z pos, calculate last z pos in a stack
-        stage_pos = self.model.get_stage_position()
+        stage_pos = self.model.get_stage_position(settled=True)
         #: float: The current z position of the stage.
         self.current_z_pos = stage_pos["z_pos"]
         #: float: The current f position of the stage.
@@ -146,6 +147,7 @@ class CalculateFocusRange:
                     + self.focus_end_pos
                     - self.focus_start_pos
                 )
+                bump_configuration_version(self.model.configuration)
 
     def end_func_signal(self):
         """Finalize the signal acquisition stage.
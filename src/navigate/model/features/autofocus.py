@@ -41,6 +41,7 @@ from scipy.stats import linregress
 
 # Local imports
 from navigate.model.features.feature_container import load_features
+from navigate.config.config import bump_configuration_version
 from navigate.model.analysis.image_contrast import fast_normalized_dct_shannon_entropy
 
 
@@ -462,6 +463,7 @@ class Autofocus:
             self.model.configuration["experiment"]["StageParameters"][
                 self.device_ref
             ] = self.focus_pos
+            bump_configuration_version(self.model.configuration)
 
             # Tell the controller to update the view
             stage_position = dict(
@@ -484,6 +486,7 @@ class Autofocus:
                 remote_focus_constants[laser]["offset"] = (
                     float(remote_focus_constants[laser]["offset"]) + self.focus_pos
                 )
+            bump_configuration_version(self.model.configuration)
 
         # Log the new focus position
         # self.model.logger.info("***********final focus: %s" % self.focus_pos)
@@ -0,0 +1,378 @@
+# Copyright (c) 2021-2024  The University of Texas Southwestern Medical Center.
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted for academic and research use only (subject to the
+# limitations in the disclaimer below) provided that the following conditions are met:
+
+#      * Redistributions of source code must retain the above copyright notice,
+#      this list of conditions and the following disclaimer.
+
+#      * Redistributions in binary form must reproduce the above copyright
+#      notice, this list of conditions and the following disclaimer in the
+#      documentation and/or other materials provided with the distribution.
+
+#      * Neither the name of the copyright holders nor the names of its
+#      contributors may be used to endorse or promote products derived from this
+#      software without specific prior written permission.
+
+# NO EXPRESS OR IMPLIED LICENSES TO ANY PARTY'S PATENT RIGHTS ARE GRANTED BY
+# THIS LICENSE. THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND
+# CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A
+# PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR
+# BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER
+# IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+#
+
+# Standard Library Imports
+import logging
+from threading import Event
+
+# Third Party Imports
+
+# Local Imports
+from navigate.model.features.image_writer import ImageWriter
+from navigate.tools.multipos_table_tools import get_ordered_positions
+
+# Logger Setup
+p = __name__.split(".")[1]
+logger = logging.getLogger(p)
+
+
+class ChannelSequenceAcquisition:
+    """ChannelSequenceAcquisition class for z-stacks without channel switching.
+
+    The waveforms of all selected channels are concatenated into one DAQ program,
+    with the lasers switched by DAQ lines during the exposure of each channel.
+    One DAQ run acquires every channel of a plane, so software only moves the
+    stage between planes and positions.
+
+    Notes:
+    ------
+    - The lasers of all selected channels must be switched by the DAQ, e.g.
+      LaserNI. The synthetic laser emulates the lines given in its configuration.
+
+    - Filter wheels can not be switched by the DAQ, so all selected channels must
+      use the same filters.
+
+    - The camera exposes for the longest channel, and every channel is given the
+      longest sweep time. The exposure of each channel is set by its laser.
+
+    - The focus is set once per position, the defocus of the first channel is used
+      for all channels.
+
+    - Channels are cycled per z plane.
+    """
+
+    def __init__(self, model, saving_flag=False, saving_dir="z-stack"):
+        """Initialize the ChannelSequenceAcquisition class.
+
+        Parameters:
+        ----------
+        model : MicroscopeModel
+            The microscope model object.
+        saving_flag : bool, optional
+            Flag to enable image saving. Default is False.
+        saving_dir : str, optional
+            The sub-directory for saving images. Default is "z-stack".
+        """
+        #: MicroscopeModel: The microscope model.
+        self.model = model
+
+        #: int: The number of z steps in a stack.
+        self.number_z_steps = 0
+
+        #: float: The start z position of the stack, relative to the position.
+        self.start_z_position = 0
+
+        #: float: The z step size in microns.
+        self.z_step_size = 0
+
+        #: float: The start focus of the stack, relative to the position.
+        self.start_focus = 0
+
+        #: list: Positions (x, y, z, theta, f) to acquire.
+        self.positions = []
+
+        #: float: Defocus used for all channels.
+        self.defocus = 0
+
+        #: list: Numbers of the selected channels.
+        self.channel_ids = []
+
+        #: int: The index of the position being acquired.
+        self.current_position_idx = 0
+
+        #: int: The index of the z plane being acquired.
+        self.current_z_idx = 0
+
+        #: Event: Set by the data thread when all channels of a plane arrived.
+        self.plane_received = Event()
+
+        #: int: Frames received by the data thread.
+        self.received_frames = 0
+
+        #: int: Frames expected by the data thread.
+        self.total_frames = 0
+
+        #: ImageWriter: An image writer object for saving images.
+        self.image_writer = None
+        if saving_flag:
+            self.image_writer = ImageWriter(model, sub_dir=saving_dir)
+
+        #: dict: A dictionary defining the configuration for the acquisition.
+        self.config_table = {
+            "signal": {
+                "init": self.pre_signal_func,
+                "main": self.signal_func,
+                "main-response": self.signal_response_func,
+                "end": self.signal_end,
+                "cleanup": self.cleanup,
+            },
+            "data": {
+                "init": self.pre_data_func,
+                "main": self.in_data_func,
+                "end": self.end_data_func,
+                "cleanup": self.cleanup_data_func,
+            },
+            "node": {"node_type": "multi-step", "device_related": True},
+        }
+
+    def pre_signal_func(self):
+        """Read the stack parameters and load the channel sequence into the DAQ."""
+        microscope = self.model.active_microscope
+        microscope_state = self.model.configuration["experiment"]["MicroscopeState"]
+
+        self.number_z_steps = int(microscope_state["number_z_steps"])
+        self.start_z_position = float(microscope_state["start_position"])
+        self.z_step_size = float(microscope_state["step_size"])
+        self.start_focus = float(microscope_state["start_focus"])
+        selected_channels = [
+            (k, v) for k, v in microscope_state["channels"].items() if v["is_selected"]
+        ]
+        self.channel_ids = [int(k[len("channel_") :]) for k, _ in selected_channels]
+        defocus = set(float(v["defocus"]) for _, v in selected_channels)
+        self.defocus = float(selected_channels[0][1]["defocus"])
+        if len(defocus) > 1:
+            logger.warning(
+                "ChannelSequenceAcquisition: the defocus of the first channel is "
+                "used for all channels."
+            )
+
+        pos_dict = self.model.get_stage_position(settled=True)
+
+        #: float: The f position to restore at the end.
+        self.restore_f = pos_dict["f_pos"]
+
+        # position: x, y, z, theta, f
+        if bool(microscope_state["is_multiposition"]):
+            self.positions = get_ordered_positions(
+                self.model.configuration["experiment"]
+            )
+        else:
+            self.positions = [
+                [
+                    float(pos_dict["x_pos"]),
+                    float(pos_dict["y_pos"]),
+                    float(microscope_state.get("stack_z_origin", pos_dict["z_pos"])),
+                    float(pos_dict["theta_pos"]),
+                    float(
+                        microscope_state.get("stack_focus_origin", pos_dict["f_pos"])
+                    ),
+                ]
+            ]
+
+        # filter wheels and camera settings of the first channel
+        microscope.central_focus = None
+        microscope.current_channel = 0
+        for microscope_name in self.model.virtual_microscopes:
+            self.model.virtual_microscopes[microscope_name].current_channel = 0
+            self.model.virtual_microscopes[microscope_name].prepare_next_channel()
+        microscope.prepare_next_channel(update_daq_task_flag=False)
+
+        if not microscope.prepare_channel_sequence():
+            logger.error(
+                "ChannelSequenceAcquisition: the selected channels can not be "
+                "played as one DAQ program."
+            )
+            self.model.stop_acquisition = True
+            self.model.event_queue.put(
+                (
+                    "warning",
+                    "The selected channels can not be switched by the DAQ! "
+                    "Please check the lasers and filters of the channels.",
+                )
+            )
+            return
+
+        self.current_position_idx = 0
+        self.current_z_idx = 0
+        logger.info(
+            f"ChannelSequenceAcquisition. Positions {self.positions}, "
+            f"Channels {self.channel_ids}, "
+            f"Starting Z-Position {self.start_z_position}, "
+            f"Step Size {self.z_step_size}"
+        )
+
+    def get_z_position(self, position_idx, z_idx):
+        """Get the z position of a plane.
+
+        Parameters
+        ----------
+        position_idx : int
+            Index of the position.
+        z_idx : int
+            Index of the plane in the stack.
+
+        Returns
+        -------
+        z_position : float
+            The z position of the plane in microns.
+        """
+        return (
+            self.start_z_position
+            + float(self.positions[position_idx][2])
+            + z_idx * self.z_step_size
+        )
+
+    def signal_func(self):
+        """Move the stage to the next plane.
+
+        Returns:
+        -------
+        bool
+            A boolean value indicating whether to continue the acquisition.
+        """
+        if self.model.stop_acquisition:
+            return False
+
+        pos_dict = {
+            "z_abs": self.get_z_position(self.current_position_idx, self.current_z_idx)
+        }
+        if self.current_z_idx == 0:
+            x, y, _, theta, f = self.positions[self.current_position_idx]
+            pos_dict.update(
+                {
+                    "x_abs": x,
+                    "y_abs": y,
+                    "theta_abs": theta,
+                    "f_abs": self.start_focus + f + self.defocus,
+                }
+            )
+        self.plane_received.clear()
+        self.model.move_stage(pos_dict, wait_until_done=True)
+        return True
+
+    def signal_response_func(self, *args):
+        """Wait until the data thread received every channel of the plane.
+
+        One DAQ run triggers a frame per channel, so the frame counter of the model
+        is advanced past these frames as well.
+
+        Returns:
+        -------
+        bool
+            A boolean value indicating whether the plane was received.
+        """
+        while not self.plane_received.wait(0.1):
+            if self.model.stop_acquisition:
+                return False
+
+        self.model.frame_id = (
+            self.model.frame_id + len(self.channel_ids) - 1
+        ) % self.model.number_of_frames
+        return True
+
+    def signal_end(self):
+        """Move on to the next plane or position.
+
+        Returns:
+        -------
+        bool
+            A boolean value indicating whether to end the current node.
+        """
+        if self.model.stop_acquisition:
+            return True
+
+        self.current_z_idx += 1
+        if self.current_z_idx >= self.number_z_steps:
+            self.current_z_idx = 0
+            self.current_position_idx += 1
+
+        if self.current_position_idx >= len(self.positions):
+            self.current_position_idx = 0
+            self.model.move_stage({"f_abs": self.restore_f}, wait_until_done=False)
+            return True
+
+        return False
+
+    def cleanup(self):
+        """Play one channel per DAQ program again."""
+        self.model.active_microscope.clear_channel_sequence()
+
+    def pre_data_func(self):
+        """Initialize the count of received and expected frames."""
+        self.received_frames = 0
+        self.total_frames = (
+            len(self.channel_ids) * self.number_z_steps * len(self.positions)
+        )
+
+    def in_data_func(self, frame_ids):
+        """Record the position and channel of each frame and save the frames.
+
+        Parameters:
+        ----------
+        frame_ids : list
+            A list of frame IDs received during data acquisition.
+        """
+        channels = max(len(self.channel_ids), 1)
+        for frame_id in frame_ids:
+            # one DAQ run triggers every channel of a plane, the signal thread only
+            # records the position and channel of its first frame
+            channel_idx = self.received_frames % channels
+            plane_idx = self.received_frames // channels
+            z_idx = plane_idx % self.number_z_steps
+            position_idx = min(
+                plane_idx // self.number_z_steps, len(self.positions) - 1
+            )
+            x, y, _, theta, f = self.positions[position_idx]
+            self.model.data_buffer_positions[frame_id][:] = [
+                x,
+                y,
+                self.get_z_position(position_idx, z_idx),
+                theta,
+                self.start_focus + f + self.defocus,
+            ]
+            if self.channel_ids:
+                self.model.data_buffer_channels[frame_id] = self.channel_ids[
+                    channel_idx
+                ]
+            self.received_frames += 1
+            if channel_idx == channels - 1:
+                self.plane_received.set()
+
+        self.model.mark_saving_flags(frame_ids)
+        if self.image_writer is not None:
+            self.image_writer.save_image(frame_ids)
+
+    def end_data_func(self):
+        """Check if all expected frames have been received.
+
+        Returns:
+        -------
+        bool
+            A boolean value indicating whether all expected frames have been
+            received.
+        """
+        return self.received_frames >= self.total_frames
+
+    def cleanup_data_func(self):
+        """Clean up the image writer, if image saving is enabled."""
+        if self.image_writer:
+            self.image_writer.cleanup()
@@ -41,7 +41,12 @@ import logging
 
 # Local application imports
 from .image_writer import ImageWriter
+from navigate.config.config import (
+    bump_configuration_version,
+    get_configuration_snapshot,
+)
 from navigate.tools.common_functions import VariableWithLock
+from navigate.tools.multipos_table_tools import get_ordered_positions
 
 # Logger Setup
 p = __name__.split(".")[1]
@@ -125,6 +130,7 @@ class ChangeResolution:
         self.model.configuration["experiment"]["MicroscopeState"][
             "zoom"
         ] = self.zoom_value
+        bump_configuration_version(self.model.configuration)
         self.model.change_resolution(self.resolution_mode)
         logger.debug(f"current resolution is {self.resolution_mode}")
         logger.debug(
@@ -132,7 +138,7 @@ class ChangeResolution:
         )
         # prepare active microscope
         waveform_dict = self.model.active_microscope.prepare_acquisition()
-        self.model.event_queue.put(("waveform", waveform_dict))
+        self.model.send_waveforms(waveform_dict)
         # resume data thread
         self.model.resume_data_thread()
         return True
@@ -545,19 +551,32 @@ class PrepareNextChannel:
 
     - The `config_table` attribute is used to define the configuration for the
     channel preparation process, specifically the main preparation function.
+
+    - When pipelined, the filter wheels, lasers and focus stage keep switching in
+    the background after this node returns, and the model waits for them right
+    before the next frame is triggered. The switch overlaps with the camera and
+    DAQ setup of this node and with the nodes that run after it, e.g. the stage
+    moves of a z-stack. If this node is the last one before the frame, only the
+    camera and DAQ setup are hidden.
     """
 
-    def __init__(self, model):
+    def __init__(self, model, pipelined=True):
         """Initialize the PrepareNextChannel class.
 
         Parameters:
         ----------
         model : MicroscopeModel
             The microscope model object used for channel preparation.
+        pipelined : bool, optional
+            Return before the devices have switched channels. Only use it when the
+            next frame is acquired by the model's snap_image(). Default is True.
         """
         #: MicroscopeModel: Microscope model associated with the channel preparation.
         self.model = model
 
+        #: bool: Leave the devices switching in the background.
+        self.pipelined = pipelined
+
         #: dict: A dictionary defining the configuration for the channel preparation
         self.config_table = {"signal": {"main": self.signal_func}}
 
@@ -572,11 +591,14 @@ class PrepareNextChannel:
         bool
             A boolean value indicating the success of the channel preparation process.
         """
+        wait = not self.pipelined
         # prepare virtual microscopes before the primary microscope
         for microscope_name in self.model.virtual_microscopes:
-            self.model.virtual_microscopes[microscope_name].prepare_next_channel()
+            self.model.virtual_microscopes[microscope_name].prepare_next_channel(
+                wait=wait
+            )
 
-        self.model.active_microscope.prepare_next_channel()
+        self.model.active_microscope.prepare_next_channel(wait=wait)
 
         return True
 
@@ -638,9 +660,9 @@ class MoveToNextPositionInMultiPositionTable:
         self.current_idx = 0
 
         #: dict: A dictionary defining the configuration for the position control
-        self.multiposition_table = self.model.configuration["experiment"][
-            "MultiPositions"
-        ]
+        self.multiposition_table = get_ordered_positions(
+            self.model.configuration["experiment"]
+        )
 
         #: int: The total number of positions in the multi-position table.
         self.position_count = self.model.configuration["experiment"]["MicroscopeState"][
@@ -751,7 +773,7 @@ class MoveToNextPositionInMultiPositionTable:
         )
         # pause data thread if necessary
         if self.current_idx == 0:
-            temp = self.model.get_stage_position()
+            temp = self.model.get_stage_position(settled=True)
             pre_stage_pos = dict(
                 map(
                     lambda k: (k, temp[f"{k}_pos"]),
@@ -884,8 +906,7 @@ class StackPause:
             pause_time -= 2 * current_exposure_time
             while pause_time > 0:
                 pt = min(pause_time, 0.1)
-                time.sleep(pt)
-                if self.model.stop_acquisition:
+                if self.model.cancel_token.wait(pt) or self.model.stop_acquisition:
                     self.model.resume_data_thread()
                     return
                 pause_time -= 0.1
@@ -1034,7 +1055,7 @@ class ZStackAcquisition:
         self.f_stack_distance = abs(end_focus - self.start_focus)
 
         # restore z, f
-        pos_dict = self.model.get_stage_position()
+        pos_dict = self.model.get_stage_position(settled=True)
 
         #: float: The z position of the channel being acquired in the z-stack
         self.restore_z = pos_dict["z_pos"]
@@ -1044,7 +1065,9 @@ class ZStackAcquisition:
 
         # position: x, y, z, theta, f
         if bool(microscope_state["is_multiposition"]):
-            self.positions = self.model.configuration["experiment"]["MultiPositions"]
+            self.positions = get_ordered_positions(
+                self.model.configuration["experiment"]
+            )
         else:
             self.positions = [
                 [
@@ -1119,6 +1142,7 @@ class ZStackAcquisition:
         if self.model.stop_acquisition:
             return False
         data_thread_is_paused = False
+        pos_dict = {}
 
         # move stage X, Y, Theta
         if self.need_to_move_new_position:
@@ -1185,8 +1209,6 @@ class ZStackAcquisition:
                 self.model.pause_data_thread()
                 data_thread_is_paused = True
 
-            self.model.move_stage(pos_dict, wait_until_done=True)
-
         if self.need_to_move_z_position:
             # move z, f
             # self.model.pause_data_thread()
@@ -1195,14 +1217,18 @@ class ZStackAcquisition:
                 self.model.pause_data_thread()
                 logger.info("Data thread paused.")
 
-            self.model.move_stage(
+            pos_dict.update(
                 {
                     "z_abs": self.current_z_position,
                     "f_abs": self.current_focus_position,
-                },
-                wait_until_done=True,
+                }
             )
 
+        if pos_dict:
+            # X, Y, Theta and Z, F are sent in one move, so stages on different
+            # devices travel to the next position at the same time.
+            self.model.move_stage(pos_dict, wait_until_done=True)
+
         if self.should_pause_data_thread:
             self.model.resume_data_thread()
             self.should_pause_data_thread = False
@@ -1417,19 +1443,20 @@ class FindTissueSimple2D:
             calc_num_tiles,
         )
 
+        configuration = get_configuration_snapshot(self.model.configuration)
         for idx in frame_ids:
             img = self.model.data_buffer[idx]
 
             # Get current mag
-            microscope_name = self.model.configuration["experiment"]["MicroscopeState"][
+            microscope_name = configuration["experiment"]["MicroscopeState"][
                 "microscope_name"
             ]
-            zoom = self.model.configuration["experiment"]["MicroscopeState"]["zoom"]
-            curr_pixel_size = self.model.configuration["configuration"]["microscopes"][
+            zoom = configuration["experiment"]["MicroscopeState"]["zoom"]
+            curr_pixel_size = configuration["configuration"]["microscopes"][
                 microscope_name
             ]["zoom"][zoom]["pixel_size"]
             # get target pixel size
-            pixel_size = self.model.configuration["configuration"]["microscopes"][
+            pixel_size = configuration["configuration"]["microscopes"][
                 self.target_resolution
             ]["zoom"][self.target_zoom]["pixel_size"]
 
@@ -1456,12 +1483,12 @@ class FindTissueSimple2D:
             xd, yd = abs(x_start - x_end), y_end - y_start
 
             # grab z, theta, f starting positions
-            z_start = self.model.configuration["experiment"]["StageParameters"]["z"]
-            r_start = self.model.configuration["experiment"]["StageParameters"]["theta"]
+            z_start = configuration["experiment"]["StageParameters"]["z"]
+            r_start = configuration["experiment"]["StageParameters"]["theta"]
             if self.target_resolution == "Nanoscale":
                 f_start = 0  # very different range of focus values in high-res
             else:
-                f_start = self.model.configuration["experiment"]["StageParameters"]["f"]
+                f_start = configuration["experiment"]["StageParameters"]["f"]
 
             # Update x and y start to initialize from the upper-left corner of the
             # current image, since this is how np.where indexed them. The + 0.5 in
@@ -1469,81 +1496,79 @@ class FindTissueSimple2D:
             # field of view.
             curr_fov_x = (
                 float(
-                    self.model.configuration["experiment"]["CameraParameters"][
-                        microscope_name
-                    ]["x_pixels"]
+                    configuration["experiment"]["CameraParameters"][microscope_name][
+                        "x_pixels"
+                    ]
                 )
                 * curr_pixel_size
             )
             curr_fov_y = (
                 float(
-                    self.model.configuration["experiment"]["CameraParameters"][
-                        microscope_name
-                    ]["y_pixels"]
+                    configuration["experiment"]["CameraParameters"][microscope_name][
+                        "y_pixels"
+                    ]
                 )
                 * curr_pixel_size
             )
             x_start += (
-                self.model.configuration["experiment"]["StageParameters"]["x"]
-                + curr_fov_x / 2
+                configuration["experiment"]["StageParameters"]["x"] + curr_fov_x / 2
             )
             y_start += (
-                self.model.configuration["experiment"]["StageParameters"]["y"]
-                - curr_fov_y / 2
+                configuration["experiment"]["StageParameters"]["y"] - curr_fov_y / 2
             )
 
             # stage offset
             x_start += float(
-                self.model.configuration["configuration"]["microscopes"][
-                    self.target_resolution
-                ]["stage"]["x_offset"]
+                configuration["configuration"]["microscopes"][self.target_resolution][
+                    "stage"
+                ]["x_offset"]
             ) - float(
-                self.model.configuration["configuration"]["microscopes"][
-                    microscope_name
-                ]["stage"]["x_offset"]
+                configuration["configuration"]["microscopes"][microscope_name]["stage"][
+                    "x_offset"
+                ]
             )
             y_start += float(
-                self.model.configuration["configuration"]["microscopes"][
-                    self.target_resolution
-                ]["stage"]["y_offset"]
+                configuration["configuration"]["microscopes"][self.target_resolution][
+                    "stage"
+                ]["y_offset"]
             ) - float(
-                self.model.configuration["configuration"]["microscopes"][
-                    microscope_name
-                ]["stage"]["y_offset"]
+                configuration["configuration"]["microscopes"][microscope_name]["stage"][
+                    "y_offset"
+                ]
             )
             z_start += float(
-                self.model.configuration["configuration"]["microscopes"][
-                    self.target_resolution
-                ]["stage"]["z_offset"]
+                configuration["configuration"]["microscopes"][self.target_resolution][
+                    "stage"
+                ]["z_offset"]
             ) - float(
-                self.model.configuration["configuration"]["microscopes"][
-                    microscope_name
-                ]["stage"]["z_offset"]
+                configuration["configuration"]["microscopes"][microscope_name]["stage"][
+                    "z_offset"
+                ]
             )
             r_start += float(
-                self.model.configuration["configuration"]["microscopes"][
-                    self.target_resolution
-                ]["stage"]["r_offset"]
+                configuration["configuration"]["microscopes"][self.target_resolution][
+                    "stage"
+                ]["r_offset"]
             ) - float(
-                self.model.configuration["configuration"]["microscopes"][
-                    microscope_name
-                ]["stage"]["r_offset"]
+                configuration["configuration"]["microscopes"][microscope_name]["stage"][
+                    "r_offset"
+                ]
             )
 
             # grid out the 2D space
             fov_x = (
                 float(
-                    self.model.configuration["experiment"]["CameraParameters"][
-                        microscope_name
-                    ]["x_pixels"]
+                    configuration["experiment"]["CameraParameters"][microscope_name][
+                        "x_pixels"
+                    ]
                 )
                 * pixel_size
             )
             fov_y = (
                 float(
-                    self.model.configuration["experiment"]["CameraParameters"][
-                        microscope_name
-                    ]["y_pixels"]
+                    configuration["experiment"]["CameraParameters"][microscope_name][
+                        "y_pixels"
+                    ]
                 )
                 * pixel_size
             )
@@ -1691,13 +1716,14 @@ class SetCameraParameters:
 
         if not update_flag:
             return True
+        bump_configuration_version(self.model.configuration)
         # pause data thread
         self.model.pause_data_thread()
         # end active microscope
         self.model.active_microscope.end_acquisition()
         # set parameters and prepare active microscope
         waveform_dict = self.model.active_microscope.prepare_acquisition()
-        self.model.event_queue.put(("waveform", waveform_dict))
+        self.model.send_waveforms(waveform_dict)
         self.model.event_queue.put(("display_camera_parameters", updated_value))
         # prepare channel
         self.model.active_microscope.prepare_next_channel()
@@ -0,0 +1,470 @@
+# Copyright (c) 2021-2024  The University of Texas Southwestern Medical Center.
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted for academic and research use only (subject to the
+# limitations in the disclaimer below) provided that the following conditions are met:
+
+#      * Redistributions of source code must retain the above copyright notice,
+#      this list of conditions and the following disclaimer.
+
+#      * Redistributions in binary form must reproduce the above copyright
+#      notice, this list of conditions and the following disclaimer in the
+#      documentation and/or other materials provided with the distribution.
+
+#      * Neither the name of the copyright holders nor the names of its
+#      contributors may be used to endorse or promote products derived from this
+#      software without specific prior written permission.
+
+# NO EXPRESS OR IMPLIED LICENSES TO ANY PARTY'S PATENT RIGHTS ARE GRANTED BY
+# THIS LICENSE. THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND
+# CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A
+# PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR
+# BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER
+# IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+#
+
+# Standard Library Imports
+import logging
+
+# Third Party Imports
+
+# Local Imports
+from navigate.model.features.common_features import PrepareNextChannel
+from navigate.model.features.image_writer import ImageWriter
+from navigate.tools.multipos_table_tools import get_ordered_positions
+
+# Logger Setup
+p = __name__.split(".")[1]
+logger = logging.getLogger(p)
+
+
+class ConstantVelocityAcquisition:
+    """ConstantVelocityAcquisition class for stage-scanned z-stacks.
+
+    Instead of stepping the z stage and snapping every plane, the stage sweeps
+    through the whole stack at constant velocity and emits a trigger pulse every
+    z step. The pulses trigger the DAQ, and thereby the camera, so there is no
+    settle time and no serial command per plane.
+
+    Notes:
+    ------
+    - The z stage must support the scan state machine (scanr, start_scan and
+      stop_scan), e.g. an ASI Tiger controller.
+
+    - The stage trigger output must be wired to the DAQ input given by
+      `trigger_source`, or by `stage.scan_trigger_source` in the microscope
+      configuration. Without a trigger source, frames are triggered by the DAQ as
+      usual, which is how the feature runs on synthetic hardware.
+
+    - Every channel and every position is one scan. Channels are always cycled
+      per stack, and the focus stays at its start value during a scan.
+
+    - The z position of each frame is computed from the scan parameters and
+      written into the model's data_buffer_positions.
+    """
+
+    def __init__(
+        self,
+        model,
+        trigger_source=None,
+        speed_factor=0.9,
+        saving_flag=False,
+        saving_dir="stage-scan",
+    ):
+        """Initialize the ConstantVelocityAcquisition class.
+
+        Parameters:
+        ----------
+        model : MicroscopeModel
+            The microscope model object.
+        trigger_source : str, optional
+            DAQ terminal that receives the stage trigger pulses, e.g.
+            "/PCIe-6738/PFI1". Default is the stage configuration's
+            scan_trigger_source.
+        speed_factor : float, optional
+            Fraction of the velocity at which pulses come exactly one frame apart.
+            Values below 1 leave the DAQ time to rearm between frames.
+            Default is 0.9.
+        saving_flag : bool, optional
+            Flag to enable image saving. Default is False.
+        saving_dir : str, optional
+            The sub-directory for saving images. Default is "stage-scan".
+        """
+        #: MicroscopeModel: The microscope model.
+        self.model = model
+
+        #: str: DAQ terminal that receives the stage trigger pulses.
+        self.trigger_source = trigger_source
+
+        #: float: Fraction of the frame-limited stage velocity to scan at.
+        self.speed_factor = speed_factor
+
+        #: StageBase: The stage that scans the z axis.
+        self.stage = None
+
+        #: float: The original velocity of the z axis.
+        self.stage_speed = None
+
+        #: str: The controller's name of the z axis.
+        self.speed_axis = "z"
+
+        #: int: The number of z steps in a scan.
+        self.number_z_steps = 0
+
+        #: float: The start z position of the stack, relative to the position.
+        self.start_z_position = 0
+
+        #: float: The z step size in microns.
+        self.z_step_size = 0
+
+        #: float: The start focus of the stack, relative to the position.
+        self.start_focus = 0
+
+        #: list: Positions (x, y, z, theta, f) to scan.
+        self.positions = []
+
+        #: list: Defocus of the selected channels.
+        self.defocus = []
+
+        #: int: The number of selected channels.
+        self.channels = 1
+
+        #: int: The index of the position being scanned.
+        self.current_position_idx = 0
+
+        #: int: The index of the channel being scanned.
+        self.current_channel_in_list = 0
+
+        #: int: Frames triggered in the current scan.
+        self.scanned_frames = 0
+
+        #: bool: Whether the next frame starts a new scan.
+        self.need_to_start_scan = True
+
+        #: bool: Whether the stage is scanning.
+        self.is_scanning = False
+
+        #: int: Frames received by the data thread.
+        self.received_frames = 0
+
+        #: int: Frames expected by the data thread.
+        self.total_frames = 0
+
+        #: ImageWriter: An image writer object for saving images.
+        self.image_writer = None
+        if saving_flag:
+            self.image_writer = ImageWriter(model, sub_dir=saving_dir)
+
+        # The scans are triggered by the stage, so the devices must be ready.
+        #: PrepareNextChannel: Switches channels between scans.
+        self.prepare_next_channel = PrepareNextChannel(model, pipelined=False)
+
+        #: dict: A dictionary defining the configuration for the acquisition.
+        self.config_table = {
+            "signal": {
+                "init": self.pre_signal_func,
+                "main": self.signal_func,
+                "end": self.signal_end,
+                "cleanup": self.cleanup,
+            },
+            "data": {
+                "init": self.pre_data_func,
+                "main": self.in_data_func,
+                "end": self.end_data_func,
+                "cleanup": self.cleanup_data_func,
+            },
+            "node": {"node_type": "multi-step", "device_related": True},
+        }
+
+    def pre_signal_func(self):
+        """Read the stack parameters, check the stage and set up triggering."""
+        microscope = self.model.active_microscope
+        microscope_state = self.model.configuration["experiment"]["MicroscopeState"]
+
+        if microscope_state["stack_cycling_mode"] != "per_stack":
+            logger.warning(
+                "ConstantVelocityAcquisition always cycles channels per stack."
+            )
+
+        self.channels = microscope_state["selected_channels"]
+        self.number_z_steps = int(microscope_state["number_z_steps"])
+        self.start_z_position = float(microscope_state["start_position"])
+        self.z_step_size = float(microscope_state["step_size"])
+        self.start_focus = float(microscope_state["start_focus"])
+        self.defocus = [
+            v["defocus"]
+            for v in microscope_state["channels"].values()
+            if v["is_selected"]
+        ]
+
+        pos_dict = self.model.get_stage_position(settled=True)
+
+        #: float: The z position to restore at the end.
+        self.restore_z = pos_dict["z_pos"]
+
+        #: float: The f position to restore at the end.
+        self.restore_f = pos_dict["f_pos"]
+
+        # position: x, y, z, theta, f
+        if bool(microscope_state["is_multiposition"]):
+            self.positions = get_ordered_positions(
+                self.model.configuration["experiment"]
+            )
+        else:
+            self.positions = [
+                [
+                    float(pos_dict["x_pos"]),
+                    float(pos_dict["y_pos"]),
+                    float(microscope_state.get("stack_z_origin", pos_dict["z_pos"])),
+                    float(pos_dict["theta_pos"]),
+                    float(
+                        microscope_state.get("stack_focus_origin", pos_dict["f_pos"])
+                    ),
+                ]
+            ]
+
+        self.stage = microscope.stages.get("z")
+        if not all(
+            hasattr(self.stage, f) for f in ("scanr", "start_scan", "stop_scan")
+        ):
+            logger.error(
+                f"ConstantVelocityAcquisition: {self.stage} can not scan the z axis."
+            )
+            self.model.stop_acquisition = True
+            self.model.event_queue.put(
+                ("warning", "The z stage does not support stage scanning!")
+            )
+            return
+        self.stage_speed = self.stage.get_speed("z")
+        self.speed_axis = self.stage.axes_mapping.get("z", "z")
+
+        if self.trigger_source is None:
+            self.trigger_source = microscope.configuration["configuration"][
+                "microscopes"
+            ][microscope.microscope_name]["stage"].get("scan_trigger_source", None)
+        if self.trigger_source is not None:
+            microscope.daq.set_external_trigger(self.trigger_source)
+        else:
+            logger.info(
+                "ConstantVelocityAcquisition: no stage trigger source, "
+                "frames are triggered by the DAQ."
+            )
+
+        microscope.central_focus = None
+        microscope.current_channel = 0
+        for microscope_name in self.model.virtual_microscopes:
+            self.model.virtual_microscopes[microscope_name].current_channel = 0
+        self.prepare_next_channel.signal_func()
+
+        self.current_position_idx = 0
+        self.current_channel_in_list = 0
+        self.scanned_frames = 0
+        self.need_to_start_scan = True
+        logger.info(
+            f"ConstantVelocityAcquisition. Positions {self.positions}, "
+            f"Starting Z-Position {self.start_z_position}, "
+            f"Step Size {self.z_step_size}"
+        )
+
+    def get_scan_range(self, position_idx):
+        """Get the z range of a scan.
+
+        Parameters
+        ----------
+        position_idx : int
+            Index of the position.
+
+        Returns
+        -------
+        start_z : float
+            The z position of the first plane in microns.
+        end_z : float
+            The z position of the last plane in microns.
+        """
+        start_z = self.start_z_position + float(self.positions[position_idx][2])
+        end_z = start_z + (self.number_z_steps - 1) * self.z_step_size
+        return start_z, end_z
+
+    def get_scan_speed(self):
+        """Get the z velocity at which the stage triggers one frame per z step.
+
+        Returns
+        -------
+        speed : float
+            Stage velocity in mm/s.
+        """
+        _, sweep_times = self.model.active_microscope.calculate_exposure_sweep_times()
+        channel_key = f"channel_{self.model.active_microscope.current_channel}"
+        frame_period = sweep_times[channel_key]
+        return self.speed_factor * abs(self.z_step_size) / 1000 / frame_period
+
+    def start_scan(self):
+        """Move to the current position and start the stage scan.
+
+        Returns
+        -------
+        bool
+            True if the scan has been started.
+        """
+        position = dict(
+            zip(
+                ["x", "y", "z", "theta", "f"],
+                self.positions[self.current_position_idx],
+            )
+        )
+        focus = self.start_focus + position["f"]
+        if self.defocus:
+            focus += self.defocus[self.current_channel_in_list]
+        start_z, end_z = self.get_scan_range(self.current_position_idx)
+
+        self.model.move_stage(
+            {
+                "x_abs": position["x"],
+                "y_abs": position["y"],
+                "theta_abs": position["theta"],
+                "z_abs": start_z,
+                "f_abs": focus,
+            },
+            wait_until_done=True,
+        )
+
+        microscope = self.model.active_microscope
+        with microscope.stage_position_service.stage_lock(self.stage):
+            success = self.stage.scanr(
+                start_z / 1000, end_z / 1000, abs(self.z_step_size) / 1000, axis="z"
+            )
+            if success:
+                # velocities are set on the controller's axis names
+                self.stage.set_speed({self.speed_axis: self.get_scan_speed()})
+                self.stage.start_scan("z")
+        # the z position is unknown until the stage is read again
+        microscope.stage_position_service.invalidate()
+
+        if not success:
+            logger.error("ConstantVelocityAcquisition: could not set up the scan.")
+            return False
+        self.is_scanning = True
+        return True
+
+    def stop_scan(self):
+        """Stop the stage scan and restore the stage velocity."""
+        if not self.is_scanning:
+            return
+        self.is_scanning = False
+        microscope = self.model.active_microscope
+        with microscope.stage_position_service.stage_lock(self.stage):
+            self.stage.stop_scan()
+            if self.stage_speed:
+                self.stage.set_speed({self.speed_axis: self.stage_speed})
+        microscope.stage_position_service.invalidate()
+
+    def signal_func(self):
+        """Start a scan when a new stack begins.
+
+        Returns:
+        -------
+        bool
+            A boolean value indicating whether to continue the acquisition.
+        """
+        if self.model.stop_acquisition:
+            return False
+
+        if self.need_to_start_scan:
+            self.need_to_start_scan = False
+            if not self.start_scan():
+                self.model.stop_acquisition = True
+                return False
+        return True
+
+    def signal_end(self):
+        """Count triggered frames and move on to the next channel or position.
+
+        Returns:
+        -------
+        bool
+            A boolean value indicating whether to end the current node.
+        """
+        if self.model.stop_acquisition:
+            return True
+
+        self.scanned_frames += 1
+        if self.scanned_frames < self.number_z_steps:
+            return False
+
+        # the stack is complete
+        self.stop_scan()
+        self.scanned_frames = 0
+        self.need_to_start_scan = True
+        self.current_channel_in_list = (self.current_channel_in_list + 1) % (
+            self.channels
+        )
+        self.prepare_next_channel.signal_func()
+        if self.current_channel_in_list == 0:
+            self.current_position_idx += 1
+
+        if self.current_position_idx >= len(self.positions):
+            self.current_position_idx = 0
+            # restore z, f
+            self.model.move_stage(
+                {"z_abs": self.restore_z, "f_abs": self.restore_f},
+                wait_until_done=False,
+            )
+            return True
+
+        return False
+
+    def cleanup(self):
+        """Stop the scan and return the DAQ to self-triggering."""
+        self.stop_scan()
+        if self.trigger_source is not None:
+            self.model.active_microscope.daq.set_external_trigger(None)
+
+    def pre_data_func(self):
+        """Initialize the count of received and expected frames."""
+        self.received_frames = 0
+        self.total_frames = self.channels * self.number_z_steps * len(self.positions)
+
+    def in_data_func(self, frame_ids):
+        """Record the z position of each frame and save the frames.
+
+        Parameters:
+        ----------
+        frame_ids : list
+            A list of frame IDs received during data acquisition.
+        """
+        for frame_id in frame_ids:
+            z_step = self.received_frames % self.number_z_steps
+            scan_idx = self.received_frames // self.number_z_steps
+            position_idx = min(scan_idx // self.channels, len(self.positions) - 1)
+            start_z, _ = self.get_scan_range(position_idx)
+            self.model.data_buffer_positions[frame_id][2] = (
+                start_z + z_step * self.z_step_size
+            )
+            self.received_frames += 1
+
+        self.model.mark_saving_flags(frame_ids)
+        if self.image_writer is not None:
+            self.image_writer.save_image(frame_ids)
+
+    def end_data_func(self):
+        """Check if all expected frames have been received.
+
+        Returns:
+        -------
+        bool
+            A boolean value indicating whether all expected frames have been
+            received.
+        """
+        return self.received_frames >= self.total_frames
+
+    def cleanup_data_func(self):
+        """Clean up the image writer, if image saving is enabled."""
+        if self.image_writer:
+            self.image_writer.cleanup()
@@ -439,6 +439,63 @@ class Container:
         #: bool: A boolean indicating whether the container is closed.
         self.is_closed = False
 
+        #: list of tuple or None: The flattened control sequence tree, built by
+        # `compile`. The tree is walked node by node while it is None.
+        self.program = None
+
+        #: dict: The index of each node in `program`.
+        self.addresses = {}
+
+    def compile(self):
+        """Flatten the control sequence tree into an instruction list.
+
+        Every node reachable from the root becomes one instruction which holds the
+        node, its registered functions and the indices of its child and sibling
+        instructions (-1 if there is none). Loop edges are back jumps to an earlier
+        index. Once compiled, `run` dispatches over the instruction list instead of
+        walking the tree, so the tree must not be relinked afterwards.
+        """
+
+        nodes, addresses = [], {}
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            if node is None or node in addresses:
+                continue
+            addresses[node] = len(nodes)
+            nodes.append(node)
+            stack.append(node.sibling)
+            stack.append(node.child)
+
+        self.addresses = addresses
+        self.program = [
+            self.compile_node(
+                node, addresses.get(node.child, -1), addresses.get(node.sibling, -1)
+            )
+            for node in nodes
+        ]
+
+    def compile_node(self, node, child, sibling):
+        """Build the instruction of a single node.
+
+        Parameters:
+        ----------
+        node : TreeNode
+            The node to compile.
+        child : int
+            The index of the child instruction, -1 if there is none.
+        sibling : int
+            The index of the sibling instruction, -1 if there is none.
+
+        Returns:
+        -------
+        tuple
+            The instruction. Its last item tells whether the dispatcher has to
+            return before running the node.
+        """
+
+        return node, child, sibling, node.device_related
+
     def reset(self):
         """Reset the container's state, including the current node and end flag.
 
@@ -487,7 +544,9 @@ class SignalContainer(Container):
       track of the remaining executions.
     """
 
-    def __init__(self, root=None, cleanup_list=[], number_of_execution=1):
+    def __init__(
+        self, root=None, cleanup_list=[], number_of_execution=1, cancel_token=None
+    ):
         """Initialize the SignalContainer object.
 
         Parameters:
@@ -499,9 +558,14 @@ class SignalContainer(Container):
             container is closed. Default is an empty list.
         number_of_execution : int, optional
             The number of times the control sequence should be executed. Default is 1.
+        cancel_token : CancellationToken or None, optional
+            The token checked before each node is run. Default is None.
         """
         super().__init__(root, cleanup_list)
 
+        #: CancellationToken or None: The token checked before each node is run.
+        self.cancel_token = cancel_token
+
         #: int: The total number of times the control sequence should be executed.
         self.number_of_execution = number_of_execution
 
@@ -543,16 +607,25 @@ class SignalContainer(Container):
 
         - It handles transitions between nodes, waits for responses if necessary, and
           tracks the remaining executions of the control sequence.
+
+        - If the cancel token is cancelled, the sequence ends before the next node
+          is run, so nodes are never interrupted halfway.
         """
 
         if self.end_flag or not self.root:
             self.end_flag = True
             return
+        if self.program is not None:
+            return self.run_program(args, wait_response)
         if not self.curr_node:
             self.curr_node = self.root
 
         logger.info(f"Running signal node: {self.curr_node.node_name}")
         while self.curr_node:
+            if self.cancel_token is not None and self.cancel_token.cancelled:
+                logger.info("SignalContainer - cancelled.")
+                self.end_flag = True
+                return
             try:
                 result, is_end = self.curr_node.run(*args, wait_response=wait_response)
             except Exception:
@@ -579,6 +652,127 @@ class SignalContainer(Container):
             if self.curr_node.device_related:
                 return
 
+    def compile_node(self, node, child, sibling):
+        """Build the instruction of a single signal node.
+
+        Parameters:
+        ----------
+        node : SignalNode
+            The node to compile.
+        child : int
+            The index of the child instruction, -1 if there is none.
+        sibling : int
+            The index of the sibling instruction, -1 if there is none.
+
+        Returns:
+        -------
+        tuple
+            The instruction.
+        """
+
+        return (
+            node,
+            node.node_funcs["init"],
+            node.node_funcs["main"],
+            node.node_funcs["main-response"],
+            node.node_funcs["end"],
+            node.node_type == "multi-step",
+            bool(node.need_response),
+            bool(node.device_related or node.need_response),
+            f"Signal running child of {node.node_name} ",
+            child,
+            sibling,
+            node.device_related,
+        )
+
+    def run_program(self, args, wait_response):
+        """Run the compiled control sequence.
+
+        This is `SignalNode.run` inlined into the loop of `run`, with the node
+        functions and jumps taken from the precompiled instructions.
+
+        Parameters:
+        -----------
+        args : tuple
+            Arguments to pass to the control sequence nodes.
+        wait_response : bool
+            A flag indicating whether to wait for responses during execution.
+        """
+
+        program = self.program
+        cancel_token = self.cancel_token
+        pc = self.addresses[self.curr_node] if self.curr_node else 0
+
+        logger.info(f"Running signal node: {program[pc][0].node_name}")
+        while True:
+            (
+                node,
+                init,
+                main,
+                main_response,
+                end,
+                multi_step,
+                need_response,
+                hold,
+                child_message,
+                child,
+                sibling,
+                _,
+            ) = program[pc]
+            if cancel_token is not None and cancel_token.cancelled:
+                logger.info("SignalContainer - cancelled.")
+                self.curr_node = node
+                self.end_flag = True
+                return
+            try:
+                if not node.is_initialized:
+                    init()
+                    node.is_initialized = True
+
+                if not wait_response:
+                    result = main(*args)
+                    if need_response:
+                        node.wait_response = True
+                        self.curr_node = node
+                        return
+                elif node.wait_response:
+                    result = main_response(*args)
+                    node.wait_response = False
+                elif hold:
+                    self.curr_node = node
+                    return
+                else:
+                    result = main(*args)
+
+                if multi_step and not end():
+                    self.curr_node = node
+                    return
+            except Exception:
+                logger.debug(f"SignalContainer - {traceback.format_exc()}")
+                self.curr_node = node
+                self.end_flag = True
+                self.cleanup()
+                return
+            node.is_initialized = False
+
+            if result and child >= 0:
+                logger.debug(child_message)
+                pc = child
+            elif sibling >= 0:
+                pc = sibling
+            else:
+                self.curr_node = None
+                if self.remaining_number_of_execution > 0:
+                    self.remaining_number_of_execution -= 1
+                    self.end_flag = self.end_flag or (
+                        self.remaining_number_of_execution == 0
+                    )
+                return
+
+            if program[pc][-1]:
+                self.curr_node = program[pc][0]
+                return
+
 
 class DataContainer(Container):
     """DataContainer class for managing data-based control sequences.
@@ -638,6 +832,8 @@ class DataContainer(Container):
 
         if self.end_flag or not self.root:
             return
+        if self.program is not None:
+            return self.run_program(args)
         if not self.curr_node:
             self.curr_node = self.root
         while self.curr_node:
@@ -684,6 +880,114 @@ class DataContainer(Container):
             if self.curr_node.device_related or self.curr_node.need_response:
                 return
 
+    def compile_node(self, node, child, sibling):
+        """Build the instruction of a single data node.
+
+        Parameters:
+        ----------
+        node : DataNode
+            The node to compile.
+        child : int
+            The index of the child instruction, -1 if there is none.
+        sibling : int
+            The index of the sibling instruction, -1 if there is none.
+
+        Returns:
+        -------
+        tuple
+            The instruction.
+        """
+
+        return (
+            node,
+            node.node_funcs["init"],
+            node.node_funcs["pre-main"],
+            node.node_funcs["main"],
+            node.node_funcs["end"],
+            node.node_type == "multi-step",
+            node.need_response is False and node.node_type == "one-step",
+            child,
+            sibling,
+            bool(node.device_related or node.need_response),
+        )
+
+    def run_program(self, args):
+        """Run the compiled control sequence.
+
+        This is `DataNode.run` inlined into the loop of `run`, with the node
+        functions and jumps taken from the precompiled instructions.
+
+        Parameters:
+        -----------
+        args : tuple
+            Arguments to pass to the control sequence nodes.
+        """
+
+        program = self.program
+        pc = self.addresses[self.curr_node] if self.curr_node else 0
+
+        while True:
+            (
+                node,
+                init,
+                pre_main,
+                main,
+                end,
+                multi_step,
+                one_step_without_response,
+                child,
+                sibling,
+                _,
+            ) = program[pc]
+            if node.is_marked:
+                result = None
+            else:
+                try:
+                    if not node.is_initialized:
+                        init()
+                        node.is_initialized = True
+
+                    # to decide whether it is the target frame
+                    if not pre_main(*args):
+                        self.curr_node = node
+                        return
+
+                    result = main(*args)
+                    if multi_step and not end():
+                        self.curr_node = node
+                        return
+                    node.is_initialized = False
+                except Exception:
+                    logger.debug(f"DataContainer - {traceback.format_exc()}")
+                    if not one_step_without_response:
+                        self.curr_node = node
+                        self.end_flag = True
+                        self.cleanup()
+                        return
+                    try:
+                        logger.debug(f"Datacontainer cleanup node {node.node_name}")
+                        node.node_funcs.get("cleanup", dummy_func)()
+                    except Exception:
+                        logger.debug(
+                            f"The node({node.node_name}) is not closed "
+                            f"correctly! Please check the cleanup function"
+                        )
+                    node.is_marked = True
+                    result = False
+
+            if result and child >= 0:
+                pc = child
+            elif sibling >= 0:
+                pc = sibling
+            else:
+                self.curr_node = None
+                self.end_flag = True
+                return
+
+            if program[pc][-1]:
+                self.curr_node = program[pc][0]
+                return
+
 
 def get_registered_funcs(feature_module, func_type="signal"):
     """Get a dictionary of registered functions for a feature module.
@@ -735,7 +1039,7 @@ def get_registered_funcs(feature_module, func_type="signal"):
     return func_dict
 
 
-def load_features(model, feature_list):
+def load_features(model, feature_list, compiled=True):
     """Load and organize a list of feature modules into a child-sibling tree structure.
 
     This function takes a list of feature modules and organizes them into a
@@ -752,6 +1056,10 @@ def load_features(model, feature_list):
         A list of dictionaries or tuples representing the feature modules and
         their configurations.
 
+    compiled : bool, optional
+        Flatten the trees into instruction lists for faster execution. Default is
+        True.
+
     Returns:
     -------
     SignalContainer
@@ -1025,9 +1333,16 @@ def load_features(model, feature_list):
     for node in break_list:
         if node[0] == "child":
             node[1].child, node[2].child = create_node({"name": DummyFeature})
-    return SignalContainer(signal_root, signal_cleanup_list), DataContainer(
-        data_root, data_cleanup_list
+    signal_container = SignalContainer(
+        signal_root,
+        signal_cleanup_list,
+        cancel_token=getattr(model, "cancel_token", None),
     )
+    data_container = DataContainer(data_root, data_cleanup_list)
+    if compiled:
+        signal_container.compile()
+        data_container.compile()
+    return signal_container, data_container
 
 
 def dummy_True(*args):
@@ -40,7 +40,12 @@ import importlib
 # Local application imports
 from navigate.model.features.auto_tile_scan import CalculateFocusRange  # noqa
 from navigate.model.features.autofocus import Autofocus  # noqa
+from navigate.model.features.constant_velocity_acquisition import (  # noqa
+    ConstantVelocityAcquisition,
+)
 from navigate.model.features.adaptive_optics import TonyWilson  # noqa
+from navigate.model.features.hardware_z_stack import HardwareZStackAcquisition  # noqa
+from navigate.model.features.channel_sequence import ChannelSequenceAcquisition  # noqa
 from navigate.model.features.common_features import (
     ChangeResolution,  # noqa
     Snap,  # noqa
@@ -0,0 +1,461 @@
+# Copyright (c) 2021-2024  The University of Texas Southwestern Medical Center.
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted for academic and research use only (subject to the
+# limitations in the disclaimer below) provided that the following conditions are met:
+
+#      * Redistributions of source code must retain the above copyright notice,
+#      this list of conditions and the following disclaimer.
+
+#      * Redistributions in binary form must reproduce the above copyright
+#      notice, this list of conditions and the following disclaimer in the
+#      documentation and/or other materials provided with the distribution.
+
+#      * Neither the name of the copyright holders nor the names of its
+#      contributors may be used to endorse or promote products derived from this
+#      software without specific prior written permission.
+
+# NO EXPRESS OR IMPLIED LICENSES TO ANY PARTY'S PATENT RIGHTS ARE GRANTED BY
+# THIS LICENSE. THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND
+# CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A
+# PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR
+# BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER
+# IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+#
+
+# Standard Library Imports
+import logging
+from threading import Event
+
+# Third Party Imports
+
+# Local Imports
+from navigate.config.config import bump_configuration_version
+from navigate.model.features.image_writer import ImageWriter
+from navigate.tools.multipos_table_tools import get_ordered_positions
+from navigate.tools.waveform_template_funcs import get_waveform_template_parameters
+
+# Logger Setup
+p = __name__.split(".")[1]
+logger = logging.getLogger(p)
+
+
+class HardwareZStackAcquisition:
+    """HardwareZStackAcquisition class for DAQ-timed z-stacks.
+
+    The z stage is driven by a DAQ analog output, e.g. a piezo or galvo controlled
+    by a GalvoNIStage. Instead of moving the stage before every frame, the stage
+    waveform of the whole stack is computed in advance, one step (or ramp) per
+    sweep, and played as one finite analog output task together with the camera
+    trigger pulses. The stack is therefore timed by the DAQ clock alone.
+
+    Notes:
+    ------
+    - The z stage must implement set_stack_waveform(), e.g. GalvoNIStage. The
+      synthetic stage accepts it as well, and the SyntheticDAQ generates one frame
+      per z step.
+
+    - The feature switches the waveform template to "Hardware-Z-Stack", which
+      expands the DAQ tasks to one sweep per z step, and restores it at the end.
+
+    - Every channel and every position is one DAQ run. Channels are always cycled
+      per stack, and the focus stays at its start value during a stack.
+
+    - The z position of each frame is written into the model's
+      data_buffer_positions.
+    """
+
+    def __init__(self, model, ramp=False, saving_flag=False, saving_dir="z-stack"):
+        """Initialize the HardwareZStackAcquisition class.
+
+        Parameters:
+        ----------
+        model : MicroscopeModel
+            The microscope model object.
+        ramp : bool, optional
+            Ramp the stage continuously through each plane instead of holding it
+            still during the exposure. Default is False.
+        saving_flag : bool, optional
+            Flag to enable image saving. Default is False.
+        saving_dir : str, optional
+            The sub-directory for saving images. Default is "z-stack".
+        """
+        #: MicroscopeModel: The microscope model.
+        self.model = model
+
+        #: bool: Ramp the stage instead of stepping it.
+        self.ramp = ramp
+
+        #: StageBase: The stage that drives the z axis.
+        self.stage = None
+
+        #: str: The waveform template to restore at the end.
+        self.waveform_template = None
+
+        #: int: The number of z steps in a stack.
+        self.number_z_steps = 0
+
+        #: float: The start z position of the stack, relative to the position.
+        self.start_z_position = 0
+
+        #: float: The z step size in microns.
+        self.z_step_size = 0
+
+        #: float: The start focus of the stack, relative to the position.
+        self.start_focus = 0
+
+        #: list: Positions (x, y, z, theta, f) to acquire.
+        self.positions = []
+
+        #: list: Defocus of the selected channels.
+        self.defocus = []
+
+        #: list: Numbers of the selected channels.
+        self.channel_ids = []
+
+        #: int: The number of selected channels.
+        self.channels = 1
+
+        #: int: The index of the position being acquired.
+        self.current_position_idx = 0
+
+        #: int: The index of the channel being acquired.
+        self.current_channel_in_list = 0
+
+        #: bool: Whether the next DAQ run starts a new stack.
+        self.need_to_start_stack = True
+
+        #: Event: Set by the data thread when all frames of a stack arrived.
+        self.stack_received = Event()
+
+        #: int: Frames received by the data thread.
+        self.received_frames = 0
+
+        #: int: Frames expected by the data thread.
+        self.total_frames = 0
+
+        #: ImageWriter: An image writer object for saving images.
+        self.image_writer = None
+        if saving_flag:
+            self.image_writer = ImageWriter(model, sub_dir=saving_dir)
+
+        #: dict: A dictionary defining the configuration for the acquisition.
+        self.config_table = {
+            "signal": {
+                "init": self.pre_signal_func,
+                "main": self.signal_func,
+                "main-response": self.signal_response_func,
+                "end": self.signal_end,
+                "cleanup": self.cleanup,
+            },
+            "data": {
+                "init": self.pre_data_func,
+                "main": self.in_data_func,
+                "end": self.end_data_func,
+                "cleanup": self.cleanup_data_func,
+            },
+            "node": {"node_type": "multi-step", "device_related": True},
+        }
+
+    def pre_signal_func(self):
+        """Read the stack parameters, check the stage and the waveform template."""
+        microscope = self.model.active_microscope
+        microscope_state = self.model.configuration["experiment"]["MicroscopeState"]
+
+        if microscope_state["stack_cycling_mode"] != "per_stack":
+            logger.warning(
+                "HardwareZStackAcquisition always cycles channels per stack."
+            )
+
+        self.channels = microscope_state["selected_channels"]
+        self.number_z_steps = int(microscope_state["number_z_steps"])
+        self.start_z_position = float(microscope_state["start_position"])
+        self.z_step_size = float(microscope_state["step_size"])
+        self.start_focus = float(microscope_state["start_focus"])
+        self.defocus = [
+            v["defocus"]
+            for v in microscope_state["channels"].values()
+            if v["is_selected"]
+        ]
+        self.channel_ids = [
+            int(k[len("channel_") :])
+            for k, v in microscope_state["channels"].items()
+            if v["is_selected"]
+        ]
+
+        pos_dict = self.model.get_stage_position(settled=True)
+
+        #: float: The f position to restore at the end.
+        self.restore_f = pos_dict["f_pos"]
+
+        # position: x, y, z, theta, f
+        if bool(microscope_state["is_multiposition"]):
+            self.positions = get_ordered_positions(
+                self.model.configuration["experiment"]
+            )
+        else:
+            self.positions = [
+                [
+                    float(pos_dict["x_pos"]),
+                    float(pos_dict["y_pos"]),
+                    float(microscope_state.get("stack_z_origin", pos_dict["z_pos"])),
+                    float(pos_dict["theta_pos"]),
+                    float(
+                        microscope_state.get("stack_focus_origin", pos_dict["f_pos"])
+                    ),
+                ]
+            ]
+
+        self.stage = microscope.stages.get("z")
+        if not hasattr(self.stage, "set_stack_waveform"):
+            logger.error(
+                f"HardwareZStackAcquisition: {self.stage} is not driven by the DAQ."
+            )
+            self.model.stop_acquisition = True
+            self.model.event_queue.put(
+                ("warning", "The z stage can not be driven by the DAQ!")
+            )
+            return
+
+        # one sweep per z step in every DAQ run
+        self.waveform_template = microscope_state.get("waveform_template", "Default")
+        microscope_state["waveform_template"] = "Hardware-Z-Stack"
+        bump_configuration_version(self.model.configuration)
+        _, expand_num = get_waveform_template_parameters(
+            "Hardware-Z-Stack",
+            self.model.configuration.get("waveform_templates", {}),
+            microscope_state,
+        )
+        if expand_num != self.number_z_steps:
+            logger.error(
+                "HardwareZStackAcquisition: the Hardware-Z-Stack waveform template "
+                "does not expand to the number of z steps."
+            )
+            self.model.stop_acquisition = True
+            self.model.event_queue.put(
+                ("warning", "Please add the Hardware-Z-Stack waveform template!")
+            )
+            return
+
+        microscope.central_focus = None
+        microscope.current_channel = 0
+        for microscope_name in self.model.virtual_microscopes:
+            self.model.virtual_microscopes[microscope_name].current_channel = 0
+        self.prepare_next_channel()
+
+        self.current_position_idx = 0
+        self.current_channel_in_list = 0
+        self.need_to_start_stack = True
+        logger.info(
+            f"HardwareZStackAcquisition. Positions {self.positions}, "
+            f"Starting Z-Position {self.start_z_position}, "
+            f"Step Size {self.z_step_size}"
+        )
+
+    def prepare_next_channel(self):
+        """Switch the microscopes to the next channel.
+
+        The DAQ tasks are written once the stack waveform is known, in start_stack().
+        """
+        for microscope_name in self.model.virtual_microscopes:
+            self.model.virtual_microscopes[microscope_name].prepare_next_channel()
+        self.model.active_microscope.prepare_next_channel(update_daq_task_flag=False)
+
+    def get_z_positions(self, position_idx):
+        """Get the z position of each plane in a stack.
+
+        Parameters
+        ----------
+        position_idx : int
+            Index of the position.
+
+        Returns
+        -------
+        z_positions : list
+            The z position of each plane in microns.
+        """
+        start_z = self.start_z_position + float(self.positions[position_idx][2])
+        return [start_z + i * self.z_step_size for i in range(self.number_z_steps)]
+
+    def start_stack(self):
+        """Move to the current position and load the stack into the DAQ.
+
+        Returns
+        -------
+        bool
+            True if the DAQ is ready to run the stack.
+        """
+        position = dict(
+            zip(
+                ["x", "y", "z", "theta", "f"],
+                self.positions[self.current_position_idx],
+            )
+        )
+        focus = self.start_focus + position["f"]
+        if self.defocus:
+            focus += self.defocus[self.current_channel_in_list]
+
+        # the z stage follows the DAQ waveform
+        self.model.move_stage(
+            {
+                "x_abs": position["x"],
+                "y_abs": position["y"],
+                "theta_abs": position["theta"],
+                "f_abs": focus,
+            },
+            wait_until_done=True,
+        )
+
+        microscope = self.model.active_microscope
+        _, sweep_times = microscope.calculate_exposure_sweep_times()
+        if not self.stage.set_stack_waveform(
+            self.get_z_positions(self.current_position_idx), sweep_times, self.ramp
+        ):
+            logger.error("HardwareZStackAcquisition: could not set the stack waveform.")
+            return False
+
+        microscope.daq.stop_acquisition()
+        microscope.daq.prepare_acquisition(f"channel_{microscope.current_channel}")
+        self.stack_received.clear()
+        return True
+
+    def signal_func(self):
+        """Load the next stack into the DAQ when a new stack begins.
+
+        Returns:
+        -------
+        bool
+            A boolean value indicating whether to continue the acquisition.
+        """
+        if self.model.stop_acquisition:
+            return False
+
+        if self.need_to_start_stack:
+            self.need_to_start_stack = False
+            if not self.start_stack():
+                self.model.stop_acquisition = True
+                return False
+        return True
+
+    def signal_response_func(self, *args):
+        """Wait until the data thread received the whole stack.
+
+        One DAQ run triggers every frame of the stack, so the frame counter of the
+        model is advanced past the stack as well.
+
+        Returns:
+        -------
+        bool
+            A boolean value indicating whether the stack was received.
+        """
+        while not self.stack_received.wait(0.1):
+            if self.model.stop_acquisition:
+                return False
+
+        self.model.frame_id = (
+            self.model.frame_id + self.number_z_steps - 1
+        ) % self.model.number_of_frames
+        return True
+
+    def signal_end(self):
+        """Move on to the next channel or position.
+
+        Returns:
+        -------
+        bool
+            A boolean value indicating whether to end the current node.
+        """
+        if self.model.stop_acquisition:
+            return True
+
+        self.need_to_start_stack = True
+        self.current_channel_in_list = (self.current_channel_in_list + 1) % (
+            self.channels
+        )
+        self.prepare_next_channel()
+        if self.current_channel_in_list == 0:
+            self.current_position_idx += 1
+
+        if self.current_position_idx >= len(self.positions):
+            self.current_position_idx = 0
+            self.model.move_stage({"f_abs": self.restore_f}, wait_until_done=False)
+            return True
+
+        return False
+
+    def cleanup(self):
+        """Return the z stage to static positioning and restore the template."""
+        if hasattr(self.stage, "switch_mode"):
+            self.stage.switch_mode("normal")
+        if self.waveform_template is not None:
+            self.model.configuration["experiment"]["MicroscopeState"][
+                "waveform_template"
+            ] = self.waveform_template
+            bump_configuration_version(self.model.configuration)
+            self.waveform_template = None
+
+    def pre_data_func(self):
+        """Initialize the count of received and expected frames."""
+        self.received_frames = 0
+        self.total_frames = self.channels * self.number_z_steps * len(self.positions)
+
+    def in_data_func(self, frame_ids):
+        """Record the position of each frame and save the frames.
+
+        Parameters:
+        ----------
+        frame_ids : list
+            A list of frame IDs received during data acquisition.
+        """
+        for frame_id in frame_ids:
+            # one DAQ run triggers the whole stack, the signal thread only records
+            # the position and channel of its first frame
+            z_step = self.received_frames % self.number_z_steps
+            stack_idx = self.received_frames // self.number_z_steps
+            channel_idx = stack_idx % self.channels
+            position_idx = min(stack_idx // self.channels, len(self.positions) - 1)
+            x, y, _, theta, f = self.positions[position_idx]
+            focus = self.start_focus + f
+            if self.defocus:
+                focus += self.defocus[channel_idx]
+            self.model.data_buffer_positions[frame_id][:] = [
+                x,
+                y,
+                self.get_z_positions(position_idx)[z_step],
+                theta,
+                focus,
+            ]
+            if self.channel_ids:
+                self.model.data_buffer_channels[frame_id] = self.channel_ids[
+                    channel_idx
+                ]
+            self.received_frames += 1
+            if z_step == self.number_z_steps - 1:
+                self.stack_received.set()
+
+        self.model.mark_saving_flags(frame_ids)
+        if self.image_writer is not None:
+            self.image_writer.save_image(frame_ids)
+
+    def end_data_func(self):
+        """Check if all expected frames have been received.
+
+        Returns:
+        -------
+        bool
+            A boolean value indicating whether all expected frames have been
+            received.
+        """
+        return self.received_frames >= self.total_frames
+
+    def cleanup_data_func(self):
+        """Clean up the image writer, if image saving is enabled."""
+        if self.image_writer:
+            self.image_writer.cleanup()
@@ -43,6 +43,7 @@ from tifffile import imsave
 
 # Local imports
 from navigate.model import data_sources
+from navigate.model.analysis.overview_mosaic import OverviewMosaic
 
 # Logger Setup
 p = __name__.split(".")[1]
@@ -198,6 +199,29 @@ class ImageWriter:
             "y": camera_config.get("flip_y", False),
         }
 
+        #: OverviewMosaic: Low-resolution mosaic of the multi-position tiles.
+        self.overview_mosaic = None
+
+        #: int: The time point of the overview mosaic.
+        self.overview_time_point = 0
+
+        if self.model.configuration["experiment"]["MicroscopeState"].get(
+            "is_multiposition", False
+        ):
+            camera_parameters = self.model.configuration["experiment"][
+                "CameraParameters"
+            ][microscope_name]
+            # the pixel size of the (binned) image
+            pixel_size = (
+                self.data_source.metadata.dx
+                * float(camera_parameters.get("x_pixels", self.data_source.shape_x))
+                / float(self.data_source.shape_x)
+            )
+            self.overview_mosaic = OverviewMosaic(
+                pixel_size=pixel_size,
+                number_of_channels=int(self.data_source.shape_c),
+            )
+
     def save_image(self, frame_ids):
         """Save the data to disk.
 
@@ -227,13 +251,14 @@ class ImageWriter:
 
             if c_idx == 0 and z_idx == 0:
                 # Initialize MIP array with same number of channels as the data
-                self.mip = np.ndarray(
+                self.mip = np.zeros(
                     (
                         int(self.data_source.shape_c),
                         int(self.data_source.shape_y),
                         int(self.data_source.shape_x),
-                    )
-                ).astype(np.uint16)
+                    ),
+                    dtype=np.uint16,
+                )
 
             # flip image if necessary
             if self.flip_flags["x"] and self.flip_flags["y"]:
@@ -268,7 +293,9 @@ class ImageWriter:
                     for c_save_idx in range(self.data_source.shape_c):
                         mip_name = (
                             "P"
-                            + str(p_idx).zfill(4)
+                            + str(
+                                self.data_source.metadata.table_position(p_idx)
+                            ).zfill(4)
                             + "_"
                             + "CH0"
                             + str(c_save_idx)
@@ -292,6 +319,18 @@ class ImageWriter:
                 logger.debug(f"Error - ImageWriter: {e}")
                 return
 
+            # The overview is only for display, so a failure must not stop saving.
+            if (c_idx == self.data_source.shape_c - 1) and (
+                z_idx == self.data_source.shape_z - 1
+            ):
+                try:
+                    self.update_overview(idx, t_idx)
+                except Exception:
+                    logger.exception(
+                        "Error - ImageWriter: Overview disabled, update failed."
+                    )
+                    self.overview_mosaic = None
+
     def generate_image_name(self, current_channel, ext=".tif"):
         """Generates a string for the filename, e.g., CH00_000000.tif.
 
@@ -320,9 +359,64 @@ class ImageWriter:
         self.current_time_point += 1
         return image_name
 
+    def update_overview(self, frame_id, time_point):
+        """Add the MIP of the current position to the overview mosaic.
+
+        The mosaic is sent to the GUI after each position and saved to the MIP
+        directory when a time point is complete.
+
+        Parameters
+        ----------
+        frame_id : int
+            Index into self.model.data_buffer of the last frame of the position.
+        time_point : int
+            The current time point.
+        """
+        if self.overview_mosaic is None:
+            return
+
+        if time_point != self.overview_time_point:
+            self.save_overview()
+            self.overview_mosaic = OverviewMosaic(
+                pixel_size=self.overview_mosaic.pixel_size,
+                number_of_channels=self.overview_mosaic.number_of_channels,
+            )
+            self.overview_time_point = time_point
+
+        self.overview_mosaic.add_tile(
+            self.mip,
+            x=self.model.data_buffer_positions[frame_id][0],
+            y=self.model.data_buffer_positions[frame_id][1],
+        )
+        self.model.event_queue.put(
+            (
+                "overview",
+                {
+                    "image": self.overview_mosaic.get_image(),
+                    "extent": self.overview_mosaic.extent,
+                    "number_of_tiles": self.overview_mosaic.number_of_tiles,
+                },
+            )
+        )
+
+    def save_overview(self):
+        """Save the overview mosaic to the MIP directory."""
+        if self.overview_mosaic is None or self.overview_mosaic.number_of_tiles == 0:
+            return
+        overview_name = "OVERVIEW_" + str(self.overview_time_point).zfill(6) + ".tif"
+        imsave(
+            os.path.join(self.mip_directory, overview_name),
+            self.overview_mosaic.canvas,
+            photometric="minisblack",
+        )
+
     def close(self):
         """Close the data source we are writing to.
         """
+        try:
+            self.save_overview()
+        except Exception:
+            logger.exception("Error - ImageWriter: Saving the overview failed.")
         self.data_source.close()
 
     def calculate_and_check_disk_space(self):
@@ -199,7 +199,7 @@ class DetectTissueInStack:
 
         microscope_config = self.model.configuration["experiment"]["MicroscopeState"]
         # get current z and f position
-        pos = self.model.get_stage_position()
+        pos = self.model.get_stage_position(settled=True)
 
         #: float: The current Z position of the microscope stage.
         self.current_z_pos = pos["z_pos"] + float(microscope_config["start_position"])
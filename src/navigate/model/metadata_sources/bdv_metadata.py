@@ -245,7 +245,7 @@ class BigDataViewerMetadata(XMLMetadata):
         for t in range(self.shape_t):
             for p in range(self.positions):
                 for c in range(self.shape_c):
-                    view_id = c * self.positions + p
+                    view_id = c * self.positions + self.table_position(p)
                     mat = np.zeros((3, 4), dtype=float)
                     for z in range(self.shape_z):
                         matrix_id = (
@@ -92,6 +92,10 @@ class Metadata:
         #: int: Number of positions
         self.positions = 1
 
+        #: list: Multi-position table row of each acquired position, in
+        #: acquisition order. Empty if positions are acquired in table order.
+        self.position_order = []
+
         #: str: Active microscope
         self.active_microscope = None
 
@@ -129,6 +133,23 @@ class Metadata:
         """
         return self._per_stack
 
+    def table_position(self, p: int) -> int:
+        """Return the multi-position table row of an acquired position.
+
+        Parameters
+        ----------
+        p : int
+            Index of the position in acquisition order.
+
+        Returns
+        -------
+        int
+            Row of the position in the multi-position table.
+        """
+        if p < len(self.position_order):
+            return self.position_order[p]
+        return p
+
     def set_from_dict(self, metadata_config: dict) -> None:
         """Set from a dictionary
 
@@ -181,7 +202,13 @@ class Metadata:
                 self.active_microscope
             ]["img_y_pixels"]
         )
-        if (state["image_mode"] == "z-stack") or (state["image_mode"] == "customized"):
+        if state["image_mode"] in [
+            "z-stack",
+            "stage-scan",
+            "hardware-z-stack",
+            "channel-sequence",
+            "customized",
+        ]:
             self.shape_z = int(state["number_z_steps"])
         else:
             self.shape_z = 1
@@ -194,8 +221,10 @@ class Metadata:
 
         if bool(self._multiposition):
             self.positions = len(self.configuration["experiment"]["MultiPositions"])
+            self.position_order = list(state.get("position_order", []))
         else:
             self.positions = 1
+            self.position_order = []
 
         # tiff
         if state["image_mode"] == "customized":
@@ -232,10 +261,9 @@ class Metadata:
     def set_stack_order_from_configuration_experiment(self) -> None:
         """Set stack order from configuration experiment"""
         state = self.configuration["experiment"]["MicroscopeState"]
-        self._per_stack = (
-            state["stack_cycling_mode"] == "per_stack"
-            and state["image_mode"] != "single"
-        )
+        self._per_stack = state["stack_cycling_mode"] == "per_stack" and state[
+            "image_mode"
+        ] not in ["single", "channel-sequence"]
 
     @property
     def voxel_size(self) -> tuple:
@@ -34,11 +34,23 @@ import logging
 import importlib  # noqa: F401
 from multiprocessing.managers import ListProxy
 import reprlib
+import time
 
 # Third-party imports
 
 # Local application imports
+from navigate.config.config import (
+    bump_configuration_version,
+    get_configuration_snapshot,
+)
+from navigate.model.concurrency.device_commands import (
+    shutdown_device_executor,
+    submit_device_command,
+    wait_for_futures,
+)
 from navigate.model.device_startup_functions import start_stage
+from navigate.model.devices.device_state import DeviceStateMixin
+from navigate.model.stage_position_service import StagePositionService
 from navigate.tools.common_functions import build_ref_name
 
 # Set up logging
@@ -120,6 +132,12 @@ class Microscope:
         #: float: Central focus position.
         self.central_focus = None
 
+        #: list: Device commands of a channel switch that may still be running.
+        self.channel_switch_futures = []
+
+        #: dict: Running average of how long each device takes to switch channels.
+        self.channel_switch_times = {}
+
         #: Bool: Is a synthetic microscope.
         self.is_synthetic = is_synthetic
 
@@ -341,6 +359,14 @@ class Microscope:
 
             self.stages_list.append((stage, list(device_config["axes"])))
 
+        #: StagePositionService: Timestamped cache of the stage positions.
+        self.stage_position_service = StagePositionService(
+            self.stages_list,
+            poll_interval=self.configuration["configuration"]["microscopes"][
+                self.microscope_name
+            ]["stage"].get("position_poll_interval", 0),
+        )
+
         # connect daq and camera in synthetic mode
         if is_synthetic:
             self.daq.add_camera(self.microscope_name, self.camera)
@@ -379,9 +405,8 @@ class Microscope:
         self_offset_dict = self.configuration["configuration"]["microscopes"][
             self.microscope_name
         ]["stage"]
-        self.ask_stage_for_position = True
         # print(self.stages)
-        pos_dict = self.get_stage_position()
+        pos_dict = self.get_stage_position(settled=True)
         for stage, axes in self.stages_list:
 
             # x_abs: current x_pos + current_x_offset - former_x_offset
@@ -394,7 +419,8 @@ class Microscope:
                 )
                 for axis in axes
             }
-            stage.move_absolute(pos, wait_until_done=True)
+            with self.stage_position_service.stage_lock(stage):
+                stage.move_absolute(pos, wait_until_done=True)
         self.ask_stage_for_position = True
 
     def prepare_acquisition(self):
@@ -415,6 +441,10 @@ class Microscope:
         )
         logger.info(f"Preparing Acquisition. Camera Parameters: {camera_info}")
 
+        # devices may have been changed outside the software between acquisitions
+        self.invalidate_device_states()
+        self.daq.set_channel_sequence(None)
+
         self.current_channel = 0
         self.central_focus = None
         self.channels = self.configuration["experiment"]["MicroscopeState"]["channels"]
@@ -469,8 +499,24 @@ class Microscope:
 
         return self.calculate_all_waveform()
 
+    def invalidate_device_states(self):
+        """Forget the last known state of all devices.
+
+        The next command to every device is sent to the hardware, even if the
+        device was already commanded to the same state.
+        """
+        for device in vars(self).values():
+            devices = device.values() if isinstance(device, dict) else [device]
+            for d in devices:
+                if isinstance(d, DeviceStateMixin):
+                    d.invalidate_device_state()
+
     def end_acquisition(self):
         """End the acquisition."""
+        try:
+            self.wait_for_channel_switch()
+        except Exception as e:
+            logger.error(f"Channel switch failed: {e}")
         self.daq.stop_acquisition()
         self.stop_stage()
         if self.central_focus is not None:
@@ -486,23 +532,38 @@ class Microscope:
 
     def turn_on_laser(self):
         """Turn on the current laser."""
+        if self.daq.channel_sequence:
+            # the lasers are switched by the DAQ
+            return
         logger.info(f"Turning on laser {self.laser_wavelength[self.current_laser_index]}")
         self.lasers[str(self.laser_wavelength[self.current_laser_index])].turn_on()
 
     def turn_off_lasers(self):
         """Turn off current laser."""
+        if self.daq.channel_sequence:
+            return
         logger.info(f"Turning off laser {self.laser_wavelength[self.current_laser_index]}")
         self.lasers[str(self.laser_wavelength[self.current_laser_index])].turn_off()
 
-    def calculate_all_waveform(self):
+    def calculate_all_waveform(self, common_sweep_time=False):
         """Calculate all the waveforms.
 
+        Parameters
+        ----------
+        common_sweep_time : bool
+            Use the longest sweep time for all channels, so the channels of a
+            channel sequence share one frame rate.
+
         Returns
         -------
         waveform : dict
             Dictionary of all the waveforms.
         """
         exposure_times, sweep_times = self.calculate_exposure_sweep_times()
+        if common_sweep_time and sweep_times:
+            sweep_time = max(sweep_times.values())
+            sweep_times = {k: sweep_time for k in sweep_times}
+            self.sweep_times = sweep_times
         camera_waveform = self.daq.calculate_all_waveforms(
             self.microscope_name, exposure_times, sweep_times
         )
@@ -545,20 +606,21 @@ class Microscope:
         """
         exposure_times = {}
         sweep_times = {}
-        microscope_state = self.configuration["experiment"]["MicroscopeState"]
-        waveform_constants = self.configuration["waveform_constants"]
+        configuration = get_configuration_snapshot(self.configuration)
+        microscope_state = configuration["experiment"]["MicroscopeState"]
+        waveform_constants = configuration["waveform_constants"]
 
         logger.info(f"Microscope state: {repr(dict(microscope_state))}")
         logger.info(f"Waveform constants: {repr(dict(waveform_constants))}")
 
         camera_delay = (
-            self.configuration["configuration"]["microscopes"][self.microscope_name][
+            configuration["configuration"]["microscopes"][self.microscope_name][
                 "camera"
             ]["delay"]
             / 1000
         )
         camera_settle_duration = (
-            self.configuration["configuration"]["microscopes"][self.microscope_name][
+            configuration["configuration"]["microscopes"][self.microscope_name][
                 "camera"
             ].get("settle_duration", 0)
             / 1000
@@ -575,20 +637,25 @@ class Microscope:
         ps = float(waveform_constants["other_constants"].get("percent_smoothing", 0.0))
 
         readout_time = 0
-        readout_mode = self.configuration["experiment"]["CameraParameters"][
+        readout_mode = configuration["experiment"]["CameraParameters"][
             self.microscope_name
         ]["sensor_mode"]
 
         if readout_mode == "Normal":
             readout_time = self.camera.calculate_readout_time()
-        elif self.configuration["experiment"]["CameraParameters"][self.microscope_name][
+        elif configuration["experiment"]["CameraParameters"][self.microscope_name][
             "readout_direction"
         ] in ["Bidirectional", "Rev. Bidirectional"]:
             remote_focus_ramp_falling = 0
         # set readout out time
-        self.configuration["experiment"]["CameraParameters"][self.microscope_name][
-            "readout_time"
-        ] = (readout_time * 1000)
+        camera_parameters = configuration["experiment"]["CameraParameters"][
+            self.microscope_name
+        ]
+        if camera_parameters.get("readout_time", None) != readout_time * 1000:
+            self.configuration["experiment"]["CameraParameters"][self.microscope_name][
+                "readout_time"
+            ] = (readout_time * 1000)
+            bump_configuration_version(self.configuration)
 
         for channel_key in microscope_state["channels"].keys():
             channel = microscope_state["channels"][channel_key]
@@ -603,7 +670,7 @@ class Microscope:
                     ) = self.camera.calculate_light_sheet_exposure_time(
                         exposure_time,
                         int(
-                            self.configuration["experiment"]["CameraParameters"][
+                            configuration["experiment"]["CameraParameters"][
                                 self.microscope_name
                             ]["number_of_pixels"]
                         ),
@@ -616,9 +683,13 @@ class Microscope:
                         )
                         exposure_time = round(updated_exposure_time, 4)
                         # update the experiment file
+                        channel = self.configuration["experiment"]["MicroscopeState"][
+                            "channels"
+                        ][channel_key]
                         channel["camera_exposure_time"] = round(
                             updated_exposure_time * 1000, 1
                         )
+                        bump_configuration_version(self.configuration)
                         self.output_event_queue.put(
                             (
                                 "exposure_time",
@@ -662,7 +733,7 @@ class Microscope:
         """
         return self.exposure_times, self.sweep_times
 
-    def prepare_next_channel(self, update_daq_task_flag=True):
+    def prepare_next_channel(self, update_daq_task_flag=True, wait=True):
         """Prepare the next channel.
 
         This function, `prepare_next_channel`, is responsible for configuring various
@@ -677,6 +748,10 @@ class Microscope:
         ----------
         update_daq_task_flag : bool
             whether to override waveforms in the DAQ (create new tasks)
+        wait : bool
+            Wait for the filter wheels, lasers and the focus stage. Otherwise they
+            keep switching in the background until wait_for_channel_switch() is
+            called.
         """
         curr_channel = self.current_channel
         prefix = "channel_"
@@ -694,12 +769,138 @@ class Microscope:
         channel = self.configuration["experiment"]["MicroscopeState"]["channels"][
             channel_key
         ]
+        # Filter wheels, lasers and the focus stage are changed over in the
+        # background while the camera and the DAQ are configured. Commands are
+        # submitted directly so plugin devices without the *_async methods work.
+        futures = []
+
         # Filter Wheel Settings.
         for k in self.filter_wheel:
-            self.filter_wheel[k].set_filter(channel[k])
+            futures.append(
+                self.time_channel_switch(
+                    f"filter_wheel_{k}",
+                    submit_device_command(
+                        self.filter_wheel[k],
+                        self.filter_wheel[k].set_filter,
+                        channel[k],
+                    ),
+                )
+            )
+
+        # Laser Settings
+        self.current_laser_index = channel["laser_index"]
+        for k in self.lasers:
+            futures.append(
+                submit_device_command(self.lasers[k], self.lasers[k].turn_off)
+            )
+        laser_name = str(self.laser_wavelength[self.current_laser_index])
+        laser = self.lasers[laser_name]
+        futures.append(
+            self.time_channel_switch(
+                f"laser_{laser_name}",
+                submit_device_command(laser, laser.set_power, channel["laser_power"]),
+            )
+        )
+        # self.lasers[str(self.laser_wavelength[self.current_laser_index])].turn_on()
+
+        # Add Defocus term
+        # Assume wherever we start is the central focus
+        # TODO: is this the correct assumption?
+        if self.central_focus is None:
+            self.central_focus = self.get_stage_position().get("f_pos")
+        if self.central_focus is not None:
+            futures.extend(
+                self.time_channel_switch("focus", future)
+                for future in self.move_stage_async(
+                    {"f_abs": self.central_focus + float(channel["defocus"])},
+                    update_focus=False,
+                )
+            )
 
         # Camera Settings
-        self.current_exposure_time = float(channel["camera_exposure_time"]) / 1000
+        self.set_camera_exposure_time(float(channel["camera_exposure_time"]) / 1000)
+
+        # stop daq before writing new waveform
+        # When called the first time, throws an error.
+        # choose to not update the waveform is very useful when running ZStack
+        # if there is a NI Galvo stage in the system.
+        if update_daq_task_flag:
+            self.daq.stop_acquisition()
+            self.daq.prepare_acquisition(channel_key)
+
+        self.channel_switch_futures.extend(futures)
+        if wait:
+            self.wait_for_channel_switch()
+
+    def time_channel_switch(self, name, future):
+        """Track how long a device takes to switch channels.
+
+        The time from submitting the command until it is done is averaged into
+        channel_switch_times, so it includes waiting behind other commands on the
+        same device connection.
+
+        Parameters
+        ----------
+        name : str
+            Name of the device, e.g. "filter_wheel_0" or "focus".
+        future : concurrent.futures.Future
+            The submitted device command.
+
+        Returns
+        -------
+        future : concurrent.futures.Future
+            The same future.
+        """
+        start_time = time.perf_counter()
+
+        def update_estimate(done_future):
+            if done_future.cancelled() or done_future.exception() is not None:
+                return
+            duration = time.perf_counter() - start_time
+            estimate = self.channel_switch_times.get(name, duration)
+            self.channel_switch_times[name] = 0.5 * (estimate + duration)
+
+        future.add_done_callback(update_estimate)
+        return future
+
+    def estimate_channel_switch_time(self):
+        """Estimate how long a channel switch keeps the microscope waiting.
+
+        Devices switch in parallel, so the slowest device sets the dead time.
+
+        Returns
+        -------
+        switch_time : float
+            Estimated dead time of a channel switch in seconds.
+        """
+        return max(self.channel_switch_times.values(), default=0.0)
+
+    def wait_for_channel_switch(self):
+        """Wait until the devices of the last channel switch are ready.
+
+        Must be called before the next frame is triggered.
+        """
+        futures, self.channel_switch_futures = self.channel_switch_futures, []
+        if not futures:
+            return
+        start_time = time.perf_counter()
+        wait_for_futures(futures)
+        logger.debug(
+            f"Waited {time.perf_counter() - start_time:.4f} s for the channel "
+            f"switch, estimated {self.estimate_channel_switch_time():.4f} s"
+        )
+
+    def set_camera_exposure_time(self, exposure_time):
+        """Set the exposure time of the camera.
+
+        In Light-Sheet mode, the line interval of the camera is set as well.
+
+        Parameters
+        ----------
+        exposure_time : float
+            Exposure time in seconds.
+        """
+        self.current_exposure_time = exposure_time
         if (
             self.configuration["experiment"]["CameraParameters"][self.microscope_name][
                 "sensor_mode"
@@ -721,34 +922,105 @@ class Microscope:
             self.camera.set_line_interval(camera_line_interval)
         self.camera.set_exposure_time(self.current_exposure_time)
 
-        # Laser Settings
-        self.current_laser_index = channel["laser_index"]
+    def prepare_channel_sequence(self, retriggerable=False):
+        """Play all selected channels back to back in one DAQ program.
+
+        The waveforms of the selected channels are concatenated, and the lasers are
+        switched by the DAQ during the exposure of each channel, so software is not
+        involved between channels. Filter wheels can not be switched by the DAQ,
+        so all selected channels must use the same filters. The camera exposes for
+        the longest channel; the exposure of each channel is set by its laser.
+
+        Parameters
+        ----------
+        retriggerable : bool
+            Replay the sequence on every external trigger.
+
+        Returns
+        -------
+        result : bool
+            True if the channel sequence is loaded in the DAQ.
+        """
+        channels = self.configuration["experiment"]["MicroscopeState"]["channels"]
+        channel_keys = [f"channel_{c}" for c in self.available_channels]
+
+        for k in self.filter_wheel:
+            if len(set(str(channels[c][k]) for c in channel_keys)) > 1:
+                logger.warning(
+                    f"Channels {channel_keys} use different filters in {k}, "
+                    "they can not be played as one sequence."
+                )
+                return False
+
+        laser_outputs = {}
+        for channel_key in channel_keys:
+            channel = channels[channel_key]
+            laser = self.lasers[str(self.laser_wavelength[channel["laser_index"]])]
+            outputs = laser.get_sequence_outputs(channel["laser_power"])
+            if not outputs:
+                logger.warning(
+                    f"The laser of {channel_key} is not switched by the DAQ, "
+                    "the channels can not be played as one sequence."
+                )
+                return False
+            for line, value in outputs.items():
+                laser_outputs.setdefault(line, {})[channel_key] = value
+
         for k in self.lasers:
             self.lasers[k].turn_off()
-        self.lasers[str(self.laser_wavelength[self.current_laser_index])].set_power(
-            channel["laser_power"]
+        self.set_camera_exposure_time(
+            max(float(channels[c]["camera_exposure_time"]) for c in channel_keys) / 1000
         )
-        # self.lasers[str(self.laser_wavelength[self.current_laser_index])].turn_on()
+        self.daq.set_channel_sequence(channel_keys, laser_outputs, retriggerable)
+        self.calculate_all_waveform(common_sweep_time=True)
+        self.daq.stop_acquisition()
+        self.daq.prepare_acquisition(channel_keys[0])
+        return True
 
-        # stop daq before writing new waveform
-        # When called the first time, throws an error.
-        # choose to not update the waveform is very useful when running ZStack
-        # if there is a NI Galvo stage in the system.
-        if update_daq_task_flag:
-            self.daq.stop_acquisition()
-            self.daq.prepare_acquisition(channel_key)
+    def clear_channel_sequence(self):
+        """Play one channel per DAQ program again."""
+        if self.daq.channel_sequence is None:
+            return
+        self.daq.set_channel_sequence(None)
+        self.calculate_all_waveform()
 
-        # Add Defocus term
-        # Assume wherever we start is the central focus
-        # TODO: is this the correct assumption?
-        if self.central_focus is None:
-            self.central_focus = self.get_stage_position().get("f_pos")
-        if self.central_focus is not None:
-            self.move_stage(
-                {"f_abs": self.central_focus + float(channel["defocus"])},
-                wait_until_done=True,
-                update_focus=False,
-            )
+    def start_continuous_acquisition(self):
+        """Play the selected channel on the DAQ until stopped.
+
+        The DAQ regenerates the waveforms and triggers the camera freely, so live
+        frames come at the rate of the sweep time. This is enabled by
+        continuous_live in the DAQ configuration, and only for a single selected
+        channel.
+
+        Returns
+        -------
+        result : bool
+            True if the DAQ is running.
+        """
+        daq_config = self.configuration["configuration"]["microscopes"][
+            self.microscope_name
+        ]["daq"]
+        if not daq_config.get("continuous_live", False):
+            return False
+        if len(self.available_channels) != 1:
+            logger.info("Continuous live mode needs a single selected channel.")
+            return False
+
+        if self.current_channel == 0:
+            self.prepare_next_channel()
+        if not self.daq.start_continuous_acquisition():
+            return False
+        self.turn_on_laser()
+        return True
+
+    def stop_continuous_acquisition(self):
+        """Stop playing the selected channel on the DAQ.
+
+        The DAQ is prepared again when the next channel is selected.
+        """
+        self.daq.stop_continuous_acquisition()
+        self.turn_off_lasers()
+        self.current_channel = 0
 
     def move_stage(self, pos_dict, wait_until_done=False, update_focus=True):
         """Move stage to a position.
@@ -767,18 +1039,75 @@ class Microscope:
         success : bool
             True if stage is successfully moved, False otherwise.
         """
-        self.ask_stage_for_position = True
-
+        # Moves are queued on the command queue of the stage's device connection,
+        # so they run after commands still pending there, e.g. a defocus move of
+        # a pipelined channel switch.
         if len(pos_dict.keys()) == 1:
             axis_key = list(pos_dict.keys())[0]
             axis = axis_key[: axis_key.index("_")]
             if update_focus and axis == "f":
                 self.central_focus = None
-            return self.stages[axis].move_axis_absolute(
-                axis, pos_dict[axis_key], wait_until_done
-            )
+            return submit_device_command(
+                self.stages[axis],
+                self.move_axis_device,
+                axis,
+                pos_dict[axis_key],
+                wait_until_done,
+            ).result()
+
+        # independent stages travel at the same time
+        futures = self.move_stage_async(
+            pos_dict, wait_until_done=wait_until_done, update_focus=False
+        )
+        success = all(wait_for_futures(futures))
+
+        if update_focus and "f_abs" in pos_dict:
+            self.central_focus = None
+
+        return success
+
+    def move_axis_device(self, axis, position, wait_until_done=False):
+        """Move a single axis and record the commanded position.
+
+        Parameters
+        ----------
+        axis : str
+            The axis, e.g. 'f'.
+        position : float
+            The absolute target.
+        wait_until_done : bool, optional
+            Wait until stage is done moving, by default False
+
+        Returns
+        -------
+        success : bool
+            True if stage is successfully moved, False otherwise.
+        """
+        # positions are predicted from the targets until the stages are read again
+        service = self.stage_position_service
+        stage = self.stages[axis]
+        with service.stage_lock(stage):
+            success = stage.move_axis_absolute(axis, position, wait_until_done)
+        if success:
+            service.command({f"{axis}_abs": position})
+        else:
+            service.invalidate()
+        return success
+
+    def split_stage_move(self, pos_dict):
+        """Split a move into the moves of the individual stages.
+
+        Parameters
+        ----------
+        pos_dict : dict
+            Dictionary of stage positions, e.g. {"x_abs": 100, "f_abs": 20}.
 
-        success = True
+        Returns
+        -------
+        moves : list
+            List of (stage, pos_dict) pairs, one per stage that has to move.
+        """
+        moves = []
         for stage, axes in self.stages_list:
             pos = {
                 axis: pos_dict[axis]
@@ -786,36 +1115,101 @@ class Microscope:
                 if axis[: axis.index("_")] in axes
             }
             if pos:
-                success = stage.move_absolute(pos, wait_until_done) and success
+                moves.append((stage, pos))
+        return moves
 
-        if update_focus and "f_abs" in pos_dict:
-            self.central_focus = None
+    def move_stage_device(self, stage, pos_dict, wait_until_done=False):
+        """Move one stage and record the commanded position.
 
+        Parameters
+        ----------
+        stage : StageBase
+            The stage.
+        pos_dict : dict
+            Dictionary of positions of the axes of this stage.
+        wait_until_done : bool, optional
+            Wait until stage is done moving, by default False
+
+        Returns
+        -------
+        success : bool
+            True if stage is successfully moved, False otherwise.
+        """
+        service = self.stage_position_service
+        with service.stage_lock(stage):
+            success = stage.move_absolute(pos_dict, wait_until_done)
+        if success:
+            service.command(pos_dict)
+        else:
+            service.invalidate()
         return success
 
+    def move_stage_async(self, pos_dict, wait_until_done=True, update_focus=True):
+        """Start moving the stages without waiting for them.
+
+        Every stage moves in the background on the command queue of its device
+        connection, so independent stages travel at the same time. The caller
+        must wait on the returned futures, e.g. with wait_for_futures(), before
+        talking to the same devices again.
+
+        Parameters
+        ----------
+        pos_dict : dict
+            Dictionary of stage positions.
+        wait_until_done : bool, optional
+            Whether each future only resolves once its stage is on target.
+        update_focus : bool, optional
+            Update the central focus
+
+        Returns
+        -------
+        futures : list
+            One concurrent.futures.Future per stage, resolving to the success of
+            its move.
+        """
+        if update_focus and "f_abs" in pos_dict:
+            self.central_focus = None
+        return [
+            submit_device_command(
+                stage, self.move_stage_device, stage, pos, wait_until_done
+            )
+            for stage, pos in self.split_stage_move(pos_dict)
+        ]
+
     def stop_stage(self):
         """Stop stage."""
 
         self.ask_stage_for_position = True
 
         for stage, axes in self.stages_list:
-            stage.stop()
+            with self.stage_position_service.stage_lock(stage):
+                stage.stop()
 
-        self.central_focus = self.get_stage_position().get("f_pos", self.central_focus)
+        self.central_focus = self.get_stage_position(settled=True).get(
+            "f_pos", self.central_focus
+        )
 
-    def get_stage_position(self):
+    def get_stage_position(self, settled=False):
         """Get stage position.
 
+        Positions are served from the stage position cache, without blocking.
+        Axes that were commanded to move since they were last read are reported
+        at their targets.
+
+        Parameters
+        ----------
+        settled : bool, optional
+            Query every stage for its true position, by default False
+
         Returns
         -------
         stage_position : dict
             Dictionary of stage positions.
         """
         if self.ask_stage_for_position:
-            for stage, axes in self.stages_list:
-                temp_pos = stage.report_position()
-                self.ret_pos_dict.update(temp_pos)
+            self.stage_position_service.invalidate()
             self.ask_stage_for_position = False
+        self.ret_pos_dict.update(self.stage_position_service.read(settled))
         return self.ret_pos_dict
 
     def move_remote_focus(self, offset=None):
@@ -952,6 +1346,7 @@ class Microscope:
     def terminate(self):
         """Close hardware explicitly."""
         self.camera.close_camera()
+        self.daq.close_tasks()
 
         for k in self.galvo:
             self.galvo[k].turn_off()
@@ -962,6 +1357,8 @@ class Microscope:
         except AttributeError:
             pass
 
+        self.stage_position_service.stop()
+        self.shutdown_device_executors()
         try:
             for stage, _ in self.stages_list:
                 stage.close()
@@ -969,6 +1366,14 @@ class Microscope:
             print(f"Stage delete failure: {e}")
         pass
 
+    def shutdown_device_executors(self):
+        """Finish the queued device commands and stop their worker threads."""
+        devices = [stage for stage, _ in self.stages_list]
+        for device in vars(self).values():
+            devices.extend(device.values() if isinstance(device, dict) else [device])
+        for device in devices:
+            shutdown_device_executor(device)
+
     def run_command(self, command, *args):
         """Run command.
 
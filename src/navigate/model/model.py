@@ -34,16 +34,22 @@
 import threading
 import logging
 import multiprocessing as mp
-import time
 import os
 
 # Third Party Imports
 
 # Local Imports
 from navigate.model.concurrency.concurrency_tools import SharedNDArray
+from navigate.model.concurrency.frame_ring import FrameRing
+from navigate.model.concurrency.cancellation import CancellationToken
 from navigate.model.features.autofocus import Autofocus
 from navigate.model.features.adaptive_optics import TonyWilson
 from navigate.model.features.image_writer import ImageWriter
+from navigate.model.data_process import (
+    DataProcess,
+    get_data_process_setting,
+    set_cpu_affinity,
+)
 from navigate.model.features.auto_tile_scan import CalculateFocusRange  # noqa
 from navigate.model.features.common_features import (
     ChangeResolution,
@@ -56,6 +62,11 @@ from navigate.model.features.common_features import (
     MoveToNextPositionInMultiPositionTable,
     WaitToContinue,
 )
+from navigate.model.features.constant_velocity_acquisition import (
+    ConstantVelocityAcquisition,
+)
+from navigate.model.features.hardware_z_stack import HardwareZStackAcquisition
+from navigate.model.features.channel_sequence import ChannelSequenceAcquisition
 from navigate.model.features.remove_empty_tiles import (
     DetectTissueInStackAndRecord,
     RemoveEmptyPositions,
@@ -73,9 +84,20 @@ from navigate.log_files.log_functions import log_setup
 from navigate.tools.common_dict_tools import update_stage_dict
 from navigate.tools.common_functions import load_module_from_file, VariableWithLock
 from navigate.tools.file_functions import load_yaml_file, save_yaml_file
+from navigate.tools.multipos_table_tools import (
+    estimate_travel_time,
+    plan_position_route,
+)
 from navigate.model.device_startup_functions import load_devices
 from navigate.model.microscope import Microscope
-from navigate.config.config import get_navigate_path
+from navigate.model.acquisition_planner import (
+    AcquisitionPlanner,
+    DeviceTimingModel,
+    benchmark_writer_throughput,
+    format_acquisition_plan,
+)
+from navigate.model.waveforms import decimate_waveforms
+from navigate.config.config import get_navigate_path, bump_configuration_version
 from navigate.model.plugins_model import PluginsModel
 
 
@@ -109,6 +131,9 @@ class Model:
         #: dict: Configuration dictionary.
         self.configuration = configuration
 
+        # Pin the model process, which runs the signal thread, to its own cores.
+        set_cpu_affinity(get_data_process_setting(configuration)["model_cpu_affinity"])
+
         plugins = PluginsModel()
         # load plugin feature and devices
         plugin_devices, plugin_acquisition_modes = plugins.load_plugins()
@@ -186,6 +211,9 @@ class Model:
         #: array: stage positions.
         self.data_buffer_positions = None
 
+        #: list: channel of each frame.
+        self.data_buffer_channels = None
+
         #: array: saving flags for a frame
         self.data_buffer_saving_flags = None
 
@@ -209,9 +237,15 @@ class Model:
         #: threading.Thread: Data thread.
         self.data_thread = None
 
-        # show image function/pipe handler
-        #: multiprocessing.connection.Connection: Show image pipe.
-        self.show_img_pipe = None
+        #: CancellationToken: Cancelled when the user stops the acquisition.
+        self.cancel_token = CancellationToken()
+
+        #: float: Maximum time in seconds to wait for the signal and data threads.
+        self.thread_join_timeout = 10.0
+
+        # show image handler
+        #: FrameRing: Newest frames published to the controller.
+        self.frame_ring = None
 
         # Plot Pipe handler
         #: multiprocessing.connection.Connection: Plot pipe.
@@ -221,6 +255,9 @@ class Model:
         #: multiprocessing.Queue: Waveform queue.
         self.event_queue = event_queue
 
+        #: int: Number of min/max bins of each waveform sent for display.
+        self.waveform_display_columns = 1000
+
         # frame signal id
         #: int: Frame ID.
         self.frame_id = 0
@@ -258,7 +295,7 @@ class Model:
         self.update_data_buffer(self.img_width, self.img_height)
 
         # Image Writer/Save functionality
-        #: ImageWriter: Image writer.
+        #: ImageWriter or DataProcess: Image writer.
         self.image_writer = None
 
         # feature list
@@ -388,6 +425,36 @@ class Model:
                     },
                 )
             ],
+            "stage-scan": [
+                (
+                    {"name": ConstantVelocityAcquisition},
+                    {"name": StackPause},
+                    {
+                        "name": LoopByCount,
+                        "args": ("experiment.MicroscopeState.timepoints",),
+                    },
+                )
+            ],
+            "hardware-z-stack": [
+                (
+                    {"name": HardwareZStackAcquisition},
+                    {"name": StackPause},
+                    {
+                        "name": LoopByCount,
+                        "args": ("experiment.MicroscopeState.timepoints",),
+                    },
+                )
+            ],
+            "channel-sequence": [
+                (
+                    {"name": ChannelSequenceAcquisition},
+                    {"name": StackPause},
+                    {
+                        "name": LoopByCount,
+                        "args": ("experiment.MicroscopeState.timepoints",),
+                    },
+                )
+            ],
             "customized": [],
         }
         # append plugin acquisition mode
@@ -417,6 +484,7 @@ class Model:
         self.data_buffer_positions = SharedNDArray(
             shape=(self.number_of_frames, 5), dtype=float
         )  # z-index, x, y, z, theta, f
+        self.data_buffer_channels = [0] * self.number_of_frames
         for microscope_name in self.microscopes:
             self.microscopes[microscope_name].update_data_buffer(
                 self.data_buffer,
@@ -473,6 +541,40 @@ class Model:
         setattr(self, pipe_name, end2)
         return end1
 
+    def create_frame_ring(self, ring_name, capacity=16):
+        """Create a ring of published frame records.
+
+        Parameters
+        ----------
+        ring_name : str
+            Name of the ring to create.
+        capacity : int
+            Number of records kept in the ring.
+
+        Returns
+        -------
+        frame_ring : FrameRing
+            The ring, to be read by the controller.
+        """
+        self.release_frame_ring(ring_name)
+        frame_ring = FrameRing(capacity)
+        setattr(self, ring_name, frame_ring)
+        return frame_ring
+
+    def release_frame_ring(self, ring_name):
+        """Close a ring of published frame records.
+
+        Parameters
+        ----------
+        ring_name : str
+            Name of the ring to close.
+        """
+        frame_ring = getattr(self, ring_name, None)
+        if frame_ring:
+            frame_ring.close()
+        if hasattr(self, ring_name):
+            delattr(self, ring_name)
+
     def release_pipe(self, pipe_name):
         """Close a data pipe.
 
@@ -500,6 +602,11 @@ class Model:
             "MicroscopeState"
         ]["microscope_name"]
         self.active_microscope = self.microscopes[self.active_microscope_name]
+        # only poll the stages of the active microscope
+        for microscope_name, microscope in self.microscopes.items():
+            if microscope_name != self.active_microscope_name:
+                microscope.stage_position_service.stop()
+        self.active_microscope.stage_position_service.start()
         return self.active_microscope
 
     def get_offset_variance_maps(self):
@@ -513,6 +620,24 @@ class Model:
 
         return self.active_microscope.camera.get_offset_variance_maps()
 
+    def send_waveforms(self, waveform_dict):
+        """Send the waveforms to the controller for display.
+
+        Only the min/max envelope of each waveform is sent, which is all the
+        waveform tab can plot anyway.
+
+        Parameters
+        ----------
+        waveform_dict : dict
+            Dictionary of all the waveforms.
+        """
+        self.event_queue.put(
+            (
+                "waveform",
+                decimate_waveforms(waveform_dict, self.waveform_display_columns),
+            )
+        )
+
     def run_command(self, command, *args, **kwargs):
         """Receives commands from the controller.
 
@@ -526,6 +651,17 @@ class Model:
             Dictionary of keyword arguments to pass to the command.
         """
         logging.info(f"Received command: {command}, {args}, {kwargs}")
+        # The controller writes the shared configuration before issuing these
+        # commands, so process-local snapshots must be refreshed. Other commands,
+        # e.g. stopping or mirror updates, don't invalidate them.
+        if command in [
+            "acquire",
+            "update_setting",
+            "autofocus",
+            "load_feature",
+            "plan_acquisition",
+        ]:
+            bump_configuration_version(self.configuration)
         if not self.data_buffer:
             logging.debug("Shared Memory Not Set Up.")
             return
@@ -542,6 +678,8 @@ class Model:
 
             # Calculate waveforms, turn on lasers, etc.
             self.prepare_acquisition()
+            if self.frame_ring:
+                self.frame_ring.reset()
 
             # load features
             if self.imaging_mode == "customized":
@@ -570,11 +708,22 @@ class Model:
                 plugin_obj = self.plugin_acquisition_modes.get(self.imaging_mode, None)
                 if plugin_obj and hasattr(plugin_obj, "update_saving_config"):
                     saving_config = getattr(plugin_obj, "update_saving_config")(self)
-                self.image_writer = ImageWriter(
-                    self,
-                    saving_flags=self.data_buffer_saving_flags,
-                    saving_config=saving_config,
-                )
+                data_process_setting = get_data_process_setting(self.configuration)
+                if data_process_setting["enabled"]:
+                    # save frames in a separate process to keep the GIL free for
+                    # the signal thread
+                    self.image_writer = DataProcess(
+                        self,
+                        saving_flags=self.data_buffer_saving_flags,
+                        saving_config=saving_config,
+                        cpu_affinity=data_process_setting["cpu_affinity"],
+                    )
+                else:
+                    self.image_writer = ImageWriter(
+                        self,
+                        saving_flags=self.data_buffer_saving_flags,
+                        saving_config=saving_config,
+                    )
                 self.data_thread = threading.Thread(
                     target=self.run_data_process,
                     kwargs={"data_func": self.image_writer.save_image},
@@ -601,11 +750,12 @@ class Model:
                 if image_writer:
                     self.virtual_microscopes[m].image_writer = image_writer
 
+                getattr(self, f"{m}_frame_ring").reset()
                 threading.Thread(
                     target=self.simplified_data_process,
                     args=(
                         self.virtual_microscopes[m],
-                        getattr(self, f"{m}_show_img_pipe"),
+                        getattr(self, f"{m}_frame_ring"),
                         image_writer.save_image if image_writer else None,
                     ),
                 ).start()
@@ -646,7 +796,7 @@ class Model:
             else:
                 waveform_dict = self.active_microscope.calculate_all_waveform()
 
-            self.event_queue.put(("waveform", waveform_dict))
+            self.send_waveforms(waveform_dict)
 
             if self.is_acquiring:
                 # prepare devices based on updated info
@@ -685,6 +835,20 @@ class Model:
                 autofocus = Autofocus(self, *args)
                 autofocus.run()
 
+        elif command == "plan_acquisition":
+            """Estimate the current acquisition and send the formatted plan."""
+            if self.is_acquiring:
+                self.event_queue.put(
+                    ("warning", "Cannot estimate the acquisition while acquiring.")
+                )
+                return
+            try:
+                plan = self.plan_acquisition()
+            except ValueError as e:
+                self.event_queue.put(("warning", str(e)))
+                return
+            self.event_queue.put(("acquisition_plan", format_acquisition_plan(plan)))
+
         elif command == "flatten_mirror":
             self.update_mirror(coef=[], flatten=True)
         elif command == "zero_mirror":
@@ -755,13 +919,18 @@ class Model:
             Called when user halts the acquisition
             """
             self.stop_acquisition = True
+            self.cancel_token.cancel()
 
             if hasattr(self, "signal_container"):
                 self.signal_container.end_flag = True
-            if self.signal_thread:
-                self.signal_thread.join()
-            if self.data_thread:
-                self.data_thread.join()
+            for thread in [self.signal_thread, self.data_thread]:
+                if thread:
+                    thread.join(self.thread_join_timeout)
+                    if thread.is_alive():
+                        self.logger.warning(
+                            f"{thread.name} thread did not stop in "
+                            f"{self.thread_join_timeout} s."
+                        )
 
             self.end_acquisition()
             self.stop_stage()
@@ -832,15 +1001,20 @@ class Model:
             return False
         return r
 
-    def get_stage_position(self):
+    def get_stage_position(self, settled=False):
         """Get the position of the stage.
 
+        Parameters
+        ----------
+        settled : bool
+            Query the stages for their true positions instead of using the cache.
+
         Returns
         -------
         ret_pos_dict : dict
             Dictionary of stage positions.
         """
-        return self.active_microscope.get_stage_position()
+        return self.active_microscope.get_stage_position(settled)
 
     def stop_stage(self):
         """Stop the stages."""
@@ -896,11 +1070,13 @@ class Model:
         # whether acquire specific number of frames.
         count_frame = num_of_frames > 0
 
-        while not self.stop_acquisition:
+        while not self.stop_acquisition and not self.cancel_token.cancelled:
             if self.ask_to_pause_data_thread:
                 self.pause_data_ready_lock.release()
                 self.pause_data_event.clear()
-                self.pause_data_event.wait()
+                while not self.pause_data_event.wait(0.1):
+                    if self.cancel_token.cancelled:
+                        break
             frame_ids = self.active_microscope.camera.get_new_frame()
             self.logger.info(f"Running data process, getting frames {frame_ids}")
             # if there is at least one frame available
@@ -936,13 +1112,17 @@ class Model:
 
             # show image
             self.logger.info(f"Image delivered to controller: {frame_ids[0]}")
-            self.show_img_pipe.send(frame_ids[-1])
+            self.frame_ring.publish(
+                frame_ids[-1],
+                self.data_buffer_positions[frame_ids[-1]],
+                self.data_buffer_channels[frame_ids[-1]],
+            )
 
             if count_frame and acquired_frame_num >= num_of_frames:
                 self.logger.info("Loop stop condition met.")
                 self.stop_acquisition = True
 
-        self.show_img_pipe.send("stop")
+        self.frame_ring.stop()
         self.logger.info("Data thread stopped.")
         self.logger.info(f"Received frames in total: {acquired_frame_num}")
 
@@ -973,22 +1153,22 @@ class Model:
         if self.pause_data_ready_lock.locked():
             self.pause_data_ready_lock.release()
 
-    def simplified_data_process(self, microscope, show_img_pipe, data_func=None):
+    def simplified_data_process(self, microscope, frame_ring, data_func=None):
         """Run the data process.
 
         Parameters
         ----------
         microscope : Microscope
             Microscope object.
-        show_img_pipe : multiprocessing.connection.Connection
-            Pipe for showing images.
+        frame_ring : FrameRing
+            Ring the newest frames are published to.
         data_func : object
             Function to run on the acquired data.
         """
 
         acquired_frame_num = 0
 
-        while not self.stop_acquisition:
+        while not self.stop_acquisition and not self.cancel_token.cancelled:
             frame_ids = (
                 microscope.camera.get_new_frame()
             )  # This is the 500 ms wait for Hamamatsu
@@ -1007,13 +1187,15 @@ class Model:
 
             # show image
             self.logger.info(
-                f"Navigate Model - Sent through pipe{frame_ids[0]} -- "
+                f"Navigate Model - Published frame {frame_ids[-1]} -- "
                 f"{microscope.microscope_name}"
             )
-            show_img_pipe.send(frame_ids[-1])
+            frame_ring.publish(
+                frame_ids[-1], channel=microscope.current_channel or 0
+            )
             acquired_frame_num += len(frame_ids)
 
-        show_img_pipe.send("stop")
+        frame_ring.stop()
         self.logger.info("Data thread stopped.")
         self.logger.info(f"Received frames in total: {acquired_frame_num}")
 
@@ -1032,6 +1214,7 @@ class Model:
         # turn off flags
         if turn_off_flags:
             self.stop_acquisition = False
+            self.cancel_token = CancellationToken()
             self.stop_send_signal = False
             self.injected_flag.value = False
             self.is_live = False
@@ -1046,12 +1229,86 @@ class Model:
         # Confirm stage position and software are in agreement.
         self.stop_stage()
 
+        self.plan_position_route()
+
         # prepare active microscope
         waveform_dict = self.active_microscope.prepare_acquisition()
-        self.event_queue.put(("waveform", waveform_dict))
+        self.send_waveforms(waveform_dict)
 
         self.frame_id = 0
 
+    def plan_acquisition(self, imaging_mode=None, writer_throughput=None):
+        """Estimate the duration, data size and bottleneck of an acquisition.
+
+        The feature list of the acquisition mode is dry-run against a timing model
+        of the active microscope. No device is moved.
+
+        Parameters
+        ----------
+        imaging_mode : str, optional
+            The acquisition mode. Defaults to the current one.
+        writer_throughput : float, optional
+            Saving speed in bytes per second. Measured with the current saving
+            settings if not given and saving is enabled.
+
+        Returns
+        -------
+        plan : dict
+            The plan, see AcquisitionPlanner.plan().
+        """
+        microscope_state = self.configuration["experiment"]["MicroscopeState"]
+        if imaging_mode is None:
+            imaging_mode = microscope_state["image_mode"]
+        if imaging_mode == "customized":
+            feature_list = self.addon_feature or []
+        else:
+            feature_list = self.acquisition_modes_feature_setting[imaging_mode]
+
+        if writer_throughput is None and microscope_state["is_save"]:
+            writer_throughput = benchmark_writer_throughput(
+                self.configuration, self.active_microscope_name
+            )
+        timing = DeviceTimingModel.from_microscope(
+            self.active_microscope, writer_throughput=writer_throughput
+        )
+        plan = AcquisitionPlanner(self.configuration, timing).plan(feature_list)
+        self.logger.info(
+            f"Acquisition plan for {imaging_mode}:\n{format_acquisition_plan(plan)}"
+        )
+        return plan
+
+    def plan_position_route(self):
+        """Plan the order in which the multi-position table is acquired.
+
+        The table itself is not reordered. The visiting order is stored as
+        MicroscopeState["position_order"], a list of table indices, so that the
+        features visit the positions in that order and the data sources can name
+        each position after its row in the table.
+        """
+        microscope_state = self.configuration["experiment"]["MicroscopeState"]
+        positions = [
+            list(position)
+            for position in self.configuration["experiment"]["MultiPositions"]
+        ]
+        order = list(range(len(positions)))
+
+        if (
+            microscope_state["is_multiposition"]
+            and microscope_state.get("optimize_position_order", False)
+            and len(positions) > 2
+        ):
+            order = plan_position_route(positions)
+            before = estimate_travel_time(positions)
+            after = estimate_travel_time([positions[i] for i in order])
+            self.logger.info(
+                f"Position route planned. Estimated travel time {before:.1f} s "
+                f"in table order, {after:.1f} s in planned order."
+            )
+            self.event_queue.put(("position_route", (before, after)))
+
+        microscope_state["position_order"] = order
+        bump_configuration_version(self.configuration)
+
     def snap_image(self):
         """Acquire an image after updating the waveforms.
 
@@ -1062,15 +1319,34 @@ class Model:
         if hasattr(self, "signal_container"):
             self.signal_container.run()
 
+        # A pipelined channel switch must be done before the next trigger.
+        try:
+            for microscope in self.virtual_microscopes.values():
+                microscope.wait_for_channel_switch()
+            self.active_microscope.wait_for_channel_switch()
+        except Exception as e:
+            self.logger.error(f"Channel switch failed: {e}")
+            self.stop_acquisition = True
+            self.event_queue.put(
+                (
+                    "warning",
+                    "An error happened. Please read the log files for details!",
+                )
+            )
+            return
+
         # Stash current position, channel, timepoint. Do this here, because signal
-        # container functions can inject changes to the stage. NOTE: This line is
-        # wildly expensive when get_stage_position() does not cache results.
+        # container functions can inject changes to the stage. The position comes
+        # from the stage position cache and does not block on the stages.
         stage_pos = self.get_stage_position()
         self.data_buffer_positions[self.frame_id][0] = stage_pos.get("x_pos", 0)
         self.data_buffer_positions[self.frame_id][1] = stage_pos.get("y_pos", 0)
         self.data_buffer_positions[self.frame_id][2] = stage_pos.get("z_pos", 0)
         self.data_buffer_positions[self.frame_id][3] = stage_pos.get("theta_pos", 0)
         self.data_buffer_positions[self.frame_id][4] = stage_pos.get("f_pos", 0)
+        self.data_buffer_channels[self.frame_id] = (
+            self.active_microscope.current_channel or 0
+        )
 
         # Run the acquisition
         try:
@@ -1107,7 +1383,16 @@ class Model:
         acquisition parameters in real-time.
         """
         self.stop_acquisition = False
-        while not self.stop_acquisition and not self.stop_send_signal:
+        continuous = True
+        while (
+            not self.stop_acquisition
+            and not self.stop_send_signal
+            and not self.cancel_token.cancelled
+        ):
+            # injected features, e.g. autofocus, run frame by frame
+            if continuous and not self.injected_flag.value:
+                continuous = self.run_continuous_live_acquisition()
+                continue
             self.run_acquisition()
             if self.injected_flag.value:
                 self.reset_feature_list()
@@ -1116,7 +1401,48 @@ class Model:
 
         # Update the stage position.
         # Allows the user to externally move the stage in the continuous mode.
-        self.get_stage_position()
+        self.get_stage_position(settled=True)
+
+    def run_continuous_live_acquisition(self):
+        """Stream live images while the DAQ triggers the camera freely.
+
+        The DAQ regenerates the waveforms instead of being armed for every frame, so
+        live images come at the rate of the camera. Waveform changes from the GUI
+        are written to the running DAQ tasks. Runs until the acquisition stops or
+        a feature is injected.
+
+        Returns
+        -------
+        result : bool
+            False if the microscope can not run continuously.
+        """
+        microscope = self.active_microscope
+        if not microscope.start_continuous_acquisition():
+            return False
+        self.logger.info("Continuous live acquisition started.")
+
+        try:
+            while (
+                not self.stop_acquisition
+                and not self.stop_send_signal
+                and not self.injected_flag.value
+            ):
+                # the frames are not triggered by the model, so every frame of the
+                # buffer is tagged with the current position and channel
+                stage_pos = self.get_stage_position()
+                self.data_buffer_positions[:] = [
+                    stage_pos.get(f"{axis}_pos", 0)
+                    for axis in ["x", "y", "z", "theta", "f"]
+                ]
+                self.data_buffer_channels[:] = [
+                    microscope.current_channel
+                ] * self.number_of_frames
+                if self.cancel_token.wait(0.1):
+                    break
+        finally:
+            microscope.stop_continuous_acquisition()
+            self.logger.info("Continuous live acquisition stopped.")
+        return True
 
     def run_acquisition(self):
         """Run acquisition along with a feature list one time."""
@@ -1128,6 +1454,7 @@ class Model:
             not self.signal_container.end_flag
             and not self.stop_send_signal
             and not self.stop_acquisition
+            and not self.cancel_token.cancelled
         ):
             self.snap_image()
             if not hasattr(self, "signal_container"):
@@ -1149,9 +1476,8 @@ class Model:
                 and not self.data_container.end_flag
                 and waiting_num > 0
             ):
-                if self.stop_acquisition:
+                if self.stop_acquisition or self.cancel_token.wait(0.01):
                     return
-                time.sleep(0.01)
                 waiting_num -= 1
             if hasattr(self, "signal_container"):
                 self.signal_container.cleanup()
@@ -1205,7 +1531,7 @@ class Model:
             ):
                 # stop stages
                 self.active_microscope.stop_stage()
-                curr_pos = self.get_stage_position()
+                curr_pos = self.get_stage_position(settled=True)
                 shift_pos = {}
                 for axis, mags in offsets[solvent].items():
                     shift_pos[f"{axis}_abs"] = curr_pos[f"{axis}_pos"] + float(
@@ -1415,6 +1741,7 @@ class Model:
 
     def terminate(self):
         """Terminate the model."""
+        self.cancel_token.cancel()
         self.active_microscope.terminate()
         for microscope_name in self.virtual_microscopes:
             self.virtual_microscopes[microscope_name].terminate()
@@ -0,0 +1,242 @@
+# Copyright (c) 2021-2024  The University of Texas Southwestern Medical Center.
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted for academic and research use only
+# (subject to the limitations in the disclaimer below)
+# provided that the following conditions are met:
+
+#      * Redistributions of source code must retain the above copyright notice,
+#      this list of conditions and the following disclaimer.
+
+#      * Redistributions in binary form must reproduce the above copyright
+#      notice, this list of conditions and the following disclaimer in the
+#      documentation and/or other materials provided with the distribution.
+
+#      * Neither the name of the copyright holders nor the names of its
+#      contributors may be used to endorse or promote products derived from this
+#      software without specific prior written permission.
+
+# NO EXPRESS OR IMPLIED LICENSES TO ANY PARTY'S PATENT RIGHTS ARE GRANTED BY
+# THIS LICENSE. THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND
+# CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A
+# PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR
+# BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER
+# IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+# Standard Library Imports
+import logging
+import threading
+import time
+
+# Third Party Imports
+
+# Local Imports
+from navigate.model.concurrency.device_commands import get_connection_lock
+
+# Logger Setup
+p = __name__.split(".")[1]
+logger = logging.getLogger(p)
+
+
+class StagePositionService:
+    """A timestamped cache of stage positions.
+
+    Reading a position from a stage is a round trip over a serial or USB link.
+    The service keeps the last position read from each stage, with the time it was
+    read, and optionally refreshes it from a background poller per stage. Between
+    reads, positions of axes that were commanded to move are predicted to be at
+    their targets.
+
+    Non-blocking reads (e.g. once per frame) are served from the cache. Settled
+    reads query every stage and are meant for features that need the true
+    position, e.g. before planning a stack.
+
+    Every call to a stage made through the service, every call made inside
+    `stage_lock` and every command queued for the stage's device connection are
+    serialized with the poller. Devices sharing a connection with the stage, e.g.
+    a filter wheel on the same controller, share its lock.
+    """
+
+    def __init__(self, stages_list, poll_interval=0):
+        """Initialize the StagePositionService.
+
+        Parameters
+        ----------
+        stages_list : list
+            List of (stage, axes) tuples.
+        poll_interval : float, optional
+            Time in seconds between two polls of a stage. 0 disables the poller.
+        """
+        #: list: List of (stage, axes) tuples.
+        self.stages_list = stages_list
+
+        #: float: Time in seconds between two polls of a stage.
+        self.poll_interval = float(poll_interval or 0)
+
+        #: dict: Last position read for each axis, e.g. {"x_pos": 0}.
+        self.positions = {}
+
+        #: dict: Time (time.monotonic) each axis was last read.
+        self.timestamps = {}
+
+        #: dict: Target and command time of axes commanded since their last read.
+        self.commanded = {}
+
+        #: bool: Whether the cache must be refreshed before the next read.
+        self.is_stale = True
+
+        #: threading.Lock: Protects the cache.
+        self.cache_lock = threading.Lock()
+
+        #: threading.Event: Set to stop the pollers.
+        self.stop_event = threading.Event()
+
+        #: list: Poller threads.
+        self.poller_threads = []
+
+    def stage_lock(self, stage):
+        """Get the lock serializing calls to a stage.
+
+        Parameters
+        ----------
+        stage : StageBase
+            The stage.
+
+        Returns
+        -------
+        threading.RLock
+            The lock of the stage's device connection.
+        """
+        return get_connection_lock(stage)
+
+    def start(self):
+        """Start a poller for each stage if a poll interval is set."""
+        if self.poll_interval <= 0 or self.poller_threads:
+            return
+        self.stop_event.clear()
+        for stage, _ in self.stages_list:
+            thread = threading.Thread(
+                target=self.run_poller,
+                args=(stage,),
+                name=f"{stage} Position Poller",
+                daemon=True,
+            )
+            thread.start()
+            self.poller_threads.append(thread)
+
+    def stop(self):
+        """Stop the pollers."""
+        self.stop_event.set()
+        for thread in self.poller_threads:
+            thread.join(max(self.poll_interval, 1.0))
+        self.poller_threads = []
+
+    def run_poller(self, stage):
+        """Poll a stage until the service is stopped.
+
+        Parameters
+        ----------
+        stage : StageBase
+            The stage to poll.
+        """
+        while not self.stop_event.wait(self.poll_interval):
+            try:
+                self.poll(stage)
+            except Exception as e:
+                logger.debug(f"Polling {stage} failed: {e}")
+
+    def poll(self, stage):
+        """Read the position of a stage and update the cache.
+
+        Parameters
+        ----------
+        stage : StageBase
+            The stage to read.
+
+        Returns
+        -------
+        dict
+            The position of the stage.
+        """
+        with self.stage_lock(stage):
+            read_time = time.monotonic()
+            position = stage.report_position()
+        with self.cache_lock:
+            self.positions.update(position)
+            for axis_pos in position:
+                self.timestamps[axis_pos] = read_time
+                # the read is newer than the command, so it is the better guess
+                commanded = self.commanded.get(axis_pos)
+                if commanded is not None and commanded[1] <= read_time:
+                    del self.commanded[axis_pos]
+        return position
+
+    def refresh(self):
+        """Read the position of every stage."""
+        for stage, _ in self.stages_list:
+            self.poll(stage)
+        self.is_stale = False
+
+    def invalidate(self):
+        """Refresh the cache before the next read, e.g. after a stage stopped."""
+        self.is_stale = True
+
+    def command(self, pos_dict):
+        """Record the targets of a move.
+
+        Parameters
+        ----------
+        pos_dict : dict
+            Absolute targets, e.g. {"x_abs": 100}.
+        """
+        command_time = time.monotonic()
+        with self.cache_lock:
+            for axis_abs, value in pos_dict.items():
+                axis = axis_abs[: axis_abs.index("_")]
+                self.commanded[f"{axis}_pos"] = (value, command_time)
+
+    def read(self, settled=False):
+        """Get the stage positions.
+
+        Parameters
+        ----------
+        settled : bool, optional
+            Query every stage instead of reading the cache.
+
+        Returns
+        -------
+        dict
+            Dictionary of stage positions.
+        """
+        if settled or self.is_stale or not self.positions:
+            self.refresh()
+        with self.cache_lock:
+            positions = dict(self.positions)
+            for axis_pos, (value, _) in self.commanded.items():
+                positions[axis_pos] = value
+        return positions
+
+    def age(self, axis):
+        """Get the time since an axis was last read.
+
+        Parameters
+        ----------
+        axis : str
+            The axis, e.g. 'x'.
+
+        Returns
+        -------
+        float
+            Time in seconds, or None if the axis was never read.
+        """
+        read_time = self.timestamps.get(f"{axis}_pos", None)
+        if read_time is None:
+            return None
+        return time.monotonic() - read_time
@@ -32,6 +32,8 @@
 
 # Standard Library Imports
 import logging
+import threading
+from collections import OrderedDict
 
 # Third Party Imports
 import numpy as np
@@ -380,6 +382,42 @@ def dc_value(sample_rate=100000, sweep_time=0.4, amplitude=1):
     return waveform
 
 
+def staircase(sample_rate=100000, sweep_time=0.4, levels=(0,), ramp=False):
+    """Returns a numpy array with one step per level
+
+    Used for driving an analog stage through a z-stack, one step per sweep.
+
+    Parameters
+    ----------
+    sample_rate : Integer
+        Unit - Hz
+    sweep_time : Float
+        Unit - Seconds. Duration of each step.
+    levels : list
+        Unit - Volts. Value of each step.
+    ramp : bool
+        If True, ramp linearly from each level towards the next one during the
+        sweep instead of holding it. The last step continues with the same slope.
+
+    Returns
+    -------
+    waveform : np.array
+
+    Examples
+    --------
+    >>> typical_stage = staircase(sample_rate, sweep_time, [0, 0.1, 0.2])
+    """
+    samples = int(np.multiply(sample_rate, sweep_time))
+    levels = np.asarray(levels, dtype=float)
+    if not ramp or len(levels) < 2:
+        return np.repeat(levels, samples)
+
+    next_levels = np.append(levels[1:], 2 * levels[-1] - levels[-2])
+    fraction = np.arange(samples) / samples
+    waveform = levels[:, None] + (next_levels - levels)[:, None] * fraction
+    return waveform.ravel()
+
+
 def square(
     sample_rate=100000,
     sweep_time=0.4,
@@ -493,3 +531,267 @@ def smooth_waveform(waveform, percent_smoothing=10):
     )
 
     return smoothed_waveform
+
+
+def min_max_envelope(waveform, number_of_columns=1000):
+    """Decimate a waveform to its minimum/maximum envelope.
+
+    The waveform is split into `number_of_columns` bins, e.g. one per pixel column
+    of a plot. The minimum and the maximum sample of each bin are kept, in the order
+    they appear in the waveform, so that the plotted envelope looks like the full
+    waveform.
+
+    Parameters
+    ----------
+    waveform : np.array
+        The waveform to be decimated
+    number_of_columns : int
+        The number of bins
+
+    Returns
+    -------
+    sample_index : np.array
+        The indices of the kept samples in the waveform
+    envelope : np.array
+        The values of the kept samples
+
+    Examples
+    --------
+    >>> sample_index, envelope = min_max_envelope(waveform, 1000)
+    """
+    waveform = np.asarray(waveform)
+    number_of_samples = waveform.size
+    if number_of_samples <= 2 * number_of_columns:
+        return np.arange(number_of_samples), waveform
+
+    bin_length = int(np.ceil(number_of_samples / number_of_columns))
+    number_of_bins = int(np.ceil(number_of_samples / bin_length))
+    padded_waveform = np.pad(
+        waveform, (0, number_of_bins * bin_length - number_of_samples), mode="edge"
+    ).reshape(number_of_bins, bin_length)
+
+    min_index = np.argmin(padded_waveform, axis=1)
+    max_index = np.argmax(padded_waveform, axis=1)
+    bin_start = np.arange(number_of_bins) * bin_length
+
+    sample_index = np.empty(2 * number_of_bins, dtype=int)
+    sample_index[0::2] = bin_start + np.minimum(min_index, max_index)
+    sample_index[1::2] = bin_start + np.maximum(min_index, max_index)
+    sample_index = np.minimum(sample_index, number_of_samples - 1)
+
+    return sample_index, waveform[sample_index]
+
+
+def decimate_waveforms(waveform_dict, number_of_columns=1000):
+    """Decimate all the waveforms of a microscope for display.
+
+    Parameters
+    ----------
+    waveform_dict : dict
+        Dictionary of all the waveforms, as returned by
+        Microscope.calculate_all_waveform()
+    number_of_columns : int
+        The number of bins of each waveform
+
+    Returns
+    -------
+    decimated_waveform_dict : dict
+        Dictionary with the same layout as waveform_dict. Each waveform is replaced by
+        a dictionary with the keys "sample_index", "envelope" and "number_of_samples".
+    """
+
+    def decimate(waveform):
+        if waveform is None:
+            return None
+        sample_index, envelope = min_max_envelope(waveform, number_of_columns)
+        return {
+            "sample_index": sample_index,
+            "envelope": envelope,
+            "number_of_samples": np.size(waveform),
+        }
+
+    decimated_waveform_dict = {}
+    for name, waveforms in waveform_dict.items():
+        if isinstance(waveforms, dict):
+            decimated_waveform_dict[name] = {
+                k: decimate(v) for k, v in waveforms.items()
+            }
+        elif isinstance(waveforms, list):
+            decimated_waveform_dict[name] = [
+                {k: decimate(v) for k, v in w.items()} for w in waveforms
+            ]
+    return decimated_waveform_dict
+
+
+def repeat_min_max_envelope(waveform, repeat_num, number_of_columns=1000):
+    """Get the minimum/maximum envelope of a decimated waveform played repeatedly.
+
+    The repeated waveform is split into `number_of_columns` bins, e.g. one per pixel
+    column of the plotted span, so the number of points does not grow with the
+    number of repeats.
+
+    Parameters
+    ----------
+    waveform : dict
+        A decimated waveform, as returned by decimate_waveforms()
+    repeat_num : int
+        How often the waveform is played back to back
+    number_of_columns : int
+        The number of bins
+
+    Returns
+    -------
+    sample_index : np.array
+        The indices of the kept samples in the repeated waveform
+    envelope : np.array
+        The values of the kept samples
+    """
+    period = int(waveform["number_of_samples"])
+    sample_index = np.asarray(waveform["sample_index"])
+    envelope = np.asarray(waveform["envelope"])
+    repeat_num = max(int(repeat_num), 1)
+    number_of_columns = max(int(number_of_columns), 1)
+    number_of_samples = period * repeat_num
+
+    def tile(first_period, last_period):
+        periods = np.arange(first_period, last_period)
+        return (
+            (sample_index + periods[:, None] * period).ravel(),
+            np.tile(envelope, periods.size),
+        )
+
+    if repeat_num * envelope.size <= 2 * number_of_columns:
+        return tile(0, repeat_num)
+
+    bin_length = int(np.ceil(number_of_samples / number_of_columns))
+    if bin_length < period:
+        # there are fewer repeats than bins, so the tiled envelope stays small
+        tiled_index, tiled_envelope = tile(0, repeat_num)
+        bins = tiled_index // bin_length
+        order = np.lexsort((tiled_envelope, bins))
+        first = np.flatnonzero(np.r_[True, bins[order][1:] != bins[order][:-1]])
+        last = np.r_[first[1:], order.size] - 1
+        min_index = tiled_index[order[first]]
+        max_index = tiled_index[order[last]]
+        min_value = tiled_envelope[order[first]]
+        max_value = tiled_envelope[order[last]]
+    else:
+        # every full bin holds a whole period
+        number_of_bins = int(np.ceil(number_of_samples / bin_length))
+        bin_start = np.arange(number_of_bins) * bin_length
+        min_phase = sample_index[np.argmin(envelope)]
+        max_phase = sample_index[np.argmax(envelope)]
+        min_index = bin_start + (min_phase - bin_start) % period
+        max_index = bin_start + (max_phase - bin_start) % period
+        min_value = np.full(number_of_bins, np.min(envelope))
+        max_value = np.full(number_of_bins, np.max(envelope))
+
+        # the last bin may be shorter than a period
+        if number_of_samples - bin_start[-1] < period:
+            tiled_index, tiled_envelope = tile(bin_start[-1] // period, repeat_num)
+            in_bin = tiled_index >= bin_start[-1]
+            tiled_index, tiled_envelope = tiled_index[in_bin], tiled_envelope[in_bin]
+            if tiled_index.size == 0:
+                min_index, max_index = min_index[:-1], max_index[:-1]
+                min_value, max_value = min_value[:-1], max_value[:-1]
+            else:
+                min_index[-1] = tiled_index[np.argmin(tiled_envelope)]
+                max_index[-1] = tiled_index[np.argmax(tiled_envelope)]
+                min_value[-1] = np.min(tiled_envelope)
+                max_value[-1] = np.max(tiled_envelope)
+
+    # keep the minimum and the maximum of each bin in the order they are played
+    min_first = min_index <= max_index
+    repeated_index = np.empty(2 * min_index.size, dtype=int)
+    repeated_index[0::2] = np.where(min_first, min_index, max_index)
+    repeated_index[1::2] = np.where(min_first, max_index, min_index)
+    repeated_envelope = np.empty(2 * min_index.size, dtype=envelope.dtype)
+    repeated_envelope[0::2] = np.where(min_first, min_value, max_value)
+    repeated_envelope[1::2] = np.where(min_first, max_value, min_value)
+
+    return repeated_index, repeated_envelope
+
+
+class WaveformCache:
+    """Least recently used cache of read-only waveforms.
+
+    Waveforms are keyed by the fully resolved tuple of parameters they are generated
+    from, so switching back to a channel, zoom or exposure time that was already used
+    does not recompute anything. Cached arrays are read-only, since the same array
+    is handed to every caller with the same parameters.
+    """
+
+    def __init__(self, max_size=64):
+        """Initialize the waveform cache.
+
+        Parameters
+        ----------
+        max_size : int
+            Maximum number of waveforms kept in the cache.
+        """
+        #: int: Maximum number of waveforms kept in the cache.
+        self.max_size = max_size
+
+        #: int: Number of lookups served from the cache.
+        self.hits = 0
+
+        #: int: Number of lookups that generated a new waveform.
+        self.misses = 0
+
+        #: OrderedDict: Cached waveforms, least recently used first.
+        self._waveforms = OrderedDict()
+
+        #: threading.Lock: Lock guarding the cache.
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        """Return the number of cached waveforms."""
+        return len(self._waveforms)
+
+    def get(self, key, generate):
+        """Return the waveform for key, generating it on a cache miss.
+
+        Parameters
+        ----------
+        key : tuple
+            Hashable tuple of every parameter the waveform depends on.
+        generate : callable
+            Called without arguments to generate the waveform on a cache miss.
+            Waveforms that are None are returned but not cached.
+
+        Returns
+        -------
+        waveform : np.array
+            Read-only waveform.
+        """
+        with self._lock:
+            waveform = self._waveforms.get(key, None)
+            if waveform is not None:
+                self._waveforms.move_to_end(key)
+                self.hits += 1
+                return waveform
+
+        waveform = generate()
+        if waveform is None:
+            return None
+        waveform = np.asarray(waveform)
+        waveform.setflags(write=False)
+
+        with self._lock:
+            self.misses += 1
+            self._waveforms[key] = waveform
+            self._waveforms.move_to_end(key)
+            while len(self._waveforms) > self.max_size:
+                self._waveforms.popitem(last=False)
+        return waveform
+
+    def clear(self):
+        """Remove all waveforms from the cache."""
+        with self._lock:
+            self._waveforms.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+#: WaveformCache: Waveform cache shared by all devices.
+waveform_cache = WaveformCache()
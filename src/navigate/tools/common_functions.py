@@ -90,13 +90,14 @@ def copy_proxy_object(content):
     from multiprocessing import managers
 
     def func(content):
+        # copy() and [:] fetch a whole dict/list level in a single round trip
         if type(content) == managers.DictProxy:
             result = {}
-            for k in content.keys():
-                result[k] = func(content[k])
+            for k, v in content.copy().items():
+                result[k] = func(v)
         elif type(content) == managers.ListProxy:
             result = []
-            for v in content:
+            for v in content[:]:
                 result.append(func(v))
         else:
             result = content
@@ -30,6 +30,7 @@
 # POSSIBILITY OF SUCH DAMAGE.
 
 # Standard library imports
+from itertools import product
 from math import ceil
 
 # Third party imports
@@ -38,6 +39,10 @@ import pandas as pd
 
 # Local application imports
 
+#: dict: Estimated seconds per micron (per degree for theta) of stage travel. Focus
+#: and rotation moves are slow and prone to backlash, so they weigh more.
+DEFAULT_TRAVEL_WEIGHTS = {"x": 0.001, "y": 0.001, "z": 0.001, "theta": 0.05, "f": 0.005}
+
 
 def sign(x):
     """Return the sign of x.
@@ -245,3 +250,249 @@ def update_table(table, pos, append=False):
     table.resetColors()
     table.redraw()
     table.tableChanged()
+
+
+def _travel_weights(axis_weights=None):
+    """Return the travel weights of (x, y, z, theta, f) as an array.
+
+    Parameters
+    ----------
+    axis_weights : dict, optional
+        Seconds per unit of travel for some axes. Missing axes use
+        DEFAULT_TRAVEL_WEIGHTS.
+
+    Returns
+    -------
+    np.array
+        Weights of the x, y, z, theta, and f axes.
+    """
+    weights = dict(DEFAULT_TRAVEL_WEIGHTS)
+    weights.update(axis_weights or {})
+    return np.array([weights[axis] for axis in ["x", "y", "z", "theta", "f"]])
+
+
+def _travel_costs(positions, weights, index, others):
+    """Travel times from one position to several others.
+
+    Axes move in parallel, so a move takes as long as its slowest axis.
+
+    Parameters
+    ----------
+    positions : np.array
+        (n_positions x (x, y, z, theta, f)) array of positions.
+    weights : np.array
+        Weights of the x, y, z, theta, and f axes.
+    index : int
+        Index of the start position.
+    others : np.array
+        Indices of the end positions.
+
+    Returns
+    -------
+    np.array
+        Travel time to each end position.
+    """
+    return np.max(np.abs(positions[others] - positions[index]) * weights, axis=1)
+
+
+def estimate_travel_time(positions, axis_weights=None):
+    """Estimate the stage travel time to visit positions in the given order.
+
+    Parameters
+    ----------
+    positions : list or np.array
+        (n_positions x (x, y, z, theta, f)) positions.
+    axis_weights : dict, optional
+        Seconds per micron (per degree for theta) for each axis. Missing axes use
+        DEFAULT_TRAVEL_WEIGHTS.
+
+    Returns
+    -------
+    float
+        Estimated travel time in seconds.
+    """
+    positions = np.asarray(positions, dtype=float).reshape(-1, 5)
+    if len(positions) < 2:
+        return 0.0
+    weights = _travel_weights(axis_weights)
+    return float(np.sum(np.max(np.abs(np.diff(positions, axis=0)) * weights, axis=1)))
+
+
+def _serpentine_order(positions, weights):
+    """Order the positions of a complete grid as a serpentine.
+
+    The axis with the most expensive step changes least often, and every other
+    axis reverses direction instead of flying back.
+
+    Parameters
+    ----------
+    positions : np.array
+        (n_positions x (x, y, z, theta, f)) array of positions.
+    weights : np.array
+        Weights of the x, y, z, theta, and f axes.
+
+    Returns
+    -------
+    list or None
+        Indices of the positions in visiting order, None if the positions are not
+        a complete grid.
+    """
+    levels = [np.unique(positions[:, i]) for i in range(5)]
+    if np.prod([len(level) for level in levels]) != len(positions):
+        return None
+    grid_index = np.stack(
+        [np.searchsorted(levels[i], positions[:, i]) for i in range(5)], axis=1
+    )
+    lookup = {tuple(row): i for i, row in enumerate(grid_index)}
+    if len(lookup) != len(positions):
+        return None
+
+    step_costs = [
+        weights[i] * np.min(np.diff(levels[i])) if len(levels[i]) > 1 else 0
+        for i in range(5)
+    ]
+    axes = sorted(range(5), key=lambda i: -step_costs[i])
+    counts = [len(levels[axis]) for axis in axes]
+
+    order = []
+    for nested_index in product(*[range(count) for count in counts]):
+        # reverse an axis whenever the axes outside of it took an odd number of steps
+        grid_position = [0] * 5
+        outer_steps = 0
+        for axis, count, i in zip(axes, counts, nested_index):
+            grid_position[axis] = count - 1 - i if outer_steps % 2 else i
+            outer_steps += grid_position[axis]
+        order.append(lookup[tuple(grid_position)])
+    return order
+
+
+def _nearest_neighbour_order(positions, weights):
+    """Order positions by always moving to the closest unvisited position.
+
+    Parameters
+    ----------
+    positions : np.array
+        (n_positions x (x, y, z, theta, f)) array of positions.
+    weights : np.array
+        Weights of the x, y, z, theta, and f axes.
+
+    Returns
+    -------
+    list
+        Indices of the positions in visiting order, starting at the first one.
+    """
+    unvisited = np.arange(1, len(positions))
+    order = [0]
+    while len(unvisited) > 0:
+        costs = _travel_costs(positions, weights, order[-1], unvisited)
+        nearest = np.argmin(costs)
+        order.append(int(unvisited[nearest]))
+        unvisited = np.delete(unvisited, nearest)
+    return order
+
+
+def _two_opt(positions, weights, order, window=100, max_passes=10):
+    """Shorten a route by reversing segments of it (2-opt).
+
+    Parameters
+    ----------
+    positions : np.array
+        (n_positions x (x, y, z, theta, f)) array of positions.
+    weights : np.array
+        Weights of the x, y, z, theta, and f axes.
+    order : list
+        Indices of the positions in visiting order.
+    window : int
+        Longest segment to reverse. Bounds the run time for thousands of
+        positions.
+    max_passes : int
+        Maximum number of passes over the route.
+
+    Returns
+    -------
+    list
+        Indices of the positions in the improved visiting order.
+    """
+    route = np.array(order)
+    n = len(route)
+    for _ in range(max_passes):
+        improved = False
+        for i in range(n - 2):
+            a, b = route[i], route[i + 1]
+            j = np.arange(i + 2, min(n, i + 2 + window))
+            c = route[j]
+            cost_ab = _travel_costs(positions, weights, a, [b])[0]
+            delta = _travel_costs(positions, weights, a, c) - cost_ab
+            # the route is open, so the last position has no successor
+            has_next = j + 1 < n
+            d = route[j[has_next] + 1]
+            delta[has_next] += np.max(
+                np.abs(positions[d] - positions[route[i + 1]]) * weights, axis=1
+            ) - np.max(np.abs(positions[d] - positions[c[has_next]]) * weights, axis=1)
+            best = np.argmin(delta)
+            if delta[best] < -1e-12:
+                route[i + 1 : j[best] + 1] = route[i + 1 : j[best] + 1][::-1]
+                improved = True
+        if not improved:
+            break
+    return route.tolist()
+
+
+def plan_position_route(positions, axis_weights=None):
+    """Plan the order in which to visit multi-position positions.
+
+    Complete grids (e.g., from compute_tiles_from_bounding_box) are visited as a
+    serpentine. Other sets of positions are ordered by nearest neighbour and
+    refined with 2-opt. The table order is kept if it is already faster.
+
+    Parameters
+    ----------
+    positions : list or np.array
+        (n_positions x (x, y, z, theta, f)) positions.
+    axis_weights : dict, optional
+        Seconds per micron (per degree for theta) for each axis. Missing axes use
+        DEFAULT_TRAVEL_WEIGHTS.
+
+    Returns
+    -------
+    list
+        Indices into positions in visiting order. Position order[i] is visited
+        i-th, so the original index of every position is preserved.
+    """
+    positions = np.asarray(positions, dtype=float).reshape(-1, 5)
+    table_order = list(range(len(positions)))
+    if len(positions) < 3:
+        return table_order
+
+    weights = _travel_weights(axis_weights)
+    order = _serpentine_order(positions, weights)
+    if order is None:
+        order = _nearest_neighbour_order(positions, weights)
+        order = _two_opt(positions, weights, order)
+
+    if estimate_travel_time(positions[order], axis_weights) < estimate_travel_time(
+        positions, axis_weights
+    ):
+        return order
+    return table_order
+
+
+def get_ordered_positions(experiment):
+    """Return the multi-position table in the order it will be acquired.
+
+    Parameters
+    ----------
+    experiment : dict
+        The experiment configuration, with MultiPositions and MicroscopeState.
+
+    Returns
+    -------
+    list
+        Positions of the multi-position table, reordered by
+        MicroscopeState["position_order"] if a route has been planned.
+    """
+    positions = experiment["MultiPositions"]
+    order = experiment["MicroscopeState"].get("position_order", None)
+    if not order or len(order) != len(positions):
+        return positions
+    return [positions[i] for i in order]
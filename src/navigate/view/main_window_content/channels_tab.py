@@ -744,6 +744,24 @@ class MultiPointFrame(ttk.Labelframe):
             row=0, column=2, sticky=tk.NSEW, padx=(10, 0), pady=(4, 4)
         )
 
+        # Optimize Position Order Checkbox
+        #: tk.BooleanVar: The variable for the optimize position order checkbox
+        self.optimize_order = tk.BooleanVar()
+        #: ttk.Checkbutton: The optimize position order checkbox
+        self.optimize_check = ttk.Checkbutton(
+            self, text="Optimize Order", variable=self.optimize_order
+        )
+        self.optimize_check.grid(
+            row=1, column=0, columnspan=2, sticky=tk.NSEW, padx=(4, 4), pady=(4, 4)
+        )
+
+        # Estimated Travel Time Label
+        #: ttk.Label: The label for the estimated stage travel time
+        self.route_label = ttk.Label(self, text="")
+        self.route_label.grid(
+            row=1, column=2, sticky=tk.NSEW, padx=(10, 0), pady=(4, 4)
+        )
+
     def get_variables(self):
         """Returns a dictionary of all the variables that are tied to each widget name.
 
@@ -42,6 +42,7 @@ from matplotlib.figure import Figure
 # Local Imports
 from navigate.view.custom_widgets.DockableNotebook import DockableNotebook
 from navigate.view.custom_widgets.LabelInputWidgetFactory import LabelInput
+from navigate.view.custom_widgets.hover import HoverRadioButton
 
 # Logger Setup
 p = __name__.split(".")[1]
@@ -80,14 +81,18 @@ class CameraNotebook(DockableNotebook):
         #: WaveformTab: The waveform settings tab.
         self.waveform_tab = WaveformTab(self)
 
+        #: OverviewTab: The multi-position overview tab.
+        self.overview_tab = OverviewTab(self)
+
         # Tab list
-        tab_list = [self.camera_tab, self.mip_tab, self.waveform_tab]
+        tab_list = [self.camera_tab, self.mip_tab, self.waveform_tab, self.overview_tab]
         self.set_tablist(tab_list)
 
         # Adding tabs to self notebook
         self.add(self.camera_tab, text="Camera", sticky=tk.NSEW)
         self.add(self.mip_tab, text="MIP", sticky=tk.NSEW)
         self.add(self.waveform_tab, text="Waveforms", sticky=tk.NSEW)
+        self.add(self.overview_tab, text="Overview", sticky=tk.NSEW)
 
 
 class MIPTab(tk.Frame):
@@ -418,6 +423,114 @@ class WaveformTab(tk.Frame):
         self.waveform_settings.grid(row=1, column=0, sticky=tk.NSEW, padx=5, pady=5)
 
 
+class OverviewTab(tk.Frame):
+    """This class is the frame that holds the multi-position overview mosaic."""
+
+    def __init__(self, cam_wave, *args, **kwargs):
+        """Initialize the OverviewTab class.
+
+        Parameters
+        ----------
+        cam_wave : tk.Frame
+            The frame that will hold the overview tab.
+        *args : tuple
+            Variable length argument list.
+        **kwargs : dict
+            Arbitrary keyword arguments.
+        """
+        # Init Frame
+        tk.Frame.__init__(self, cam_wave, *args, **kwargs)
+
+        #: int: The index of the tab.
+        self.index = 3
+
+        #: bool: The popup flag.
+        self.is_popup = False
+
+        #: bool: The docked flag.
+        self.is_docked = True
+
+        # Formatting
+        tk.Grid.columnconfigure(self, "all", weight=1)
+        tk.Grid.rowconfigure(self, "all", weight=1)
+
+        #: tk.Frame: The frame that will hold the overview image.
+        self.overview_image = ttk.Frame(self)
+        self.overview_image.grid(row=0, column=0, rowspan=2, sticky=tk.NSEW)
+
+        #: int: The width of the canvas.
+        #: int: The height of the canvas.
+        self.canvas_width, self.canvas_height = 512, 512
+
+        #: tk.Canvas: The canvas that will hold the overview image.
+        self.canvas = tk.Canvas(
+            self.overview_image, width=self.canvas_width, height=self.canvas_height
+        )
+        self.canvas.grid(row=0, column=0, sticky=tk.NSEW, padx=5, pady=5)
+
+        #: OverviewSettingsFrame: The frame that will hold the overview settings.
+        self.overview_settings = OverviewSettingsFrame(self)
+        self.overview_settings.grid(row=0, column=1, sticky=tk.NSEW, padx=5, pady=5)
+
+
+class OverviewSettingsFrame(ttk.Labelframe):
+    """This class is the frame that holds the overview settings."""
+
+    def __init__(self, overview_tab, *args, **kwargs):
+        """Initialize the OverviewSettingsFrame class.
+
+        Parameters
+        ----------
+        overview_tab : tk.Frame
+            The frame that will hold the overview settings.
+        *args : tuple
+            Variable length argument list.
+        **kwargs : dict
+            Arbitrary keyword arguments.
+        """
+        # Init Frame
+        text_label = "Overview"
+        ttk.Labelframe.__init__(self, overview_tab, text=text_label, *args, **kwargs)
+
+        # Formatting
+        Grid.columnconfigure(self, "all", weight=1)
+        Grid.rowconfigure(self, "all", weight=1)
+
+        #: dict: The dictionary that holds the widgets.
+        self.inputs = {}
+
+        self.inputs["channel"] = LabelInput(
+            parent=self,
+            label="Channel",
+            input_class=ttk.Combobox,
+            input_var=tk.StringVar(),
+            input_args={"width": 6, "state": "readonly"},
+        )
+        self.inputs["channel"].grid(row=0, column=0, sticky=tk.NSEW, padx=3, pady=3)
+
+        #: tk.StringVar: The number of tiles in the overview.
+        self.tiles = tk.StringVar(value="Tiles: 0")
+        ttk.Label(self, textvariable=self.tiles).grid(
+            row=1, column=0, sticky=tk.W, padx=3, pady=3
+        )
+
+        #: tk.StringVar: The stage extent of the overview.
+        self.extent = tk.StringVar(value="")
+        ttk.Label(self, textvariable=self.extent).grid(
+            row=2, column=0, sticky=tk.W, padx=3, pady=3
+        )
+
+    def get_widgets(self):
+        """Function to get the widgets.
+
+        Returns
+        -------
+        dict
+            The dictionary that holds the widgets.
+        """
+        return self.inputs
+
+
 class WaveformSettingsFrame(ttk.Labelframe):
     """This class is the frame that holds the waveform settings."""
 
@@ -612,13 +725,17 @@ class IntensityFrame(ttk.Labelframe):
             self.inputs[self.color_labels[i]] = LabelInput(
                 parent=self,
                 label=self.color_labels[i],
-                input_class=ttk.Radiobutton,
+                input_class=HoverRadioButton,
                 input_var=self.color,
                 input_args={"value": self.color_values[i]},
             )
             self.inputs[self.color_labels[i]].grid(
                 row=i, column=0, sticky=tk.NSEW, pady=3
             )
+        self.inputs["SNR"].widget.hover.setdescription(
+            "Signal-to-noise ratio of each displayed pixel, which averages the "
+            "camera pixels it covers"
+        )
 
         #: tk.BooleanVar: The variable that holds the flip xy flag.
         self.transpose = tk.BooleanVar()
@@ -38,6 +38,7 @@ from multiprocessing import Manager
 from multiprocessing.managers import ListProxy, DictProxy
 import os
 import time
+import threading
 import random
 import yaml
 import sys
@@ -63,16 +64,30 @@ def test_config_methods():
         "__name__",
         "__package__",
         "__spec__",
+        "add_configuration_listener",
         "build_nested_dict",
         "build_ref_name",
+        "bump_configuration_version",
+        "configuration_listeners",
+        "configuration_snapshots",
+        "ConfigurationSnapshot",
+        "ConfigurationTransaction",
+        "configuration_transaction",
+        "configuration_transactions",
+        "get_configuration_key",
+        "copy_proxy_object",
+        "get_configuration_snapshot",
+        "get_configuration_version",
         "get_configuration_paths",
         "get_navigate_path",
         "isfile",
         "load_configs",
+        "remove_configuration_listener",
         "os",
         "platform",
         "shutil",
         "sys",
+        "threading",
         "time",
         "update_config_dict",
         "verify_experiment_config",
@@ -349,6 +364,7 @@ class TestVerifyExperimentConfig(unittest.TestCase):
             "experiment_duration": 1.03,
             "is_multiposition": False,
             "multiposition_count": 1,
+            "optimize_position_order": False,
             "selected_channels": 0,
             "stack_z_origin": 0,
             "stack_focus_origin": 0,
@@ -801,3 +817,246 @@ class TestVerifyExperimentConfig(unittest.TestCase):
             if k in parameter_dict.keys():
                 del parameter_dict[k]
         return deleted_parameters
+
+
+class TestConfigurationSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.manager = Manager()
+        current_path = os.path.abspath(os.path.dirname(__file__))
+        root_path = os.path.dirname(os.path.dirname(current_path))
+        config_path = os.path.join(root_path, "src", "navigate", "config")
+        self.configuration = config.load_configs(
+            self.manager,
+            configuration=os.path.join(config_path, "configuration.yaml"),
+            experiment=os.path.join(config_path, "experiment.yml"),
+        )
+
+    def tearDown(self):
+        config.configuration_snapshots.clear()
+        self.manager.shutdown()
+
+    def test_plain_dict(self):
+        configuration = {"experiment": {"MicroscopeState": {"zoom": "1x"}}}
+        assert config.get_configuration_snapshot(configuration) is configuration
+
+    def test_snapshot_is_reused_and_refreshed(self):
+        snapshot = config.get_configuration_snapshot(self.configuration)
+        state = snapshot["experiment"]["MicroscopeState"]
+        assert type(state) is dict
+        assert config.get_configuration_snapshot(self.configuration) is snapshot
+
+        # writes are invisible until the version is bumped
+        self.configuration["experiment"]["MicroscopeState"]["zoom"] = "test_zoom"
+        snapshot = config.get_configuration_snapshot(self.configuration)
+        assert snapshot["experiment"]["MicroscopeState"]["zoom"] != "test_zoom"
+
+        config.bump_configuration_version(self.configuration)
+        new_snapshot = config.get_configuration_snapshot(self.configuration)
+        assert new_snapshot is not snapshot
+        assert new_snapshot.version == config.get_configuration_version(
+            self.configuration
+        )
+        assert new_snapshot["experiment"]["MicroscopeState"]["zoom"] == "test_zoom"
+        assert "waveform_constants" not in new_snapshot
+        assert new_snapshot.get("waveform_constants") is None
+
+    def test_snapshot_lookup(self):
+        n = 20
+        microscope_name = self.configuration["experiment"]["MicroscopeState"][
+            "microscope_name"
+        ]
+
+        def lookup(configuration):
+            return configuration["configuration"]["microscopes"][microscope_name][
+                "daq"
+            ]["sample_rate"]
+
+        snapshot = config.get_configuration_snapshot(self.configuration)
+        for _ in range(n):
+            assert lookup(
+                config.get_configuration_snapshot(self.configuration)
+            ) == lookup(self.configuration)
+        # the section was copied once and is served from the snapshot
+        assert config.get_configuration_snapshot(self.configuration) is snapshot
+        assert type(snapshot.sections["configuration"]) is dict
+
+    @unittest.skip("benchmark, run by hand to compare the lookup cost")
+    def test_snapshot_lookup_cost(self):
+        n = 20
+        microscope_name = self.configuration["experiment"]["MicroscopeState"][
+            "microscope_name"
+        ]
+
+        def lookup(configuration):
+            return configuration["configuration"]["microscopes"][microscope_name][
+                "daq"
+            ]["sample_rate"]
+
+        start = time.perf_counter()
+        for _ in range(n):
+            lookup(self.configuration)
+        proxy_time = (time.perf_counter() - start) / n
+
+        config.get_configuration_snapshot(self.configuration)["configuration"]
+        start = time.perf_counter()
+        for _ in range(n):
+            lookup(config.get_configuration_snapshot(self.configuration))
+        snapshot_time = (time.perf_counter() - start) / n
+
+        print(
+            f"proxy lookup: {proxy_time * 1000:.3f} ms, "
+            f"snapshot lookup: {snapshot_time * 1000:.3f} ms"
+        )
+        assert snapshot_time < proxy_time
+
+
+class TestConfigurationTransaction(unittest.TestCase):
+    def setUp(self):
+        self.manager = Manager()
+        current_path = os.path.abspath(os.path.dirname(__file__))
+        root_path = os.path.dirname(os.path.dirname(current_path))
+        config_path = os.path.join(root_path, "src", "navigate", "config")
+        self.configuration = config.load_configs(
+            self.manager,
+            experiment=os.path.join(config_path, "experiment.yml"),
+        )
+        self.path = ("experiment", "MicroscopeState")
+
+    def tearDown(self):
+        config.configuration_transactions.clear()
+        config.configuration_listeners.clear()
+        self.manager.shutdown()
+
+    def test_commit(self):
+        microscope_state = self.configuration["experiment"]["MicroscopeState"]
+        version = config.get_configuration_version(self.configuration)
+
+        with config.configuration_transaction(self.configuration) as transaction:
+            transaction.update(self.path, {"timepoints": 7, "stack_pause": 2})
+            transaction.set(self.path, "is_save", True, microscope_state)
+            # nested blocks join the outer transaction
+            with config.configuration_transaction(self.configuration) as inner:
+                assert inner is transaction
+                inner.set(("experiment", "StageParameters"), "x", 10)
+            assert microscope_state["timepoints"] != 7
+            assert self.configuration["experiment"]["StageParameters"]["x"] != 10
+            assert transaction.get(self.path, "timepoints") == 7
+            assert transaction.get(self.path, "zoom") == microscope_state["zoom"]
+
+        assert microscope_state["timepoints"] == 7
+        assert microscope_state["stack_pause"] == 2
+        assert microscope_state["is_save"] is True
+        assert self.configuration["experiment"]["StageParameters"]["x"] == 10
+        assert config.get_configuration_version(self.configuration) == version + 1
+        assert config.configuration_transactions == {}
+
+    def test_commit_paths(self):
+        transaction = config.ConfigurationTransaction(self.configuration)
+        transaction.update(self.path, {"timepoints": 7, "stack_pause": 2})
+        transaction.set(("experiment", "StageParameters"), "x", 10)
+        assert sorted(transaction.commit()) == sorted(
+            [
+                self.path + ("timepoints",),
+                self.path + ("stack_pause",),
+                ("experiment", "StageParameters", "x"),
+            ]
+        )
+        assert transaction.commit() == []
+
+    def test_listener(self):
+        listener = MagicMock()
+        config.add_configuration_listener(self.configuration, listener)
+
+        with config.configuration_transaction(self.configuration) as transaction:
+            transaction.update(self.path, {"timepoints": 7, "stack_pause": 2})
+            transaction.set(("experiment", "StageParameters"), "x", 10)
+
+        # one notification with every touched path
+        listener.assert_called_once()
+        assert sorted(listener.call_args[0][0]) == sorted(
+            [
+                self.path + ("timepoints",),
+                self.path + ("stack_pause",),
+                ("experiment", "StageParameters", "x"),
+            ]
+        )
+
+        # empty and discarded transactions notify nobody
+        with config.configuration_transaction(self.configuration) as transaction:
+            transaction.update(self.path, {})
+        with self.assertRaises(ValueError):
+            with config.configuration_transaction(self.configuration) as transaction:
+                transaction.set(self.path, "timepoints", 8)
+                raise ValueError
+        listener.assert_called_once()
+
+        config.remove_configuration_listener(self.configuration, listener)
+        with config.configuration_transaction(self.configuration) as transaction:
+            transaction.set(self.path, "timepoints", 9)
+        listener.assert_called_once()
+        assert config.configuration_listeners == {}
+
+    def test_failing_listener(self):
+        listener = MagicMock()
+        config.add_configuration_listener(
+            self.configuration, MagicMock(side_effect=RuntimeError)
+        )
+        config.add_configuration_listener(self.configuration, listener)
+
+        with config.configuration_transaction(self.configuration) as transaction:
+            transaction.set(self.path, "timepoints", 7)
+
+        # a failing listener doesn't keep the others from being notified
+        listener.assert_called_once_with([self.path + ("timepoints",)])
+        assert self.configuration["experiment"]["MicroscopeState"]["timepoints"] == 7
+
+    def test_transaction_per_thread(self):
+        started, finish = threading.Event(), threading.Event()
+        transactions = []
+
+        def other_thread():
+            with config.configuration_transaction(self.configuration) as transaction:
+                transactions.append(transaction)
+                transaction.set(self.path, "stack_pause", 3)
+                started.set()
+                finish.wait(5)
+
+        microscope_state = self.configuration["experiment"]["MicroscopeState"]
+        thread = threading.Thread(target=other_thread)
+        with config.configuration_transaction(self.configuration) as transaction:
+            transaction.set(self.path, "timepoints", 5)
+            thread.start()
+            assert started.wait(5)
+            assert transactions[0] is not transaction
+            # the other thread's change is not applied with this transaction
+            finish.set()
+            thread.join()
+            assert microscope_state["stack_pause"] == 3
+            assert microscope_state["timepoints"] != 5
+        assert microscope_state["timepoints"] == 5
+
+    def test_discard(self):
+        timepoints = self.configuration["experiment"]["MicroscopeState"]["timepoints"]
+
+        with self.assertRaises(ValueError):
+            with config.configuration_transaction(self.configuration) as transaction:
+                transaction.set(self.path, "timepoints", timepoints + 1)
+                raise ValueError
+
+        assert (
+            self.configuration["experiment"]["MicroscopeState"]["timepoints"]
+            == timepoints
+        )
+        assert config.configuration_transactions == {}
+
+    def test_empty_transaction(self):
+        version = config.get_configuration_version(self.configuration)
+        with config.configuration_transaction(self.configuration) as transaction:
+            transaction.update(self.path, {})
+        assert config.get_configuration_version(self.configuration) == version
+
+    def test_plain_dict(self):
+        configuration = {"experiment": {"MicroscopeState": {"timepoints": 1}}}
+        with config.configuration_transaction(configuration) as transaction:
+            transaction.set(self.path, "timepoints", 2)
+        assert configuration["experiment"]["MicroscopeState"]["timepoints"] == 2
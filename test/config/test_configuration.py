@@ -188,6 +188,7 @@ class TestConfiguration(unittest.TestCase):
             "trigger_source",
             "laser_port_switcher",
             "laser_switch_state",
+            "continuous_live",
         ]
         type_keys = ["type"]
 
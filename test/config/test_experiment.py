@@ -165,6 +165,7 @@ class TextExperimentFile(unittest.TestCase):
             "experiment_duration": float,
             "is_multiposition": bool,
             "multiposition_count": int,
+            "optimize_position_order": bool,
             "selected_channels": int,
             "channels": dict,
             "stack_z_origin": float,
@@ -51,7 +51,12 @@ class TestWaveformTemplates(unittest.TestCase):
         with open(yaml_path) as file:
             data = yaml.safe_load(file)
 
-        expected_keys = ["Default", "Confocal-Projection", "Bidirectional"]
+        expected_keys = [
+            "Default",
+            "Confocal-Projection",
+            "Bidirectional",
+            "Hardware-Z-Stack",
+        ]
 
         waveform_keys = data.keys()
         for key in waveform_keys:
@@ -256,6 +256,9 @@ class TestAcquireBarController:
         [
             ("Continuous Scan", "live"),
             ("Z-Stack", "z-stack"),
+            ("Stage-Scan Z-Stack", "stage-scan"),
+            ("Hardware Z-Stack", "hardware-z-stack"),
+            ("Channel Sequence", "channel-sequence"),
             ("Single Acquisition", "single"),
             ("Customized", "customized"),
         ],
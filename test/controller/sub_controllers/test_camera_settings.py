@@ -32,6 +32,7 @@
 #
 
 # Standard Imports
+from types import SimpleNamespace
 
 # Third Party Imports
 import pytest
@@ -43,6 +44,28 @@ from navigate.controller.sub_controllers.camera_settings import (
 )
 
 
+def test_update_camera_setting_dict():
+    configuration = {
+        "experiment": {
+            "MicroscopeState": {"microscope_name": "Mesoscale"},
+            "CameraParameters": {"Mesoscale": {"binning": "1x1"}},
+        }
+    }
+    camera_settings = CameraSettingController.__new__(CameraSettingController)
+    camera_settings.parent_controller = SimpleNamespace(configuration=configuration)
+    camera_settings.microscope_name = None
+    camera_settings.camera_setting_dict = configuration["experiment"][
+        "CameraParameters"
+    ]["Mesoscale"]
+
+    camera_settings.update_camera_setting_dict({"binning": "2x2", "x_pixels": 512})
+
+    assert configuration["experiment"]["CameraParameters"]["Mesoscale"] == {
+        "binning": "2x2",
+        "x_pixels": 512,
+    }
+
+
 class TestCameraSettingController:
     @pytest.fixture(autouse=True)
     def setup_class(self, dummy_controller):
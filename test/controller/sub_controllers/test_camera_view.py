@@ -103,6 +103,15 @@ class TestCameraViewController:
     def test_update_display_state(self):
         pass
 
+    def test_unregister_ui_updates(self):
+        scheduler = MagicMock()
+        self.camera_view.ui_update_scheduler = scheduler
+        self.camera_view.unregister_ui_updates()
+
+        keys = [args[0] for args, _ in scheduler.unregister.call_args_list]
+        names = self.camera_view.image_metrics_callbacks.keys()
+        assert keys == [(self.camera_view, name) for name in names]
+
     def test_get_absolute_position(self, monkeypatch):
         def mock_winfo_pointerx():
             self.x = int(random.random())
@@ -403,6 +412,71 @@ class TestCameraViewController:
         # Check reset display
         self.camera_view.reset_display.assert_called()
 
+    @pytest.mark.parametrize("flip_x", [True, False])
+    @pytest.mark.parametrize("flip_y", [True, False])
+    def test_digital_zoom_flip(self, flip_x, flip_y):
+        self.camera_view.canvas_width = 100
+        self.camera_view.canvas_height = 50
+        self.camera_view.canvas_width_scale = 4
+        self.camera_view.canvas_height_scale = 4
+        self.camera_view.zoom_width = 50
+        self.camera_view.zoom_height = 25
+        self.camera_view.zoom_scale = 2
+        self.camera_view.zoom_value = 1
+        self.camera_view.zoom_offset = np.array([[0], [0]])
+        self.camera_view.zoom_rect = np.array([[-20, 180], [-10, 90]])
+        self.camera_view.flip_flags = {"x": flip_x, "y": flip_y}
+        self.camera_view.image = np.random.randint(0, 2**16, (200, 400))
+
+        zoom_image = self.camera_view.digital_zoom()
+
+        # Cropping before flipping gives the same result as flipping before cropping
+        flip_flags = self.camera_view.flip_flags
+        self.camera_view.flip_flags = {"x": False, "y": False}
+        flipped_image = self.camera_view.image
+        if flip_x:
+            flipped_image = flipped_image[:, ::-1]
+        if flip_y:
+            flipped_image = flipped_image[::-1, :]
+        expected_image = flipped_image[20:120, 40:240]
+        self.camera_view.flip_flags = flip_flags
+
+        assert np.array_equal(self.camera_view.flip_image(zoom_image), expected_image)
+
+    def test_signal_to_noise_maps_cache(self, monkeypatch):
+        self.camera_view.canvas_width = 64
+        self.camera_view.canvas_height = 32
+        self.camera_view._offset = np.full((256, 512), 100, dtype=np.uint16)
+        self.camera_view._variance = np.full((256, 512), 4, dtype=np.uint16)
+        self.camera_view.zoom_crop = (0, 256, 0, 512)
+        image = np.full((32, 64), 200, dtype=np.uint16)
+
+        # SNR is not computed unless it is selected
+        self.camera_view._snr_selected = False
+        assert self.camera_view.signal_to_noise(image) is image
+
+        # Each canvas pixel averages 8 x 8 camera pixels, which divides the
+        # variance by 64
+        self.camera_view._snr_selected = True
+        snr = self.camera_view.signal_to_noise(image)
+        assert snr.shape == (32, 64)
+        assert np.allclose(snr, 8 * 100 / np.sqrt(105))
+
+        # The down-sampled maps are reused for the same crop and canvas size
+        down_sample_image = MagicMock()
+        monkeypatch.setattr(self.camera_view, "down_sample_image", down_sample_image)
+        self.camera_view.signal_to_noise(image)
+        down_sample_image.assert_not_called()
+
+        # and recomputed when the digital zoom changes
+        self.camera_view.zoom_crop = (0, 128, 0, 256)
+        self.camera_view.get_signal_to_noise_maps()
+        assert down_sample_image.call_count == 2
+
+        # Up-sampled pixels are not averaged
+        self.camera_view.zoom_crop = (0, 16, 0, 32)
+        assert self.camera_view.get_signal_to_noise_maps()[2] == 1.0
+
     @pytest.mark.parametrize("onoff", [True, False])
     def test_left_click(self, onoff):
         self.camera_view.add_crosshair = MagicMock()
@@ -470,7 +544,7 @@ class TestCameraViewController:
         self.camera_view.resize(event)
 
         # monkeypatch cv2.resize
-        def mocked_resize(img, size):
+        def mocked_resize(img, size, **kwargs):
             return np.ones((size[0], size[1]))
 
         monkeypatch.setattr(cv2, "resize", mocked_resize)
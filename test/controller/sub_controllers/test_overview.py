@@ -0,0 +1,40 @@
+import pytest
+import numpy as np
+
+
+@pytest.fixture(scope="module")
+def overview_controller(dummy_view, dummy_controller):
+    from navigate.controller.sub_controllers.overview import OverviewController
+
+    return OverviewController(dummy_view.camera_waveform.overview_tab, dummy_controller)
+
+
+def test_custom_events(overview_controller):
+    assert "overview" in overview_controller.custom_events
+    assert (
+        overview_controller.parent_controller.event_listeners["overview"]
+        == overview_controller.update_overview
+    )
+
+
+@pytest.mark.parametrize("shape", [(1, 64, 128), (2, 1024, 256), (3, 1, 1)])
+def test_update_overview(overview_controller, shape):
+    overview = {
+        "image": np.random.randint(0, 2**16, shape, dtype=np.uint16),
+        "extent": (-100.0, 50.0, 900.0, 550.0),
+        "number_of_tiles": 4,
+    }
+    overview_controller.update_overview(overview)
+
+    widget = overview_controller.widgets["channel"]
+    assert list(widget.widget["values"]) == [f"CH{i + 1}" for i in range(shape[0])]
+    assert widget.get() == "CH1"
+    assert overview_controller.view.overview_settings.tiles.get() == "Tiles: 4"
+    assert overview_controller.view.overview_settings.extent.get() == "1000 x 500 um"
+
+    view = overview_controller.view
+    assert overview_controller.tk_image.width() <= view.canvas_width
+    assert overview_controller.tk_image.height() <= view.canvas_height
+
+    widget.set(f"CH{shape[0]}")
+    overview_controller.display_overview()
@@ -350,7 +350,10 @@ def test_execute_autofocus(controller):
     controller.acquire_bar_controller.is_acquiring = False
     controller.execute("autofocus")
     controller.threads_pool.createThread.assert_called_with(
-        "camera", controller.capture_image, args=("autofocus", "live")
+        "camera",
+        controller.capture_image,
+        args=("autofocus", "live"),
+        pass_token=True,
     )
 
     # Test the acquiring case
@@ -485,7 +488,10 @@ def test_execute_adaptive_optics(controller):
 
     controller.execute("tony_wilson")
     controller.threads_pool.createThread.assert_called_with(
-        "camera", controller.capture_image, args=("tony_wilson", "live")
+        "camera",
+        controller.capture_image,
+        args=("tony_wilson", "live"),
+        pass_token=True,
     )
 
 
@@ -504,12 +510,13 @@ def test_execute_random(controller):
 def test_capture_image(controller):
 
     count = 0
-    def get_image_id():
+    def get_latest_record():
         nonlocal count
         count += 1
         if count >= 10:
-            return "stop"
-        return numpy.random.randint(0, 10)
+            controller.frame_ring.stopped = True
+            return None
+        return {"sequence": count, "slot": numpy.random.randint(0, 10)}
     
     microscope_name = controller.configuration["experiment"]["MicroscopeState"]["microscope_name"]
     width = controller.configuration["experiment"]["CameraParameters"][microscope_name]["img_x_pixels"]
@@ -520,9 +527,10 @@ def test_capture_image(controller):
     work_thread.join = MagicMock()
     controller.threads_pool.createThread = MagicMock()
     controller.threads_pool.createThread.return_value = work_thread
-    controller.show_img_pipe.recv = get_image_id
-    controller.show_img_pipe.poll = MagicMock()
-    controller.show_img_pipe.poll.return_value = False
+    controller.frame_ring = MagicMock()
+    controller.frame_ring.sequence = 0
+    controller.frame_ring.stopped = False
+    controller.frame_ring.latest = get_latest_record
 
     # Deal with stop_acquire
     controller.sloppy_stop = MagicMock()
@@ -545,6 +553,7 @@ def test_capture_image(controller):
             controller.stop_acquisition_flag = True
             controller.threads_pool.createThread.reset_mock()
 
+    controller.ui_update_scheduler.flush()
     assert controller.acquire_bar_controller.framerate != 0
     assert controller.camera_setting_controller.framerate_widgets[
         "max_framerate"
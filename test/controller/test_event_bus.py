@@ -0,0 +1,109 @@
+# Copyright (c) 2021-2024  The University of Texas Southwestern Medical Center.
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted for academic and research use only
+# (subject to the limitations in the disclaimer below)
+# provided that the following conditions are met:
+
+#      * Redistributions of source code must retain the above copyright notice,
+#      this list of conditions and the following disclaimer.
+
+#      * Redistributions in binary form must reproduce the above copyright
+#      notice, this list of conditions and the following disclaimer in the
+#      documentation and/or other materials provided with the distribution.
+
+#      * Neither the name of the copyright holders nor the names of its
+#      contributors may be used to endorse or promote products derived from this
+#      software without specific prior written permission.
+
+# NO EXPRESS OR IMPLIED LICENSES TO ANY PARTY'S PATENT RIGHTS ARE GRANTED BY
+# THIS LICENSE. THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND
+# CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A
+# PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR
+# BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER
+# IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+
+# Standard Library Imports
+from unittest.mock import MagicMock, call
+
+# Third Party Imports
+import pytest
+
+# Local Imports
+from navigate.controller.event_bus import EventBus
+
+
+@pytest.fixture
+def event_bus():
+    view = MagicMock()
+    view.after.return_value = "after#1"
+    event_bus = EventBus(view, MagicMock())
+    event_bus.set_policy("update_stage", "latest")
+    event_bus.set_policy("autofocus", "history", maxlen=2)
+    return event_bus
+
+
+def test_policies(event_bus):
+    event_bus.publish("warning", "first")
+    for i in range(5):
+        event_bus.publish("update_stage", {"x": i})
+        event_bus.publish("autofocus", i)
+    event_bus.publish("warning", "second")
+    event_bus.flush()
+
+    # events are delivered in the order they were published
+    assert event_bus.dispatch.call_args_list == [
+        call("warning", "first"),
+        call("autofocus", 3),
+        call("update_stage", {"x": 4}),
+        call("autofocus", 4),
+        call("warning", "second"),
+    ]
+    assert event_bus.events_dropped == 7
+
+    # nothing left to deliver
+    event_bus.dispatch.reset_mock()
+    event_bus.flush()
+    event_bus.dispatch.assert_not_called()
+
+
+def test_set_policy(event_bus):
+    with pytest.raises(ValueError):
+        event_bus.set_policy("overview", "newest")
+    with pytest.raises(ValueError):
+        event_bus.set_policy("overview", "history")
+
+    # pending events follow the new policy
+    for i in range(3):
+        event_bus.publish("overview", i)
+    event_bus.set_policy("overview", "latest")
+    event_bus.flush()
+    event_bus.dispatch.assert_called_once_with("overview", 2)
+
+
+def test_failing_dispatch(event_bus):
+    event_bus.dispatch.side_effect = RuntimeError
+    event_bus.publish("warning", "first")
+    event_bus.publish("warning", "second")
+    event_bus.flush()
+    assert event_bus.dispatch.call_count == 2
+    assert event_bus.pending == {}
+
+
+def test_start_stop(event_bus):
+    event_bus.start()
+    event_bus.start()
+    event_bus.view.after.assert_called_once_with(event_bus.interval, event_bus.run)
+
+    event_bus.run()
+    assert event_bus.view.after.call_count == 2
+
+    event_bus.stop()
+    event_bus.view.after_cancel.assert_called_once_with("after#1")
+    assert event_bus.after_id is None
@@ -0,0 +1,162 @@
+# Copyright (c) 2021-2024  The University of Texas Southwestern Medical Center.
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted for academic and research use only
+# (subject to the limitations in the disclaimer below)
+# provided that the following conditions are met:
+
+#      * Redistributions of source code must retain the above copyright notice,
+#      this list of conditions and the following disclaimer.
+
+#      * Redistributions in binary form must reproduce the above copyright
+#      notice, this list of conditions and the following disclaimer in the
+#      documentation and/or other materials provided with the distribution.
+
+#      * Neither the name of the copyright holders nor the names of its
+#      contributors may be used to endorse or promote products derived from this
+#      software without specific prior written permission.
+
+# NO EXPRESS OR IMPLIED LICENSES TO ANY PARTY'S PATENT RIGHTS ARE GRANTED BY
+# THIS LICENSE. THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND
+# CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A
+# PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR
+# BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER
+# IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+
+# Standard Library Imports
+import time
+from unittest.mock import MagicMock
+
+# Third Party Imports
+import numpy as np
+import pytest
+
+# Local Imports
+from navigate.controller.render_scheduler import RenderScheduler
+
+
+def create_view_controller(visible=True):
+    view_controller = MagicMock()
+    view_controller.canvas.winfo_viewable.return_value = 1 if visible else 0
+    return view_controller
+
+
+@pytest.fixture
+def render_scheduler():
+    scheduler = RenderScheduler(max_frame_rate=1000)
+    yield scheduler
+    scheduler.stop()
+
+
+def test_register_view(render_scheduler):
+    view_controller = create_view_controller()
+    render_scheduler.register_view(view_controller)
+    render_scheduler.register_view(view_controller)
+
+    assert render_scheduler.views == [view_controller]
+    assert view_controller.render_scheduler is render_scheduler
+
+    render_scheduler.unregister_view(view_controller)
+    assert render_scheduler.views == []
+
+    # images from unregistered views are ignored
+    render_scheduler.submit(view_controller, np.zeros((4, 4)))
+    assert render_scheduler.pending_images == {}
+
+
+def test_newest_image_wins(render_scheduler):
+    view_controller = create_view_controller()
+    render_scheduler.register_view(view_controller)
+
+    images = [np.full((4, 4), i) for i in range(5)]
+    for image in images:
+        render_scheduler.submit(view_controller, image)
+
+    assert render_scheduler.frames_dropped == 4
+    assert render_scheduler.render_next() is True
+    view_controller.display_image.assert_called_once_with(images[-1])
+    assert render_scheduler.render_next() is False
+
+
+def test_round_robin(render_scheduler):
+    view_controllers = [create_view_controller() for _ in range(3)]
+    for view_controller in view_controllers:
+        render_scheduler.register_view(view_controller)
+
+    rendered = []
+    for view_controller in view_controllers:
+        view_controller.display_image.side_effect = (
+            lambda image, v=view_controller: rendered.append(v)
+        )
+
+    # the first view gets new images all the time, but can't starve the others
+    for _ in range(3):
+        for view_controller in view_controllers:
+            render_scheduler.submit(view_controller, np.zeros((4, 4)))
+        render_scheduler.render_next()
+        render_scheduler.submit(view_controllers[0], np.zeros((4, 4)))
+
+    assert rendered == view_controllers
+
+
+def test_hidden_view_is_skipped(render_scheduler):
+    hidden_view_controller = create_view_controller(visible=False)
+    view_controller = create_view_controller()
+    render_scheduler.register_view(hidden_view_controller)
+    render_scheduler.register_view(view_controller)
+
+    render_scheduler.submit(hidden_view_controller, np.zeros((4, 4)))
+    render_scheduler.submit(view_controller, np.zeros((4, 4)))
+
+    assert render_scheduler.render_next() is True
+    assert render_scheduler.render_next() is False
+    hidden_view_controller.display_image.assert_not_called()
+    view_controller.display_image.assert_called_once()
+
+    # the newest image is shown once the view is visible again
+    hidden_view_controller.canvas.winfo_viewable.return_value = 1
+    assert render_scheduler.render_next() is True
+    hidden_view_controller.display_image.assert_called_once()
+
+
+def test_render_thread(render_scheduler):
+    view_controller = create_view_controller()
+    render_scheduler.register_view(view_controller)
+    render_scheduler.start()
+
+    render_scheduler.submit(view_controller, np.zeros((4, 4)))
+    for _ in range(100):
+        if view_controller.display_image.called:
+            break
+        time.sleep(0.01)
+    view_controller.display_image.assert_called_once()
+
+    render_scheduler.stop()
+    assert render_scheduler.is_running is False
+    assert render_scheduler.render_thread is None
+
+
+def test_frame_budget():
+    render_scheduler = RenderScheduler(max_frame_rate=20)
+    view_controllers = [create_view_controller() for _ in range(3)]
+    for view_controller in view_controllers:
+        render_scheduler.register_view(view_controller)
+        view_controller.display_image.side_effect = (
+            lambda image, v=view_controller: render_scheduler.submit(v, image)
+        )
+        render_scheduler.submit(view_controller, np.zeros((4, 4)))
+
+    render_scheduler.start()
+    time.sleep(0.5)
+    render_scheduler.stop()
+
+    # at most 20 images per second over all views
+    assert render_scheduler.frames_rendered <= 12
+    for view_controller in view_controllers:
+        assert view_controller.display_image.called
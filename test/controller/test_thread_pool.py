@@ -0,0 +1,129 @@
+# Copyright (c) 2021-2024  The University of Texas Southwestern Medical Center.
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted for academic and research use only
+# (subject to the limitations in the disclaimer below)
+# provided that the following conditions are met:
+
+#      * Redistributions of source code must retain the above copyright notice,
+#      this list of conditions and the following disclaimer.
+
+#      * Redistributions in binary form must reproduce the above copyright
+#      notice, this list of conditions and the following disclaimer in the
+#      documentation and/or other materials provided with the distribution.
+
+#      * Neither the name of the copyright holders nor the names of its
+#      contributors may be used to endorse or promote products derived from this
+#      software without specific prior written permission.
+
+# NO EXPRESS OR IMPLIED LICENSES TO ANY PARTY'S PATENT RIGHTS ARE GRANTED BY
+# THIS LICENSE. THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND
+# CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A
+# PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR
+# BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER
+# IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+
+
+# Standard Library Imports
+import threading
+import time
+
+# Third Party Imports
+
+# Local Imports
+from navigate.controller.thread_pool import SynchronizedThreadPool
+
+
+def test_threads_run_to_completion():
+    pool = SynchronizedThreadPool()
+    results = []
+    threads = [pool.createThread("model", results.append, args=(i,)) for i in range(5)]
+    for thread in threads:
+        thread.join(1)
+    assert sorted(results) == [0, 1, 2, 3, 4]
+    assert pool.getRunningThread("model") is None
+
+
+def test_pass_token():
+    pool = SynchronizedThreadPool()
+    tokens = []
+    thread = pool.createThread(
+        "camera", lambda cancel_token: tokens.append(cancel_token), pass_token=True
+    )
+    thread.join(1)
+    assert tokens == [thread.cancel_token]
+
+
+def test_clear_cancels_running_and_waiting_threads():
+    pool = SynchronizedThreadPool(join_timeout=2)
+    started = threading.Event()
+    results = []
+
+    def long_task(cancel_token):
+        started.set()
+        # checkpoint loop
+        while not cancel_token.wait(0.01):
+            pass
+        results.append("cancelled")
+
+    running = pool.createThread("camera", long_task, pass_token=True)
+    started.wait(1)
+    waiting = [pool.createThread("camera", results.append, args=(i,)) for i in range(3)]
+    time.sleep(0.05)
+
+    start_time = time.monotonic()
+    assert pool.clear() == []
+    assert time.monotonic() - start_time < 1
+
+    assert not running.is_alive()
+    assert all(not thread.is_alive() for thread in waiting)
+    # waiting tasks never ran
+    assert results == ["cancelled"]
+    assert pool.getRunningThread("camera") is None
+
+    # the pool can be used again
+    pool.createThread("camera", results.append, args=("next",)).join(1)
+    assert results == ["cancelled", "next"]
+
+
+def test_clear_is_bounded():
+    pool = SynchronizedThreadPool()
+    release = threading.Event()
+
+    # a task without checkpoints
+    thread = pool.createThread("model", release.wait, args=(5,))
+    time.sleep(0.05)
+
+    start_time = time.monotonic()
+    assert pool.clear(timeout=0.1) == [thread]
+    assert time.monotonic() - start_time < 1
+    release.set()
+    thread.join(1)
+    assert not thread.is_alive()
+
+
+def test_remove_waiting_thread():
+    pool = SynchronizedThreadPool()
+    release = threading.Event()
+    results = []
+
+    running = pool.createThread("model", release.wait, args=(1,))
+    waiting = pool.createThread("model", results.append, args=(1,))
+    time.sleep(0.05)
+
+    assert pool.removeThread("model", waiting) is True
+    waiting.join(1)
+    assert not waiting.is_alive()
+    assert pool.removeThread("model", running) is False
+    assert running.cancel_token.cancelled
+
+    release.set()
+    running.join(1)
+    assert results == []
+    assert pool.getRunningThread("model") is None
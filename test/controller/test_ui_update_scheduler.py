@@ -0,0 +1,161 @@
+# Copyright (c) 2021-2024  The University of Texas Southwestern Medical Center.
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted for academic and research use only
+# (subject to the limitations in the disclaimer below)
+# provided that the following conditions are met:
+
+#      * Redistributions of source code must retain the above copyright notice,
+#      this list of conditions and the following disclaimer.
+
+#      * Redistributions in binary form must reproduce the above copyright
+#      notice, this list of conditions and the following disclaimer in the
+#      documentation and/or other materials provided with the distribution.
+
+#      * Neither the name of the copyright holders nor the names of its
+#      contributors may be used to endorse or promote products derived from this
+#      software without specific prior written permission.
+
+# NO EXPRESS OR IMPLIED LICENSES TO ANY PARTY'S PATENT RIGHTS ARE GRANTED BY
+# THIS LICENSE. THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND
+# CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A
+# PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR
+# BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER
+# IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+
+# Standard Library Imports
+import threading
+from unittest.mock import MagicMock, call
+
+# Third Party Imports
+import pytest
+
+# Local Imports
+from navigate.controller.ui_update_scheduler import UIUpdateScheduler
+
+
+@pytest.fixture
+def scheduler():
+    view = MagicMock()
+    view.after.return_value = "after#1"
+    return UIUpdateScheduler(view)
+
+
+def test_coalesced_updates(scheduler):
+    callback = MagicMock()
+    scheduler.register("framerate", callback)
+
+    for i in range(10):
+        scheduler.post("framerate", i)
+    scheduler.flush()
+
+    callback.assert_called_once_with(9)
+    assert scheduler.updates_dropped == 9
+
+    # nothing left to deliver
+    scheduler.flush()
+    callback.assert_called_once()
+
+
+def test_ordered_updates_are_never_dropped(scheduler):
+    callback = MagicMock()
+    scheduler.register("progress_bar", callback)
+
+    scheduler.post("progress_bar", images_received=0, stop=False, coalesce=False)
+    for i in range(1, 5):
+        scheduler.post("progress_bar", images_received=i, stop=False)
+    scheduler.post("progress_bar", images_received=5, stop=True, coalesce=False)
+    scheduler.flush()
+
+    # the stop update supersedes the pending coalesced one
+    assert callback.call_args_list == [
+        call(images_received=0, stop=False),
+        call(images_received=5, stop=True),
+    ]
+
+
+def test_max_rate(scheduler):
+    callback = MagicMock()
+    scheduler.register("framerate", callback, max_rate=1e-3)
+
+    scheduler.post("framerate", 1)
+    scheduler.flush(force=False)
+    callback.assert_called_once_with(1)
+
+    # too early for another update, the value stays pending
+    scheduler.post("framerate", 2)
+    scheduler.flush(force=False)
+    callback.assert_called_once()
+    assert "framerate" in scheduler.pending
+
+    scheduler.flush(force=True)
+    callback.assert_called_with(2)
+
+
+def test_unknown_key_and_failing_callback(scheduler):
+    scheduler.post("unknown", 1)
+    assert scheduler.pending == {}
+
+    scheduler.register("channel", MagicMock(side_effect=RuntimeError))
+    scheduler.post("channel", 1)
+    scheduler.flush()
+    assert scheduler.pending == {}
+
+
+def test_unregister(scheduler):
+    callback = MagicMock()
+    scheduler.register("channel", callback)
+    scheduler.register("framerate", MagicMock())
+
+    scheduler.post("channel", 1)
+    scheduler.post("channel", 2, coalesce=False)
+    scheduler.post("framerate", 3, coalesce=False)
+    scheduler.unregister("channel")
+
+    # pending updates are dropped and later updates are ignored
+    scheduler.post("channel", 4)
+    scheduler.flush()
+    callback.assert_not_called()
+    assert "channel" not in scheduler.callbacks
+    assert scheduler.pending == {}
+    assert len(scheduler.ordered) == 0
+
+    # unknown keys are ignored
+    scheduler.unregister("channel")
+
+
+def test_post_from_threads(scheduler):
+    callback = MagicMock()
+    scheduler.register("framerate", callback)
+
+    threads = [
+        threading.Thread(target=scheduler.post, args=("framerate", i))
+        for i in range(20)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    scheduler.flush()
+
+    callback.assert_called_once()
+    assert scheduler.updates_dropped == 19
+
+
+def test_start_stop(scheduler):
+    scheduler.start()
+    scheduler.start()
+    scheduler.view.after.assert_called_once_with(scheduler.interval, scheduler.run)
+
+    scheduler.run()
+    assert scheduler.view.after.call_count == 2
+
+    scheduler.stop()
+    scheduler.view.after_cancel.assert_called_once_with("after#1")
+    assert scheduler.after_id is None
@@ -35,8 +35,8 @@ import pytest
 
 
 @pytest.mark.parametrize("logging_configuration", ["logging.yml"])
-@pytest.mark.parametrize("logging_path", [None, Path("./")])
-def test_log_setup(logging_configuration, logging_path):
+@pytest.mark.parametrize("custom_logging_path", [False, True])
+def test_log_setup(logging_configuration, custom_logging_path, tmp_path):
     from datetime import datetime
 
     from navigate.log_files.log_functions import log_setup
@@ -54,6 +54,8 @@ def test_log_setup(logging_configuration, logging_path):
         )
     )
 
+    # write custom logs to a temporary directory, not the working directory
+    logging_path = tmp_path if custom_logging_path else None
     if logging_path is None:
         logging_path = Path.joinpath(Path(get_navigate_path()), "logs")
     todays_path = Path.joinpath(logging_path, time_stamp)
@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from navigate.model.analysis.overview_mosaic import OverviewMosaic, block_max
+
+
+def test_block_max():
+    image = np.arange(25, dtype=np.uint16).reshape(1, 5, 5)
+    reduced = block_max(image, 2)
+
+    assert reduced.shape == (1, 3, 3)
+    assert reduced[0, 0, 0] == 6
+    assert reduced[0, 2, 2] == 24
+    assert block_max(image, 1) is image
+
+
+def test_add_tiles():
+    mosaic = OverviewMosaic(pixel_size=1.0, tile_size=128, max_size=512)
+    tile = np.ones((256, 256), dtype=np.uint16)
+
+    for i in range(3):
+        for j in range(3):
+            mosaic.add_tile(tile * (3 * i + j + 1), x=256 * i + 128, y=256 * j + 128)
+
+    assert mosaic.number_of_tiles == 9
+    assert mosaic.level == 1
+    assert mosaic.canvas.shape == (1, 384, 384)
+    assert mosaic.origin == (0, 0)
+    # stage x along the columns, stage y along the rows
+    np.testing.assert_array_equal(
+        mosaic.canvas[0, ::128, ::128], [[1, 4, 7], [2, 5, 8], [3, 6, 9]]
+    )
+
+
+@pytest.mark.parametrize("x, y", [(5000, 100), (-3000, -2000)])
+def test_canvas_is_memory_bounded(x, y):
+    mosaic = OverviewMosaic(
+        pixel_size=2.0, number_of_channels=2, tile_size=64, max_size=256
+    )
+    tile = np.full((2, 128, 128), 10, dtype=np.uint16)
+
+    mosaic.add_tile(tile, x=0, y=0)
+    first_level = mosaic.level
+    mosaic.add_tile(tile * 2, x=x, y=y)
+
+    assert mosaic.level > first_level
+    assert max(mosaic.canvas.shape[-2:]) <= 256
+    assert mosaic.number_of_tiles == 2
+
+    # both tiles survive the move up the pyramid
+    left, top, right, bottom = mosaic.extent
+    for value, (tx, ty) in [(10, (0, 0)), (20, (x, y))]:
+        col = int((tx - left) / mosaic.scale)
+        row = int((ty - top) / mosaic.scale)
+        assert mosaic.canvas[1, row, col] == value
+
+
+def test_get_image():
+    mosaic = OverviewMosaic(pixel_size=1.0, tile_size=256, max_size=1024)
+    assert mosaic.get_image() is None
+
+    mosaic.add_tile(np.ones((256, 256), dtype=np.uint16), x=0, y=0)
+    mosaic.add_tile(np.ones((256, 256), dtype=np.uint16), x=768, y=0)
+    image = mosaic.get_image(max_size=128)
+
+    assert max(image.shape[-2:]) <= 128
+    assert image.max() == 1
+    assert mosaic.get_image() is not mosaic.canvas
@@ -9,6 +9,8 @@ from navigate.model.concurrency.concurrency_tools import (
     CustodyThread,
     _WaitingList,
     SharedNDArray,
+    call_async,
+    call_batch,
 )
 
 
@@ -700,30 +702,106 @@ def test_lock_with_waitlist():
     assert usage_record["display"] == list(range(num_snaps))
 
 
-def test_incorrect_thread_management():
+def test_calls_from_multiple_threads():
     """Test accessing an object in a subprocess from multiple threads
-    without using a custody object. This is expected to raise a
-    RunTimeError.
+    without using a custody object. The pipe is only locked while a request
+    is sent, so every thread gets the response of its own call.
     """
     p = ObjectInSubprocess(TestClass)
     exceptions = []
+    results = {}
 
-    def unsafe_fn():
+    def call(i):
         try:
-            p.sleep(0.1)  # noqa
-        except RuntimeError:  # Should raise this sometimes
-            exceptions.append(1)
+            p.sleep(0.01)
+            results[i] = p.mirror(i)
+        except RuntimeError:
+            exceptions.append(i)
 
-    threads = [threading.Thread(target=unsafe_fn) for i in range(20)]
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(20)]
     for th in threads:
         th.start()
     for th in threads:
         th.join()
-    assert len(exceptions) == 19, "This should have raised some exceptions."
+    assert not exceptions
+    assert results == {i: ((i,), {}) for i in range(20)}
 
     del p
 
 
+def test_method_call_takes_one_round_trip():
+    p = ObjectInSubprocess(TestClass)
+    assert p.mirror(1) == ((1,), {})
+    requests_sent = next(p._.request_ids)
+
+    # The method name is cached, only the call itself is sent.
+    assert p.mirror(2) == ((2,), {})
+    assert next(p._.request_ids) == requests_sent + 2
+
+    # Attributes are still looked up every time.
+    p.x = 1
+    assert p.x == 1
+    p.x = 2
+    assert p.x == 2
+
+    del p
+
+
+def test_call_async():
+    import time
+
+    p = ObjectInSubprocess(TestClass)
+    start_time = time.perf_counter()
+    futures = [call_async(p, "sleep", 0.1) for _ in range(3)]
+    futures.append(call_async(p, "mirror", 1, a=2))
+    # The calls are in flight, and were sent without waiting.
+    assert time.perf_counter() - start_time < 0.1
+
+    assert futures[-1].result(timeout=5) == ((1,), {"a": 2})
+    assert all(f.done() for f in futures)
+
+    # Synchronous calls still work while nothing is in flight.
+    assert p.mirror(3) == ((3,), {})
+
+    future = call_async(p, "nested_method", crash=True)
+    try:
+        future.result(timeout=5)
+    except Exception as e:
+        assert "supposed to be raised" in str(e)
+    else:
+        raise AssertionError("Did not get the error we expected")
+
+    del p
+
+
+def test_call_batch():
+    p = ObjectInSubprocess(TestClass)
+    requests_sent = next(p._.request_ids)
+    futures = call_batch(
+        p,
+        [
+            ("mirror", (1,), {}),
+            ("nested_method", (), {"crash": True}),
+            ("get_attribute", ("missing",), {}),
+        ],
+    )
+    assert futures[0].result(timeout=5) == ((1,), {})
+    assert isinstance(futures[1].exception(timeout=5), Exception)
+    assert futures[2].result(timeout=5) is None
+    # A single request for the whole batch.
+    assert next(p._.request_ids) == requests_sent + 2
+
+    del p
+
+
+def test_call_async_on_local_object():
+    obj = TestClass()
+    assert call_async(obj, "mirror", 1).result() == ((1,), {})
+    futures = call_batch(obj, [("mirror", (2,), {}), ("nested_method", (True,), {})])
+    assert futures[0].result() == ((2,), {})
+    assert isinstance(futures[1].exception(), ValueError)
+
+
 def test_sending_shared_arrays():
     """Testing sending a SharedNDArray to a ObjectInSubprocess."""
 
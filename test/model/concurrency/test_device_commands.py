@@ -0,0 +1,129 @@
+# Copyright (c) 2021-2024  The University of Texas Southwestern Medical Center.
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted for academic and research use only
+# (subject to the limitations in the disclaimer below)
+# provided that the following conditions are met:
+
+#      * Redistributions of source code must retain the above copyright notice,
+#      this list of conditions and the following disclaimer.
+
+#      * Redistributions in binary form must reproduce the above copyright
+#      notice, this list of conditions and the following disclaimer in the
+#      documentation and/or other materials provided with the distribution.
+
+#      * Neither the name of the copyright holders nor the names of its
+#      contributors may be used to endorse or promote products derived from this
+#      software without specific prior written permission.
+
+# NO EXPRESS OR IMPLIED LICENSES TO ANY PARTY'S PATENT RIGHTS ARE GRANTED BY
+# THIS LICENSE. THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND
+# CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A
+# PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR
+# BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER
+# IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+# Standard Library Imports
+import threading
+import time
+
+# Third Party Imports
+import pytest
+
+# Local Imports
+from navigate.model.concurrency.device_commands import (
+    completed_future,
+    get_connection_lock,
+    get_device_executor,
+    shutdown_device_executor,
+    submit_device_command,
+    wait_for_futures,
+)
+
+
+class SlowDevice:
+    """A device whose commands take a while and are recorded."""
+
+    def __init__(self, device_connection=None, delay=0.2):
+        self.device_connection = device_connection
+        self.delay = delay
+        self.calls = []
+
+    def command(self, value):
+        time.sleep(self.delay)
+        self.calls.append((value, threading.current_thread().name))
+        return value
+
+    def fail(self):
+        raise RuntimeError("device error")
+
+
+def test_commands_to_one_device_keep_their_order():
+    device = SlowDevice(delay=0.01)
+    futures = [submit_device_command(device, device.command, i) for i in range(5)]
+    assert wait_for_futures(futures) == list(range(5))
+    assert [value for value, _ in device.calls] == list(range(5))
+    shutdown_device_executor(device)
+
+
+def test_commands_to_different_devices_run_in_parallel():
+    devices = [SlowDevice() for _ in range(3)]
+    start_time = time.perf_counter()
+    futures = [submit_device_command(d, d.command, i) for i, d in enumerate(devices)]
+    assert wait_for_futures(futures) == [0, 1, 2]
+    assert time.perf_counter() - start_time < 0.5
+    for device in devices:
+        shutdown_device_executor(device)
+
+
+def test_devices_sharing_a_connection_share_a_queue():
+    connection = SlowDevice()
+    devices = [SlowDevice(connection, delay=0.05) for _ in range(2)]
+    assert get_device_executor(devices[0]) is get_device_executor(devices[1])
+    assert get_device_executor(SlowDevice()) is not get_device_executor(devices[0])
+
+    futures = [submit_device_command(d, d.command, i) for i, d in enumerate(devices)]
+    wait_for_futures(futures)
+    assert devices[0].calls[0][1] == devices[1].calls[0][1]
+    shutdown_device_executor(devices[0])
+
+    # connections that cannot be used as a key fall back to the device
+    device = SlowDevice("COM1")
+    assert get_device_executor(device) is not get_device_executor(SlowDevice("COM1"))
+
+
+def test_commands_hold_the_connection_lock():
+    connection = SlowDevice()
+    devices = [SlowDevice(connection) for _ in range(2)]
+    assert get_connection_lock(devices[0]) is get_connection_lock(devices[1])
+    assert get_connection_lock(SlowDevice()) is not get_connection_lock(devices[0])
+
+    future = submit_device_command(devices[0], devices[0].command, 1)
+    time.sleep(0.05)
+    # a call outside the executor waits for the running command
+    with get_connection_lock(devices[1]):
+        assert future.done()
+        assert devices[0].calls == [(1, devices[0].calls[0][1])]
+    shutdown_device_executor(devices[0])
+    # objects that can not own an executor are ignored
+    shutdown_device_executor([])
+
+
+def test_wait_for_futures_waits_for_all_before_raising():
+    failing_device = SlowDevice(delay=0)
+    slow_device = SlowDevice()
+    futures = [
+        submit_device_command(failing_device, failing_device.fail),
+        submit_device_command(slow_device, slow_device.command, 1),
+        completed_future(2),
+    ]
+    with pytest.raises(RuntimeError):
+        wait_for_futures(futures)
+    assert slow_device.calls[0][0] == 1
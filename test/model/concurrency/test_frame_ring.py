@@ -0,0 +1,109 @@
+# Copyright (c) 2021-2024  The University of Texas Southwestern Medical Center.
+# All rights reserved.
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted for academic and research use only
+# (subject to the limitations in the disclaimer below)
+# provided that the following conditions are met:
+
+#      * Redistributions of source code must retain the above copyright notice,
+#      this list of conditions and the following disclaimer.
+
+#      * Redistributions in binary form must reproduce the above copyright
+#      notice, this list of conditions and the following disclaimer in the
+#      documentation and/or other materials provided with the distribution.
+
+#      * Neither the name of the copyright holders nor the names of its
+#      contributors may be used to endorse or promote products derived from this
+#      software without specific prior written permission.
+
+# NO EXPRESS OR IMPLIED LICENSES TO ANY PARTY'S PATENT RIGHTS ARE GRANTED BY
+# THIS LICENSE. THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND
+# CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A
+# PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR
+# BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER
+# IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+#
+
+import threading
+import time
+
+from navigate.model.concurrency.concurrency_tools import ObjectInSubprocess
+from navigate.model.concurrency.frame_ring import FrameRing
+
+
+class FramePublisher:
+    """Publishes frames from a thread, like the model's data thread."""
+
+    def create_frame_ring(self, capacity):
+        self.frame_ring = FrameRing(capacity)
+        return self.frame_ring
+
+    def publish(self, n_frames):
+        def run():
+            for i in range(n_frames):
+                self.frame_ring.publish(i % 10, [i, 1, 2, 3, 4], i % 3)
+                time.sleep(0.0005)
+            self.frame_ring.stop()
+
+        threading.Thread(target=run).start()
+
+
+def test_publish_and_read_latest():
+    frame_ring = FrameRing(capacity=4)
+    assert frame_ring.latest() is None
+    assert frame_ring.wait(timeout=0) is False
+
+    for i in range(10):
+        assert frame_ring.publish(i, [i, 0, 0, 0, 0], channel=i % 2) == i + 1
+
+    # a single wakeup is pending, no matter how many frames were published
+    assert frame_ring.wait(timeout=0) is True
+    assert frame_ring.wait(timeout=0) is False
+
+    record = frame_ring.latest()
+    assert record["sequence"] == 10
+    assert record["slot"] == 9
+    assert record["position"]["x"] == 9
+    assert record["channel"] == 1
+    assert frame_ring.stopped is False
+
+    frame_ring.stop()
+    assert frame_ring.wait(timeout=0) is True
+    assert frame_ring.stopped is True
+
+    # sequence numbers keep increasing after a reset
+    frame_ring.reset()
+    assert frame_ring.stopped is False
+    assert frame_ring.publish(0) == 11
+    frame_ring.close()
+
+
+def test_read_from_another_process():
+    publisher = ObjectInSubprocess(FramePublisher)
+    frame_ring = publisher.create_frame_ring(4)
+    last_sequence = frame_ring.sequence
+    n_frames = 200
+    publisher.publish(n_frames)
+
+    frames_received = 0
+    while True:
+        frame_ring.wait(timeout=0.5)
+        record = frame_ring.latest()
+        if record is None or record["sequence"] <= last_sequence:
+            if frame_ring.stopped:
+                break
+            continue
+        assert record["position"]["x"] == record["sequence"] - 1
+        assert record["slot"] == (record["sequence"] - 1) % 10
+        frames_received += record["sequence"] - last_sequence
+        last_sequence = record["sequence"]
+        # a slow reader only sees the newest frames
+        time.sleep(0.002)
+
+    assert frames_received == n_frames
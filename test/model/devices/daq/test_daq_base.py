@@ -35,3 +35,51 @@ def test_calculate_all_waveforms():
         exposure_time = channel["camera_exposure_time"] / 1000
         print(k, channel["is_selected"], np.sum(v > 0), exposure_time)
         assert np.sum(v > 0) == daq.sample_rate * exposure_time
+
+
+def test_channel_sequence_waveforms():
+    import numpy as np
+
+    from navigate.model.devices.daq.base import DAQBase
+    from test.model.dummy import DummyModel
+
+    model = DummyModel()
+    daq = DAQBase(model.configuration)
+    microscope_state = model.configuration["experiment"]["MicroscopeState"]
+    microscope_name = microscope_state["microscope_name"]
+    channel_keys = ["channel_1", "channel_2"]
+    exposure_times = {"channel_1": 0.01, "channel_2": 0.02, "channel_3": 0.03}
+    sweep_times = {k: 0.05 for k in exposure_times}
+    daq.calculate_all_waveforms(microscope_name, exposure_times, sweep_times)
+
+    daq.set_channel_sequence(
+        channel_keys,
+        {
+            "Dev1/port0/line0": {"channel_1": True},
+            "Dev1/port0/line1": {"channel_2": True},
+            "Dev1/ao3": {"channel_1": 1.0, "channel_2": 2.0},
+        },
+    )
+    analog_waveforms, digital_waveforms, camera_pulses = daq.get_sequence_waveforms()
+
+    # one frame per channel
+    n_sample = int(daq.sample_rate * 0.05)
+    assert camera_pulses == [daq.get_camera_pulse_times(k) for k in channel_keys]
+    lines, samples = digital_waveforms["Dev1"]
+    assert lines == ["Dev1/port0/line0", "Dev1/port0/line1"]
+    assert samples.shape == (2, 2 * n_sample)
+
+    # each laser is on during the exposure of its own channel only
+    assert np.sum(samples[0, :n_sample]) == daq.sample_rate * 0.01
+    assert not np.any(samples[0, n_sample:])
+    assert not np.any(samples[1, :n_sample])
+    assert np.sum(samples[1, n_sample:]) == daq.sample_rate * 0.02
+
+    channels, power = analog_waveforms["Dev1"]
+    assert channels == ["Dev1/ao3"]
+    assert set(np.unique(power[:n_sample])) == {0.0, 1.0}
+    assert set(np.unique(power[n_sample:])) == {0.0, 2.0}
+
+    daq.set_channel_sequence(None)
+    assert daq.channel_sequence is None
+    assert daq.sequence_outputs == {}
@@ -30,8 +30,11 @@
 # POSSIBILITY OF SUCH DAMAGE.
 
 # Standard Library Imports
+from unittest.mock import MagicMock, patch
 
 # Third Party Imports
+import nidaqmx
+import numpy as np
 import pytest
 
 # Local Imports
@@ -76,3 +79,150 @@ def test_daq_ni_functions():
             getattr(daq, f)(*a)
         else:
             getattr(daq, f)()
+
+
+class MockTasks:
+    """A mock nidaqmx layer that records every task that is created."""
+
+    def __init__(self):
+        #: list: The tasks, in the order they were created.
+        self.tasks = []
+
+    def __call__(self, *args, **kwargs):
+        task = MagicMock()
+        task.is_task_done.return_value = True
+        self.tasks.append(task)
+        return task
+
+    def calls(self, method):
+        """Count the calls of a method, e.g. "timing.cfg_implicit_timing", over all
+        tasks."""
+        count = 0
+        for task in self.tasks:
+            func = task
+            for name in method.split("."):
+                func = getattr(func, name)
+            count += func.call_count
+        return count
+
+
+@pytest.fixture
+def pooled_daq():
+    from navigate.model.devices.daq.ni import NIDAQ
+    from test.model.dummy import DummyModel
+
+    mock_tasks = MockTasks()
+    with patch("nidaqmx.Task", new=mock_tasks):
+        model = DummyModel()
+        model.configuration["waveform_templates"] = {}
+        daq = NIDAQ(model.configuration)
+        microscope_name = model.configuration["experiment"]["MicroscopeState"][
+            "microscope_name"
+        ]
+        times = {f"channel_{i}": 0.01 * i for i in range(1, 4)}
+        daq.calculate_all_waveforms(microscope_name, times, times)
+        daq.analog_outputs = {
+            f"PXI6733/ao{i}": {
+                "waveform": {
+                    k: np.full(int(daq.sample_rate * t), float(i))
+                    for k, t in times.items()
+                }
+            }
+            for i in range(2)
+        }
+        mock_tasks.tasks = []
+        yield daq, mock_tasks
+        daq.close_tasks()
+
+
+def test_daq_ni_reuses_pooled_tasks(pooled_daq):
+    daq, mock_tasks = pooled_daq
+
+    daq.prepare_acquisition("channel_1")
+    # camera, analog output and master trigger tasks
+    assert len(mock_tasks.tasks) == 3
+    analog_task = daq.analog_output_tasks["PXI6733"]
+    assert analog_task.write.call_count == 1
+    daq.run_acquisition()
+    daq.stop_acquisition()
+    assert mock_tasks.calls("close") == 0
+
+    # the same channel again: no new task, the buffer is not rewritten
+    daq.prepare_acquisition("channel_1")
+    daq.stop_acquisition()
+    assert len(mock_tasks.tasks) == 3
+    assert analog_task.write.call_count == 1
+    assert mock_tasks.calls("timing.cfg_samp_clk_timing") == 1
+    assert mock_tasks.calls("timing.cfg_implicit_timing") == 1
+
+    # another channel: the tasks are reconfigured and rewritten
+    daq.prepare_acquisition("channel_2")
+    assert len(mock_tasks.tasks) == 3
+    assert daq.analog_output_tasks["PXI6733"] is analog_task
+    assert analog_task.write.call_count == 2
+    assert mock_tasks.calls("timing.cfg_samp_clk_timing") == 2
+    samples = analog_task.timing.cfg_samp_clk_timing.call_args[1]["samps_per_chan"]
+    assert samples == int(daq.sample_rate * 0.02)
+    assert analog_task.ao_channels.add_ao_voltage_chan.call_count == 1
+    daq.stop_acquisition()
+
+    # new analog output channels get a task of their own
+    daq.analog_outputs.pop("PXI6733/ao1")
+    daq.prepare_acquisition("channel_2")
+    assert len(mock_tasks.tasks) == 4
+    daq.stop_acquisition()
+
+    daq.close_tasks()
+    assert mock_tasks.calls("close") == 4
+    assert daq.task_pool == {}
+
+
+def test_daq_ni_recreates_failed_tasks(pooled_daq):
+    daq, mock_tasks = pooled_daq
+
+    daq.prepare_acquisition("channel_1")
+    daq.stop_acquisition()
+    camera_task = daq.camera_trigger_task
+    camera_task.co_channels.__getitem__.side_effect = nidaqmx.errors.DaqError(
+        "", -200088
+    )
+
+    # the failed task is closed and every task is created again
+    daq.prepare_acquisition("channel_2")
+    assert camera_task.close.called
+    assert daq.camera_trigger_task is not camera_task
+    assert len(mock_tasks.tasks) == 6
+
+
+def test_daq_ni_continuous_acquisition(pooled_daq):
+    daq, mock_tasks = pooled_daq
+
+    daq.prepare_acquisition("channel_1")
+    daq.stop_acquisition()
+    analog_task = daq.task_pool[("ao", "PXI6733/ao0, PXI6733/ao1", "")]
+
+    # the tasks regenerate one sweep and are started once
+    assert daq.start_continuous_acquisition() is True
+    assert len(mock_tasks.tasks) == 3
+    timing = analog_task.timing.cfg_samp_clk_timing.call_args[1]
+    assert timing["sample_mode"] == nidaqmx.constants.AcquisitionType.CONTINUOUS
+    assert timing["samps_per_chan"] == int(daq.sample_rate * 0.01)
+    camera_timing = daq.camera_trigger_task.timing.cfg_implicit_timing.call_args[1]
+    assert camera_timing["sample_mode"] == nidaqmx.constants.AcquisitionType.CONTINUOUS
+    assert analog_task.start.call_count == 1
+    assert daq.camera_trigger_task.start.call_count == 1
+
+    # waveform changes are written to the running task
+    writes = analog_task.write.call_count
+    stops = analog_task.stop.call_count
+    daq.update_analog_task("PXI6733")
+    assert analog_task.write.call_count == writes + 1
+    assert analog_task.stop.call_count == stops
+    assert analog_task.out_stream.offset == 0
+
+    # the tasks are finite again after the continuous acquisition
+    daq.stop_continuous_acquisition()
+    daq.prepare_acquisition("channel_1")
+    timing = analog_task.timing.cfg_samp_clk_timing.call_args[1]
+    assert timing["sample_mode"] == nidaqmx.constants.AcquisitionType.FINITE
+    assert len(mock_tasks.tasks) == 3
@@ -1,3 +1,6 @@
+from unittest.mock import MagicMock
+
+
 def test_initialize_daq_synthetic():
     from navigate.model.devices.daq.synthetic import SyntheticDAQ
     from test.model.dummy import DummyModel
@@ -50,3 +53,67 @@ def test_synthetic_daq_functions():
             getattr(daq, f)(*a)
         else:
             getattr(daq, f)()
+
+
+def test_synthetic_daq_channel_sequence():
+    from navigate.model.devices.daq.synthetic import SyntheticDAQ
+    from test.model.dummy import DummyModel
+
+    model = DummyModel()
+    daq = SyntheticDAQ(model.configuration)
+    microscope_name = model.configuration["experiment"]["MicroscopeState"][
+        "microscope_name"
+    ]
+    camera = model.camera[microscope_name]
+    daq.add_camera(microscope_name, camera)
+
+    channel_keys = ["channel_1", "channel_2", "channel_3"]
+    times = {k: 0.02 for k in channel_keys}
+    daq.calculate_all_waveforms(microscope_name, times, times)
+    daq.set_channel_sequence(
+        channel_keys, {"Dev1/port0/line0": {k: True for k in channel_keys}}
+    )
+    daq.prepare_acquisition("channel_1")
+    assert len(daq.camera_pulses) == 3
+    assert daq.digital_output_tasks["Dev1"].shape == (int(daq.sample_rate * 0.06),)
+
+    # one run triggers a frame for every channel
+    camera.generate_new_frame = MagicMock()
+    daq.run_acquisition()
+    assert camera.generate_new_frame.call_count == 3
+
+    daq.stop_acquisition()
+    assert daq.digital_output_tasks == {}
+    assert daq.camera_pulses == []
+
+
+def test_synthetic_daq_continuous_acquisition():
+    import time
+
+    from navigate.model.devices.daq.synthetic import SyntheticDAQ
+    from test.model.dummy import DummyModel
+
+    model = DummyModel()
+    daq = SyntheticDAQ(model.configuration)
+    microscope_name = model.configuration["experiment"]["MicroscopeState"][
+        "microscope_name"
+    ]
+    camera = MagicMock()
+    daq.add_camera(microscope_name, camera)
+    daq.sweep_times = {"channel_1": 0.01}
+    daq.current_channel_key = "channel_1"
+
+    # frames are generated until the acquisition is stopped
+    assert daq.start_continuous_acquisition() is True
+    assert daq.continuous is True
+    time.sleep(0.1)
+    daq.stop_continuous_acquisition()
+    assert daq.continuous is False
+    frames = camera.generate_new_frame.call_count
+    assert frames > 1
+    time.sleep(0.05)
+    assert camera.generate_new_frame.call_count == frames
+
+    # external triggers can not be generated freely
+    daq.set_external_trigger("/PXI6259/PFI1")
+    assert daq.start_continuous_acquisition() is False
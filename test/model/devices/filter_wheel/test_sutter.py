@@ -114,6 +114,7 @@ class TestSutterFilterWheel(unittest.TestCase):
         for wait_flag, read_num in [(True, 2), (False, 1)]:
             self.mock_device_connection.reset_mock()
             self.filter_wheel.init_finished = True
+            self.filter_wheel.invalidate_device_state()
             read_count = 0
             for i in range(6):
                 self.filter_wheel.set_filter(
@@ -142,3 +142,17 @@ class TestGalvoBase(unittest.TestCase):
         for channel in "channel_1", "channel_2", "channel_3":
             assert np.all(result[channel] <= self.galvo.galvo_max_voltage)
             assert np.all(result[channel] >= self.galvo.galvo_min_voltage)
+
+    def test_adjust_reuses_cached_waveforms(self):
+        self.galvo.galvo_waveform = "sawtooth"
+        result = dict(self.galvo.adjust(self.exposure_times, self.sweep_times))
+        result_again = self.galvo.adjust(self.exposure_times, self.sweep_times)
+        for channel in "channel_1", "channel_2", "channel_3":
+            assert result_again[channel] is result[channel]
+            assert not result[channel].flags.writeable
+
+        # A new amplitude only recomputes the waveform
+        self.galvo.galvo_max_voltage += 1
+        result_new = self.galvo.adjust(self.exposure_times, self.sweep_times)
+        assert result_new["channel_1"] is not result["channel_1"]
+        np.testing.assert_array_equal(result_new["channel_1"], result["channel_1"])
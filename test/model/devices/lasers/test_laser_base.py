@@ -18,3 +18,6 @@ def test_laser_base_functions():
             getattr(laser, f)(*a)
         else:
             getattr(laser, f)()
+
+    # the base laser is not switched by a DAQ
+    assert laser.get_sequence_outputs(50) == {}
@@ -71,7 +71,9 @@ class TestLaserNI(unittest.TestCase):
         self.laser.turn_on()
         self.laser.laser_do_task.write.assert_called_with(True, auto_start=True)
 
+        # a changed on/off type is not known to the state cache
         self.laser.on_off_type = "analog"
+        self.laser.invalidate_device_state()
         self.laser.turn_on()
         self.laser.laser_do_task.write.assert_called_with(
             self.laser.laser_max_do, auto_start=True
@@ -94,3 +96,14 @@ class TestLaserNI(unittest.TestCase):
         )
 
         assert self.laser._current_intensity == self.current_intensity
+
+    def test_get_sequence_outputs(self):
+        onoff = self.laser.device_config["onoff"]["hardware"]["channel"]
+        power = self.laser.device_config["power"]["hardware"]["channel"]
+
+        self.laser.on_off_type = "digital"
+        outputs = self.laser.get_sequence_outputs(50)
+        assert outputs == {onoff: True, power: 0.5 * self.laser.laser_max_ao}
+
+        self.laser.on_off_type = "analog"
+        assert self.laser.get_sequence_outputs(50)[onoff] == self.laser.laser_max_do
@@ -33,11 +33,13 @@
 # Standard Library Imports
 import pytest
 import random
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 # Third Party Imports
+import numpy as np
 
 # Local Imports
+from navigate.model.devices.daq.synthetic import SyntheticDAQ
 from navigate.model.devices.stages.ni import GalvoNIStage
 from test.model.dummy import DummyModel
 from navigate.tools.common_functions import copy_proxy_object
@@ -156,3 +158,43 @@ class TestStageGalvo:
             self.random_multiple_axes_test(stage)
             stage.stage_limits = False
             self.random_multiple_axes_test(stage)
+
+    @pytest.mark.parametrize("ramp", [False, True])
+    def test_stack_waveform(self, ramp):
+        self.stage_configuration["stage"]["hardware"]["axes"] = ["z"]
+        self.stage_configuration["stage"]["hardware"]["volts_per_micron"] = "0.01*x"
+        microscope_state = self.configuration["experiment"]["MicroscopeState"]
+        microscope_state["number_z_steps"] = 4
+        microscope_state["waveform_template"] = "Hardware-Z-Stack"
+        self.configuration["waveform_templates"] = {
+            "Hardware-Z-Stack": {"repeat": 1, "expand": "number_z_steps"}
+        }
+        channel_keys = [
+            k for k, v in microscope_state["channels"].items() if v["is_selected"]
+        ]
+        sweep_times = {k: 0.01 for k in channel_keys}
+
+        daq = SyntheticDAQ(self.configuration)
+        daq.sweep_times = sweep_times
+        camera = MagicMock()
+        daq.add_camera(self.microscope_name, camera)
+        with patch("nidaqmx.Task"):
+            stage = GalvoNIStage(self.microscope_name, daq, self.configuration)
+            assert stage.set_stack_waveform([10, 20, 30, 40], sweep_times, ramp)
+            assert stage.ao_task is None
+
+            # one finite analog output task steps through the whole stack
+            daq.prepare_acquisition(channel_keys[0])
+            samples = daq.analog_output_tasks["PXI6259"]
+            n_sample = int(daq.sample_rate * 0.01)
+            assert samples.shape == (4 * n_sample,)
+            np.testing.assert_allclose(samples[::n_sample], [0.1, 0.2, 0.3, 0.4])
+            assert np.all(np.diff(samples) >= 0)
+            assert np.all(np.diff(samples) > 0) == ramp
+
+            # one camera trigger per plane
+            daq.run_acquisition()
+            assert camera.generate_new_frame.call_count == 4
+
+            stage.switch_mode("normal")
+            assert daq.analog_outputs == {}
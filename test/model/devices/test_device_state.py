@@ -0,0 +1,153 @@
+# Copyright (c) 2021-2024  The University of Texas Southwestern Medical Center.
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted for academic and research use only
+# (subject to the limitations in the disclaimer below)
+# provided that the following conditions are met:
+
+#      * Redistributions of source code must retain the above copyright notice,
+#      this list of conditions and the following disclaimer.
+
+#      * Redistributions in binary form must reproduce the above copyright
+#      notice, this list of conditions and the following disclaimer in the
+#      documentation and/or other materials provided with the distribution.
+
+#      * Neither the name of the copyright holders nor the names of its
+#      contributors may be used to endorse or promote products derived from this
+#      software without specific prior written permission.
+
+# NO EXPRESS OR IMPLIED LICENSES TO ANY PARTY'S PATENT RIGHTS ARE GRANTED BY
+# THIS LICENSE. THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND
+# CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A
+# PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR
+# BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER
+# IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+# Standard Library Imports
+
+# Third Party Imports
+import pytest
+
+# Local Imports
+from navigate.model.devices.device_state import (
+    ARGUMENT,
+    DeviceStateCache,
+    DeviceStateMixin,
+)
+
+
+class DummyDeviceBase(DeviceStateMixin):
+    cached_commands = {
+        "set_power": ("power", ARGUMENT, ("on",)),
+        "turn_on": ("on", True, ()),
+        "turn_off": ("on", False, ()),
+        "reset": (None, None, None),
+    }
+
+    def set_power(self, power):
+        pass
+
+    def turn_on(self):
+        pass
+
+    def turn_off(self):
+        pass
+
+    def reset(self):
+        pass
+
+
+class DummyDevice(DummyDeviceBase):
+    def __init__(self):
+        self.commands = []
+        self.fail = False
+
+    def set_power(self, power):
+        if self.fail:
+            raise RuntimeError("device error")
+        self.commands.append(("set_power", power))
+        return power != 0 or None
+
+    def turn_on(self):
+        self.commands.append(("turn_on",))
+        return False if self.fail else None
+
+
+def test_device_state_cache():
+    cache = DeviceStateCache()
+    assert cache.is_current("power", 10) is False
+
+    cache.update("power", 10)
+    cache.update("on", True)
+    assert cache.is_current("power", 10) is True
+    assert cache.is_current("power", 20) is False
+
+    cache.invalidate("power")
+    assert cache.is_current("power", 10) is False
+    assert cache.is_current("on", True) is True
+
+    cache.invalidate()
+    assert cache.states == {}
+
+
+def test_unchanged_commands_are_skipped():
+    device = DummyDevice()
+
+    device.set_power(10)
+    device.set_power(10)
+    device.set_power(power=10)
+    assert device.commands == [("set_power", 10)]
+
+    device.set_power(20)
+    assert device.commands[-1] == ("set_power", 20)
+
+    device.turn_on()
+    device.turn_on()
+    assert device.commands.count(("turn_on",)) == 1
+
+    # a new power makes the on/off state unknown
+    device.set_power(30)
+    device.turn_on()
+    assert device.commands.count(("turn_on",)) == 2
+
+    # commands without a key always run and may invalidate everything
+    device.reset()
+    assert device.device_state.states == {}
+
+
+def test_subclass_commands_are_wrapped_once():
+    assert DummyDevice.set_power.is_cached_command
+    assert DummyDevice.turn_off is DummyDeviceBase.turn_off
+    assert DummyDevice.set_power.__wrapped__.__qualname__ == "DummyDevice.set_power"
+
+
+def test_failed_commands_invalidate_the_state():
+    device = DummyDevice()
+    device.set_power(10)
+
+    device.fail = True
+    with pytest.raises(RuntimeError):
+        device.set_power(20)
+    device.fail = False
+    device.set_power(10)
+    assert device.commands == [("set_power", 10), ("set_power", 10)]
+
+    # a command that returns False leaves the state unknown
+    device.fail = True
+    device.turn_on()
+    device.fail = False
+    device.turn_on()
+    assert device.commands.count(("turn_on",)) == 2
+
+    # external changes
+    device.invalidate_device_state()
+    device.set_power(10)
+    assert device.commands[-1] == ("set_power", 10)
+    assert len(device.commands) == 5
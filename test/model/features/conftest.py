@@ -3,6 +3,7 @@ import time
 import threading
 import multiprocessing as mp
 from navigate.model.features.feature_container import load_features
+from navigate.model.concurrency.cancellation import CancellationToken
 
 
 class DummyDevice:
@@ -92,6 +93,7 @@ class DummyModelToTestFeatures:
         self.data_thread = None
 
         self.stop_acquisition = False
+        self.cancel_token = CancellationToken()
         self.frame_id = 0  # signal_num
         self.frame_id_completed = -1
 
@@ -157,7 +159,7 @@ class DummyModelToTestFeatures:
 
         return True
 
-    def get_stage_position(self):
+    def get_stage_position(self, settled=False):
         axes = ["x", "y", "z", "theta", "f"]
         stage_pos = self.configuration["experiment"]["StageParameters"]
         return dict(map(lambda axis: (axis + "_pos", stage_pos[axis]), axes))
@@ -32,15 +32,18 @@
 import unittest
 import random
 import threading
+import time
 
 from navigate.model.features.feature_container import (
     SignalNode,
     DataNode,
+    SignalContainer,
     DataContainer,
     load_features,
 )
 from navigate.model.features.common_features import WaitToContinue, LoopByCount
 from navigate.model.features.feature_container import dummy_True
+from navigate.model.concurrency.cancellation import CancellationToken
 from test.model.dummy import DummyModel
 
 
@@ -188,6 +191,169 @@ class DummyFeature:
         return self.current_data_step >= self.multi_steps
 
 
+class TraceFeature:
+    """A feature which records every call into ``model.trace``.
+
+    args:
+        0: model
+        1: name
+        2: results returned by the signal and data main functions, in turn
+        3: has a response function
+        4: number of steps, 'multi-step' if > 1
+        5: call of the signal main function that raises an error (0 for never)
+        6: call of the data main function that raises an error (0 for never)
+    """
+
+    def __init__(
+        self,
+        model,
+        name,
+        results=(True,),
+        response=False,
+        steps=1,
+        signal_error=0,
+        data_error=0,
+    ):
+        self.model = model
+        self.name = name
+        self.results = results
+        self.steps = steps
+        self.signal_error = signal_error
+        self.data_error = data_error
+        self.signal_calls = 0
+        self.data_calls = 0
+        self.signal_step = 0
+        self.data_step = 0
+        self.config_table = {
+            "signal": {
+                "init": self.signal_init,
+                "main": self.signal_main,
+                "cleanup": self.signal_cleanup,
+            },
+            "data": {
+                "init": self.data_init,
+                "main": self.data_main,
+                "cleanup": self.data_cleanup,
+            },
+            "node": {},
+        }
+        if response:
+            self.config_table["signal"]["main-response"] = self.signal_response
+        if steps > 1:
+            self.config_table["node"]["node_type"] = "multi-step"
+            self.config_table["signal"]["end"] = self.signal_end
+            self.config_table["data"]["end"] = self.data_end
+
+    def record(self, *event):
+        self.model.trace.append((self.name, *event))
+
+    def signal_init(self):
+        self.signal_step = 0
+        self.record("signal-init")
+
+    def signal_main(self, *args):
+        self.signal_calls += 1
+        self.record("signal-main", self.signal_calls)
+        if self.signal_calls == self.signal_error:
+            raise RuntimeError(self.name)
+        return self.results[self.signal_calls % len(self.results)]
+
+    def signal_response(self, *args):
+        self.record("signal-response")
+        return self.results[self.signal_calls % len(self.results)]
+
+    def signal_end(self):
+        self.signal_step += 1
+        return self.signal_step >= self.steps
+
+    def signal_cleanup(self):
+        self.record("signal-cleanup")
+
+    def data_init(self):
+        self.data_step = 0
+        self.record("data-init")
+
+    def data_main(self, frame_ids):
+        self.data_calls += 1
+        self.record("data-main", self.data_calls, frame_ids[0])
+        if self.data_calls == self.data_error:
+            raise RuntimeError(self.name)
+        return self.results[self.data_calls % len(self.results)]
+
+    def data_end(self):
+        self.data_step += 1
+        return self.data_step >= self.steps
+
+    def data_cleanup(self):
+        self.record("data-cleanup")
+
+
+class TraceModel:
+    def __init__(self):
+        self.trace = []
+
+
+def trace_feature(name, *args):
+    return {"name": TraceFeature, "args": (name, *args)}
+
+
+def node_label(node):
+    if node is None:
+        return None
+    feature = node.node_funcs["main"].__self__
+    return getattr(feature, "name", node.node_name)
+
+
+def run_containers(feature_list, compiled, frames=200):
+    """Run the containers the way ``Model.snap_image`` does, one frame at a time."""
+    model = TraceModel()
+    signal_container, data_container = load_features(
+        model, feature_list, compiled=compiled
+    )
+    states = []
+    for frame_id in range(frames):
+        if signal_container.end_flag and data_container.end_flag:
+            break
+        signal_container.run()
+        signal_container.run(wait_response=True)
+        data_container.run([frame_id])
+        states.append(
+            (
+                signal_container.end_flag,
+                data_container.end_flag,
+                signal_container.is_closed,
+                data_container.is_closed,
+                node_label(signal_container.curr_node),
+                node_label(data_container.curr_node),
+            )
+        )
+    return model.trace, states
+
+
+def generate_random_trace_feature_list(depth=0):
+    feature_list = []
+    for i in range(random.randint(1, 4)):
+        name = f"node{depth}-{i}-{random.randint(0, 1 << 16)}"
+        results = tuple(random.choice([True, False]) for _ in range(3))
+        args = (
+            results,
+            random.random() < 0.3,
+            random.choice([1, 1, 2, 3]),
+            random.choice([0, 0, 0, 2, 5]),
+            random.choice([0, 0, 0, 2, 5]),
+        )
+        feature = trace_feature(name, *args)
+        if depth < 2 and random.random() < 0.3:
+            feature["true"] = generate_random_trace_feature_list(depth + 1)
+        if depth < 2 and random.random() < 0.3:
+            feature["false"] = generate_random_trace_feature_list(depth + 1)
+        feature_list.append(feature)
+    if depth < 2 and random.random() < 0.5:
+        feature_list.append({"name": LoopByCount, "args": (random.randint(1, 3),)})
+        feature_list = tuple(feature_list)
+    return feature_list
+
+
 def generate_random_feature_list(
     has_response_func=False, multi_step=False, with_data_func=True, loop_node=False
 ):
@@ -965,6 +1131,140 @@ class TestFeatureContainer(unittest.TestCase):
         assert feature.running_times_main_func == 6
         assert data_container.end_flag == True
 
+    def test_signal_container_cancellation(self):
+        cancel_token = CancellationToken()
+        feature = DummyFeature()
+
+        def cancel_func():
+            feature.main_func()
+            cancel_token.cancel()
+
+        node1 = SignalNode("node1", {"init": feature.init_func, "main": cancel_func})
+        node2 = SignalNode(
+            "node2", {"init": feature.init_func, "main": feature.main_func}
+        )
+        node1.sibling = node2
+        signal_container = SignalContainer(node1, cancel_token=cancel_token)
+
+        # node2 is never started once node1 cancelled the token
+        signal_container.run()
+        assert feature.running_times_main_func == 1
+        assert signal_container.end_flag is True
+        signal_container.run()
+        assert feature.running_times_main_func == 1
+
+        # the model's token is handed to the signal container
+        model = DummyModel()
+        model.cancel_token = cancel_token
+        signal_container, _ = load_features(model, [{"name": WaitToContinue}])
+        assert signal_container.cancel_token is cancel_token
+
+    def test_compiled_containers(self):
+        signal_container, data_container = load_features(
+            TraceModel(), [trace_feature("node0"), trace_feature("node1")]
+        )
+        assert [instruction[0].node_name for instruction in signal_container.program]
+        assert signal_container.addresses[signal_container.root] == 0
+        assert data_container.addresses[data_container.root] == 0
+
+        signal_container, data_container = load_features(
+            TraceModel(), [trace_feature("node0")], compiled=False
+        )
+        assert signal_container.program is None
+        assert data_container.program is None
+
+    def test_compiled_containers_match_tree(self):
+        feature_lists = [
+            # branches
+            [
+                trace_feature("node0", (True, False)),
+                {
+                    **trace_feature("node1", (False, True, True)),
+                    "true": [trace_feature("node2"), trace_feature("node3", (), 1, 3)],
+                    "false": [trace_feature("node4", (False,), True)],
+                },
+                trace_feature("node5"),
+            ],
+            # nested loops with a multi-step node and a response node
+            [
+                (
+                    (
+                        trace_feature("node0", (True,), False, 3),
+                        trace_feature("node1", (True, False), True),
+                        {"name": LoopByCount, "args": (2,)},
+                    ),
+                    trace_feature("node2"),
+                    {"name": LoopByCount, "args": (3,)},
+                ),
+                trace_feature("node3"),
+            ],
+            # break and continue
+            [
+                (
+                    trace_feature("node0"),
+                    {**trace_feature("node1", (False, False, True)), "true": "break"},
+                    {**trace_feature("node2", (True, False)), "false": "continue"},
+                    trace_feature("node3"),
+                    {"name": LoopByCount, "args": (5,)},
+                ),
+                trace_feature("node4"),
+            ],
+            # a data node fails and is marked, then a signal node fails
+            [
+                (
+                    trace_feature("node0", (True,), False, 1, 0, 2),
+                    trace_feature("node1", (True,), False, 1, 5),
+                    {"name": LoopByCount, "args": (4,)},
+                ),
+            ],
+            # a response node fails in the data container
+            [
+                trace_feature("node0"),
+                trace_feature("node1", (True,), True, 1, 0, 1),
+                trace_feature("node2"),
+            ],
+        ]
+        random.seed(50)
+        feature_lists += [generate_random_trace_feature_list() for _ in range(100)]
+
+        for feature_list in feature_lists:
+            expected = run_containers(feature_list, compiled=False)
+            assert run_containers(feature_list, compiled=True) == expected, str(
+                feature_list
+            )
+
+    @unittest.skip("benchmark, run by hand to compare the per-frame overhead")
+    def test_compiled_containers_overhead(self):
+        """Compare the per-frame overhead of the compiled containers with the tree."""
+        feature_list = [
+            trace_feature("node0"),
+            (
+                trace_feature("node1"),
+                {**trace_feature("node2"), "true": [trace_feature("node3")]},
+                trace_feature("node4", (True,), True),
+                {"name": LoopByCount, "args": (10**9,)},
+            ),
+        ]
+        n_frames = 5000
+
+        def time_per_frame_us(compiled):
+            model = TraceModel()
+            signal_container, data_container = load_features(
+                model, feature_list, compiled=compiled
+            )
+            start = time.perf_counter()
+            for frame_id in range(n_frames):
+                signal_container.run()
+                signal_container.run(wait_response=True)
+                data_container.run([frame_id])
+                model.trace.clear()
+            return (time.perf_counter() - start) / n_frames * 1e6
+
+        tree = min(time_per_frame_us(False) for _ in range(3))
+        compiled = min(time_per_frame_us(True) for _ in range(3))
+        print("Per-frame overhead of the feature containers:")
+        print(f" tree: {tree:.2f} \u03bcs, compiled: {compiled:.2f} \u03bcs")
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,148 @@
+# Copyright (c) 2021-2024  The University of Texas Southwestern Medical Center.
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted for academic and research use only
+# (subject to the limitations in the disclaimer below)
+# provided that the following conditions are met:
+
+#      * Redistributions of source code must retain the above copyright notice,
+#      this list of conditions and the following disclaimer.
+
+#      * Redistributions in binary form must reproduce the above copyright
+#      notice, this list of conditions and the following disclaimer in the
+#      documentation and/or other materials provided with the distribution.
+
+#      * Neither the name of the copyright holders nor the names of its
+#      contributors may be used to endorse or promote products derived from this
+#      software without specific prior written permission.
+
+# NO EXPRESS OR IMPLIED LICENSES TO ANY PARTY'S PATENT RIGHTS ARE GRANTED BY
+# THIS LICENSE. THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND
+# CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A
+# PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR
+# BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER
+# IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+# Standard Library Imports
+from unittest.mock import MagicMock
+
+# Third Party Imports
+import numpy as np
+import pytest
+
+# Local Imports
+from navigate.model.features.channel_sequence import ChannelSequenceAcquisition
+
+
+@pytest.fixture
+def sequence_model():
+    model = MagicMock()
+    model.stop_acquisition = False
+    model.virtual_microscopes = {}
+    model.frame_id = 0
+    model.number_of_frames = 100
+    model.data_buffer_positions = np.zeros((100, 5))
+    model.data_buffer_channels = [0] * 100
+    model.configuration = {
+        "experiment": {
+            "MicroscopeState": {
+                "stack_cycling_mode": "per_stack",
+                "number_z_steps": 3,
+                "start_position": -5.0,
+                "end_position": 5.0,
+                "step_size": 5.0,
+                "start_focus": 0.0,
+                "is_multiposition": True,
+                "channels": {
+                    "channel_1": {"is_selected": True, "defocus": 1},
+                    "channel_2": {"is_selected": False, "defocus": 0},
+                    "channel_3": {"is_selected": True, "defocus": 1},
+                },
+            },
+            "MultiPositions": [[0, 0, 100, 0, 50], [10, 20, 200, 0, 60]],
+        },
+    }
+    model.get_stage_position.return_value = {
+        "x_pos": 0,
+        "y_pos": 0,
+        "z_pos": 1,
+        "theta_pos": 0,
+        "f_pos": 2,
+    }
+    model.active_microscope.prepare_channel_sequence.return_value = True
+    return model
+
+
+def test_channel_sequence_runs_one_daq_task_per_plane(sequence_model):
+    feature = ChannelSequenceAcquisition(sequence_model)
+    microscope = sequence_model.active_microscope
+
+    feature.pre_signal_func()
+    microscope.prepare_next_channel.assert_called_once_with(update_daq_task_flag=False)
+    microscope.prepare_channel_sequence.assert_called_once()
+
+    daq_runs = 0
+    while True:
+        assert feature.signal_func() is True
+        daq_runs += 1
+        # the data thread received every channel of the plane
+        feature.plane_received.set()
+        assert feature.signal_response_func() is True
+        if feature.signal_end():
+            break
+
+    # one DAQ run per plane and position, the channels are not switched
+    assert daq_runs == 3 * 2
+    assert microscope.prepare_next_channel.call_count == 1
+
+    moves = [c[0][0] for c in sequence_model.move_stage.call_args_list]
+    assert moves[0] == {
+        "z_abs": 95,
+        "x_abs": 0,
+        "y_abs": 0,
+        "theta_abs": 0,
+        "f_abs": 51,
+    }
+    assert moves[1] == {"z_abs": 100}
+    assert moves[3]["z_abs"] == 195 and moves[3]["x_abs"] == 10
+    assert moves[-1] == {"f_abs": 2}
+
+    # the frame counter skips the frames triggered by the same DAQ run
+    assert sequence_model.frame_id == 6 * (2 - 1)
+
+    feature.cleanup()
+    microscope.clear_channel_sequence.assert_called_once()
+
+
+def test_channel_sequence_positions(sequence_model):
+    feature = ChannelSequenceAcquisition(sequence_model)
+    feature.pre_signal_func()
+    feature.pre_data_func()
+    assert feature.total_frames == 12
+
+    feature.in_data_func([0])
+    assert not feature.plane_received.is_set()
+    feature.in_data_func([1, 2])
+    assert feature.plane_received.is_set()
+    assert sequence_model.data_buffer_channels[:3] == [1, 3, 1]
+    assert list(sequence_model.data_buffer_positions[1]) == [0, 0, 95, 0, 51]
+    assert list(sequence_model.data_buffer_positions[2]) == [0, 0, 100, 0, 51]
+
+    feature.in_data_func(list(range(3, 12)))
+    assert list(sequence_model.data_buffer_positions[11]) == [10, 20, 205, 0, 61]
+    assert feature.end_data_func() is True
+
+
+def test_channel_sequence_not_supported(sequence_model):
+    sequence_model.active_microscope.prepare_channel_sequence.return_value = False
+    feature = ChannelSequenceAcquisition(sequence_model)
+    feature.pre_signal_func()
+    assert sequence_model.stop_acquisition is True
+    assert feature.signal_func() is False
@@ -144,7 +144,7 @@ class TestZStack:
 
             idx = self.get_next_record("move_stage", idx)
 
-            # x, y, theta
+            # x, y, theta, together with the first z, f
             pos_moved = self.model.signal_records[idx][1][0]
             for i, axis in [(0, "x"), (1, "y"), (3, "theta")]:
                 assert pos[i] == pos_moved[axis + "_abs"], (
@@ -159,7 +159,8 @@ class TestZStack:
             if mode == "per_z":
                 f_pos += selected_channels[0]["defocus"]
                 for j in range(self.config["number_z_steps"]):
-                    idx = self.get_next_record("move_stage", idx)
+                    if j > 0:
+                        idx = self.get_next_record("move_stage", idx)
 
                     pos_moved = self.model.signal_records[idx][1][0]
                     # z, f
@@ -231,7 +232,8 @@ class TestZStack:
                     # z
                     f_pos += selected_channels[k]["defocus"]
                     for j in range(self.config["number_z_steps"]):
-                        idx = self.get_next_record("move_stage", idx)
+                        if k > 0 or j > 0:
+                            idx = self.get_next_record("move_stage", idx)
 
                         pos_moved = self.model.signal_records[idx][1][0]
                         # z, f
@@ -0,0 +1,162 @@
+# Copyright (c) 2021-2024  The University of Texas Southwestern Medical Center.
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted for academic and research use only
+# (subject to the limitations in the disclaimer below)
+# provided that the following conditions are met:
+
+#      * Redistributions of source code must retain the above copyright notice,
+#      this list of conditions and the following disclaimer.
+
+#      * Redistributions in binary form must reproduce the above copyright
+#      notice, this list of conditions and the following disclaimer in the
+#      documentation and/or other materials provided with the distribution.
+
+#      * Neither the name of the copyright holders nor the names of its
+#      contributors may be used to endorse or promote products derived from this
+#      software without specific prior written permission.
+
+# NO EXPRESS OR IMPLIED LICENSES TO ANY PARTY'S PATENT RIGHTS ARE GRANTED BY
+# THIS LICENSE. THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND
+# CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A
+# PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR
+# BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER
+# IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+# Standard Library Imports
+from unittest.mock import MagicMock
+
+# Third Party Imports
+import numpy as np
+import pytest
+
+# Local Imports
+from navigate.model.features.constant_velocity_acquisition import (
+    ConstantVelocityAcquisition,
+)
+
+
+@pytest.fixture
+def scan_model():
+    model = MagicMock()
+    model.stop_acquisition = False
+    model.virtual_microscopes = {}
+    model.data_buffer_positions = np.zeros((100, 5))
+    model.configuration = {
+        "experiment": {
+            "MicroscopeState": {
+                "stack_cycling_mode": "per_stack",
+                "selected_channels": 2,
+                "number_z_steps": 5,
+                "start_position": -10.0,
+                "end_position": 10.0,
+                "step_size": 5.0,
+                "start_focus": 0.0,
+                "is_multiposition": True,
+                "channels": {
+                    "channel_1": {"is_selected": True, "defocus": 0},
+                    "channel_2": {"is_selected": True, "defocus": 2},
+                },
+            },
+            "MultiPositions": [[0, 0, 100, 0, 50], [10, 20, 200, 0, 60]],
+        }
+    }
+    model.get_stage_position.return_value = {
+        "x_pos": 0,
+        "y_pos": 0,
+        "z_pos": 1,
+        "theta_pos": 0,
+        "f_pos": 2,
+    }
+
+    microscope = model.active_microscope
+    microscope.microscope_name = "scope"
+    microscope.current_channel = 0
+    microscope.configuration = {
+        "configuration": {
+            "microscopes": {"scope": {"stage": {"scan_trigger_source": "/Dev1/PFI1"}}}
+        }
+    }
+    microscope.calculate_exposure_sweep_times.return_value = ({}, {"channel_0": 0.1})
+
+    stage = MagicMock()
+    stage.axes_mapping = {"z": "Z"}
+    stage.get_speed.return_value = 1.5
+    stage.scanr.return_value = True
+    microscope.stages = {"z": stage}
+    return model
+
+
+def run_signal(feature):
+    feature.pre_signal_func()
+    frames = 0
+    while True:
+        assert feature.signal_func() is True
+        frames += 1
+        if feature.signal_end():
+            return frames
+
+
+def test_constant_velocity_acquisition_scans(scan_model):
+    feature = ConstantVelocityAcquisition(scan_model)
+    microscope = scan_model.active_microscope
+    stage = microscope.stages["z"]
+
+    assert run_signal(feature) == 2 * 2 * 5
+    microscope.daq.set_external_trigger.assert_called_once_with("/Dev1/PFI1")
+
+    # one scan per channel and position
+    assert stage.start_scan.call_count == 4
+    assert stage.stop_scan.call_count == 4
+    start_mm, end_mm, step_mm = stage.scanr.call_args_list[0][0]
+    assert start_mm == pytest.approx(0.09)
+    assert end_mm == pytest.approx(0.11)
+    assert step_mm == pytest.approx(0.005)
+    assert stage.scanr.call_args_list[2][0][0] == pytest.approx(0.19)
+
+    # the stage moves one z step per frame, and gets its speed back afterwards
+    assert stage.set_speed.call_args_list[0][0][0] == {
+        "Z": pytest.approx(0.9 * 0.005 / 0.1)
+    }
+    assert stage.set_speed.call_args_list[-1][0][0] == {"Z": 1.5}
+
+    # the second channel is defocused
+    moves = [c[0][0] for c in scan_model.move_stage.call_args_list]
+    assert moves[0]["f_abs"] == 50 and moves[1]["f_abs"] == 52
+    assert moves[2]["x_abs"] == 10 and moves[2]["z_abs"] == 190
+    assert moves[-1] == {"z_abs": 1, "f_abs": 2}
+
+    feature.cleanup()
+    microscope.daq.set_external_trigger.assert_called_with(None)
+    assert stage.stop_scan.call_count == 4
+
+
+def test_constant_velocity_acquisition_positions(scan_model):
+    feature = ConstantVelocityAcquisition(scan_model)
+    feature.pre_signal_func()
+    feature.pre_data_func()
+    assert feature.total_frames == 20
+
+    frame_ids = list(range(20))
+    feature.in_data_func(frame_ids[:3])
+    feature.in_data_func(frame_ids[3:])
+    z = scan_model.data_buffer_positions[:20, 2]
+    np.testing.assert_allclose(z[:5], [90, 95, 100, 105, 110])
+    np.testing.assert_allclose(z[5:10], z[:5])
+    np.testing.assert_allclose(z[10:15], [190, 195, 200, 205, 210])
+    assert feature.end_data_func() is True
+
+
+def test_constant_velocity_acquisition_needs_a_scanning_stage(scan_model):
+    scan_model.active_microscope.stages = {"z": object()}
+    feature = ConstantVelocityAcquisition(scan_model)
+    feature.pre_signal_func()
+    assert scan_model.stop_acquisition is True
+    assert feature.signal_func() is False
@@ -0,0 +1,182 @@
+# Copyright (c) 2021-2024  The University of Texas Southwestern Medical Center.
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted for academic and research use only
+# (subject to the limitations in the disclaimer below)
+# provided that the following conditions are met:
+
+#      * Redistributions of source code must retain the above copyright notice,
+#      this list of conditions and the following disclaimer.
+
+#      * Redistributions in binary form must reproduce the above copyright
+#      notice, this list of conditions and the following disclaimer in the
+#      documentation and/or other materials provided with the distribution.
+
+#      * Neither the name of the copyright holders nor the names of its
+#      contributors may be used to endorse or promote products derived from this
+#      software without specific prior written permission.
+
+# NO EXPRESS OR IMPLIED LICENSES TO ANY PARTY'S PATENT RIGHTS ARE GRANTED BY
+# THIS LICENSE. THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND
+# CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A
+# PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR
+# BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER
+# IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+# Standard Library Imports
+from unittest.mock import MagicMock
+
+# Third Party Imports
+import numpy as np
+import pytest
+
+# Local Imports
+from navigate.model.features.hardware_z_stack import HardwareZStackAcquisition
+
+
+@pytest.fixture
+def stack_model():
+    model = MagicMock()
+    model.stop_acquisition = False
+    model.virtual_microscopes = {}
+    model.frame_id = 0
+    model.number_of_frames = 100
+    model.data_buffer_positions = np.zeros((100, 5))
+    model.data_buffer_channels = [0] * 100
+    model.configuration = {
+        "experiment": {
+            "MicroscopeState": {
+                "stack_cycling_mode": "per_stack",
+                "selected_channels": 2,
+                "number_z_steps": 5,
+                "start_position": -10.0,
+                "end_position": 10.0,
+                "step_size": 5.0,
+                "start_focus": 0.0,
+                "is_multiposition": True,
+                "waveform_template": "Default",
+                "channels": {
+                    "channel_1": {"is_selected": True, "defocus": 0},
+                    "channel_2": {"is_selected": False, "defocus": 0},
+                    "channel_3": {"is_selected": True, "defocus": 2},
+                },
+            },
+            "MultiPositions": [[0, 0, 100, 0, 50], [10, 20, 200, 0, 60]],
+        },
+        "waveform_templates": {
+            "Hardware-Z-Stack": {"repeat": 1, "expand": "number_z_steps"}
+        },
+    }
+    model.get_stage_position.return_value = {
+        "x_pos": 0,
+        "y_pos": 0,
+        "z_pos": 1,
+        "theta_pos": 0,
+        "f_pos": 2,
+    }
+
+    microscope = model.active_microscope
+    microscope.current_channel = 1
+    microscope.calculate_exposure_sweep_times.return_value = ({}, {"channel_1": 0.1})
+    microscope.stages = {"z": MagicMock()}
+    return model
+
+
+def run_signal(feature):
+    feature.pre_signal_func()
+    daq_runs = 0
+    while True:
+        assert feature.signal_func() is True
+        daq_runs += 1
+        # the data thread received the stack
+        feature.stack_received.set()
+        assert feature.signal_response_func() is True
+        if feature.signal_end():
+            return daq_runs
+
+
+def test_hardware_z_stack_runs_one_daq_task_per_stack(stack_model):
+    feature = HardwareZStackAcquisition(stack_model, ramp=True)
+    microscope = stack_model.active_microscope
+    stage = microscope.stages["z"]
+    microscope_state = stack_model.configuration["experiment"]["MicroscopeState"]
+
+    assert run_signal(feature) == 2 * 2
+    assert microscope_state["waveform_template"] == "Hardware-Z-Stack"
+    # the template change invalidates configuration snapshots
+    assert stack_model.configuration["snapshot_version"] == 1
+
+    # one stack waveform and one DAQ task per channel and position
+    assert stage.set_stack_waveform.call_count == 4
+    positions, sweep_times, ramp = stage.set_stack_waveform.call_args_list[0][0]
+    assert positions == [90, 95, 100, 105, 110]
+    assert sweep_times == {"channel_1": 0.1}
+    assert ramp is True
+    assert stage.set_stack_waveform.call_args_list[2][0][0][0] == 190
+    assert microscope.daq.prepare_acquisition.call_count == 4
+    microscope.prepare_next_channel.assert_called_with(update_daq_task_flag=False)
+
+    # the z stage is not moved by the model, the second channel is defocused
+    moves = [c[0][0] for c in stack_model.move_stage.call_args_list]
+    assert "z_abs" not in moves[0]
+    assert moves[0]["f_abs"] == 50 and moves[1]["f_abs"] == 52
+    assert moves[2]["x_abs"] == 10
+    assert moves[-1] == {"f_abs": 2}
+
+    # the frame counter skips the frames triggered by the same DAQ run
+    assert stack_model.frame_id == 4 * 4
+
+    feature.cleanup()
+    stage.switch_mode.assert_called_with("normal")
+    assert microscope_state["waveform_template"] == "Default"
+    assert stack_model.configuration["snapshot_version"] == 2
+
+
+def test_hardware_z_stack_positions(stack_model):
+    feature = HardwareZStackAcquisition(stack_model)
+    feature.pre_signal_func()
+    feature.pre_data_func()
+    assert feature.total_frames == 20
+
+    frame_ids = list(range(20))
+    feature.in_data_func(frame_ids[:3])
+    assert not feature.stack_received.is_set()
+    feature.in_data_func(frame_ids[3:])
+    assert feature.stack_received.is_set()
+
+    positions = stack_model.data_buffer_positions[:20]
+    np.testing.assert_allclose(positions[:5, 2], [90, 95, 100, 105, 110])
+    np.testing.assert_allclose(positions[5:10, 2], positions[:5, 2])
+    np.testing.assert_allclose(positions[10:15, 2], [190, 195, 200, 205, 210])
+    np.testing.assert_allclose(positions[:5, 4], 50)
+    np.testing.assert_allclose(positions[5:10, 4], 52)
+    np.testing.assert_allclose(positions[10:15, 0], 10)
+    assert stack_model.data_buffer_channels[:10] == [1] * 5 + [3] * 5
+    assert feature.end_data_func() is True
+
+
+def test_hardware_z_stack_needs_a_daq_driven_stage(stack_model):
+    stack_model.active_microscope.stages = {"z": object()}
+    feature = HardwareZStackAcquisition(stack_model)
+    feature.pre_signal_func()
+    assert stack_model.stop_acquisition is True
+    assert feature.signal_func() is False
+
+
+def test_hardware_z_stack_needs_the_waveform_template(stack_model):
+    stack_model.configuration["waveform_templates"] = {}
+    feature = HardwareZStackAcquisition(stack_model)
+    feature.pre_signal_func()
+    assert stack_model.stop_acquisition is True
+    feature.cleanup()
+    assert (
+        stack_model.configuration["experiment"]["MicroscopeState"]["waveform_template"]
+        == "Default"
+    )
@@ -46,3 +46,59 @@ def test_image_write(image_writer):
     assert ls
 
     delete_folder("test_save_dir")
+
+
+def test_image_write_overview(dummy_model):
+    from unittest.mock import MagicMock
+    from numpy.random import rand
+    from navigate.model.features.image_writer import ImageWriter
+
+    model = dummy_model
+    model.configuration["experiment"]["Saving"]["save_directory"] = "test_save_dir"
+    model.configuration["experiment"]["MicroscopeState"]["is_multiposition"] = True
+    model.event_queue = MagicMock()
+
+    writer = ImageWriter(model)
+    assert writer.overview_mosaic is not None
+
+    for i in range(model.data_buffer.shape[0]):
+        model.data_buffer[i, ...] = rand(model.img_width, model.img_height)
+    writer.save_image(list(range(model.number_of_frames)))
+    writer.close()
+
+    assert writer.overview_mosaic.number_of_tiles > 0
+    event, value = model.event_queue.put.call_args[0][0]
+    assert event == "overview"
+    assert value["number_of_tiles"] == writer.overview_mosaic.number_of_tiles
+    assert any(f.startswith("OVERVIEW") for f in os.listdir("test_save_dir/MIP"))
+
+    model.configuration["experiment"]["MicroscopeState"]["is_multiposition"] = False
+    delete_folder("test_save_dir")
+
+
+def test_image_write_overview_fail(dummy_model):
+    from unittest.mock import MagicMock
+    from numpy.random import rand
+    from navigate.model.features.image_writer import ImageWriter
+
+    model = dummy_model
+    model.configuration["experiment"]["Saving"]["save_directory"] = "test_save_dir"
+    model.configuration["experiment"]["MicroscopeState"]["is_multiposition"] = True
+    model.event_queue = MagicMock()
+    model.stop_acquisition = False
+
+    writer = ImageWriter(model)
+    writer.overview_mosaic.add_tile = MagicMock(side_effect=ValueError("overview"))
+
+    for i in range(model.data_buffer.shape[0]):
+        model.data_buffer[i, ...] = rand(model.img_width, model.img_height)
+    writer.save_image(list(range(model.number_of_frames)))
+
+    # the overview is disabled, but the data is still saved
+    assert writer.overview_mosaic is None
+    assert model.stop_acquisition is False
+    assert writer.data_source._current_frame == model.number_of_frames
+    writer.close()
+
+    model.configuration["experiment"]["MicroscopeState"]["is_multiposition"] = False
+    delete_folder("test_save_dir")
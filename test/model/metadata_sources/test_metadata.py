@@ -101,3 +101,24 @@ def test_metadata_set_stack_order_from_configuration_experiment(
         assert md._per_stack is True
     else:
         assert md._per_stack is False
+
+
+@pytest.mark.parametrize("is_multiposition", [True, False])
+def test_metadata_table_position(dummy_model, is_multiposition):
+    from navigate.model.metadata_sources.metadata import Metadata
+
+    microscope_state = dummy_model.configuration["experiment"]["MicroscopeState"]
+    microscope_state["is_multiposition"] = is_multiposition
+    microscope_state["position_order"] = [1, 0]
+
+    md = Metadata()
+
+    md.configuration = dummy_model.configuration
+
+    if is_multiposition:
+        assert [md.table_position(p) for p in range(3)] == [1, 0, 2]
+    else:
+        assert [md.table_position(p) for p in range(3)] == [0, 1, 2]
+
+    del microscope_state["position_order"]
+    microscope_state["is_multiposition"] = False
@@ -0,0 +1,201 @@
+# Copyright (c) 2021-2024  The University of Texas Southwestern Medical Center.
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted for academic and research use only
+# (subject to the limitations in the disclaimer below)
+# provided that the following conditions are met:
+
+#      * Redistributions of source code must retain the above copyright notice,
+#      this list of conditions and the following disclaimer.
+
+#      * Redistributions in binary form must reproduce the above copyright
+#      notice, this list of conditions and the following disclaimer in the
+#      documentation and/or other materials provided with the distribution.
+
+#      * Neither the name of the copyright holders nor the names of its
+#      contributors may be used to endorse or promote products derived from this
+#      software without specific prior written permission.
+
+# NO EXPRESS OR IMPLIED LICENSES TO ANY PARTY'S PATENT RIGHTS ARE GRANTED BY
+# THIS LICENSE. THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND
+# CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A
+# PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR
+# BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER
+# IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+# Standard Library Imports
+
+# Third Party Imports
+import pytest
+
+# Local Imports
+from navigate.model.acquisition_planner import (
+    AcquisitionPlanner,
+    DeviceTimingModel,
+    benchmark_writer_throughput,
+    format_acquisition_plan,
+)
+from navigate.model.features.common_features import (
+    LoopByCount,
+    StackPause,
+    ZStackAcquisition,
+)
+from navigate.model.features.hardware_z_stack import HardwareZStackAcquisition
+from navigate.tools.common_functions import copy_proxy_object
+
+Z_STACK = [
+    (
+        {"name": ZStackAcquisition},
+        {"name": StackPause},
+        {"name": LoopByCount, "args": ("experiment.MicroscopeState.timepoints",)},
+    )
+]
+
+
+@pytest.fixture
+def configuration(dummy_model):
+    configuration = copy_proxy_object(dummy_model.configuration)
+    experiment = configuration["experiment"]
+    microscope_state = experiment["MicroscopeState"]
+    microscope_state.update(
+        {
+            "start_position": 0,
+            "end_position": 100,
+            "number_z_steps": 10,
+            "step_size": 10,
+            "start_focus": 0,
+            "end_focus": 0,
+            "stack_z_origin": 0,
+            "stack_focus_origin": 0,
+            "timepoints": 2,
+            "stack_pause": 5,
+            "is_multiposition": False,
+            "stack_cycling_mode": "per_z",
+            "selected_channels": 2,
+        }
+    )
+    for i, channel in enumerate(microscope_state["channels"].values()):
+        channel["is_selected"] = i < 2
+        channel["defocus"] = 0
+        channel["filter_wheel_0"] = f"filter_{i}"
+    experiment["StageParameters"].update({"z": 0, "f": 0})
+    microscope_name = microscope_state["microscope_name"]
+    experiment["CameraParameters"][microscope_name].update(
+        {"img_x_pixels": 100, "img_y_pixels": 50}
+    )
+    return configuration
+
+
+@pytest.fixture
+def timing(configuration):
+    channels = configuration["experiment"]["MicroscopeState"]["channels"]
+    return DeviceTimingModel(
+        {k: 0.1 for k in channels},
+        {k: 0.2 for k in channels},
+        readout_time=0.05,
+        filter_wheel_delays=[1.0],
+    )
+
+
+def test_plan_z_stack(configuration, timing):
+    plan = AcquisitionPlanner(configuration, timing).plan(Z_STACK)
+
+    # 2 channels x 10 planes x 2 timepoints
+    assert plan["frames"] == 40
+    assert plan["bytes"] == 40 * 100 * 50 * 2
+    assert plan["complete"] is True
+    assert plan["phases"]["exposure"] == pytest.approx(40 * 0.1)
+    assert plan["phases"]["readout"] == pytest.approx(40 * 0.05)
+    assert plan["phases"]["settle"] == pytest.approx(40 * 0.05)
+    assert plan["phases"]["pause"] == pytest.approx(5)
+    # the filter wheel is positioned for the first frame and switches before
+    # every other frame
+    assert plan["phases"]["channel switch"] == pytest.approx(40 * 1.0)
+    assert plan["limiting_resource"] == "channel switch"
+    assert plan["duration"] == pytest.approx(sum(plan["phases"].values()))
+    assert any("per_stack" in text for text in plan["recommendations"])
+
+    # the configuration is never changed by the dry run
+    assert configuration["experiment"]["MicroscopeState"]["stack_pause"] == 5
+    assert "Limited by: channel switch" in format_acquisition_plan(plan)
+
+
+def test_plan_per_stack(configuration, timing):
+    configuration["experiment"]["MicroscopeState"]["stack_cycling_mode"] = "per_stack"
+    plan = AcquisitionPlanner(configuration, timing).plan(Z_STACK)
+
+    assert plan["frames"] == 40
+    # one switch per stack
+    assert plan["phases"]["channel switch"] == pytest.approx(4 * 1.0)
+    assert not any("per_z" in text for text in plan["recommendations"])
+
+
+def test_plan_measured_channel_switch(configuration, timing):
+    # switch times measured on the microscope are longer than the filter wheel
+    timing.channel_switch_time = 2.0
+    plan = AcquisitionPlanner(configuration, timing).plan(Z_STACK)
+
+    assert plan["phases"]["channel switch"] == pytest.approx(40 * 2.0)
+
+
+def test_plan_writer_limited(configuration, timing):
+    timing.writer_throughput = 1000.0
+    plan = AcquisitionPlanner(configuration, timing).plan(Z_STACK)
+
+    assert plan["limiting_resource"] == "writer"
+    assert plan["write_time"] == pytest.approx(plan["bytes"] / 1000.0)
+    assert plan["duration"] == plan["write_time"]
+    assert plan["duration"] > plan["acquisition_time"]
+
+
+def test_plan_position_order(configuration, timing):
+    experiment = configuration["experiment"]
+    experiment["MicroscopeState"]["is_multiposition"] = True
+    experiment["MicroscopeState"]["optimize_position_order"] = False
+    experiment["MultiPositions"] = [
+        [x, 0, 0, 0, 0] for x in [0, 10000, 1000, 9000, 2000, 8000]
+    ]
+    plan = AcquisitionPlanner(configuration, timing).plan(Z_STACK)
+
+    assert plan["frames"] == 40 * 6
+    assert any("Optimize Order" in text for text in plan["recommendations"])
+
+
+def test_plan_stops_at_max_frames(configuration, timing):
+    plan = AcquisitionPlanner(configuration, timing, max_frames=5).plan(Z_STACK)
+
+    assert plan["frames"] == 5
+    assert plan["complete"] is False
+
+
+def test_plan_rejects_features_waiting_for_data(configuration, timing):
+    with pytest.raises(ValueError):
+        AcquisitionPlanner(configuration, timing).plan(
+            [{"name": HardwareZStackAcquisition}]
+        )
+
+
+def test_stage_move_time(timing):
+    timing.stage_settle_time = 0.02
+    assert timing.stage_move_time([0] * 5, [0] * 5) == 0
+    assert timing.stage_move_time([0] * 5, [1000, 0, 0, 0, 0]) == pytest.approx(
+        1000 * 0.001 + 0.02
+    )
+
+
+def test_benchmark_writer_throughput(dummy_model, tmp_path):
+    configuration = dummy_model.configuration
+    microscope_name = configuration["experiment"]["MicroscopeState"]["microscope_name"]
+    throughput = benchmark_writer_throughput(
+        configuration, microscope_name, directory=str(tmp_path), number_of_frames=2
+    )
+
+    assert throughput > 0
+    assert list(tmp_path.iterdir()) == []
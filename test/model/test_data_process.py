@@ -0,0 +1,112 @@
+# Copyright (c) 2021-2024  The University of Texas Southwestern Medical Center.
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted for academic and research use only
+# (subject to the limitations in the disclaimer below)
+# provided that the following conditions are met:
+
+#      * Redistributions of source code must retain the above copyright notice,
+#      this list of conditions and the following disclaimer.
+
+#      * Redistributions in binary form must reproduce the above copyright
+#      notice, this list of conditions and the following disclaimer in the
+#      documentation and/or other materials provided with the distribution.
+
+#      * Neither the name of the copyright holders nor the names of its
+#      contributors may be used to endorse or promote products derived from this
+#      software without specific prior written permission.
+
+# NO EXPRESS OR IMPLIED LICENSES TO ANY PARTY'S PATENT RIGHTS ARE GRANTED BY
+# THIS LICENSE. THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND
+# CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A
+# PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR
+# BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER
+# IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+# Standard Library Imports
+import os
+import multiprocessing as mp
+
+# Third Party Imports
+import psutil
+import pytest
+from numpy.random import rand
+
+# Local Imports
+from navigate.model.data_process import (
+    DataProcess,
+    get_data_process_setting,
+    set_cpu_affinity,
+)
+
+
+def test_get_data_process_setting():
+    configuration = {"configuration": {}}
+    assert get_data_process_setting(configuration) == {
+        "enabled": False,
+        "cpu_affinity": [],
+        "model_cpu_affinity": [],
+    }
+
+    configuration["configuration"]["data_process"] = {
+        "enabled": True,
+        "cpu_affinity": [1, 2],
+        "model_cpu_affinity": None,
+    }
+    assert get_data_process_setting(configuration) == {
+        "enabled": True,
+        "cpu_affinity": [1, 2],
+        "model_cpu_affinity": [],
+    }
+
+
+def test_set_cpu_affinity():
+    assert set_cpu_affinity([]) is False
+    if not hasattr(psutil.Process(), "cpu_affinity"):
+        pytest.skip("CPU affinity is not supported on this platform.")
+    cpu_affinity = psutil.Process().cpu_affinity()
+    assert set_cpu_affinity(cpu_affinity) is True
+    assert psutil.Process().cpu_affinity() == cpu_affinity
+
+
+@pytest.mark.parametrize("use_saving_flags", [False, True])
+def test_data_process_saves_images(dummy_model, tmp_path, use_saving_flags):
+    model = dummy_model
+    save_directory = str(tmp_path / "data")
+    saving = model.configuration["experiment"]["Saving"]
+    original_save_directory = saving["save_directory"]
+    model.configuration["experiment"]["Saving"]["save_directory"] = save_directory
+    model.event_queue = mp.Queue()
+    model.stop_acquisition = False
+    for i in range(model.number_of_frames):
+        model.data_buffer[i, ...] = rand(model.img_width, model.img_height)
+
+    saving_flags = None
+    if use_saving_flags:
+        saving_flags = [i % 2 == 0 for i in range(model.number_of_frames)]
+
+    data_process = DataProcess(model, saving_flags=saving_flags)
+    assert data_process.max_pending_frames == model.number_of_frames // 2
+    for i in range(model.number_of_frames):
+        data_process.save_image([i])
+        assert data_process.pending_frames <= data_process.max_pending_frames
+    data_process.close()
+
+    assert data_process.is_running is False
+    assert not data_process.process.is_alive()
+    assert model.stop_acquisition is False
+    if use_saving_flags:
+        assert not any(saving_flags)
+
+    files = os.listdir(save_directory)
+    files.remove("MIP")
+    assert files
+
+    saving["save_directory"] = original_save_directory
@@ -30,6 +30,8 @@
 # POSSIBILITY OF SUCH DAMAGE.
 #
 
+import threading
+
 import pytest
 import random
 
@@ -74,6 +76,28 @@ def test_prepare_acquisition(dummy_microscope):
     ]
 
 
+def test_prepare_acquisition_reads_written_configuration(dummy_microscope):
+    from navigate.config.config import bump_configuration_version
+
+    configuration = dummy_microscope.configuration
+    other_constants = configuration["waveform_constants"]["other_constants"]
+    settle_duration = other_constants["remote_focus_settle_duration"]
+    dummy_microscope.prepare_acquisition()
+    sweep_times = dict(dummy_microscope.sweep_times)
+
+    # writers bump the version, so the snapshot is taken again
+    other_constants["remote_focus_settle_duration"] = float(settle_duration) + 10
+    bump_configuration_version(configuration)
+    try:
+        dummy_microscope.prepare_acquisition()
+        for channel_key, sweep_time in dummy_microscope.sweep_times.items():
+            assert sweep_time > sweep_times[channel_key]
+    finally:
+        other_constants["remote_focus_settle_duration"] = settle_duration
+        bump_configuration_version(configuration)
+        dummy_microscope.prepare_acquisition()
+
+
 def test_get_stage_position(dummy_microscope):
     import numpy as np
 
@@ -102,6 +126,21 @@ def test_get_stage_position(dummy_microscope):
     assert dummy_microscope.ask_stage_for_position is False
 
 
+def test_move_stage_async(dummy_microscope):
+    from navigate.model.concurrency.device_commands import wait_for_futures
+
+    pos_dict = {f"{k}_abs": v for k, v in zip(["x", "y", "z", "f"], [1, 2, 3, 4])}
+    futures = dummy_microscope.move_stage_async(pos_dict)
+
+    assert len(futures) == len(dummy_microscope.split_stage_move(pos_dict))
+    assert all(wait_for_futures(futures))
+    assert dummy_microscope.central_focus is None
+
+    stage_dict = dummy_microscope.get_stage_position(settled=True)
+    for axis_abs, value in pos_dict.items():
+        assert stage_dict[axis_abs.replace("_abs", "_pos")] == value
+
+
 def test_prepare_next_channel(dummy_microscope):
     dummy_microscope.prepare_acquisition()
 
@@ -120,6 +159,67 @@ def test_prepare_next_channel(dummy_microscope):
     )
 
 
+def test_pipelined_channel_switch(dummy_microscope):
+    dummy_microscope.prepare_acquisition()
+    dummy_microscope.channel_switch_times = {}
+
+    dummy_microscope.prepare_next_channel(wait=False)
+
+    futures = list(dummy_microscope.channel_switch_futures)
+    assert futures
+    assert dummy_microscope.current_channel == dummy_microscope.available_channels[0]
+
+    dummy_microscope.wait_for_channel_switch()
+    assert dummy_microscope.channel_switch_futures == []
+    assert all(future.done() for future in futures)
+    assert "focus" in dummy_microscope.channel_switch_times
+    assert dummy_microscope.estimate_channel_switch_time() == max(
+        dummy_microscope.channel_switch_times.values()
+    )
+
+    # nothing left to wait for
+    dummy_microscope.wait_for_channel_switch()
+
+
+def test_channel_switch_keeps_configuration_snapshot(dummy_microscope):
+    from navigate.config.config import get_configuration_snapshot
+
+    dummy_microscope.prepare_acquisition()
+    snapshot = get_configuration_snapshot(dummy_microscope.configuration)
+    for _ in range(3):
+        dummy_microscope.prepare_next_channel()
+    # switching channels doesn't copy the configuration again
+    assert get_configuration_snapshot(dummy_microscope.configuration) is snapshot
+
+
+def test_move_stage_after_pending_channel_switch(dummy_microscope):
+    from navigate.model.concurrency.device_commands import submit_device_command
+
+    stage = dummy_microscope.stages["f"]
+    calls = []
+    release = threading.Event()
+
+    def pending_defocus():
+        release.wait(5)
+        calls.append("defocus")
+
+    move_axis_absolute = stage.move_axis_absolute
+
+    def record_move(axis, value, wait_until_done=False):
+        calls.append("move")
+        return move_axis_absolute(axis, value, wait_until_done)
+
+    stage.move_axis_absolute = record_move
+    try:
+        submit_device_command(stage, pending_defocus)
+        threading.Timer(0.1, release.set).start()
+        assert dummy_microscope.move_stage({"f_abs": 10}, wait_until_done=True)
+    finally:
+        del stage.move_axis_absolute
+
+    assert calls == ["defocus", "move"]
+
+
 def test_calculate_all_waveform(dummy_microscope):
     # set waveform template to default
     dummy_microscope.configuration["experiment"]["MicroscopeState"][
@@ -141,3 +241,73 @@ def test_calculate_all_waveform(dummy_microscope):
             assert waveform_dict["galvo_waveform"][i][channel_key].shape == (
                 waveform_length,
             )
+
+
+def test_prepare_channel_sequence(dummy_microscope):
+    dummy_microscope.prepare_acquisition()
+    channels = dummy_microscope.configuration["experiment"]["MicroscopeState"][
+        "channels"
+    ]
+    channel_keys = [f"channel_{c}" for c in dummy_microscope.available_channels]
+    filters = {
+        k: [channels[c][k] for c in channel_keys] for k in dummy_microscope.filter_wheel
+    }
+
+    try:
+        # channels with different filters can not be played as one sequence
+        for k in dummy_microscope.filter_wheel:
+            channels[channel_keys[0]][k] = "filter_a"
+            channels[channel_keys[1]][k] = "filter_b"
+        if dummy_microscope.filter_wheel:
+            assert dummy_microscope.prepare_channel_sequence() is False
+            assert dummy_microscope.daq.channel_sequence is None
+
+        for k in dummy_microscope.filter_wheel:
+            for c in channel_keys:
+                channels[c][k] = "filter_a"
+        assert dummy_microscope.prepare_channel_sequence() is True
+        assert dummy_microscope.daq.channel_sequence == channel_keys
+        assert dummy_microscope.daq.camera_pulses
+        # all channels share the longest sweep time
+        assert len(set(dummy_microscope.sweep_times.values())) == 1
+
+        dummy_microscope.clear_channel_sequence()
+        assert dummy_microscope.daq.channel_sequence is None
+    finally:
+        for k, values in filters.items():
+            for c, v in zip(channel_keys, values):
+                channels[c][k] = v
+
+
+def test_continuous_acquisition(dummy_microscope):
+    daq_config = dummy_microscope.configuration["configuration"]["microscopes"][
+        dummy_microscope.microscope_name
+    ]["daq"]
+    channels = dummy_microscope.configuration["experiment"]["MicroscopeState"][
+        "channels"
+    ]
+    selected = {k: channels[k]["is_selected"] for k in channels.keys()}
+
+    dummy_microscope.prepare_acquisition()
+    # not enabled in the configuration
+    assert dummy_microscope.start_continuous_acquisition() is False
+
+    daq_config["continuous_live"] = True
+    try:
+        if len(dummy_microscope.available_channels) > 1:
+            assert dummy_microscope.start_continuous_acquisition() is False
+
+        for i, k in enumerate(channels.keys()):
+            channels[k]["is_selected"] = i == 0
+        dummy_microscope.prepare_acquisition()
+        assert dummy_microscope.start_continuous_acquisition() is True
+        assert dummy_microscope.daq.continuous is True
+        assert dummy_microscope.current_channel == 1
+
+        dummy_microscope.stop_continuous_acquisition()
+        assert dummy_microscope.daq.continuous is False
+        assert dummy_microscope.current_channel == 0
+    finally:
+        daq_config.pop("continuous_live")
+        for k, v in selected.items():
+            channels[k]["is_selected"] = v
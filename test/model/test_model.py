@@ -106,21 +106,14 @@ def test_single_acquisition(model):
 
     n_frames = state["selected_channels"]
 
-    show_img_pipe = model.create_pipe("show_img_pipe")
+    frame_ring = model.create_frame_ring("frame_ring")
 
     model.run_command("acquire")
-
-    image_id = show_img_pipe.recv()
-    n_images = 0
-    max_iters = 10
-    while image_id != "stop" and max_iters > 0:
-        image_id = show_img_pipe.recv()
-        n_images += 1
-        max_iters -= 1
-
-    assert n_images == n_frames
     model.data_thread.join()
-    model.release_pipe("show_img_pipe")
+
+    assert frame_ring.stopped
+    assert frame_ring.sequence == n_frames
+    model.release_frame_ring("frame_ring")
 
 
 def test_live_acquisition(model):
@@ -130,22 +123,25 @@ def test_live_acquisition(model):
     n_images = 0
     pre_channel = 0
 
-    show_img_pipe = model.create_pipe("show_img_pipe")
+    frame_ring = model.create_frame_ring("frame_ring")
 
     model.run_command("acquire")
 
-    while True:
-        image_id = show_img_pipe.recv()
-        if image_id == "stop":
-            break
-        channel_id = model.active_microscope.current_channel
-        assert channel_id != pre_channel
-        pre_channel = channel_id
-        n_images += 1
+    while not frame_ring.stopped:
+        if not frame_ring.wait(timeout=0.5):
+            continue
+        record = frame_ring.latest()
+        if record is None or record["sequence"] == n_images:
+            continue
+        # the channel changes between consecutive frames
+        if record["sequence"] == n_images + 1:
+            assert record["channel"] != pre_channel
+        pre_channel = record["channel"]
+        n_images = record["sequence"]
         if n_images >= 30:
             model.run_command("stop")
     model.data_thread.join()
-    model.release_pipe("show_img_pipe")
+    model.release_frame_ring("frame_ring")
 
 
 def test_autofocus_live_acquisition(model):
@@ -155,30 +151,32 @@ def test_autofocus_live_acquisition(model):
     n_images = 0
     pre_channel = 0
     autofocus = False
+    autofocus_started = False
 
-    show_img_pipe = model.create_pipe("show_img_pipe")
+    frame_ring = model.create_frame_ring("frame_ring")
 
     model.run_command("acquire")
 
-    while True:
-        image_id = show_img_pipe.recv()
-        if image_id == "stop":
-            break
-        channel_id = model.active_microscope.current_channel
-        if not autofocus:
-            assert channel_id != pre_channel
-        pre_channel = channel_id
-        n_images += 1
+    while not frame_ring.stopped:
+        if not frame_ring.wait(timeout=0.5):
+            continue
+        record = frame_ring.latest()
+        if record is None or record["sequence"] == n_images:
+            continue
+        if not autofocus and record["sequence"] == n_images + 1:
+            assert record["channel"] != pre_channel
+        pre_channel = record["channel"]
+        n_images = record["sequence"]
         if n_images >= 100:
             model.run_command("stop")
         elif n_images >= 70:
             autofocus = False
-        elif n_images == 30:
-            autofocus = True
+        elif n_images >= 30 and not autofocus_started:
+            autofocus = autofocus_started = True
             model.run_command("autofocus")
 
     model.data_thread.join()
-    model.release_pipe("show_img_pipe")
+    model.release_frame_ring("frame_ring")
 
 
 @pytest.mark.skipif(IN_GITHUB_ACTIONS, reason="Test hangs entire workflow on GitHub.")
@@ -213,7 +211,7 @@ def test_multiposition_acquisition(model):
     #             return True
     #     return False
 
-    _ = model.create_pipe("show_img_pipe")
+    _ = model.create_frame_ring("frame_ring")
 
     # Multiposition is selected and actually is True
     model.configuration["experiment"]["MicroscopeState"]["is_multiposition"] = True
@@ -262,7 +260,35 @@ def test_multiposition_acquisition(model):
         is False
     )
     model.data_thread.join()
-    model.release_pipe("show_img_pipe")
+    model.release_frame_ring("frame_ring")
+
+
+def test_plan_acquisition(model):
+    microscope_state = model.configuration["experiment"]["MicroscopeState"]
+    stack_pause = microscope_state["stack_pause"]
+
+    plan = model.plan_acquisition("z-stack", writer_throughput=1e9)
+
+    assert plan["frames"] > 0
+    assert plan["duration"] >= plan["acquisition_time"] > 0
+    assert plan["limiting_resource"]
+    assert microscope_state["stack_pause"] == stack_pause
+
+
+def test_run_command_plan_acquisition(model):
+    state = model.configuration["experiment"]["MicroscopeState"]
+    state["image_mode"] = "z-stack"
+    state["is_save"] = False
+    frame_ring = model.create_frame_ring("frame_ring")
+    model.event_queue.reset_mock()
+
+    model.run_command("plan_acquisition")
+
+    event, value = model.event_queue.put.call_args[0][0]
+    assert event == "acquisition_plan"
+    assert "Limited by" in value
+    assert model.is_acquiring is False
+    model.release_frame_ring("frame_ring")
 
 
 def test_change_resolution(model):
@@ -0,0 +1,163 @@
+# Copyright (c) 2021-2024  The University of Texas Southwestern Medical Center.
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted for academic and research use only
+# (subject to the limitations in the disclaimer below)
+# provided that the following conditions are met:
+
+#      * Redistributions of source code must retain the above copyright notice,
+#      this list of conditions and the following disclaimer.
+
+#      * Redistributions in binary form must reproduce the above copyright
+#      notice, this list of conditions and the following disclaimer in the
+#      documentation and/or other materials provided with the distribution.
+
+#      * Neither the name of the copyright holders nor the names of its
+#      contributors may be used to endorse or promote products derived from this
+#      software without specific prior written permission.
+
+# NO EXPRESS OR IMPLIED LICENSES TO ANY PARTY'S PATENT RIGHTS ARE GRANTED BY
+# THIS LICENSE. THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND
+# CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A
+# PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR
+# BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER
+# IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+# Standard Library Imports
+import time
+
+# Third Party Imports
+
+# Local Imports
+from navigate.model.concurrency.device_commands import (
+    shutdown_device_executor,
+    submit_device_command,
+)
+from navigate.model.stage_position_service import StagePositionService
+
+
+class CountingStage:
+    """A stage that counts how often its position is read."""
+
+    def __init__(self, axes, device_connection=None):
+        self.axes = axes
+        self.device_connection = device_connection
+        self.positions = {f"{axis}_pos": 0.0 for axis in axes}
+        self.report_count = 0
+
+    def report_position(self):
+        self.report_count += 1
+        return dict(self.positions)
+
+    def move_absolute(self, pos_dict, wait_until_done=False):
+        for axis_abs, value in pos_dict.items():
+            self.positions[axis_abs.replace("_abs", "_pos")] = value
+        return True
+
+
+def create_service(poll_interval=0):
+    xy_stage = CountingStage(["x", "y"])
+    f_stage = CountingStage(["f"])
+    service = StagePositionService(
+        [(xy_stage, ["x", "y"]), (f_stage, ["f"])], poll_interval=poll_interval
+    )
+    return service, xy_stage, f_stage
+
+
+def test_read_is_served_from_cache():
+    service, xy_stage, f_stage = create_service()
+
+    # the first read fills the cache
+    assert service.read() == {"x_pos": 0.0, "y_pos": 0.0, "f_pos": 0.0}
+    assert xy_stage.report_count == 1
+    assert f_stage.report_count == 1
+
+    for _ in range(10):
+        service.read()
+    assert xy_stage.report_count == 1
+    assert service.age("x") >= 0
+    assert service.age("z") is None
+
+    # settled reads always query the stages
+    service.read(settled=True)
+    assert xy_stage.report_count == 2
+    assert f_stage.report_count == 2
+
+    # so does the next read after the cache is invalidated
+    service.invalidate()
+    service.read()
+    assert xy_stage.report_count == 3
+
+
+def test_commanded_positions_are_predicted():
+    service, xy_stage, f_stage = create_service()
+    service.read()
+
+    xy_stage.move_absolute({"x_abs": 100})
+    service.command({"x_abs": 100})
+    assert service.read()["x_pos"] == 100
+    assert xy_stage.report_count == 1
+
+    # a later read replaces the prediction
+    xy_stage.positions["x_pos"] = 99.5
+    assert service.read(settled=True)["x_pos"] == 99.5
+    assert service.commanded == {}
+
+
+def test_poller_refreshes_the_cache():
+    service, xy_stage, f_stage = create_service(poll_interval=0.01)
+    service.read()
+    service.start()
+    try:
+        xy_stage.positions["y_pos"] = 42.0
+        start_time = time.monotonic()
+        while service.read()["y_pos"] != 42.0 and time.monotonic() - start_time < 2:
+            time.sleep(0.01)
+        assert service.read()["y_pos"] == 42.0
+        assert service.age("y") < 1
+    finally:
+        service.stop()
+    assert service.poller_threads == []
+
+    # stopped pollers do not read the stages anymore
+    report_count = xy_stage.report_count
+    time.sleep(0.05)
+    assert xy_stage.report_count == report_count
+
+
+def test_poll_waits_for_commands_on_a_shared_connection():
+    class Connection:
+        pass
+
+    class FilterWheel:
+        def __init__(self, device_connection):
+            self.device_connection = device_connection
+            self.is_moving = False
+
+        def set_filter(self):
+            self.is_moving = True
+            time.sleep(0.2)
+            self.is_moving = False
+
+    connection = Connection()
+    stage = CountingStage(["x"], connection)
+    filter_wheel = FilterWheel(connection)
+    service = StagePositionService([(stage, ["x"])])
+    assert service.stage_lock(stage) is service.stage_lock(
+        CountingStage([], connection)
+    )
+
+    future = submit_device_command(filter_wheel, filter_wheel.set_filter)
+    time.sleep(0.05)
+    # the position is not read while the filter wheel talks to the controller
+    service.poll(stage)
+    assert future.done()
+    assert not filter_wheel.is_moving
+    shutdown_device_executor(filter_wheel)
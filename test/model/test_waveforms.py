@@ -157,6 +157,25 @@ class TestWaveforms(unittest.TestCase):
             self.assertEqual(np.max(data), amplitude)
         self.assertEqual(np.size(data), sample_rate * sweep_time)
 
+    def test_staircase(self):
+        sample_rate = 1000
+        sweep_time = 0.01
+        levels = [0.0, 0.5, 1.0]
+        data = waveforms.staircase(
+            sample_rate=sample_rate, sweep_time=sweep_time, levels=levels
+        )
+        self.assertEqual(np.size(data), 30)
+        np.testing.assert_array_equal(data[:10], 0.0)
+        np.testing.assert_array_equal(data[20:], 1.0)
+
+        data = waveforms.staircase(
+            sample_rate=sample_rate, sweep_time=sweep_time, levels=levels, ramp=True
+        )
+        self.assertEqual(np.size(data), 30)
+        self.assertEqual(data[10], 0.5)
+        self.assertAlmostEqual(data[-1], 1.45)
+        self.assertTrue(np.all(np.diff(data) > 0))
+
     def test_sawtooth_amplitude(self):
         sample_rate = 100000
         sweep_time = 0.4
@@ -232,3 +251,102 @@ class TestWaveforms(unittest.TestCase):
             sample_rate=sr, sweep_time=st, exposure=ex, camera_delay=cd
         )
         assert np.sum(v > 0) == int(sr * (ex - cd))
+
+    def test_min_max_envelope(self):
+        waveform = waveforms.sawtooth(sample_rate=100000, sweep_time=0.4)
+        sample_index, envelope = waveforms.min_max_envelope(waveform, 500)
+        assert len(envelope) <= 2 * 500
+        np.testing.assert_array_equal(waveform[sample_index], envelope)
+        assert np.all(np.diff(sample_index) >= 0)
+        assert np.max(envelope) == np.max(waveform)
+        assert np.min(envelope) == np.min(waveform)
+
+    def test_min_max_envelope_short_waveform(self):
+        waveform = waveforms.remote_focus_ramp(sample_rate=1000)
+        sample_index, envelope = waveforms.min_max_envelope(waveform, 1000)
+        np.testing.assert_array_equal(sample_index, np.arange(len(waveform)))
+        np.testing.assert_array_equal(envelope, waveform)
+
+    def test_decimate_waveforms(self):
+        waveform = waveforms.remote_focus_ramp()
+        waveform_dict = {
+            "camera_waveform": {"channel_1": waveform},
+            "remote_focus_waveform": {"channel_1": waveform, "channel_2": None},
+            "galvo_waveform": [{"channel_1": waveform}],
+        }
+        decimated_waveform_dict = waveforms.decimate_waveforms(waveform_dict, 100)
+        assert decimated_waveform_dict["remote_focus_waveform"]["channel_2"] is None
+        for decimated_waveform in [
+            decimated_waveform_dict["camera_waveform"]["channel_1"],
+            decimated_waveform_dict["remote_focus_waveform"]["channel_1"],
+            decimated_waveform_dict["galvo_waveform"][0]["channel_1"],
+        ]:
+            assert decimated_waveform["number_of_samples"] == len(waveform)
+            assert len(decimated_waveform["envelope"]) <= 200
+            np.testing.assert_array_equal(
+                waveform[decimated_waveform["sample_index"]],
+                decimated_waveform["envelope"],
+            )
+
+    def test_repeat_min_max_envelope(self):
+        waveform = waveforms.sawtooth(sample_rate=100000, sweep_time=0.1)
+        decimated_waveform = waveforms.decimate_waveforms(
+            {"remote_focus_waveform": {"channel_1": waveform}}, 1000
+        )["remote_focus_waveform"]["channel_1"]
+        repeated_waveform = np.tile(waveform, 100)
+
+        for repeat_num in [1, 3, 100]:
+            sample_index, envelope = waveforms.repeat_min_max_envelope(
+                decimated_waveform, repeat_num, 500
+            )
+            # the number of points does not grow with the number of repeats
+            assert len(envelope) <= 2 * 500
+            assert np.all(np.diff(sample_index) >= 0)
+            np.testing.assert_array_equal(repeated_waveform[sample_index], envelope)
+            assert np.max(envelope) == np.max(waveform)
+            assert np.min(envelope) == np.min(waveform)
+            assert sample_index[-1] < repeat_num * len(waveform)
+
+    def test_repeat_min_max_envelope_few_points(self):
+        waveform = waveforms.remote_focus_ramp(sample_rate=1000)
+        decimated_waveform = {
+            "sample_index": np.arange(len(waveform)),
+            "envelope": waveform,
+            "number_of_samples": len(waveform),
+        }
+        sample_index, envelope = waveforms.repeat_min_max_envelope(
+            decimated_waveform, 2, 1000
+        )
+        np.testing.assert_array_equal(sample_index, np.arange(2 * len(waveform)))
+        np.testing.assert_array_equal(envelope, np.tile(waveform, 2))
+
+    def test_waveform_cache(self):
+        cache = waveforms.WaveformCache(max_size=2)
+        calls = []
+
+        def generate(sweep_time):
+            calls.append(sweep_time)
+            return waveforms.sawtooth(sample_rate=1000, sweep_time=sweep_time)
+
+        waveform = cache.get(("sawtooth", 0.1), lambda: generate(0.1))
+        assert not waveform.flags.writeable
+        with pytest.raises(ValueError):
+            waveform[0] = 1
+        assert cache.get(("sawtooth", 0.1), lambda: generate(0.1)) is waveform
+        assert calls == [0.1]
+        assert (cache.hits, cache.misses) == (1, 1)
+
+        # The least recently used waveform is evicted
+        cache.get(("sawtooth", 0.2), lambda: generate(0.2))
+        cache.get(("sawtooth", 0.1), lambda: generate(0.1))
+        cache.get(("sawtooth", 0.3), lambda: generate(0.3))
+        assert len(cache) == 2
+        cache.get(("sawtooth", 0.2), lambda: generate(0.2))
+        assert calls == [0.1, 0.2, 0.3, 0.2]
+
+        # Waveforms that could not be generated are not cached
+        assert cache.get(("unknown",), lambda: None) is None
+        assert len(cache) == 2
+
+        cache.clear()
+        assert len(cache) == 0 and (cache.hits, cache.misses) == (0, 0)
@@ -201,6 +201,61 @@ def test_calc_num_tiles(dist, overlap, roi_length):
     assert result == expected_num_tiles
 
 
+def test_estimate_travel_time():
+    from navigate.tools.multipos_table_tools import estimate_travel_time
+
+    positions = [[0, 0, 0, 0, 0], [1000, 500, 0, 0, 0], [1000, 500, 0, 10, 0]]
+    weights = {"x": 0.001, "y": 0.001, "theta": 0.1}
+
+    # axes move in parallel, the slowest axis sets the travel time
+    assert estimate_travel_time(positions, weights) == pytest.approx(1.0 + 1.0)
+    assert estimate_travel_time(positions[:1], weights) == 0
+
+
+def test_plan_position_route_grid():
+    from navigate.tools.multipos_table_tools import (
+        compute_tiles_from_bounding_box,
+        estimate_travel_time,
+        plan_position_route,
+    )
+
+    tiles = compute_tiles_from_bounding_box(
+        0, 4, 100, 0, 0, 3, 100, 0, 0, 1, 0, 0, 0, 2, 90, 0, 0, 1, 0, 0
+    )
+    order = plan_position_route(tiles)
+
+    assert sorted(order) == list(range(len(tiles)))
+    assert estimate_travel_time(tiles[order]) < estimate_travel_time(tiles)
+
+    # a serpentine takes only single steps and rotates once
+    steps = np.abs(np.diff(tiles[order], axis=0))
+    assert np.all(np.count_nonzero(steps, axis=1) == 1)
+    assert np.all(steps[:, :2].max(axis=1) <= 100)
+    assert np.count_nonzero(steps[:, 3]) == 1
+
+
+def test_plan_position_route_arbitrary_positions():
+    from navigate.tools.multipos_table_tools import (
+        estimate_travel_time,
+        plan_position_route,
+    )
+
+    rng = np.random.default_rng(0)
+    positions = np.zeros((200, 5))
+    positions[:, :3] = rng.uniform(0, 10000, (200, 3))
+    order = plan_position_route(positions)
+
+    assert sorted(order) == list(range(len(positions)))
+    assert order[0] == 0
+    assert estimate_travel_time(positions[order]) < 0.5 * estimate_travel_time(
+        positions
+    )
+
+    # an already optimal route is kept
+    line = [[i * 100, 0, 0, 0, 0] for i in range(5)]
+    assert plan_position_route(line) == list(range(5))
+
+
 class UpdateTableTestCase(unittest.TestCase):
     def setUp(self):
         self.root = tk.Tk()